@@ -193,6 +193,7 @@ class AIManager:
     generate_video_variations = backend.services.narrative.generate_video_variations
     generate_image_variation_prompts = backend.services.narrative.generate_image_variation_prompts
     curate_workflow = backend.services.workflow.curate_workflow
+    iter_workflow_curations = backend.services.workflow.iter_workflow_curations
     embed_metadata = backend.utils.image_utils.embed_metadata
     extract_metadata = backend.utils.image_utils.extract_metadata
     get_image_dimensions = backend.utils.image_utils.get_image_dimensions
@@ -102,6 +102,12 @@ OUTPUT_BASE_DIR = Path(
 OUTPUT_IMAGES_DIR = OUTPUT_BASE_DIR / "Images"
 OUTPUT_VIDEOS_DIR = OUTPUT_BASE_DIR / "Videos"
 OUTPUT_JSON_DIR = OUTPUT_BASE_DIR / "JSON"
+OUTPUT_AUDIO_DIR = OUTPUT_BASE_DIR / "Audio"   # server-side music recordings (music_recorder.py)
+# Videorama film projects (local installs; mounted at /films for the review UI)
+FILMS_ROOT = Path(os.environ.get(
+    "SYNTH_FILMS_ROOT",
+    r"D:\Synthograsizer_Films" if Path(r"D:\\").exists()
+    else str(Path.home() / "Synthograsizer_Films")))
 
 # ── Operational Limits ──
 VIDEO_POLL_TIMEOUT_SECONDS = 300  # Max wait for video generation
@@ -109,3 +115,6 @@ VIDEO_DOWNLOAD_TIMEOUT_SECONDS = (10, 120)  # (connect, read) for downloading th
 MAX_BATCH_IMAGES = 200           # Safety cap for batch analysis
 TEMPLATE_GEN_TIMEOUT_SECONDS = 180    # Max wait for LLM template generation (text/image/hybrid/remix/story)
 TEMPLATE_GEN_P5_TIMEOUT_SECONDS = 300 # p5.js sketch generation: Pro model writes complete code with lookup maps — needs more time
+WORKFLOW_CURATION_CONCURRENCY = 4     # Images curated at once in workflow mode (each = 1 vision + 1 JSON call)
+METADATA_POOL_WORKERS = min(4, os.cpu_count() or 1)  # Worker processes for /api/extract-metadata/bulk (<2 = threads only)
+METADATA_POOL_MIN_BATCH = 8           # Smaller bulk batches stay on threads (process hand-off costs more than parsing)
@@ -19,9 +19,10 @@ dedicated endpoints regardless of mode (see video_gen / image_gen Imagen path /
 music_manager).
 
 Content is expressed as neutral block dicts (``text_block`` / ``image_block``,
-image data kept as raw bytes) and converted per mode at dispatch time:
-Interactions wants ``{"type": "image", "data": <base64 str>, ...}``; legacy
-wants ``types.Part``. Safety blocks surface as ``SafetyBlockedError`` in both
+image data kept as raw bytes or an ``ImagePayload``) and converted per mode at
+dispatch time: Interactions wants ``{"type": "image", "data": <base64 str>,
+...}`` (a payload's base64 is reused, not re-encoded); legacy wants
+``types.Part``. Safety blocks surface as ``SafetyBlockedError`` in both
 modes so routers keep emitting the structured 422 the front-end's
 "Report wrongly blocked" affordance recognizes. Under Interactions there is no
 documented block signal, so detection is best-effort: ``status == "failed"``
@@ -29,13 +30,18 @@ step errors and safety-flavored API error messages.
 """
 
 import base64
+import functools
+import inspect
 import logging
+import time
 from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from google.genai import types
 
 from backend.helpers import SafetyBlockedError
 from backend.policy import policy, GOOGLE_API_LEGACY
+from backend.utils import metrics
+from backend.utils.image_payload import ImageLike, ImagePayload
 from backend.utils.image_utils import sniff_mime_type
 
 logger = logging.getLogger(__name__)
@@ -69,8 +75,11 @@ def text_block(text: str) -> Dict[str, Any]:
     return {"type": "text", "text": text}
 
 
-def image_block(data: bytes, mime_type: Optional[str] = None) -> Dict[str, Any]:
-    """Image input block. ``data`` is raw bytes; encoding happens at dispatch."""
+def image_block(data: ImageLike, mime_type: Optional[str] = None) -> Dict[str, Any]:
+    """Image input block. ``data`` is raw bytes or an ``ImagePayload``;
+    encoding happens at dispatch (a payload's memoized base64 is reused)."""
+    if isinstance(data, ImagePayload):
+        return {"type": "image", "data": data, "mime_type": mime_type or data.mime}
     return {
         "type": "image",
         "data": data,
@@ -90,7 +99,9 @@ def _to_interactions_input(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     """Blocks → Interactions content dicts (image bytes → base64 str)."""
     out = []
     for b in blocks:
-        if b.get("type") == "image" and isinstance(b.get("data"), (bytes, bytearray)):
+        if b.get("type") == "image" and isinstance(b.get("data"), ImagePayload):
+            out.append({"type": "image", "data": b["data"].b64, "mime_type": b["mime_type"]})
+        elif b.get("type") == "image" and isinstance(b.get("data"), (bytes, bytearray)):
             out.append({
                 "type": "image",
                 "data": base64.b64encode(b["data"]).decode("ascii"),
@@ -109,7 +120,9 @@ def _to_legacy_contents(blocks: List[Dict[str, Any]]) -> List[Any]:
             out.append(b["text"])
         elif b.get("type") == "image":
             data = b["data"]
-            if isinstance(data, str):
+            if isinstance(data, ImagePayload):
+                data = data.data
+            elif isinstance(data, str):
                 data = base64.b64decode(data)
             out.append(types.Part.from_bytes(data=data, mime_type=b["mime_type"]))
         else:
@@ -303,8 +316,48 @@ def _legacy_raise_if_blocked(response) -> None:
             )
 
 
+def _timed_dispatch(func):
+    """Latency histogram per dispatcher + model (``google_api.<fn>``). A
+    streaming dispatcher is timed to exhaustion, with time-to-first-chunk as
+    its own series; a stream the consumer closes early (client disconnect)
+    is recorded under ``status="cancelled"``, not as an error."""
+    name = f"google_api.{func.__name__}"
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def stream_wrapper(client, model, *args, **kwargs):
+            if not metrics.ENABLED:
+                yield from func(client, model, *args, **kwargs)
+                return
+            t0 = time.perf_counter()
+            first = True
+            try:
+                for chunk in func(client, model, *args, **kwargs):
+                    if first:
+                        metrics.observe(name + ".first_chunk", (time.perf_counter() - t0) * 1000,
+                                        model=model)
+                        first = False
+                    yield chunk
+            except GeneratorExit:
+                metrics.observe(name, (time.perf_counter() - t0) * 1000,
+                                model=model, status="cancelled")
+                raise
+            except BaseException:
+                metrics.observe(name, (time.perf_counter() - t0) * 1000, error=True, model=model)
+                raise
+            metrics.observe(name, (time.perf_counter() - t0) * 1000, model=model)
+        return stream_wrapper
+
+    @functools.wraps(func)
+    def wrapper(client, model, *args, **kwargs):
+        with metrics.span(name, model=model):
+            return func(client, model, *args, **kwargs)
+    return wrapper
+
+
 # ── public dispatchers ───────────────────────────────────────────────────────
 
+@_timed_dispatch
 def gen_text(client, model: str, blocks: List[Dict[str, Any]], *,
              system_instruction: Optional[str] = None,
              json_mode: bool = False,
@@ -369,6 +422,7 @@ def gen_text(client, model: str, blocks: List[Dict[str, Any]], *,
     return extract_text(interaction)
 
 
+@_timed_dispatch
 def gen_text_stream(client, model: str, blocks: List[Dict[str, Any]], *,
                     system_instruction: Optional[str] = None,
                     safety_settings: Optional[List[Dict[str, str]]] = None
@@ -408,6 +462,7 @@ def gen_text_stream(client, model: str, blocks: List[Dict[str, Any]], *,
     yield from iter_stream_text(stream)
 
 
+@_timed_dispatch
 def gen_chat(client, model: str, message: str,
              history: Optional[List[Dict[str, str]]]) -> str:
     """Stateless multi-turn chat via the active API mode.
@@ -440,6 +495,7 @@ def gen_chat(client, model: str, message: str,
 _INTERACTIONS_IMAGE_SIZE = {"512px": "512", "1K": "1K", "2K": "2K", "4K": "4K"}
 
 
+@_timed_dispatch
 def gen_image(client, model: str, blocks: List[Dict[str, Any]], *,
               aspect_ratio: Optional[str] = None,
               image_size: Optional[str] = None,
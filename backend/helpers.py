@@ -1,6 +1,8 @@
 import base64
 import json
 
+from backend.utils.image_payload import ImagePayload, check_encoded_size
+
 
 class SafetyBlockedError(Exception):
     """A generation was blocked by the provider's safety filters.
@@ -44,18 +46,20 @@ def decode_base64_image(b64_string: str, max_bytes: int = MAX_DECODED_IMAGE_BYTE
     """
     if "," in b64_string:
         b64_string = b64_string.split(",", 1)[1]
-
-    # Conservative pre-check: every 4 base64 chars decode to at most 3 bytes.
-    # Add a small slack for padding edge cases.
-    estimated_decoded = (len(b64_string) * 3) // 4
-    if estimated_decoded > max_bytes:
-        raise ValueError(
-            f"Image payload too large: ~{estimated_decoded // (1024 * 1024)} MB "
-            f"exceeds the {max_bytes // (1024 * 1024)} MB cap"
-        )
+    check_encoded_size(b64_string, max_bytes)
     return base64.b64decode(b64_string)
 
 
+def decode_image_payload(b64_string: str, max_bytes: int = MAX_DECODED_IMAGE_BYTES) -> ImagePayload:
+    """Like `decode_base64_image`, but returns a lazily decoded `ImagePayload`.
+
+    Same data-URI handling and size cap; the base64 is kept as sent, so a
+    Gemini call in Interactions mode forwards it without a decode/encode
+    round trip. Use it where the image only passes through to the model.
+    """
+    return ImagePayload.from_b64(b64_string, max_bytes)
+
+
 def parse_llm_json(json_str: str) -> dict:
     """Parse JSON from an LLM response, handling markdown fences.
 
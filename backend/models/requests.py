@@ -43,6 +43,8 @@ class ImageRequest(BaseModel):
     # a different API and is not affected by this deprecation.
     # Provenance tags to embed in PNG metadata
     tags: Optional[List[Dict]] = None
+    # "json" (default, base64 inline) | "multipart" | "ref" — see routers/generation.py
+    response_mode: Optional[str] = None
 
 class VideoRequest(BaseModel):
     prompt: str
@@ -54,6 +56,7 @@ class VideoRequest(BaseModel):
     resolution: Optional[str] = None               # "720p" | "1080p" | "4k" (4k: Veo 3.1 only; 1080p/4k require 8s)
     reference_images: Optional[List[str]] = None   # Up to 3 base64 images (Veo 3.1 full/fast only)
     extension_video_uri: Optional[str] = None      # URI of a prior Veo generation to extend (Veo 3.1 full/fast only)
+    response_mode: Optional[str] = None            # "json" (default) | "multipart" | "ref" — as ImageRequest
 
 class ChatRequest(BaseModel):
     message: str
@@ -112,6 +115,7 @@ class MetadataRequest(BaseModel):
 
 class BulkMetadataRequest(BaseModel):
     images: List[str]  # List of base64 encoded PNG images
+    stream: bool = False  # NDJSON, one line per image as it finishes (completion order)
 
 class NarrativeRequest(BaseModel):
     descriptions: List[str]
@@ -140,6 +144,12 @@ class OSCSendParamRequest(BaseModel):
 class OSCConfigRequest(BaseModel):
     host: Optional[str] = None
     port: Optional[int] = None
+    tick_ms: Optional[float] = None  # bundle tick; 0 = send every call immediately
 
 class ScopeDiscoverRequest(BaseModel):
     scopeUrl: Optional[str] = None
+
+
+class RecorderSegmentsRequest(BaseModel):
+    action: str                    # "start" | "stop"
+    segment_seconds: int = 300
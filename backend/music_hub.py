@@ -0,0 +1,176 @@
+"""Music fan-out hub — one Lyria session, many /ws/music listeners.
+
+MusicManager produces PCM chunks (48kHz stereo 16-bit) and JSON status
+strings through a single callback. The hub is that callback: ``publish()``
+is synchronous and never awaits a socket, it just appends to every
+listener's own bounded ring buffer. Each listener drains its ring from its
+own pump task, so a slow browser only ever falls behind itself.
+
+Overflow policy mirrors MusicManager.send_command: a live stream cares about
+now, not backlog, so when a listener's ring exceeds its byte budget the
+OLDEST audio is dropped (the client skips ahead). Status/error text goes on a
+separate small queue and is sent before audio, so a lagging client still
+sees state changes.
+
+No network or SDK imports — tests drive it with a fake PCM source.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 48000
+CHANNELS = 2
+SAMPLE_WIDTH = 2  # bytes, 16-bit PCM
+BYTES_PER_SECOND = SAMPLE_RATE * CHANNELS * SAMPLE_WIDTH
+
+# Per-listener audio buffer. Two seconds absorbs network jitter; past that a
+# client is better served skipping ahead than playing ever-staler audio.
+DEFAULT_BUFFER_SECONDS = 2.0
+TEXT_QUEUE_MAX = 64
+
+Payload = Union[bytes, str]
+
+
+class Listener:
+    """One client's ring buffer + counters. Drained by ``pump()``."""
+
+    def __init__(self, listener_id: int, buffer_seconds: float = DEFAULT_BUFFER_SECONDS):
+        self.id = listener_id
+        self.max_bytes = max(1, int(buffer_seconds * BYTES_PER_SECOND))
+        self._audio: deque = deque()
+        self._audio_bytes = 0
+        self._text: deque = deque(maxlen=TEXT_QUEUE_MAX)
+        self._wake = asyncio.Event()
+        self.closed = False
+        self.connected_at = time.time()
+        # metrics
+        self.chunks_in = 0
+        self.chunks_sent = 0
+        self.chunks_dropped = 0
+        self.bytes_sent = 0
+        self.bytes_dropped = 0
+        self.max_lag_bytes = 0
+
+    def offer(self, data: Payload) -> None:
+        if self.closed:
+            return
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+            self.chunks_in += 1
+            self._audio.append(data)
+            self._audio_bytes += len(data)
+            # Keep at least the newest chunk even if it alone exceeds the budget.
+            while self._audio_bytes > self.max_bytes and len(self._audio) > 1:
+                old = self._audio.popleft()
+                self._audio_bytes -= len(old)
+                self.chunks_dropped += 1
+                self.bytes_dropped += len(old)
+            self.max_lag_bytes = max(self.max_lag_bytes, self._audio_bytes)
+        else:
+            self._text.append(data)
+        self._wake.set()
+
+    @property
+    def lag_seconds(self) -> float:
+        """Audio queued for this client but not yet sent."""
+        return self._audio_bytes / BYTES_PER_SECOND
+
+    async def pump(self, send: Callable[[Payload], Awaitable[None]]) -> None:
+        """Send queued payloads until closed. Text first, then audio in order.
+
+        Raises whatever ``send`` raises (e.g. a disconnect) — the caller owns
+        the socket and decides what that means."""
+        while not self.closed:
+            await self._wake.wait()
+            self._wake.clear()
+            while self._text or self._audio:
+                if self._text:
+                    await send(self._text.popleft())
+                    continue
+                chunk = self._audio.popleft()
+                self._audio_bytes -= len(chunk)
+                await send(chunk)
+                self.chunks_sent += 1
+                self.bytes_sent += len(chunk)
+
+    def close(self) -> None:
+        self.closed = True
+        self._wake.set()
+
+    def stats(self) -> dict:
+        return {
+            "id": self.id,
+            "connected_for_s": round(time.time() - self.connected_at, 1),
+            "chunks_in": self.chunks_in,
+            "chunks_sent": self.chunks_sent,
+            "chunks_dropped": self.chunks_dropped,
+            "bytes_sent": self.bytes_sent,
+            "bytes_dropped": self.bytes_dropped,
+            "lag_s": round(self.lag_seconds, 3),
+            "max_lag_s": round(self.max_lag_bytes / BYTES_PER_SECOND, 3),
+        }
+
+
+class MusicHub:
+    def __init__(self, buffer_seconds: float = DEFAULT_BUFFER_SECONDS):
+        self.buffer_seconds = buffer_seconds
+        self._listeners: dict[int, Listener] = {}
+        self._ids = itertools.count(1)
+        # Synchronous audio consumers that see every chunk (the recorder).
+        # They run inline in publish(), so they must not block.
+        self._taps: list[Callable[[bytes], None]] = []
+
+    def add_tap(self, fn: Callable[[bytes], None]) -> None:
+        if fn not in self._taps:
+            self._taps.append(fn)
+
+    def remove_tap(self, fn: Callable[[bytes], None]) -> None:
+        if fn in self._taps:
+            self._taps.remove(fn)
+
+    def add(self, buffer_seconds: Optional[float] = None) -> Listener:
+        listener = Listener(next(self._ids), buffer_seconds or self.buffer_seconds)
+        self._listeners[listener.id] = listener
+        return listener
+
+    def remove(self, listener: Listener) -> None:
+        listener.close()
+        self._listeners.pop(listener.id, None)
+
+    def __len__(self) -> int:
+        return len(self._listeners)
+
+    def publish_nowait(self, data: Payload) -> None:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data)
+            for tap in self._taps:
+                try:
+                    tap(data)
+                except Exception:
+                    logger.exception("Music hub tap failed")
+        for listener in list(self._listeners.values()):
+            listener.offer(data)
+
+    async def publish(self, data: Payload) -> None:
+        """MusicManager's send callback. Never blocks on a client."""
+        self.publish_nowait(data)
+
+    def stats(self) -> dict:
+        listeners = [l.stats() for l in self._listeners.values()]
+        return {
+            "listeners": len(listeners),
+            "buffer_seconds": self.buffer_seconds,
+            "chunks_dropped": sum(l["chunks_dropped"] for l in listeners),
+            "per_listener": listeners,
+        }
+
+
+music_hub = MusicHub()
@@ -8,6 +8,8 @@ Key design: `client.aio.live.music.connect()` returns an async context manager,
 so the session only lives inside the `async with` block. We run the entire
 session lifecycle in a background task (`_session_loop`) that keeps the
 context manager alive. Control commands are sent via an asyncio.Queue.
+Prompt crossfades run beside that queue in a CrossfadeScheduler, so a fade
+never blocks other commands and can be retargeted mid-flight.
 """
 
 from __future__ import annotations
@@ -15,7 +17,9 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import Any, Optional
+import math
+import time
+from typing import Any, Awaitable, Callable, Optional
 
 from google import genai as genai_sdk
 from google.genai import types
@@ -52,6 +56,141 @@ MUSIC_MODE_MAP = {
 # bursty UIs without ever realistically blocking.
 CMD_QUEUE_MAX = 64
 
+# Commands where only the newest intent matters. Each key holds one queue
+# slot: a newer command replaces the pending one in place (set_config merges,
+# prompts are latest-wins) instead of taking another entry, so a knob storm
+# can't push play/stop out of the drop-oldest queue.
+COALESCE_KEYS = {
+    "set_prompts": "prompts",
+    "crossfade_prompts": "prompts",
+    "set_config": "config",
+}
+
+# Crossfade weight updates are coalesced to at most this many per second —
+# each one is a websocket message to Lyria, and it can't hear finer steps.
+CROSSFADE_MAX_UPDATES_PER_S = 10.0
+MIN_PROMPT_WEIGHT = 0.01  # Lyria doesn't accept weight=0
+
+
+def equal_power_blend(old_prompts: list[dict], new_prompts: list[dict], t: float) -> list[dict]:
+    """Prompt weights ``t`` of the way (0..1) from ``old_prompts`` to ``new_prompts``.
+
+    Outgoing prompts follow cos(t·π/2) and incoming ones sin(t·π/2), so the
+    summed power stays constant — a linear fade dips in the middle. A prompt
+    in both sets is the same source, not two, so its weight moves linearly.
+    """
+    t = min(max(t, 0.0), 1.0)
+    fade_out, fade_in = math.cos(t * math.pi / 2), math.sin(t * math.pi / 2)
+    old_w = {p["text"]: float(p.get("weight", 1.0)) for p in old_prompts}
+    new_w = {p["text"]: float(p.get("weight", 1.0)) for p in new_prompts}
+    blended = []
+    for text in list(old_w) + [k for k in new_w if k not in old_w]:
+        if text in old_w and text in new_w:
+            weight = old_w[text] + (new_w[text] - old_w[text]) * t
+        elif text in old_w:
+            weight = old_w[text] * fade_out
+        else:
+            weight = new_w[text] * fade_in
+        if weight > MIN_PROMPT_WEIGHT:
+            blended.append({"text": text, "weight": weight})
+    return blended
+
+
+class CrossfadeScheduler:
+    """Runs prompt crossfades beside the command queue instead of inside it.
+
+    A fade is a target plus a start time on the monotonic clock; one task
+    wakes at most ``max_rate`` times a second and sends the weights for the
+    time that has *actually* elapsed, so a slow send shortens the next wait
+    rather than stretching the fade. ``start()`` during a fade retargets it
+    from the weights last sent (no jump back to the old prompts), and
+    ``set_now()`` cancels it — both just swap ``_fade``, never queue messages.
+    """
+
+    def __init__(
+        self,
+        apply: Callable[[list[dict]], Awaitable[None]],
+        on_done: Optional[Callable[[list[dict]], Awaitable[None]]] = None,
+        max_rate: float = CROSSFADE_MAX_UPDATES_PER_S,
+    ):
+        self._apply = apply
+        self._on_done = on_done
+        self.max_rate = max_rate
+        self._lock = asyncio.Lock()  # one weight update in flight at a time
+        self._fade: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self.current: list[dict] = []  # the weights last sent to the session
+        self.updates_sent = 0
+
+    @property
+    def active(self) -> bool:
+        return self._fade is not None
+
+    def start(self, old_prompts: list[dict], new_prompts: list[dict],
+              duration: float = 1.5, steps: Optional[int] = None) -> None:
+        """Fade to ``new_prompts`` over ``duration`` seconds. ``steps`` is the
+        client's requested granularity, still capped by ``max_rate``."""
+        duration = max(0.0, float(duration))
+        interval = 1.0 / self.max_rate
+        if steps:
+            interval = max(interval, duration / max(1, int(steps)))
+        self._fade = {
+            "old": self.current if self.active else old_prompts,
+            "new": new_prompts,
+            "t0": time.monotonic(),
+            "duration": duration,
+            "interval": interval,
+        }
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def cancel(self) -> None:
+        self._fade = None
+
+    async def set_now(self, prompts: list[dict]) -> None:
+        """Cancel any fade and send ``prompts`` as-is."""
+        async with self._lock:
+            self._fade = None
+            await self._send(prompts)
+
+    async def close(self) -> None:
+        self._fade = None
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _send(self, prompts: list[dict]) -> None:
+        await self._apply(prompts)
+        self.current = prompts
+        self.updates_sent += 1
+
+    async def _run(self) -> None:
+        while self._fade is not None:
+            fade = self._fade
+            elapsed = time.monotonic() - fade["t0"]
+            if elapsed < fade["duration"]:
+                due = min((int(elapsed / fade["interval"]) + 1) * fade["interval"], fade["duration"])
+                await asyncio.sleep(due - elapsed)
+                if self._fade is not fade:
+                    continue  # retargeted or cancelled while we slept
+                t = (time.monotonic() - fade["t0"]) / fade["duration"]
+            else:
+                t = 1.0
+            done = t >= 1.0
+            prompts = fade["new"] if done else equal_power_blend(fade["old"], fade["new"], t)
+            async with self._lock:
+                if self._fade is not fade:
+                    continue
+                if prompts:
+                    await self._send(prompts)
+                if done:
+                    self._fade = None
+            if done and self._on_done:
+                await self._on_done(fade["new"])
+
 
 class MusicManager:
     """Manages a single Lyria RealTime session.
@@ -83,8 +222,25 @@ class MusicManager:
         # producer drops the oldest backlog rather than blocking forever —
         # see `send_command` for the overflow policy.
         self._cmd_queue: asyncio.Queue = asyncio.Queue(maxsize=CMD_QUEUE_MAX)
+        self._pending: dict[str, dict] = {}  # COALESCE_KEYS slot → newest command
         self._send_callback: Optional[Any] = None
         self._session_ready = asyncio.Event()
+        self._crossfader: Optional[CrossfadeScheduler] = None
+        # Serializes ensure_started/shutdown between concurrent /ws/music
+        # listeners, so two sockets connecting at once can't both start.
+        self.lifecycle_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._session_task and not self._session_task.done())
+
+    async def ensure_started(self, send_callback) -> bool:
+        """Start the session unless one is already running. Returns True if
+        this call started it. Callers hold ``lifecycle_lock``."""
+        if self.running and self.connected:
+            return False
+        await self.start(send_callback)
+        return True
 
     async def start(self, send_callback) -> None:
         """Start the Lyria session in a background task.
@@ -102,6 +258,7 @@ class MusicManager:
         # Re-create the queue so a previous session's leftover commands don't
         # leak into the new one. Keep the same cap.
         self._cmd_queue = asyncio.Queue(maxsize=CMD_QUEUE_MAX)
+        self._pending = {}
         self._session_task = asyncio.create_task(self._session_loop())
 
         # Wait for the session to connect (with timeout)
@@ -137,6 +294,10 @@ class MusicManager:
             ) as session:
                 self.session = session
                 self.connected = True
+                self._crossfader = CrossfadeScheduler(
+                    apply=lambda prompts: self._set_weighted_prompts(session, prompts),
+                    on_done=self._crossfade_done,
+                )
                 self._session_ready.set()
                 logger.info("Lyria RealTime session connected")
 
@@ -171,6 +332,9 @@ class MusicManager:
                 except Exception:
                     pass
         finally:
+            if self._crossfader is not None:
+                await self._crossfader.close()
+                self._crossfader = None
             self.session = None
             self.connected = False
             self.playing = False
@@ -199,6 +363,10 @@ class MusicManager:
         try:
             while True:
                 cmd = await self._cmd_queue.get()
+                if "_slot" in cmd:
+                    cmd = self._pending.pop(cmd["_slot"], None)
+                    if cmd is None:
+                        continue
                 action = cmd.get("action", "")
                 try:
                     result_status = await self._execute_command(session, cmd)
@@ -240,13 +408,7 @@ class MusicManager:
 
         elif action == "set_prompts":
             prompts = cmd.get("prompts", [])
-            weighted = [
-                types.WeightedPrompt(
-                    text=p["text"], weight=float(p.get("weight", 1.0))
-                )
-                for p in prompts
-            ]
-            await session.set_weighted_prompts(prompts=weighted)
+            await self._crossfader.set_now(prompts)
             self.current_prompts = prompts
             logger.debug("Prompts updated: %s", [p["text"][:40] for p in prompts])
             return "prompts_updated"
@@ -263,10 +425,8 @@ class MusicManager:
         elif action == "crossfade_prompts":
             old_p = cmd.get("old_prompts", self.current_prompts)
             new_p = cmd.get("new_prompts", [])
-            steps = cmd.get("steps", 5)
-            duration = cmd.get("duration", 1.5)
-            await self._crossfade(session, old_p, new_p, steps, duration)
-            return "prompts_crossfaded"
+            self._crossfader.start(old_p, new_p, cmd.get("duration", 1.5), cmd.get("steps"))
+            return None  # "prompts_crossfaded" is sent when the fade lands
 
         else:
             return None
@@ -306,61 +466,49 @@ class MusicManager:
 
         return kwargs
 
-    async def _crossfade(
-        self, session, old_prompts, new_prompts, steps=5, duration=1.5
-    ) -> None:
-        """Gradually transition from old to new prompts."""
-        step_delay = duration / steps
-
-        for i in range(1, steps + 1):
-            t = i / steps
-            blended = []
-
-            for p in old_prompts:
-                blended.append({
-                    "text": p["text"],
-                    "weight": p.get("weight", 1.0) * (1.0 - t),
-                })
-            for p in new_prompts:
-                blended.append({
-                    "text": p["text"],
-                    "weight": p.get("weight", 1.0) * t,
-                })
-
-            # Lyria doesn't accept weight=0
-            blended = [p for p in blended if p["weight"] > 0.01]
-            weighted = [
-                types.WeightedPrompt(
-                    text=p["text"], weight=float(p["weight"])
-                )
-                for p in blended
-            ]
-            await session.set_weighted_prompts(prompts=weighted)
-            await asyncio.sleep(step_delay)
-
-        # Final state
-        final = [
+    async def _set_weighted_prompts(self, session, prompts: list[dict]) -> None:
+        weighted = [
             types.WeightedPrompt(
                 text=p["text"], weight=float(p.get("weight", 1.0))
             )
-            for p in new_prompts
+            for p in prompts
         ]
-        await session.set_weighted_prompts(prompts=final)
+        await session.set_weighted_prompts(prompts=weighted)
+
+    async def _crossfade_done(self, new_prompts: list[dict]) -> None:
         self.current_prompts = new_prompts
+        if self._send_callback:
+            await self._send_callback(json.dumps({"status": "prompts_crossfaded"}))
 
     async def send_command(self, cmd: dict) -> None:
         """Queue a command for the session task to process.
 
+        Commands in COALESCE_KEYS share one slot per key: if one is already
+        waiting, the new one replaces it (set_config merges into it) and no
+        queue entry is added.
+
         If the queue is full (the consumer is wedged or Lyria is unresponsive),
         we drop the OLDEST queued command to make room for the new one.
         For a control surface — knob turns, prompt updates — the freshest
         intent matters more than backlog fidelity, so this trade is correct.
         """
+        slot = COALESCE_KEYS.get(cmd.get("action"))
+        if slot is not None:
+            pending = self._pending.get(slot)
+            if pending is not None:
+                if cmd["action"] == "set_config" and pending.get("action") == "set_config":
+                    cmd = {**cmd, "config": {**pending.get("config", {}), **cmd.get("config", {})}}
+                self._pending[slot] = cmd
+                return
+            self._pending[slot] = cmd
+            cmd = {"_slot": slot}
         try:
             self._cmd_queue.put_nowait(cmd)
         except asyncio.QueueFull:
             try:
                 dropped = self._cmd_queue.get_nowait()
+                if "_slot" in dropped:
+                    dropped = self._pending.pop(dropped["_slot"], None) or {}
                 logger.warning(
                     "Music command queue full — dropped oldest action=%s",
                     dropped.get("action") if isinstance(dropped, dict) else "?",
@@ -376,6 +524,7 @@ class MusicManager:
             "playing": self.playing,
             "prompts": self.current_prompts,
             "config": self.current_config,
+            "crossfading": bool(self._crossfader and self._crossfader.active),
         }
 
 
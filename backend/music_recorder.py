@@ -0,0 +1,253 @@
+"""Server-side capture of the Lyria stream — ring buffer, exports, segments.
+
+Registered as a tap on music_hub, so it sees every PCM chunk the session
+relays (48kHz stereo 16-bit) without the browser having to record and upload.
+
+- **Ring buffer** — the last ``SYNTH_MUSIC_RING_MINUTES`` (default 5) of audio
+  in one preallocated bytearray, allocated on the first chunk so an install
+  that never plays music never pays for it. ``feed()`` is a memcpy into it.
+- **Export** — any range still in the ring, addressed on the recorder's own
+  timeline (seconds of audio since it started), as WAV (stdlib ``wave``) or
+  FLAC (ffmpeg, like video_tools). Runs off the event loop.
+- **Segments** — optional continuous recording to OUTPUT_AUDIO_DIR as
+  fixed-length WAV files. ``feed()`` only enqueues; a dedicated writer thread
+  does all disk I/O, so a slow disk can never stall the relay loop.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import wave
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from backend.music_hub import BYTES_PER_SECOND, CHANNELS, SAMPLE_RATE, SAMPLE_WIDTH
+from backend.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+FRAME_BYTES = CHANNELS * SAMPLE_WIDTH
+DEFAULT_RING_MINUTES = 5.0
+DEFAULT_SEGMENT_SECONDS = 300
+
+EXPORT_MIME = {"wav": "audio/wav", "flac": "audio/flac"}
+
+
+def ring_minutes() -> float:
+    try:
+        return max(0.0, float(os.environ.get("SYNTH_MUSIC_RING_MINUTES", DEFAULT_RING_MINUTES)))
+    except ValueError:
+        return DEFAULT_RING_MINUTES
+
+
+def _align(n: int) -> int:
+    return n - n % FRAME_BYTES
+
+
+def encode_wav(pcm: bytes) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(CHANNELS)
+        w.setsampwidth(SAMPLE_WIDTH)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(pcm)
+    return buf.getvalue()
+
+
+def encode_flac(pcm: bytes) -> bytes:
+    ffmpeg_path = shutil.which("ffmpeg")
+    if not ffmpeg_path:
+        raise RuntimeError("FFmpeg not found on system (needed for FLAC export)")
+    with metrics.span("ffmpeg", op="flac"):
+        result = subprocess.run(
+            [ffmpeg_path, "-loglevel", "error", "-f", "s16le", "-ar", str(SAMPLE_RATE),
+             "-ac", str(CHANNELS), "-i", "pipe:0", "-f", "flac", "pipe:1"],
+            input=pcm, capture_output=True, timeout=120,
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed: {result.stderr[:200].decode(errors='replace')}")
+    return result.stdout
+
+
+class SegmentWriter:
+    """Writer thread for continuous recording. ``put()`` never blocks."""
+
+    def __init__(self, directory: Path, segment_seconds: int = DEFAULT_SEGMENT_SECONDS):
+        self.directory = Path(directory)
+        self.segment_bytes = _align(int(segment_seconds * BYTES_PER_SECOND)) or FRAME_BYTES
+        self.segment_seconds = segment_seconds
+        self.files: list[str] = []
+        self.error: Optional[str] = None
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._thread = threading.Thread(target=self._run, name="music-segments", daemon=True)
+        self._thread.start()
+
+    def put(self, chunk: bytes) -> None:
+        self._queue.put(chunk)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush and close. Blocking — call from a worker thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _open(self, n: int):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"music-{self._stamp}-{n:03d}.wav"
+        w = wave.open(str(path), "wb")
+        w.setnchannels(CHANNELS)
+        w.setsampwidth(SAMPLE_WIDTH)
+        w.setframerate(SAMPLE_RATE)
+        self.files.append(str(path))
+        return w
+
+    def _run(self) -> None:
+        w, n, in_segment = None, 0, 0
+        try:
+            while True:
+                chunk = self._queue.get()
+                if chunk is None:
+                    break
+                view = memoryview(chunk)
+                while view:
+                    if w is None:
+                        n += 1
+                        w, in_segment = self._open(n), 0
+                    take = min(len(view), self.segment_bytes - in_segment)
+                    w.writeframesraw(view[:take])
+                    in_segment += take
+                    view = view[take:]
+                    if in_segment >= self.segment_bytes:
+                        w.close()
+                        w = None
+        except Exception as e:
+            self.error = str(e)
+            logger.error("Music segment recording failed: %s", e)
+        finally:
+            if w is not None:
+                w.close()
+
+
+class MusicRecorder:
+    def __init__(self, minutes: Optional[float] = None):
+        self.minutes = ring_minutes() if minutes is None else minutes
+        self.capacity = _align(int(self.minutes * 60 * BYTES_PER_SECOND))
+        self._ring: Optional[bytearray] = None
+        self._written = 0           # total bytes ever fed = end of the timeline
+        self._lock = threading.Lock()  # feed writes vs. snapshot range bookkeeping
+        self.segments: Optional[SegmentWriter] = None
+
+    # -- relay side (event loop) -----------------------------------------
+    def feed(self, chunk: bytes) -> None:
+        """Hub tap: copy one PCM chunk into the ring (and the segment queue)."""
+        if self.segments is not None:
+            self.segments.put(chunk)
+        if not self.capacity:
+            return
+        with self._lock:
+            if self._ring is None:
+                self._ring = bytearray(self.capacity)
+            ring, cap = memoryview(self._ring), self.capacity
+            data = memoryview(chunk)
+            self._written += len(data)
+            if len(data) > cap:
+                data = data[-cap:]
+            pos = (self._written - len(data)) % cap
+            first = min(len(data), cap - pos)
+            ring[pos:pos + first] = data[:first]
+            if first < len(data):
+                ring[:len(data) - first] = data[first:]
+
+    # -- timeline ----------------------------------------------------------
+    @property
+    def position_s(self) -> float:
+        return self._written / BYTES_PER_SECOND
+
+    @property
+    def buffered_s(self) -> float:
+        return min(self._written, self.capacity) / BYTES_PER_SECOND
+
+    def snapshot(self, start_s: Optional[float] = None, end_s: Optional[float] = None,
+                 last: Optional[float] = None) -> bytearray:
+        """Raw PCM for a timeline range; ``last`` = the final N seconds.
+
+        Ranges are clamped to what the ring still holds. Raises ValueError
+        when nothing of the requested range is left.
+
+        Only the range is resolved under the lock; the copy (up to the whole
+        ring) runs outside it, so ``feed`` on the event loop never waits on an
+        export. Whatever ``feed`` overwrote meanwhile is dropped from the
+        front afterwards."""
+        with self._lock:
+            written = self._written
+            oldest = max(0, written - self.capacity)
+            if last is not None:
+                start = written - _align(int(last * BYTES_PER_SECOND))
+                end = written
+            else:
+                start = _align(int((start_s or 0) * BYTES_PER_SECOND))
+                end = written if end_s is None else _align(int(end_s * BYTES_PER_SECOND))
+            start, end = max(start, oldest), min(end, written)
+            if self._ring is None or end <= start:
+                raise ValueError("Requested range is not in the recording buffer")
+            ring = memoryview(self._ring)  # never reallocated once created
+        cap = self.capacity
+        a, b = start % cap, end % cap or cap
+        out = bytearray(end - start)
+        if a < b:
+            out[:] = ring[a:b]
+        else:
+            out[:cap - a] = ring[a:]
+            out[cap - a:] = ring[:b]
+        with self._lock:
+            # Timeline bytes before the ring's current oldest may have been
+            # overwritten mid-copy; everything from there on is intact.
+            overwritten = max(0, self._written - cap) - start
+        if overwritten > 0:
+            drop = overwritten + (-overwritten) % FRAME_BYTES  # whole frames only
+            if drop >= len(out):
+                raise ValueError("Requested range is not in the recording buffer")
+            del out[:drop]
+        return out
+
+    def export(self, fmt: str = "wav", **rng) -> bytes:
+        """Encoded audio for a range (see ``snapshot``). Blocking for FLAC."""
+        if fmt not in EXPORT_MIME:
+            raise ValueError(f"Unsupported format: {fmt!r} (wav or flac)")
+        pcm = self.snapshot(**rng)
+        return encode_wav(pcm) if fmt == "wav" else encode_flac(pcm)
+
+    # -- continuous recording --------------------------------------------
+    def start_segments(self, directory: Path, segment_seconds: int = DEFAULT_SEGMENT_SECONDS) -> None:
+        if self.segments is None:
+            self.segments = SegmentWriter(directory, segment_seconds)
+
+    def stop_segments(self) -> Optional[SegmentWriter]:
+        """Detach the writer (feed stops enqueueing at once) and return it so
+        the caller can ``stop()`` it off the event loop."""
+        writer, self.segments = self.segments, None
+        return writer
+
+    def status(self) -> dict:
+        seg = self.segments
+        return {
+            "ring_minutes": self.minutes,
+            "position_s": round(self.position_s, 3),
+            "buffered_s": round(self.buffered_s, 3),
+            "segments": None if seg is None else {
+                "directory": str(seg.directory),
+                "segment_seconds": seg.segment_seconds,
+                "files": list(seg.files),
+                "error": seg.error,
+            },
+        }
+
+
+music_recorder = MusicRecorder()
@@ -4,12 +4,32 @@ Uses python-osc's SimpleUDPClient.  The bridge is a singleton created at
 import time with sensible defaults (localhost:8000 — Scope's OSC port mirrors
 its HTTP port, default 8000).
 FastAPI endpoints call its methods; the browser never talks UDP directly.
+
+Sends are scheduled, not immediate: each ``send_*`` records the latest value
+for its address, and a sender thread flushes once per tick (default 20 ms,
+``SYNTH_OSC_TICK_MS``) as timestamped OSC bundles. A knob sweep that would
+have been hundreds of tiny packets — which Scope could apply out of order —
+becomes one bundle per tick carrying each address's newest value. A tick of
+0 restores one-packet-per-call sends.
+
+Scope discovery is async and cached: candidate URLs are probed concurrently
+with a short timeout (fallbacks only when no URL was asked for), and
+handlers get the cached answer while a stale one refreshes in the background.
 """
 
+import asyncio
 import logging
-import urllib.request
-import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any
+from urllib.parse import urlparse
 
+import httpx
+
+from pythonosc.osc_bundle_builder import OscBundleBuilder
+from pythonosc.osc_message_builder import OscMessageBuilder
 from pythonosc.udp_client import SimpleUDPClient
 
 logger = logging.getLogger(__name__)
@@ -17,41 +37,182 @@ logger = logging.getLogger(__name__)
 # Default Scope URL for auto-discovery
 DEFAULT_SCOPE_URL = "http://127.0.0.1:8000"
 
+DEFAULT_TICK_MS = 20.0
+# Keep each bundle well inside one UDP datagram; a tick with more than this
+# (many long prompts) goes out as several bundles, in order.
+MAX_BUNDLE_BYTES = 8192
+RATE_WINDOW_S = 10.0
+
+# Scope discovery: each candidate gets PROBE_TIMEOUT_S, all probed at once;
+# results are reused for DISCOVERY_TTL_S before a background refresh.
+PROBE_TIMEOUT_S = 0.75
+DISCOVERY_TTL_S = 5.0
+
+
+def _tick_from_env() -> float:
+    try:
+        return max(0.0, float(os.environ.get("SYNTH_OSC_TICK_MS", DEFAULT_TICK_MS)))
+    except ValueError:
+        return DEFAULT_TICK_MS
+
+
+def _candidates_from_env() -> list[str]:
+    """Extra Scope URLs to probe (``SYNTH_SCOPE_URLS``, comma-separated)."""
+    return [u.strip() for u in os.environ.get("SYNTH_SCOPE_URLS", "").split(",") if u.strip()]
+
+
+def _message(address: str, value: Any):
+    builder = OscMessageBuilder(address=address)
+    builder.add_arg(value)
+    return builder.build()
+
 
 class OSCBridge:
-    def __init__(self, host: str = "127.0.0.1", port: int = 8000):
+    def __init__(self, host: str = "127.0.0.1", port: int = 8000, tick_ms: float | None = None):
         self.host = host
         self.port = port
         self._client = SimpleUDPClient(host, port)
         self.scope_url = DEFAULT_SCOPE_URL
         self._scope_healthy = False
+        self.tick_ms = _tick_from_env() if tick_ms is None else max(0.0, tick_ms)
+        # address → latest value; insertion order = order within the bundle
+        self._pending: dict[str, Any] = {}
+        self._cond = threading.Condition()
+        self._sender: threading.Thread | None = None
+        # stats
+        self.messages_in = 0
+        self.messages_sent = 0
+        self.messages_coalesced = 0
+        self.bundles_sent = 0
+        self.bytes_sent = 0
+        self.send_errors = 0
+        self._recent: deque = deque()  # (ts, messages) per packet, last RATE_WINDOW_S
+        # discovery cache: requested url (None = auto) → {"result": dict, "at": monotonic}
+        self.scope_candidates = _candidates_from_env()
+        self.discovery_ttl = DISCOVERY_TTL_S
+        self._discovery: dict[str | None, dict] = {}
+        self._discovery_tasks: dict[str | None, asyncio.Task] = {}
 
     # ── send helpers ──────────────────────────────────────────
 
     def send_prompt(self, prompt: str, address: str = "/scope/prompt") -> None:
         """Send a prompt string to the target OSC address."""
         logger.debug("OSC → %s:%d %s  %r", self.host, self.port, address, prompt[:80])
-        self._client.send_message(address, prompt)
+        self._schedule(address, prompt)
 
     def send_float(self, address: str, value: float) -> None:
         """Send a single float value (guidance_scale, delta, seed …)."""
         logger.debug("OSC → %s:%d %s  %f", self.host, self.port, address, value)
-        self._client.send_message(address, value)
+        self._schedule(address, float(value))
 
     def send_int(self, address: str, value: int) -> None:
         """Send a single int value."""
         logger.debug("OSC → %s:%d %s  %d", self.host, self.port, address, value)
-        self._client.send_message(address, value)
+        self._schedule(address, int(value))
 
     def send_string(self, address: str, value: str) -> None:
         """Send a string value to an arbitrary OSC address."""
         logger.debug("OSC → %s:%d %s  %r", self.host, self.port, address, value[:80])
-        self._client.send_message(address, value)
+        self._schedule(address, value)
+
+    # ── send scheduler ────────────────────────────────────────
+
+    def _schedule(self, address: str, value: Any) -> None:
+        if self.tick_ms <= 0:
+            with self._cond:
+                self.messages_in += 1
+            # Immediate send: a failure is the caller's to see, as before ticks.
+            self._send_packet(_message(address, value), 1, raise_errors=True)
+            return
+        with self._cond:
+            self.messages_in += 1
+            if address in self._pending:
+                self.messages_coalesced += 1
+            self._pending[address] = value
+            if self._sender is None or not self._sender.is_alive():
+                self._sender = threading.Thread(target=self._run, name="osc-sender", daemon=True)
+                self._sender.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            # Let the rest of the tick's updates land on top of this one.
+            time.sleep(self.tick_ms / 1000.0)
+            self.flush()
+
+    def flush(self) -> None:
+        """Send everything pending now, as bundles stamped with the send time."""
+        with self._cond:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        stamp = time.time()
+        bundle, size, count = OscBundleBuilder(stamp), 16, 0
+        for address, value in pending.items():
+            msg = _message(address, value)
+            if count and size + 4 + msg.size > MAX_BUNDLE_BYTES:
+                self._send_packet(bundle.build(), count)
+                bundle, size, count = OscBundleBuilder(stamp), 16, 0
+            bundle.add_content(msg)
+            size += 4 + msg.size
+            count += 1
+        self._send_packet(bundle.build(), count)
+
+    def _send_packet(self, packet, messages: int, raise_errors: bool = False) -> None:
+        """Send one packet. An OSError is counted in ``send_errors``; it is
+        re-raised with ``raise_errors`` (synchronous sends), otherwise logged —
+        the sender thread has no caller to report to."""
+        try:
+            self._client.send(packet)
+        except OSError as e:
+            with self._cond:
+                self.send_errors += 1
+            if raise_errors:
+                raise
+            logger.warning("OSC send to %s:%d failed: %s", self.host, self.port, e)
+            return
+        now = time.monotonic()
+        with self._cond:
+            self.messages_sent += messages
+            self.bundles_sent += 1
+            self.bytes_sent += packet.size
+            self._recent.append((now, messages))
+            while self._recent and self._recent[0][0] < now - RATE_WINDOW_S:
+                self._recent.popleft()
+
+    def stats(self) -> dict:
+        """Send-rate counters. Rates are over the last RATE_WINDOW_S seconds."""
+        with self._cond:
+            now = time.monotonic()
+            recent = [m for ts, m in self._recent if ts >= now - RATE_WINDOW_S]
+            return {
+                "tickMs": self.tick_ms,
+                "messagesIn": self.messages_in,
+                "messagesSent": self.messages_sent,
+                "messagesCoalesced": self.messages_coalesced,
+                "packetsSent": self.bundles_sent,
+                "bytesSent": self.bytes_sent,
+                "sendErrors": self.send_errors,
+                "pending": len(self._pending),
+                "packetsPerSec": round(len(recent) / RATE_WINDOW_S, 2),
+                "messagesPerSec": round(sum(recent) / RATE_WINDOW_S, 2),
+            }
 
     # ── reconfiguration ──────────────────────────────────────
 
-    def update_config(self, host: str | None = None, port: int | None = None) -> None:
-        """Change the target host/port and reconnect the UDP client."""
+    def update_config(self, host: str | None = None, port: int | None = None,
+                      tick_ms: float | None = None) -> None:
+        """Change the target host/port (reconnecting the UDP client) and/or the
+        send tick. Updates still pending go to the new target."""
+        if tick_ms is not None:
+            self.tick_ms = max(0.0, tick_ms)
+            if self.tick_ms <= 0:
+                self.flush()
+        if host is None and port is None:
+            return
         if host is not None:
             self.host = host
         if port is not None:
@@ -61,40 +222,80 @@ class OSCBridge:
 
     # ── auto-discovery ────────────────────────────────────────
 
-    def discover_scope(self, scope_url: str | None = None) -> dict:
-        """Probe Scope's /health endpoint to check if it's running.
+    def _candidates(self, url: str, fallbacks: bool) -> list[str]:
+        """The URL to check first, then (with ``fallbacks``) the default and
+        configured ones."""
+        out = [url]
+        if not fallbacks:
+            return out
+        for c in [DEFAULT_SCOPE_URL] + self.scope_candidates:
+            c = c.rstrip("/")
+            if c and c not in out:
+                out.append(c)
+        return out
+
+    async def discover_scope(self, scope_url: str | None = None) -> dict:
+        """Scope health + OSC target for ``scope_url`` (default: the current one).
 
-        Returns a dict with { healthy, scopeUrl, oscHost, oscPort }.
+        An explicit ``scope_url`` is the only URL probed. Without one, the
+        current URL is tried alongside ``DEFAULT_SCOPE_URL`` and
+        ``SYNTH_SCOPE_URLS``, and the first healthy one wins.
+
+        Served from a TTL cache. The first lookup of a URL waits for a probe
+        (bounded by PROBE_TIMEOUT_S); after that a stale entry is returned
+        as-is and refreshed in the background, so a slow or absent Scope
+        never holds up the request.
+
+        Returns a dict with { healthy, scopeUrl, oscHost, oscPort, checkedAt }.
         """
-        url = (scope_url or self.scope_url).rstrip("/")
-        result = {
-            "healthy": False,
-            "scopeUrl": url,
-            "oscHost": self.host,
-            "oscPort": self.port,
-        }
+        key = scope_url.rstrip("/") if scope_url else None  # None = auto-discovery
+        entry = self._discovery.get(key)
+        if entry is None:
+            await self._refresh_discovery(key)
+            entry = self._discovery[key]
+        elif time.monotonic() - entry["at"] > self.discovery_ttl:
+            self._refresh_discovery(key)  # fire and forget; task is tracked
+        return {**entry["result"], "oscHost": self.host, "oscPort": self.port}
+
+    def _refresh_discovery(self, key: str | None) -> asyncio.Task:
+        task = self._discovery_tasks.get(key)
+        if task is None or task.done():
+            task = self._discovery_tasks[key] = asyncio.create_task(self._probe_candidates(key))
+        return task
+
+    async def _probe_candidates(self, key: str | None) -> None:
+        url = key or self.scope_url.rstrip("/")
+        candidates = self._candidates(url, fallbacks=key is None)
+        try:
+            async with httpx.AsyncClient(timeout=PROBE_TIMEOUT_S, trust_env=False) as client:
+                healthy = await asyncio.gather(*(self._probe(client, c) for c in candidates))
+        except Exception as e:  # never let a refresh task die with the cache unset
+            logger.warning("Scope discovery failed: %s", e)
+            healthy = [False] * len(candidates)
+        found = next((c for c, ok in zip(candidates, healthy) if ok), None)
+        result = {"healthy": found is not None, "scopeUrl": found or url,
+                  "checkedAt": time.time()}
+        self._discovery[key] = {"result": result, "at": time.monotonic()}
+        self._scope_healthy = found is not None
+        if found is None:
+            logger.debug("Scope not found at %s", ", ".join(candidates))
+            return
+        # Scope's OSC listener uses the same port as its HTTP server.
+        # Auto-align OSC port to the discovered HTTP port.
+        parsed = urlparse(found)
+        host, port = parsed.hostname or self.host, parsed.port or 8000
+        if (found, host, port) != (self.scope_url, self.host, self.port):
+            self.scope_url = found
+            self.update_config(host=host, port=port)
+            logger.info("Scope discovered at %s — OSC aligned to %s:%d", found, self.host, self.port)
 
+    @staticmethod
+    async def _probe(client: "httpx.AsyncClient", url: str) -> bool:
         try:
-            req = urllib.request.Request(f"{url}/health", method="GET")
-            with urllib.request.urlopen(req, timeout=3) as resp:
-                if resp.status == 200:
-                    result["healthy"] = True
-                    self._scope_healthy = True
-                    self.scope_url = url
-                    # Scope's OSC listener uses the same port as its HTTP server.
-                    # Auto-align OSC port to the discovered HTTP port.
-                    from urllib.parse import urlparse
-                    parsed = urlparse(url)
-                    inferred_osc_port = parsed.port or 8000
-                    self.update_config(host=parsed.hostname or self.host, port=inferred_osc_port)
-                    result["oscHost"] = self.host
-                    result["oscPort"] = self.port
-                    logger.info("Scope discovered at %s — OSC aligned to %s:%d", url, self.host, self.port)
-        except Exception as e:
-            logger.debug("Scope not found at %s: %s", url, e)
-            self._scope_healthy = False
-
-        return result
+            resp = await client.get(f"{url}/health")
+            return resp.status_code == 200
+        except httpx.HTTPError:
+            return False
 
     def status(self) -> dict:
         """Return the current configuration as a JSON-friendly dict."""
@@ -103,6 +304,7 @@ class OSCBridge:
             "port": self.port,
             "scopeUrl": self.scope_url,
             "scopeHealthy": self._scope_healthy,
+            "stats": self.stats(),
         }
 
 
@@ -2,14 +2,22 @@
 
 Admin is computed from ADMIN_EMAILS (never stored); everyone else gets 404s
 so the surface doesn't advertise itself. Service mode only.
+
+Dashboard stats read the daily usage rollup (backend/service/usage.py);
+``?live=true`` forces the full aggregates over generations instead.
+``/api/admin/prompts`` lists each template mode's system-prompt size/version;
+``/api/admin/retries`` the retry counters and breaker state per model;
+``/api/admin/surfaces`` the startup import time and each router's load state;
+``/api/admin/metrics`` the latency histograms (JSON, or ``?format=prometheus``).
 """
 
 import logging
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
-from backend.service import auth, db, service_mode
+from backend.service import auth, db, service_mode, usage
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -30,9 +38,17 @@ def _require_admin(request: Request) -> None:
 
 
 @router.get("/api/admin/stats")
-async def admin_stats(request: Request):
+async def admin_stats(request: Request, live: bool = False):
     _require_admin(request)
     pool = db.pool()
+    users = await pool.fetchrow(
+        "SELECT COUNT(*) AS total, COUNT(*) FILTER (WHERE disabled_at IS NOT NULL) AS disabled "
+        "FROM users"
+    )
+    users = {"total": users["total"], "disabled": users["disabled"]}
+    if not live:
+        return {**await usage.stats(), "users": users, "source": "rollup"}
+
     today = await pool.fetchrow(
         "SELECT COUNT(*) AS generations, COALESCE(SUM(usd_est),0) AS usd, "
         "COALESCE(SUM(credits),0) AS credits FROM generations "
@@ -43,10 +59,6 @@ async def admin_stats(request: Request):
         "COALESCE(SUM(credits),0) AS credits FROM generations "
         "WHERE ts >= date_trunc('month', now() AT TIME ZONE 'utc')"
     )
-    users = await pool.fetchrow(
-        "SELECT COUNT(*) AS total, COUNT(*) FILTER (WHERE disabled_at IS NOT NULL) AS disabled "
-        "FROM users"
-    )
     by_action = await pool.fetch(
         "SELECT action, COUNT(*) AS n, COALESCE(SUM(usd_est),0) AS usd FROM generations "
         "WHERE ts >= date_trunc('day', now() AT TIME ZONE 'utc') GROUP BY action ORDER BY usd DESC"
@@ -58,10 +70,45 @@ async def admin_stats(request: Request):
                                 for r in by_action]},
         "month": {"generations": month["generations"], "usd_est": float(month["usd"]),
                   "credits": month["credits"]},
-        "users": {"total": users["total"], "disabled": users["disabled"]},
+        "users": users,
+        "source": "live",
     }
 
 
+@router.get("/api/admin/prompts")
+async def admin_prompts(request: Request):
+    """System-prompt size + version per template mode (services/prompt_registry.py)."""
+    _require_admin(request)
+    from backend.services import prompt_registry
+    return {"prompts": prompt_registry.sizes()}
+
+
+@router.get("/api/admin/retries")
+async def admin_retries(request: Request):
+    """Retry attempts / give-ups / budget refusals per key (utils/retry.py)."""
+    _require_admin(request)
+    from backend.utils import retry
+    return {"retries": retry.stats()}
+
+
+@router.get("/api/admin/surfaces")
+async def admin_surfaces(request: Request):
+    """Server import time and per-router mode / import ms (utils/lazy_router.py)."""
+    _require_admin(request)
+    from backend.utils import lazy_router
+    return {"startup_ms": lazy_router.startup_ms, "surfaces": lazy_router.report()}
+
+
+@router.get("/api/admin/metrics")
+async def admin_metrics(request: Request, format: str = "json"):
+    """Per-endpoint and hot-path latency histograms (utils/metrics.py)."""
+    _require_admin(request)
+    from backend.utils import metrics
+    if format == "prometheus":
+        return PlainTextResponse(metrics.prometheus_text(), media_type="text/plain; version=0.0.4")
+    return {"enabled": metrics.ENABLED, "series": metrics.snapshot()}
+
+
 @router.get("/api/admin/users")
 async def admin_users(request: Request, limit: int = 200):
     _require_admin(request)
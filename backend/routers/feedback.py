@@ -9,12 +9,19 @@ Privacy posture: nothing is sent anywhere except this machine's disk. The
 client never auto-includes prompts — including one is an explicit opt-in
 checkbox. On Vercel (read-only filesystem) the endpoint returns 503 with the
 GitHub issues URL so the front-end can fall back.
+
+Appends go through services/feedback_store.py's single writer thread, which
+also keeps per-month offset indexes and rollups behind the read endpoints:
+  GET /api/feedback          → entries filtered by since/until/kind/user, paginated
+  GET /api/feedback/rollups  → per-month totals by kind/surface/category/day
+Reads are local-only: a hosted instance's JSONL holds visitors' messages (and
+service mode keeps feedback in Postgres anyway).
 """
 
+import asyncio
 import json
 import logging
 import os
-import threading
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -22,6 +29,9 @@ from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional, List
 
+from backend.policy import is_hosted
+from backend.services import feedback_store
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
@@ -33,8 +43,6 @@ FEEDBACK_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "feedbac
 
 MAX_ENTRY_BYTES = 32 * 1024  # cap a single feedback entry at 32 KB
 
-_write_lock = threading.Lock()
-
 
 class FeedbackRequest(BaseModel):
     kind: str = "general"                  # "general" | "wrongly_blocked"
@@ -88,12 +96,9 @@ async def submit_feedback(request: FeedbackRequest, http_request: Request):
         return {"status": "success", "message": "Feedback saved — thank you.",
                 "stored_at": "service-db"}
 
+    path = feedback_store.month_path(FEEDBACK_DIR)
     try:
-        FEEDBACK_DIR.mkdir(parents=True, exist_ok=True)
-        path = FEEDBACK_DIR / f"feedback-{datetime.now(timezone.utc):%Y%m}.jsonl"
-        with _write_lock:
-            with open(path, "a", encoding="utf-8") as f:
-                f.write(line + "\n")
+        await feedback_store.append(path, line)
     except OSError as e:
         logger.error("Feedback write failed: %s", e)
         raise HTTPException(
@@ -104,3 +109,34 @@ async def submit_feedback(request: FeedbackRequest, http_request: Request):
 
     return {"status": "success", "message": "Feedback saved — thank you.",
             "stored_at": str(path)}
+
+
+def _require_local_reads() -> None:
+    if is_hosted():
+        raise HTTPException(status_code=404, detail="Not found")
+
+
+@router.get("/api/feedback")
+async def list_feedback(since: Optional[str] = None, until: Optional[str] = None,
+                        kind: Optional[str] = None, user: Optional[str] = None,
+                        limit: int = 100, offset: int = 0):
+    """Stored feedback, newest first. ``since`` inclusive / ``until`` exclusive
+    (ISO, UTC if naive); ``user`` matches an entry's contact."""
+    _require_local_reads()
+    try:
+        # Index refreshes and line reads are blocking file I/O — off the loop.
+        result = await asyncio.to_thread(
+            feedback_store.query, FEEDBACK_DIR, since=since, until=until, kind=kind,
+            user=user, limit=min(max(limit, 1), 1000), offset=max(offset, 0))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Bad timestamp: {e}")
+    return {"status": "success", **result}
+
+
+@router.get("/api/feedback/rollups")
+async def feedback_rollups(since_month: Optional[str] = None, until_month: Optional[str] = None):
+    """Per-month aggregates (``YYYY-MM`` bounds, inclusive) — no line scans."""
+    _require_local_reads()
+    months = await asyncio.to_thread(feedback_store.rollups, FEEDBACK_DIR,
+                                     since_month, until_month)
+    return {"status": "success", "months": months}
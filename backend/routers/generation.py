@@ -5,7 +5,9 @@ import re
 import time
 import os
 import io
+import json
 import tempfile
+import uuid
 import subprocess
 from pathlib import Path
 from fastapi import APIRouter, Request, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
@@ -18,9 +20,12 @@ from backend.osc_bridge import osc_bridge
 from backend.music_manager import get_music_manager
 from backend import config
 from backend.models.requests import *
-from backend.helpers import decode_base64_image, parse_llm_json, SafetyBlockedError, safety_block_detail
+from backend.policy import is_hosted
+from backend.helpers import decode_base64_image, decode_image_payload, parse_llm_json, SafetyBlockedError, safety_block_detail
+from backend.utils.image_payload import ImagePayload
 from backend.service import is_free_tier, service_mode
 from backend.service.credits import Charge, charged
+from backend.utils.stream_bridge import ThreadedIterator
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -80,11 +85,13 @@ async def generate_image_variation_prompts(request: ImageVariationPromptsRequest
 @router.post("/api/generate/smart-transform")
 async def generate_smart_transform(request: SmartTransformRequest, http_request: Request):
     try:
-        input_bytes = decode_base64_image(request.input_image)
+        # Payloads: both analyses and the final generation forward the
+        # client's base64 as-is instead of re-encoding it per call.
+        input_bytes = decode_image_payload(request.input_image)
 
         ref_bytes = None
         if request.reference_image:
-            ref_bytes = decode_base64_image(request.reference_image)
+            ref_bytes = decode_image_payload(request.reference_image)
 
         async with charged(http_request, action="smart_transform",
                            model=request.model or config.MODEL_IMAGE_GEN_NB2,
@@ -144,18 +151,18 @@ async def generate_text_stream(request: TextRequest, http_request: Request):
                 prompt_chars=len(request.prompt))
     await ch.reserve()  # raises 400/402 before the stream opens
 
-    _DONE = object()
-
     async def gen():
         produced = False
         try:
-            it = ai_manager.generate_text_stream(request.prompt, request.model)
-            while True:
-                chunk = await asyncio.to_thread(next, it, _DONE)
-                if chunk is _DONE:
-                    break
-                produced = True
-                yield chunk
+            # One dedicated worker per stream; leaving the block (client gone)
+            # stops it and closes the SDK stream.
+            async with ThreadedIterator(
+                lambda: ai_manager.generate_text_stream(request.prompt, request.model),
+                name="text-stream",
+            ) as chunks:
+                async for chunk in chunks:
+                    produced = True
+                    yield chunk
             await ch.settle_ok()
         except Exception as exc:
             logger.warning("text stream failed (produced=%s): %s", produced, exc)
@@ -166,15 +173,121 @@ async def generate_text_stream(request: TextRequest, http_request: Request):
     return StreamingResponse(gen(), media_type="text/plain; charset=utf-8")
 
 
+# ── media response modes ─────────────────────────────────────────────────────
+# Image/video endpoints answer in one of three shapes. "json" (default) keeps
+# base64 inline. "multipart" (multipart/mixed: the metadata JSON, then one
+# raw part per image/clip) and "ref" (the same JSON with each base64 replaced
+# by {url, mime, bytes} for GET /api/media/<token>) never base64 the output.
+# Chosen by the request's `response_mode`, else `Accept: multipart/mixed`.
+# Refs live in one process's spool (services/media_store.py), so "ref" is
+# refused on hosted deployments, where the GET may reach another instance or
+# worker, and needs a signed-in user in service mode.
+
+RESPONSE_MODES = ("json", "multipart", "ref")
+_MEDIA_EXT = {"image/png": "png", "image/jpeg": "jpg", "image/webp": "webp",
+              "image/gif": "gif", "video/mp4": "mp4"}
+
+
+def _response_mode(requested: Optional[str], http_request: Request) -> str:
+    if requested:
+        if requested not in RESPONSE_MODES:
+            raise HTTPException(status_code=400, detail=(
+                f"response_mode must be one of {', '.join(RESPONSE_MODES)}"))
+        if requested == "ref":
+            if is_hosted():
+                raise HTTPException(status_code=400, detail=(
+                    "response_mode 'ref' is single-process only and unavailable on "
+                    "hosted deployments; use 'json' or 'multipart'"))
+            if service_mode() and not getattr(http_request.state, "user", None):
+                raise HTTPException(status_code=401, detail="response_mode 'ref' requires sign-in.")
+        return requested
+    accept = http_request.headers.get("accept", "")
+    return "multipart" if "multipart/mixed" in accept else "json"
+
+
+def _as_payload(value, mime: Optional[str] = None) -> ImagePayload:
+    if isinstance(value, ImagePayload):
+        return value
+    return ImagePayload(b64=value, mime=mime)
+
+
+def _multipart_response(meta: dict, name: str, media: List[ImagePayload]) -> StreamingResponse:
+    """multipart/mixed: metadata JSON first, then each payload's raw bytes."""
+    boundary = uuid.uuid4().hex
+    head = (f"--{boundary}\r\nContent-Type: application/json\r\n\r\n".encode()
+            + json.dumps(meta).encode() + b"\r\n")
+    part_heads = [
+        (f"--{boundary}\r\nContent-Type: {m.mime}\r\nContent-Length: {len(m.data)}\r\n"
+         f'Content-Disposition: inline; name="{name}"; '
+         f'filename="{name}-{i}.{_MEDIA_EXT.get(m.mime, "bin")}"\r\n\r\n').encode()
+        for i, m in enumerate(media)
+    ]
+    tail = f"--{boundary}--\r\n".encode()
+    length = len(head) + len(tail) + sum(len(h) + len(m.data) + 2 for h, m in zip(part_heads, media))
+
+    async def body():
+        yield head
+        for part_head, m in zip(part_heads, media):
+            yield part_head
+            yield m.data  # the payload's own bytes object — no joined copy
+            yield b"\r\n"
+        yield tail
+
+    return StreamingResponse(body(), media_type=f"multipart/mixed; boundary={boundary}",
+                             headers={"Content-Length": str(length)})
+
+
+async def _media_response(http_request: Request, mode: str, meta: dict, name: str,
+                          media: List[ImagePayload], plural: bool = False):
+    """Render `media` under `meta` in the negotiated mode.
+
+    `name` holds the first item; with `plural`, `name + "s"` holds them all
+    (the /api/generate/image multi-image contract).
+    """
+    if mode == "multipart":
+        meta = {**meta, "parts": [{"name": name, "mime": m.mime, "bytes": len(m)} for m in media]}
+        return _multipart_response(meta, name, media)
+
+    if mode == "ref":
+        from backend.services import media_store
+        user = getattr(http_request.state, "user", None) if service_mode() else None
+        owner = user["id"] if user else None
+        tokens = await asyncio.to_thread(
+            lambda: [media_store.put(m.data, m.mime, owner) for m in media])
+        rendered = [{"url": f"/api/media/{t}", "mime": m.mime, "bytes": len(m)}
+                    for t, m in zip(tokens, media)]
+        meta = {**meta, "expires_in": int(media_store.TTL_S)}
+    else:
+        rendered = [m.b64 for m in media]
+
+    out = {**meta, name: rendered[0]}
+    if plural:
+        out[name + "s"] = rendered
+    return out
+
+
+@router.get("/api/media/{token}")
+async def get_media(token: str, http_request: Request):
+    """Stream one spooled output (see services/media_store.py)."""
+    from backend.services import media_store
+    user = getattr(http_request.state, "user", None) if service_mode() else None
+    entry = media_store.get(token, user["id"] if user else None)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired media reference")
+    return FileResponse(entry.path, media_type=entry.mime,
+                        headers={"Cache-Control": f"private, max-age={int(media_store.TTL_S)}"})
+
+
 @router.post("/api/generate/image")
 async def generate_image(request: ImageRequest, http_request: Request):
+    mode = _response_mode(request.response_mode, http_request)
     try:
         # Decode input images (supports both new multi-image and old single-image params)
         decoded_images = None
         if request.input_images:
-            decoded_images = [decode_base64_image(img) for img in request.input_images]
+            decoded_images = [decode_image_payload(img) for img in request.input_images]
         elif request.reference_image:
-            decoded_images = [decode_base64_image(request.reference_image)]
+            decoded_images = [decode_image_payload(request.reference_image)]
 
         # Call generate_image with all parameters
 
@@ -218,7 +331,8 @@ async def generate_image(request: ImageRequest, http_request: Request):
                 image_count=request.image_count,
                 add_watermark=request.add_watermark,
                 use_google_search=request.use_google_search,
-                tags=request.tags
+                tags=request.tags,
+                as_payload=True,
             )
             ch.commit()
 
@@ -229,14 +343,17 @@ async def generate_image(request: ImageRequest, http_request: Request):
         # callers both get what they asked for. generation_id lets the client
         # bind a later "save to my creations" call to this call, whichever of
         # possibly several images it saves — see routers/artifacts.py.
-        if isinstance(result, dict):
-            payload = {"status": "success", "generation_id": ch.gen_id}
-            for key in ("image", "images", "text"):
-                value = result.get(key)
-                if value is not None:
-                    payload[key] = value
-            return payload
-        return {"status": "success", "image": result, "generation_id": ch.gen_id}
+        meta = {"status": "success", "generation_id": ch.gen_id}
+        if not isinstance(result, dict):
+            return await _media_response(http_request, mode, meta, "image", [_as_payload(result)])
+        if result.get("text") is not None:
+            meta["text"] = result["text"]
+        if result.get("images") is not None:
+            media = [_as_payload(v) for v in result["images"]]
+            return await _media_response(http_request, mode, meta, "image", media, plural=True)
+        if result.get("image") is not None:
+            return await _media_response(http_request, mode, meta, "image", [_as_payload(result["image"])])
+        return meta
 
     except HTTPException:
         raise
@@ -255,6 +372,7 @@ async def generate_video(request: VideoRequest, http_request: Request):
             "error": "tier_video",
             "message": "Video generation is not included in the free tier.",
         })
+    mode = _response_mode(request.response_mode, http_request)
     try:
         async with charged(http_request, action="video", model=request.model,
                            units=request.duration or 8,
@@ -268,11 +386,13 @@ async def generate_video(request: VideoRequest, http_request: Request):
                 request.start_frame_image,
                 request.reference_images,
                 request.extension_video_uri,
-                request.resolution
+                request.resolution,
+                as_payload=True,
             )
             ch.commit()
-        return {"status": "success", "video": result["video_b64"], "video_uri": result.get("video_uri"),
-                "generation_id": ch.gen_id}
+        video = result.get("video") or _as_payload(result["video_b64"], "video/mp4")
+        meta = {"status": "success", "video_uri": result.get("video_uri"), "generation_id": ch.gen_id}
+        return await _media_response(http_request, mode, meta, "video", [video])
     except SafetyBlockedError as e:
         raise HTTPException(status_code=422, detail=safety_block_detail(e))
     except HTTPException:
@@ -11,6 +11,7 @@ from pathlib import Path
 from fastapi import APIRouter, Request, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse, StreamingResponse, Response
 import httpx
+import json
 from typing import Optional, List, Dict
 
 from backend.ai_manager import ai_manager, normalize_template
@@ -19,6 +20,7 @@ from backend.music_manager import get_music_manager
 from backend import config
 from backend.models.requests import *
 from backend.helpers import decode_base64_image, parse_llm_json
+from backend.services.metadata_bulk import iter_extract_metadata
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -36,30 +38,23 @@ async def extract_metadata(request: MetadataRequest):
 @router.post("/api/extract-metadata/bulk")
 async def extract_metadata_bulk(request: BulkMetadataRequest):
     """Extract metadata from multiple PNG images in bulk.
-    
-    Returns a list of results with prompts extracted from each image.
+
+    Decoding and parsing run in a worker pool (see services/metadata_bulk.py),
+    so a large batch no longer blocks other requests. Returns a list of
+    results with prompts extracted from each image, in input order; with
+    ``stream: true`` it returns NDJSON instead, one result line per image as
+    it finishes, then ``{"status": "success", "done": true}``.
     """
-    results = []
-    for idx, img_b64 in enumerate(request.images):
-        try:
-            image_bytes = decode_base64_image(img_b64)
-            metadata = ai_manager.extract_metadata(image_bytes)
-            
-            results.append({
-                "index": idx,
-                "status": "success",
-                "metadata": metadata,
-                "prompt": metadata.get("prompt", "")
-            })
-            
-        except Exception as e:
-            results.append({
-                "index": idx,
-                "status": "error",
-                "error": str(e),
-                "prompt": ""
-            })
-    
+    if request.stream:
+        async def gen():
+            async for row in iter_extract_metadata(request.images):
+                yield json.dumps(row) + "\n"
+            yield json.dumps({"status": "success", "done": True}) + "\n"
+
+        return StreamingResponse(gen(), media_type="application/x-ndjson")
+
+    results = [row async for row in iter_extract_metadata(request.images)]
+    results.sort(key=lambda r: r["index"])
     return {"status": "success", "results": results}
 
 # Serve Static Files
@@ -12,11 +12,15 @@ from fastapi import APIRouter, Request, HTTPException, BackgroundTasks, WebSocke
 from fastapi.responses import FileResponse, StreamingResponse, Response
 import httpx
 import json
+from datetime import datetime
 from typing import Optional, List, Dict
 
 from backend.ai_manager import ai_manager, normalize_template
 from backend.osc_bridge import osc_bridge
 from backend.music_manager import get_music_manager
+from backend.music_hub import music_hub
+from backend.music_recorder import EXPORT_MIME, music_recorder
+from backend.policy import is_hosted
 from backend import config
 from backend.models.requests import *
 from backend.helpers import decode_base64_image, parse_llm_json
@@ -24,15 +28,64 @@ from backend.helpers import decode_base64_image, parse_llm_json
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Every relayed PCM chunk also lands in the server-side recorder's ring.
+music_hub.add_tap(music_recorder.feed)
+
 @router.get("/api/music/status")
 async def music_status():
     """Return current Lyria session status."""
     from backend.music_manager import music_manager
     if music_manager is None:
-        return {"connected": False, "playing": False, "prompts": [], "config": {}}
-    return music_manager.get_status()
+        return {"connected": False, "playing": False, "prompts": [], "config": {},
+                "hub": music_hub.stats()}
+    return {**music_manager.get_status(), "hub": music_hub.stats()}
+
+
+
+@router.get("/api/music/recorder")
+async def recorder_status():
+    return music_recorder.status()
 
 
+@router.get("/api/music/recorder/export")
+async def recorder_export(format: str = "wav", last: Optional[float] = None,
+                          start: Optional[float] = None, end: Optional[float] = None):
+    """Export part of the ring buffer. ``last`` = final N seconds; otherwise
+    ``start``/``end`` on the recorder timeline (see ``position_s``)."""
+    if format not in EXPORT_MIME:
+        raise HTTPException(status_code=400, detail="format must be wav or flac")
+    if last is None and start is None:
+        last = 60.0
+    try:
+        audio = await asyncio.to_thread(music_recorder.export, format,
+                                        start_s=start, end_s=end, last=last)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    filename = f"lyria-{datetime.now():%Y%m%d-%H%M%S}.{format}"
+    return Response(content=audio, media_type=EXPORT_MIME[format],
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+@router.post("/api/music/recorder/segments")
+async def recorder_segments(body: RecorderSegmentsRequest):
+    """Start/stop continuous segmented WAV recording to OUTPUT_AUDIO_DIR.
+    Local-only: a hosted instance's disk is not the operator's archive."""
+    if is_hosted():
+        raise HTTPException(status_code=403, detail="Recording to disk is local-only")
+    if body.action == "start":
+        music_recorder.start_segments(config.OUTPUT_AUDIO_DIR,
+                                      max(10, min(body.segment_seconds, 3600)))
+    elif body.action == "stop":
+        writer = music_recorder.stop_segments()
+        if writer is not None:
+            await asyncio.to_thread(writer.stop)
+            return {"status": "stopped", "files": writer.files, "error": writer.error}
+    else:
+        raise HTTPException(status_code=400, detail="action must be start or stop")
+    return {"status": "success", **music_recorder.status()}
+
 
 @router.websocket("/ws/music")
 async def ws_music(websocket: WebSocket):
@@ -43,6 +96,11 @@ async def ws_music(websocket: WebSocket):
       Server → Client (binary): raw 16-bit PCM audio chunks (48kHz stereo)
       Server → Client (JSON text): status updates and errors
 
+    Every socket is a listener on the shared Lyria session via music_hub:
+    the first one starts the session, any listener's controls drive it, and
+    the last one to leave shuts it down. Each listener has its own bounded
+    buffer, so a slow socket skips audio instead of stalling the others.
+
     Service mode gates this endpoint here — HTTP middleware never sees
     websocket scope. Lyria is not part of the free tier: anonymous sockets
     close 4401, non-admin users 4403 (music-studio.js maps both to UI).
@@ -76,20 +134,35 @@ async def ws_music(websocket: WebSocket):
     # the original `finally` would call `mm.shutdown()` on an undefined name
     # and mask the real error.
     mm = None
+    listener = music_hub.add()
+
+    # Forwards this listener's buffered data to its browser socket
+    async def send_to_browser(data):
+        if isinstance(data, bytes):
+            await websocket.send_bytes(data)
+        elif isinstance(data, str):
+            await websocket.send_text(data)
+        else:
+            await websocket.send_text(data.decode())
+
+    async def pump():
+        try:
+            await listener.pump(send_to_browser)
+        except Exception as e:  # socket gone; the receive loop will notice
+            logger.debug("Music listener %s pump ended: %s", listener.id, e)
+
+    pump_task = asyncio.create_task(pump())
     try:
         mm = get_music_manager(ai_manager.api_key)
 
-        # Callback that forwards data to the browser WebSocket
-        async def send_to_browser(data):
-            if isinstance(data, bytes):
-                await websocket.send_bytes(data)
-            elif isinstance(data, str):
-                await websocket.send_text(data)
-            else:
-                await websocket.send_text(data.decode())
-
-        # Start the Lyria session (runs in background task with async context manager)
-        await mm.start(send_to_browser)
+        # Start the Lyria session (runs in background task with async context
+        # manager) unless another listener already did — then just join it.
+        async with mm.lifecycle_lock:
+            started = await mm.ensure_started(music_hub.publish)
+        if not started:
+            listener.offer(json.dumps({"status": "connected"}))
+            if mm.playing:
+                listener.offer(json.dumps({"status": "playing"}))
 
         # Listen for control messages from the browser and queue them
         try:
@@ -98,7 +171,7 @@ async def ws_music(websocket: WebSocket):
                 try:
                     msg = json.loads(raw)
                 except json.JSONDecodeError:
-                    await websocket.send_json({"error": "Invalid JSON"})
+                    listener.offer(json.dumps({"error": "Invalid JSON"}))
                     continue
 
                 await mm.send_command(msg)
@@ -114,10 +187,16 @@ async def ws_music(websocket: WebSocket):
             pass
 
     finally:
+        music_hub.remove(listener)
+        pump_task.cancel()
+        try:
+            await pump_task
+        except asyncio.CancelledError:
+            pass
         if mm is not None:
-            try:
-                await mm.shutdown()
-            except Exception:
-                logger.exception("MusicManager shutdown raised — ignoring")
-
-
+            async with mm.lifecycle_lock:
+                if len(music_hub) == 0:
+                    try:
+                        await mm.shutdown()
+                    except Exception:
+                        logger.exception("MusicManager shutdown raised — ignoring")
@@ -23,12 +23,20 @@ from backend.helpers import decode_base64_image, parse_llm_json
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+def _sent() -> dict:
+    """With a send tick the value is only queued — a failed flush surfaces in
+    the bridge's running ``sendErrors``, not as an error on this request."""
+    if osc_bridge.tick_ms > 0:
+        return {"ok": True, "queued": True, "sendErrors": osc_bridge.send_errors}
+    return {"ok": True}
+
+
 @router.post("/api/osc/send-prompt")
 async def osc_send_prompt(req: OSCSendPromptRequest):
     """Forward a prompt string to Scope via OSC."""
     try:
         osc_bridge.send_prompt(req.prompt, req.address)
-        return {"ok": True}
+        return _sent()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -38,15 +46,15 @@ async def osc_send_param(req: OSCSendParamRequest):
     """Forward a numeric parameter to Scope via OSC."""
     try:
         osc_bridge.send_float(req.address, req.value)
-        return {"ok": True}
+        return _sent()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/api/osc/config")
 async def osc_config(req: OSCConfigRequest):
-    """Update the OSC target host/port."""
-    osc_bridge.update_config(host=req.host, port=req.port)
+    """Update the OSC target host/port and/or the send tick."""
+    osc_bridge.update_config(host=req.host, port=req.port, tick_ms=req.tick_ms)
     return osc_bridge.status()
 
 
@@ -20,6 +20,12 @@ Recovery flow:
 Supported kinds are declared in KIND_DIRS. To add a new kind, extend KIND_DIRS and
 optionally add a summary extractor to _SUMMARY_EXTRACTORS so the list endpoint
 returns useful previews.
+
+Listing and dedup read a SQLite sidecar (utils/json_index.py, under
+OUTPUT_JSON_DIR/.index/) holding each file's fingerprint, mtime, size and list
+summary. The JSON files stay authoritative: every list/save re-stats the kind
+directory and re-indexes only what changed, so out-of-band edits and retention
+deletes heal without a rebuild step.
 """
 from __future__ import annotations
 
@@ -34,6 +40,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from backend import config
+from backend.utils.json_index import open_index
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -100,6 +107,16 @@ def _fingerprint(content: Any) -> str:
     return hashlib.sha256(_canonical_content_json(content).encode("utf-8")).hexdigest()[:8]
 
 
+def _index():
+    return open_index(config.OUTPUT_JSON_DIR / ".index" / "outputs.sqlite")
+
+
+def _describer(kind: str):
+    """What the index stores per file of this kind: (fingerprint, list summary)."""
+    extractor = _SUMMARY_EXTRACTORS.get(kind, lambda c: {})
+    return lambda content: (_fingerprint(content), extractor(content))
+
+
 def _slugify(text: str, max_words: int = 3) -> str:
     text = re.sub(r"\{\{[^}]*\}\}", "", text or "")
     words = re.sub(r"[^a-z0-9 ]+", " ", text.lower()).split()
@@ -210,15 +227,14 @@ async def save_output(req: SaveOutputRequest):
         return {"status": "exists", "kind": req.kind, "filename": filename,
                 "filepath": str(filepath), "fingerprint": fp}
 
-    # Slow path: scan for content-equal file under a different slug
-    for existing in target_dir.glob("*.json"):
-        try:
-            with existing.open("r", encoding="utf-8") as f:
-                if _fingerprint(json.load(f)) == fp:
-                    return {"status": "exists", "kind": req.kind, "filename": existing.name,
-                            "filepath": str(existing), "fingerprint": fp}
-        except Exception:
-            continue
+    # Slow path: content-equal file under a different slug, by indexed fingerprint
+    index = _index()
+    describe = _describer(req.kind)
+    index.sync(req.kind, target_dir, describe)
+    existing = index.find(req.kind, fp)
+    if existing:
+        return {"status": "exists", "kind": req.kind, "filename": existing,
+                "filepath": str(target_dir / existing), "fingerprint": fp}
 
     try:
         with filepath.open("w", encoding="utf-8") as f:
@@ -226,6 +242,7 @@ async def save_output(req: SaveOutputRequest):
     except Exception as e:
         logger.error("Failed to write %s: %s", filepath, e)
         raise HTTPException(status_code=500, detail=str(e))
+    index.record(req.kind, filepath, describe, req.content)
     return {"status": "success", "kind": req.kind, "filename": filename,
             "filepath": str(filepath), "fingerprint": fp}
 
@@ -238,23 +255,13 @@ async def list_outputs(kind: str):
       {status, kind, count, items: [{filename, mtime, ...summary fields}]}
     """
     target_dir = _kind_dir(kind)
-    extractor = _SUMMARY_EXTRACTORS.get(kind, lambda c: {})
+    index = _index()
+    index.sync(kind, target_dir, _describer(kind))
     items = []
-    for p in target_dir.glob("*.json"):
-        try:
-            stat = p.stat()
-            with p.open("r", encoding="utf-8") as f:
-                content = json.load(f)
-        except Exception as e:
-            logger.warning("Skipping unreadable %s: %s", p, e)
-            continue
-        summary = extractor(content)
-        items.append({
-            "filename": p.name,
-            "mtime": stat.st_mtime,
-            **summary,
-        })
-    items.sort(key=lambda x: x.get("mtime") or 0, reverse=True)
+    for row in index.rows(kind, order_by="mtime", descending=True):
+        row.pop("size", None)
+        row.pop("fingerprint", None)
+        items.append(row)
     return {"status": "success", "kind": kind, "count": len(items), "items": items}
 
 
@@ -285,4 +292,5 @@ async def delete_output(kind: str, filename: str):
         filepath.unlink()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Delete failed: {e}")
+    _index().forget(kind, filename)
     return {"status": "success", "kind": kind, "filename": filename}
@@ -57,14 +57,15 @@ async def scope_save_asset(request: Request):
 
 @router.post("/api/scope/discover")
 async def scope_discover(req: ScopeDiscoverRequest):
-    """Probe Scope's health endpoint and return connection info."""
-    return osc_bridge.discover_scope(req.scopeUrl)
+    """Scope health + connection info (cached; see OSCBridge.discover_scope)."""
+    return await osc_bridge.discover_scope(req.scopeUrl)
 
 
 @router.get("/api/scope/discover")
 async def scope_discover_get():
-    """Quick health check of Scope at the current configured URL."""
-    return osc_bridge.discover_scope()
+    """Quick health check of Scope at the current configured URL, falling back
+    to the default and SYNTH_SCOPE_URLS candidates."""
+    return await osc_bridge.discover_scope()
 
 
 # ── Music Studio (Lyria RealTime) ───────────────────────────────────
@@ -11,6 +11,12 @@ A "session" bundles:
 
 Storage is plain JSON files under OUTPUT_JSON_DIR / "Sessions" / <id>.json.
 File name == id so deletes and reads are O(1) by id.
+
+Listing reads a SQLite sidecar (utils/json_index.py) of per-session metadata —
+name, timestamps, agent/anchor counts — so the list view never parses bodies;
+pass ``full=true`` to have the bodies of just the requested page loaded. The
+files stay authoritative and the index re-syncs from their mtimes on each
+list. PATCH rewrites only the one session it touches.
 """
 import json
 import logging
@@ -25,6 +31,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from backend import config
+from backend.utils.json_index import open_index
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -51,6 +58,15 @@ class SessionPreset(BaseModel):
     updatedAt: Optional[str] = None
 
 
+class SessionPatch(BaseModel):
+    """Partial update — only the fields present are changed."""
+    name: Optional[str] = None
+    agents: Optional[List[SessionAgentSlot]] = None
+    sharedAnchors: Optional[Dict[str, str]] = None
+    goal: Optional[str] = None
+    resolutionMode: Optional[str] = None
+
+
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 _ID_RE = re.compile(r"^[a-zA-Z0-9_\-]+$")
@@ -80,19 +96,79 @@ def _read_one(p: Path) -> Optional[dict]:
         return None
 
 
+def _write_one(sid: str, payload: dict):
+    """Write one session atomically (temp file + replace) and index it."""
+    p = _path_for(sid)
+    tmp = p.with_name(f".{p.name}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, p)
+    except Exception as e:
+        tmp.unlink(missing_ok=True)
+        raise HTTPException(status_code=500, detail=f"Failed to save: {e}")
+    _index().record("sessions", p, _describe, payload)
+
+
+# ── Index ─────────────────────────────────────────────────────────────────────
+
+SORT_FIELDS = {"updatedAt", "createdAt", "name"}
+
+
+def _index():
+    return open_index(SESSIONS_DIR.parent / ".index" / "sessions.sqlite")
+
+
+def _describe(s: dict):
+    """List-view metadata for one session (the index has no use for a fingerprint)."""
+    return None, {
+        "id": s.get("id"),
+        "name": s.get("name") or "",
+        "goal": (s.get("goal") or "")[:140],
+        "resolutionMode": s.get("resolutionMode") or "once",
+        "createdAt": s.get("createdAt"),
+        "updatedAt": s.get("updatedAt") or s.get("createdAt") or "",
+        "agentCount": len(s.get("agents") or []),
+        "anchorCount": len(s.get("sharedAnchors") or {}),
+    }
+
+
 # ── Routes ────────────────────────────────────────────────────────────────────
 
 @router.get("/api/sessions")
-async def list_sessions():
-    """List all saved sessions, newest first."""
+async def list_sessions(limit: Optional[int] = None, offset: int = 0,
+                        sort: str = "updatedAt", order: str = "desc", full: bool = False):
+    """List saved sessions, newest first by default.
+
+    Items are index metadata (id, name, goal preview, timestamps, agentCount,
+    anchorCount); ``full=true`` returns the stored body of each session on the
+    page instead, with agentCount/anchorCount added (a session whose file can't
+    be read keeps its metadata item). ``limit``/``offset`` paginate; ``total``
+    is the unpaginated count."""
+    if sort not in SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {sorted(SORT_FIELDS)}")
+    if (limit is not None and limit < 0) or offset < 0:
+        raise HTTPException(status_code=400, detail="limit/offset must be non-negative")
+    index = _index()
+    index.sync("sessions", SESSIONS_DIR, _describe)
+    rows = index.rows("sessions", order_by=sort, descending=order != "asc",
+                      limit=limit, offset=offset)
     out = []
-    for p in SESSIONS_DIR.glob("*.json"):
-        data = _read_one(p)
-        if data:
-            out.append(data)
-    # Sort by updatedAt desc, falling back to createdAt, then name
-    out.sort(key=lambda s: (s.get("updatedAt") or s.get("createdAt") or "", s.get("name") or ""), reverse=True)
-    return {"status": "success", "sessions": out}
+    for row in rows:
+        filename = row.pop("filename")
+        for k in ("mtime", "size", "fingerprint"):
+            row.pop(k, None)
+        row["id"] = row.get("id") or filename[:-len(".json")]
+        if full:
+            # The stored body as-is, plus the index-only counts; an unreadable
+            # file keeps its metadata row so the page still matches ``total``.
+            data = _read_one(SESSIONS_DIR / filename)
+            if data:
+                row = {**data, "id": data.get("id") or row["id"],
+                       "agentCount": row["agentCount"], "anchorCount": row["anchorCount"]}
+        out.append(row)
+    return {"status": "success", "sessions": out, "total": index.count("sessions"),
+            "limit": limit, "offset": offset}
 
 
 @router.post("/api/sessions")
@@ -106,14 +182,29 @@ async def save_session(preset: SessionPreset):
     if not payload.get("createdAt"):
         payload["createdAt"] = now
     payload["updatedAt"] = now
-    try:
-        with _path_for(sid).open("w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to save: {e}")
+    _write_one(sid, payload)
     return {"status": "success", "session": payload}
 
 
+@router.patch("/api/sessions/{sid}")
+async def patch_session(sid: str, patch: SessionPatch):
+    """Change only the given fields of one session; nothing else is rewritten."""
+    p = _path_for(sid)
+    if not p.exists():
+        raise HTTPException(status_code=404, detail=f"Session not found: {sid}")
+    data = _read_one(p)
+    if not data:
+        raise HTTPException(status_code=500, detail="Session file unreadable")
+    changes = patch.model_dump(exclude_unset=True)
+    if not changes:
+        return {"status": "success", "session": data}
+    data.update(changes)
+    data["id"] = sid
+    data["updatedAt"] = _now()
+    _write_one(sid, data)
+    return {"status": "success", "session": data}
+
+
 @router.get("/api/sessions/{sid}")
 async def get_session(sid: str):
     p = _path_for(sid)
@@ -134,4 +225,5 @@ async def delete_session(sid: str):
         p.unlink()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete: {e}")
+    _index().forget("sessions", p.name)
     return {"status": "success", "id": sid}
@@ -22,21 +22,36 @@ from backend import config
 from backend.models.requests import *
 from backend.helpers import decode_base64_image, parse_llm_json, SafetyBlockedError, safety_block_detail
 from backend.service import is_free_tier, service_mode
-from backend.service.credits import charged
+from backend.service.credits import Charge, charged
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+TITLE_MAX_CHARS = 60  # gallery label for a name the template already carries
+
+
+def _clean_line(raw: str) -> str:
+    """First line of ``raw`` without markdown/markup characters or a trailing dot."""
+    line = raw.strip().splitlines()[0] if raw and raw.strip() else ""
+    return re.sub(r'[`"*_#<>\[\]\(\)]', "", line).strip().strip(".").strip()
+
+
 def _sanitize_name(raw: str) -> Optional[str]:
     """First line of the model's reply, stripped to a 1-2 word Title-Case label."""
-    if not raw:
-        return None
-    line = raw.strip().splitlines()[0] if raw.strip() else ""
-    line = re.sub(r'[`"*_#<>\[\]\(\)]', "", line).strip().strip(".").strip()
-    name = " ".join(line.split()[:2])[:24].strip()
+    name = " ".join(_clean_line(raw).split()[:2])[:24].strip()
     return name or None
 
 
+def _trim_title(raw: str) -> Optional[str]:
+    """A title the template carries, cleaned and cut to ``TITLE_MAX_CHARS`` at
+    a word boundary — kept whole otherwise, unlike the naming-model clamp."""
+    title = " ".join(_clean_line(raw).split())
+    if len(title) > TITLE_MAX_CHARS:
+        cut = title[:TITLE_MAX_CHARS + 1].rsplit(" ", 1)[0]
+        title = (cut if len(cut) <= TITLE_MAX_CHARS else title[:TITLE_MAX_CHARS]).rstrip(" ,;:-")
+    return title or None
+
+
 def _name_template(template: dict) -> Optional[str]:
     """One cheap Flash call → a snappy 1-2 word theme name for the saved-
     workflow gallery. Synchronous (runs in a thread); see _safe_name_template."""
@@ -55,6 +70,48 @@ def _name_template(template: dict) -> Optional[str]:
     return _sanitize_name(ai_manager.generate_text(ask, model_name=config.MODEL_FAST))
 
 
+def _name_brief(brief: str) -> Optional[str]:
+    """Same Flash call as _name_template, but from the user's request text —
+    so it can run while the template is still being generated."""
+    brief = (brief or "").strip()
+    if not brief:
+        return None
+    ask = (
+        "Give a snappy 1-2 word name for the THEME of the generative-art prompt "
+        "template this request will produce, for a user's saved-workflow library. "
+        "Reply with ONLY the name — no quotes, no punctuation, Title Case.\n\n"
+        f"Request: {brief[:400]}"
+    )
+    return _sanitize_name(ai_manager.generate_text(ask, model_name=config.MODEL_FAST))
+
+
+def _local_template_name(template: dict) -> Optional[str]:
+    """A name the model already wrote into the template (p5 sketches and agent
+    profiles carry ``name``, stories a ``story.title``) — no call needed."""
+    story = template.get("story")
+    for raw in (template.get("name"), story.get("title") if isinstance(story, dict) else None):
+        if isinstance(raw, str):
+            name = _trim_title(raw)
+            if name:
+                return name
+    return None
+
+
+# Modes whose result is a {template: …} worth naming, and whose request text
+# describes its theme well enough to name speculatively. Not "p5"/"story"
+# (the template always carries its own name/title), nor "remix" (the prompt
+# is an edit instruction like "make it darker", not a theme).
+_SPECULATIVE_NAME_MODES = {"text", "image", "hybrid", "multi-image"}
+
+
+async def _safe_name_brief(brief: str) -> Optional[str]:
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(_name_brief, brief), timeout=15)
+    except Exception:
+        logger.info("speculative template naming skipped (non-fatal)", exc_info=True)
+        return None
+
+
 async def _safe_name_template(template: dict) -> Optional[str]:
     """Best-effort wrapper: naming must never fail or noticeably slow a
     generation that already succeeded, so any error/timeout just yields None
@@ -66,6 +123,21 @@ async def _safe_name_template(template: dict) -> Optional[str]:
         return None
 
 
+async def _resolve_template_name(template: dict, speculative: Optional[asyncio.Task]) -> Optional[str]:
+    """Cheapest first: a name already in the template, then the speculative
+    brief-based name (normally finished by now), then a post-hoc call."""
+    name = _local_template_name(template)
+    if name:
+        if speculative is not None:
+            speculative.cancel()
+        return name
+    if speculative is not None:
+        name = await speculative
+        if name:
+            return name
+    return await _safe_name_template(template)
+
+
 @router.post("/api/generate/template")
 async def generate_template(request: TemplateRequest, http_request: Request):
     """Charged wrapper around the mode dispatch below.
@@ -77,7 +149,9 @@ async def generate_template(request: TemplateRequest, http_request: Request):
     bind a later "save this template to My creations" call to it — the artifacts
     save endpoint requires an owned generation_id of a compatible action. Also
     attaches a ``template_name`` (service mode only, so a local install pays no
-    extra call) for the gallery label.
+    extra call) for the gallery label — taken from the template itself when the
+    model already named it, else from a naming call started in parallel with
+    generation (see _resolve_template_name).
     """
     if request.is_demo and not service_mode():
         priced_model = config.MODEL_DEMO
@@ -88,11 +162,23 @@ async def generate_template(request: TemplateRequest, http_request: Request):
     if is_free_tier(http_request) and request.images and len(request.images) > 8:
         request.images = request.images[:8]
     n_images = min(len(request.images or []), 8)
-    async with charged(http_request, action="template", model=priced_model,
-                       units=n_images, prompt_chars=len(request.prompt or "")) as ch:
-        result = await _generate_template_impl(request)
-        ch.commit()
-        gen_id = ch.gen_id
+    speculative = None
+    try:
+        async with charged(http_request, action="template", model=priced_model,
+                           units=n_images, prompt_chars=len(request.prompt or "")) as ch:
+            # Start naming from the request text alongside generation, so the
+            # label doesn't add a sequential model round-trip after the template
+            # arrives — only once the reservation went through, since a started
+            # call can't be recalled (cancel() doesn't stop its thread).
+            if service_mode() and request.mode in _SPECULATIVE_NAME_MODES and (request.prompt or "").strip():
+                speculative = asyncio.create_task(_safe_name_brief(request.prompt))
+            result = await _generate_template_impl(request)
+            ch.commit()
+            gen_id = ch.gen_id
+    except BaseException:
+        if speculative is not None:
+            speculative.cancel()
+        raise
 
     if isinstance(result, dict):
         if gen_id is not None:
@@ -101,12 +187,80 @@ async def generate_template(request: TemplateRequest, http_request: Request):
         # Name real Synthograsizer templates only (not p5_edit/workflow/taste
         # payloads), and only in service mode where the gallery uses the label.
         if service_mode() and isinstance(tpl, dict):
-            name = await _safe_name_template(tpl)
+            name = await _resolve_template_name(tpl, speculative)
             if name:
                 result["template_name"] = name
+        elif speculative is not None:
+            speculative.cancel()
     return result
 
 
+@router.post("/api/generate/template/workflow-stream")
+async def generate_workflow_stream(request: TemplateRequest, http_request: Request):
+    """Workflow curation with progress: NDJSON, one line per image as it
+    finishes (``{"type": "image", "index", "done", "total", ...}``), then
+    ``{"type": "done", "results", "failed"}`` with results in image order.
+
+    Metered like /api/generate/text/stream: reserve before the stream opens;
+    keep the charge if any image was curated, refund if none were. A client
+    that disconnects mid-stream is still charged for curations already
+    running — their threads finish on the operator's key regardless — and
+    refunded only when every started image had already failed.
+    """
+    if not request.workflow:
+        raise HTTPException(status_code=400, detail="Workflow mode requires a workflow JSON.")
+    if not request.images:
+        raise HTTPException(status_code=400, detail="Workflow mode requires at least one reference image.")
+    if is_free_tier(http_request) and len(request.images) > 8:
+        request.images = request.images[:8]
+    if request.is_demo and not service_mode():
+        model_override = config.MODEL_DEMO
+    else:
+        model_override = request.model or (config.MODEL_TEMPLATE_GEN_FAST if request.use_flash else None)
+    ch = Charge(http_request, action="template",
+                model=model_override or config.MODEL_TEMPLATE_GEN,
+                units=min(len(request.images), 8), prompt_chars=len(request.prompt or ""))
+    await ch.reserve()  # raises 400/402 before the stream opens
+
+    guidance = request.prompt if request.prompt.strip() else None
+    include_rationale = request.preview if request.preview is not None else True
+
+    async def gen():
+        results, failed, done = [None] * len(request.images), 0, 0
+        started, abandoned = set(), False
+        try:
+            async for o in ai_manager.iter_workflow_curations(
+                request.workflow, request.images, guidance=guidance,
+                include_rationale=include_rationale, model_override=model_override,
+                timeout=config.TEMPLATE_GEN_TIMEOUT_SECONDS, on_start=started.add,
+            ):
+                done += 1
+                line = {"type": "image", "index": o["index"], "done": done,
+                        "total": len(results), "ok": o["ok"]}
+                if o["ok"]:
+                    results[o["index"]] = line["result"] = o["result"]
+                else:
+                    failed += 1
+                    results[o["index"]] = {"template": None, "error": o["error"]}
+                    line["error"] = o["error"]
+                yield json.dumps(line) + "\n"
+            yield json.dumps({"type": "done", "status": "success",
+                              "results": results, "failed": failed}) + "\n"
+        except (GeneratorExit, asyncio.CancelledError):
+            abandoned = True
+            raise
+        finally:
+            still_running = abandoned and len(started) > done
+            if done and failed < done:
+                await ch.settle_ok(error="partial" if failed or abandoned else None)
+            elif still_running:
+                await ch.settle_ok(error="client_disconnected")
+            else:
+                await ch.settle_refund(error="workflow_curation_failed")
+
+    return StreamingResponse(gen(), media_type="application/x-ndjson")
+
+
 async def _generate_template_impl(request: TemplateRequest):
     # p5.js sketch generation uses a longer timeout — the Pro model writes a complete,
     # self-contained sketch with lookup maps, variables, and animation logic.
@@ -261,24 +415,20 @@ async def _generate_template_impl(request: TemplateRequest):
             guidance = request.prompt if request.prompt.strip() else None
             include_rationale = request.preview if request.preview is not None else True
 
-            # Process each image (batch support)
-            results = []
-            for img_b64 in request.images:
-                image_bytes = decode_base64_image(img_b64)
-                result = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        ai_manager.curate_workflow,
-                        request.workflow,
-                        image_bytes,
-                        guidance=guidance,
-                        include_rationale=include_rationale,
-                        model_override=model_override
-                    ),
-                    timeout=timeout
-                )
-                results.append(result)
-
-            return {"status": "success", "results": results}
+            # Curate every image concurrently (batch support); one failed image
+            # leaves an error entry in its slot instead of failing the batch.
+            outcomes = [o async for o in ai_manager.iter_workflow_curations(
+                request.workflow, request.images, guidance=guidance,
+                include_rationale=include_rationale, model_override=model_override,
+                timeout=timeout,
+            )]
+            outcomes.sort(key=lambda o: o["index"])
+            failed = [o for o in outcomes if not o["ok"]]
+            if len(failed) == len(outcomes):
+                raise failed[0]["exc"]  # nothing to show — surface it like a single-image failure
+            results = [o["result"] if o["ok"] else {"template": None, "error": o["error"]}
+                       for o in outcomes]
+            return {"status": "success", "results": results, "failed": len(failed)}
 
         elif mode == "p5":
             if not request.prompt.strip():
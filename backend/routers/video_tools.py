@@ -19,6 +19,7 @@ from backend.music_manager import get_music_manager
 from backend import config
 from backend.models.requests import *
 from backend.helpers import decode_base64_image, parse_llm_json
+from backend.utils import metrics
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -58,11 +59,12 @@ async def combine_videos(request: CombineVideosRequest):
         output_path = os.path.join(tmp_dir, "combined.mp4")
 
         # Run FFmpeg concat
-        result = subprocess.run(
-            [ffmpeg_path, "-y", "-f", "concat", "-safe", "0",
-             "-i", list_path, "-c", "copy", output_path],
-            capture_output=True, text=True, timeout=120
-        )
+        with metrics.span("ffmpeg", op="concat"):
+            result = subprocess.run(
+                [ffmpeg_path, "-y", "-f", "concat", "-safe", "0",
+                 "-i", list_path, "-c", "copy", output_path],
+                capture_output=True, text=True, timeout=120
+            )
 
         if result.returncode != 0:
             logger.error(f"FFmpeg error: {result.stderr}")
@@ -24,16 +24,15 @@ from pathlib import Path
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from backend import config
 from backend.ai_manager import ai_manager
+from backend.utils import metrics
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/videorama", tags=["videorama"])
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
-FILMS_ROOT = Path(os.environ.get(
-    "SYNTH_FILMS_ROOT",
-    r"D:\Synthograsizer_Films" if Path(r"D:\\").exists()
-    else str(Path.home() / "Synthograsizer_Films")))
+FILMS_ROOT = config.FILMS_ROOT
 
 from backend.policy import is_hosted
 HOSTED = is_hosted()
@@ -63,7 +62,8 @@ def _inline(slug: str, name: str):
     with _lock:
         _inline_ops[slug] = name
     try:
-        yield
+        with metrics.span("film_factory.inline_op", op=name):
+            yield
     finally:
         with _lock:
             _inline_ops.pop(slug, None)
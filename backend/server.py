@@ -1,15 +1,19 @@
 """Synthograsizer API Server — FastAPI endpoints for AI generation.
 
 Routes delegate to AIManager (ai_manager.py) for Gemini/Imagen/Veo calls.
-All base64 image inputs are decoded via `decode_base64_image()` and all
+All base64 image inputs are decoded via `decode_base64_image()` (or wrapped
+lazily by `decode_image_payload()` where they only pass through to Gemini) and all
 LLM JSON responses are parsed via `parse_llm_json()` to keep endpoint
 handlers concise and consistent.
 """
 
 import sys
 import os
+import time
 from pathlib import Path
 
+_import_t0 = time.perf_counter()
+
 # Add the project root and backend directory to path for imports
 # This allows both 'import config' and 'from backend import config' to work
 backend_dir = Path(__file__).resolve().parent
@@ -34,62 +38,77 @@ import re
 import time
 
 from backend import config
-from ai_manager import ai_manager, normalize_template
-from osc_bridge import osc_bridge
-from music_manager import get_music_manager
 
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Synthograsizer AI Suite")
 
-from backend.routers import chat
-from backend.routers import generation
-from backend.routers import video_tools
-from backend.routers import system
-from backend.routers import templates
-from backend.routers import analysis
-from backend.routers import scope
-from backend.routers import metadata
-from backend.routers import osc
-from backend.routers import music
-from backend.routers import sessions
-from backend.routers import outputs
-from backend.routers import feedback
-from backend.routers import videorama
-from backend.routers import account
-from backend.routers import admin
-from backend.routers import artifacts
-
-app.include_router(chat.router)
-app.include_router(generation.router)
-app.include_router(video_tools.router)
-app.include_router(system.router)
-app.include_router(templates.router)
-app.include_router(analysis.router)
-app.include_router(scope.router)
-app.include_router(metadata.router)
-app.include_router(osc.router)
-app.include_router(music.router)
-app.include_router(sessions.router)
-app.include_router(outputs.router)
-app.include_router(feedback.router)
-app.include_router(videorama.router)
-app.include_router(account.router)  # endpoints 404 unless SYNTH_AUTH=1
-app.include_router(admin.router)    # 404 unless SYNTH_AUTH=1 and caller is admin
-app.include_router(artifacts.router)  # endpoints 404 unless SYNTH_AUTH=1
+# ── API surfaces ─────────────────────────────────────────────────────────────
+# One router module per surface. Prefixes ending in "/" claim a subtree, the
+# rest are exact paths (tests/test_lazy_router.py keeps them in step with the
+# routers). SYNTH_SURFACES (comma list) mounts only the named surfaces;
+# SYNTH_LAZY_ROUTERS=1 defers each router's import — and the genai/PIL/asyncpg
+# stack behind it — to its first request (default: on when hosted, where cold
+# start matters; off locally so /docs lists everything).
+from backend.policy import is_hosted as _is_hosted
+from backend.utils import lazy_router
+
+SURFACES = {
+    "chat": ("/api/chat",),
+    "generation": ("/api/batch/text", "/api/generate/image", "/api/generate/image-variation-prompts",
+                   "/api/generate/narrative", "/api/generate/smart-transform", "/api/generate/text",
+                   "/api/generate/text/stream", "/api/generate/video", "/api/generate/video-variations",
+                   "/api/media/"),
+    "video_tools": ("/api/video/",),
+    "system": ("/api/backend/", "/api/config", "/api/health", "/chatroom/api/"),
+    "templates": ("/api/generate/template", "/api/generate/template/workflow-stream",
+                  "/api/generate/template-from-analysis", "/api/save-template"),
+    "analysis": ("/api/analyze/",),
+    "scope": ("/api/scope/",),
+    "metadata": ("/api/extract-metadata", "/api/extract-metadata/bulk"),
+    "osc": ("/api/osc/",),
+    "music": ("/api/music/", "/ws/music"),
+    "sessions": ("/api/sessions", "/api/sessions/"),
+    "outputs": ("/api/delete-output/", "/api/get-output/", "/api/list-outputs/", "/api/save-output"),
+    "feedback": ("/api/feedback", "/api/feedback/"),
+    "videorama": ("/api/videorama/",),
+    "account": ("/api/auth/", "/api/me", "/api/me/accept-terms", "/api/me/export"),  # 404 unless SYNTH_AUTH=1
+    "admin": ("/api/admin/",),            # 404 unless SYNTH_AUTH=1 and caller is admin
+    "artifacts": ("/api/artifacts", "/api/artifacts/", "/api/me/artifacts"),  # 404 unless SYNTH_AUTH=1
+}
+
+_enabled = {n.strip() for n in os.environ.get("SYNTH_SURFACES", "").split(",") if n.strip()}
+_lazy_env = os.environ.get("SYNTH_LAZY_ROUTERS", "").strip().lower()
+LAZY_ROUTERS = _lazy_env in ("1", "true", "yes") if _lazy_env else _is_hosted()
+
+for _name, _prefixes in SURFACES.items():
+    _module = f"backend.routers.{_name}"
+    if _enabled and _name not in _enabled:
+        lazy_router.record(_name, _module, "disabled")
+    elif LAZY_ROUTERS:
+        app.router.routes.append(lazy_router.LazySurface(_name, _module, _prefixes))
+    else:
+        _mod, _ms = lazy_router.timed_import(_module)
+        app.include_router(_mod.router)
+        lazy_router.record(_name, _module, "eager", _ms)
 
 # Videorama project media (local installs only): serves rendered takes,
 # tape-processed clips, and export reels for the review UI.
-if not videorama.HOSTED and videorama.FILMS_ROOT.exists():
+if (not _is_hosted() and (not _enabled or "videorama" in _enabled)
+        and config.FILMS_ROOT.exists()):
     from fastapi.staticfiles import StaticFiles as _SF
-    app.mount("/films", _SF(directory=str(videorama.FILMS_ROOT)), name="films")
+    app.mount("/films", _SF(directory=str(config.FILMS_ROOT)), name="films")
+
+
+@app.on_event("shutdown")
+async def _stop_metadata_pool():
+    if "backend.services.metadata_bulk" in sys.modules:
+        sys.modules["backend.services.metadata_bulk"].shutdown()
 
 
 # ── Hosted-mode hardening ────────────────────────────────────────────────────
 # Rate limiting + retention purge activate only when SYNTH_HOSTED=1 (or on
 # Vercel). A solo local install is unaffected. See docs/COMPLIANCE_ROADMAP.md.
-from backend.policy import is_hosted as _is_hosted
-
 if _is_hosted():
     import time as _time
     from collections import defaultdict, deque
@@ -144,6 +163,36 @@ from backend.service.enforcement import service_middleware as _service_middlewar
 
 app.middleware("http")(_service_middleware)
 
+# Per-endpoint latency histograms (utils/metrics.py, /api/admin/metrics).
+# Registered after the service middleware so it is the outermost layer and
+# includes auth/credit time — and only with metrics on, so SYNTH_METRICS=0
+# costs no middleware hop. Streaming responses are timed to their first byte
+# (call_next returns once headers are ready); a client that disconnects
+# first is labelled "cancelled", not 5xx.
+from fastapi.routing import APIRoute as _APIRoute
+from backend.utils import metrics as _metrics
+
+
+async def _endpoint_latency(request, call_next):
+    t0 = time.perf_counter()
+    status = "5xx"
+    try:
+        response = await call_next(request)
+        status = f"{response.status_code // 100}xx"
+        return response
+    except asyncio.CancelledError:
+        status = "cancelled"
+        raise
+    finally:
+        route = request.scope.get("route")
+        _metrics.observe("http.request", (time.perf_counter() - t0) * 1000,
+                         route=route.path if isinstance(route, _APIRoute) else "static",
+                         method=request.method, status=status)
+
+
+if _metrics.ENABLED:
+    app.middleware("http")(_endpoint_latency)
+
 # Error hygiene: our routers wrap upstream failures as HTTPException(500,
 # str(e)), which is exactly right for a local operator debugging their own
 # box and exactly wrong for a shared instance (leaks paths, SDK internals,
@@ -211,5 +260,9 @@ class CacheControlStaticFiles(StaticFiles):
 if not os.environ.get("VERCEL") and STATIC_DIR.exists():
     app.mount("/", CacheControlStaticFiles(directory=str(STATIC_DIR), html=True), name="static")
 
+lazy_router.startup_ms = (time.perf_counter() - _import_t0) * 1000
+logger.info("Server import took %.0f ms; surfaces: %s", lazy_router.startup_ms,
+            ", ".join(f"{r['name']}={r['mode']}" for r in lazy_router.report()))
+
 if __name__ == "__main__":
     uvicorn.run("backend.server:app", host="0.0.0.0", port=8000, reload=True)
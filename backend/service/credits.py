@@ -24,6 +24,8 @@ from datetime import datetime, timezone
 
 from fastapi import HTTPException
 
+from backend.utils import metrics
+
 from . import auth, db, pricing, service_mode
 
 logger = logging.getLogger(__name__)
@@ -84,6 +86,7 @@ class Charge:
         self._t0 = time.monotonic()
         self._settled = False
 
+    @metrics.timed("credits.reserve")
     async def reserve(self):
         if not self.active:
             return self
@@ -132,6 +135,7 @@ class Charge:
             self.request.state.credits_balance = balance  # → X-Credits-Balance header
         return self
 
+    @metrics.timed("credits.settle_ok")
     async def settle_ok(self, error: str | None = None):
         """Charge stands. ``error`` marks a mid-stream interruption on an
         otherwise-committed generation."""
@@ -143,6 +147,7 @@ class Charge:
             int((time.monotonic() - self._t0) * 1000), error, self.gen_id,
         )
 
+    @metrics.timed("credits.settle_refund")
     async def settle_refund(self, error: str | None = None):
         if not self.active or self._settled:
             return
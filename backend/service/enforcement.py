@@ -56,6 +56,7 @@ DISABLED_PREFIXES = (
 ADMIN_ONLY_PREFIXES = (
     "/api/generate/video",
     "/api/video/combine",
+    "/api/music/recorder",   # shared-session recordings: operator-only
 )
 
 # ── per-user rate limiting (sliding window, mirrors the per-IP limiter) ─────
@@ -67,6 +67,29 @@ CREATE TABLE IF NOT EXISTS generations (
 );
 CREATE INDEX IF NOT EXISTS generations_ts      ON generations(ts);
 CREATE INDEX IF NOT EXISTS generations_user_ts ON generations(user_id, ts);
+-- The retention janitor's orphaned-reserve scan; stays tiny since rows only
+-- sit at 'failed' between reserve and settle (or until refunded).
+CREATE INDEX IF NOT EXISTS generations_failed_ts ON generations(ts) WHERE status = 'failed';
+
+-- Daily usage rollup behind the admin dashboard (backend/service/usage.py).
+-- Folded in from generations by id; usage_rollup_state holds the single-row
+-- watermark. Survives the generations retention purge, so history outlives
+-- the per-call log.
+CREATE TABLE IF NOT EXISTS usage_daily (
+  day         DATE NOT NULL,                 -- UTC
+  action      TEXT NOT NULL,
+  model       TEXT NOT NULL DEFAULT '',      -- '' for model-less actions
+  generations INT NOT NULL DEFAULT 0,
+  credits     BIGINT NOT NULL DEFAULT 0,
+  usd_est     NUMERIC(12,4) NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, action, model)
+);
+
+CREATE TABLE IF NOT EXISTS usage_rollup_state (
+  id                 BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+  last_generation_id BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO usage_rollup_state DEFAULT VALUES ON CONFLICT DO NOTHING;
 
 CREATE TABLE IF NOT EXISTS feedback (
   id      BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
@@ -24,6 +24,8 @@ import os
 from datetime import timedelta
 from typing import Optional
 
+from backend.utils import metrics
+
 logger = logging.getLogger(__name__)
 
 _client = None
@@ -99,12 +101,14 @@ def thumb_path(user_id: int, artifact_key: str) -> str:
     return f"users/{user_id}/{artifact_key}_thumb.jpg"
 
 
+@metrics.timed("storage.put")
 def put(storage_path: str, data: bytes, mime: str) -> None:
     """Upload bytes to an already-computed path (see object_path)."""
     _client_obj, bucket = _client_and_bucket()
     bucket.blob(storage_path).upload_from_string(data, content_type=mime)
 
 
+@metrics.timed("storage.get")
 def get(storage_path: str) -> bytes:
     """Download an object's bytes. Used by the thumbnail proxy endpoint, which
     streams tiny previews through the app instead of minting a signed URL per
@@ -114,6 +118,7 @@ def get(storage_path: str) -> bytes:
     return bucket.blob(storage_path).download_as_bytes()
 
 
+@metrics.timed("storage.signed_url")
 def signed_url(storage_path: str, ttl_seconds: Optional[int] = None) -> str:
     _client_obj, bucket = _client_and_bucket()
     ttl = ttl_seconds or int(os.environ.get("SYNTH_SIGNED_URL_TTL_S", "600"))
@@ -127,6 +132,7 @@ def signed_url(storage_path: str, ttl_seconds: Optional[int] = None) -> str:
     )
 
 
+@metrics.timed("storage.delete")
 def delete(storage_path: str) -> None:
     """Idempotent: deleting an already-gone object is not an error (a retry
     after a partial failure, or the janitor racing a user's own delete, must
@@ -140,6 +146,7 @@ def delete(storage_path: str) -> None:
         pass
 
 
+@metrics.timed("storage.delete_prefix")
 def delete_prefix(prefix: str) -> int:
     """Delete every object under ``prefix``. Returns the count removed."""
     from google.api_core import exceptions as gcs_exceptions
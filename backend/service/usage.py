@@ -0,0 +1,103 @@
+"""Pre-aggregated usage — the daily rollup behind the admin dashboard.
+
+``usage_daily`` holds one row per (UTC day, action, model) with the count,
+credits and usd_est of every generations row on that day. A compactor folds
+new generations rows in by id: ``usage_rollup_state.last_generation_id`` is
+the watermark, advanced in the same transaction as the upsert, so a
+compaction is all-or-nothing and two compactors serialize on the watermark
+row instead of double counting.
+
+Reads combine the rollup with the uncompacted tail (``id > watermark``, an
+index range on the primary key), so numbers are exact while the cost stays
+bounded by "rows since the last compaction" rather than table size. The
+compactor runs hourly from the retention loop — before the purge, so rows
+are rolled up before they age out — and opportunistically on each stats
+read. ``live=True`` bypasses all of it with the original full aggregates.
+
+Rows settle (status flips) after insert but credits/usd_est are fixed at
+reserve time, and the dashboard counts every row regardless of status, so
+folding a row in at insert-time granularity never needs a correction.
+"""
+
+import logging
+from datetime import datetime, timezone
+
+from . import db
+
+logger = logging.getLogger(__name__)
+
+# Rows younger than this are left to the next pass: identity ids are handed
+# out before commit, so a just-inserted lower id may still be in flight.
+COMPACT_LAG = "1 minute"
+
+
+async def compact() -> int:
+    """Fold generations rows past the watermark into usage_daily. Returns rows folded."""
+    pool = db.pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            lo = await conn.fetchval(
+                "SELECT last_generation_id FROM usage_rollup_state FOR UPDATE")
+            lo = lo or 0
+            hi = await conn.fetchval(
+                "SELECT MAX(id) FROM generations WHERE id > $1 "
+                f"AND ts < now() - INTERVAL '{COMPACT_LAG}'", lo)
+            if hi is None:
+                return 0
+            folded = await conn.fetchval(
+                "WITH tail AS (SELECT (ts AT TIME ZONE 'utc')::date AS day, action, "
+                "COALESCE(model, '') AS model, COUNT(*) AS n, COALESCE(SUM(credits), 0) AS credits, "
+                "COALESCE(SUM(usd_est), 0) AS usd FROM generations "
+                "WHERE id > $1 AND id <= $2 GROUP BY 1, 2, 3), "
+                "up AS (INSERT INTO usage_daily (day, action, model, generations, credits, usd_est) "
+                "SELECT day, action, model, n, credits, usd FROM tail "
+                "ON CONFLICT (day, action, model) DO UPDATE SET "
+                "generations = usage_daily.generations + EXCLUDED.generations, "
+                "credits = usage_daily.credits + EXCLUDED.credits, "
+                "usd_est = usage_daily.usd_est + EXCLUDED.usd_est RETURNING 1) "
+                "SELECT COALESCE(SUM(n), 0) FROM tail", lo, hi)
+            await conn.execute(
+                "UPDATE usage_rollup_state SET last_generation_id = $1", hi)
+    return int(folded or 0)
+
+
+def _bucket(rows, day_from) -> dict:
+    out = {"generations": 0, "usd_est": 0.0, "credits": 0, "by_action": {}}
+    for r in rows:
+        if r["day"] < day_from:
+            continue
+        out["generations"] += r["n"]
+        out["credits"] += r["credits"]
+        out["usd_est"] += float(r["usd"])
+        a = out["by_action"].setdefault(r["action"], {"action": r["action"], "n": 0, "usd_est": 0.0})
+        a["n"] += r["n"]
+        a["usd_est"] += float(r["usd"])
+    return out
+
+
+async def stats() -> dict:
+    """Today / month totals and today's by-action split from rollup + tail.
+
+    Same shape as the live aggregates in routers/admin.py."""
+    try:
+        await compact()
+    except Exception:  # a failed fold only widens the tail; never fail the read
+        logger.exception("usage rollup compaction failed")
+    pool = db.pool()
+    now = datetime.now(timezone.utc)
+    today, month_start = now.date(), now.date().replace(day=1)
+    rows = [dict(r) for r in await pool.fetch(
+        "SELECT day, action, SUM(generations) AS n, SUM(credits) AS credits, "
+        "SUM(usd_est) AS usd FROM usage_daily WHERE day >= $1 GROUP BY day, action",
+        month_start)]
+    rows += [dict(r) for r in await pool.fetch(
+        "SELECT (ts AT TIME ZONE 'utc')::date AS day, action, COUNT(*) AS n, "
+        "COALESCE(SUM(credits), 0) AS credits, COALESCE(SUM(usd_est), 0) AS usd "
+        "FROM generations WHERE id > (SELECT last_generation_id FROM usage_rollup_state) "
+        "AND ts >= $1 GROUP BY 1, 2",
+        datetime(month_start.year, month_start.month, 1, tzinfo=timezone.utc))]
+    day = _bucket(rows, today)
+    month = _bucket(rows, month_start)
+    by_action = sorted(day.pop("by_action").values(), key=lambda a: a["usd_est"], reverse=True)
+    month.pop("by_action")
+    return {"today": {**day, "by_action": by_action}, "month": month}
@@ -0,0 +1,248 @@
+"""Feedback JSONL store — single-writer appends, offset indexes, monthly rollups.
+
+The write side is one dedicated writer thread fed through an executor queue:
+request handlers await the append's future instead of taking a lock, so the
+event loop never blocks behind another request's disk write, and appends stay
+strictly serialized without one.
+
+The read side never streams a whole month unless it has to. Each
+``feedback-YYYYMM.jsonl`` gets a sidecar ``feedback-YYYYMM.idx.json`` holding
+one ``[offset, length, ts, kind, user]`` row per line plus that month's
+aggregates, and the byte count it covers. Refresh is incremental: when the
+JSONL has grown past ``indexed_bytes`` only the tail is parsed; when it has
+shrunk (rewritten out of band) the month is rebuilt. Queries filter on the
+index rows and seek straight to the matching lines.
+
+"user" is the entry's ``user`` field when present, else its ``contact`` —
+local entries carry no account, and contact is the only identity they have.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+_FILE_RE = re.compile(r"^feedback-(\d{4})(\d{2})\.jsonl$")
+
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="feedback-writer")
+
+# path → month index (see _empty_index); guarded by _cache_lock
+_cache: dict = {}
+_cache_lock = threading.RLock()
+
+
+def month_path(directory: Path, when: Optional[datetime] = None) -> Path:
+    when = when or datetime.now(timezone.utc)
+    return Path(directory) / f"feedback-{when:%Y%m}.jsonl"
+
+
+# ── write side ───────────────────────────────────────────────────────────────
+
+def _append(path: Path, line: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+    try:
+        _refresh(path)  # tail-parse just this line into the in-memory index
+    except Exception as e:  # the append itself succeeded; the index heals on read
+        logger.warning("Feedback index refresh failed for %s: %s", path, e)
+
+
+async def append(path: Path, line: str) -> None:
+    """Queue one JSONL line for the writer thread and wait for it to land.
+
+    Raises whatever the write raised (OSError), so callers still report a
+    failed save."""
+    await asyncio.wrap_future(_writer.submit(_append, Path(path), line))
+
+
+# ── index ────────────────────────────────────────────────────────────────────
+
+def _sidecar(path: Path) -> Path:
+    return path.with_name(path.name[:-len(".jsonl")] + ".idx.json")
+
+
+def _empty_index(path: Path) -> dict:
+    m = _FILE_RE.match(path.name)
+    return {
+        "version": INDEX_VERSION,
+        "month": f"{m.group(1)}-{m.group(2)}" if m else None,
+        "indexed_bytes": 0,
+        "rows": [],
+        "rollup": {"total": 0, "by_kind": {}, "by_surface": {}, "by_category": {}, "by_day": {}},
+        "dirty": False,
+    }
+
+
+def _load(path: Path) -> dict:
+    side = _sidecar(path)
+    try:
+        idx = json.loads(side.read_text(encoding="utf-8"))
+        if idx.get("version") == INDEX_VERSION:
+            idx["dirty"] = False
+            return idx
+    except (OSError, ValueError):
+        pass
+    return _empty_index(path)
+
+
+def _save(path: Path, idx: dict) -> None:
+    side = _sidecar(path)
+    tmp = side.with_name(side.name + ".tmp")
+    try:
+        tmp.write_text(json.dumps({k: v for k, v in idx.items() if k != "dirty"}), encoding="utf-8")
+        tmp.replace(side)
+        idx["dirty"] = False
+    except OSError as e:
+        logger.warning("Could not persist feedback index %s: %s", side, e)
+
+
+def _bump(counter: dict, key) -> None:
+    if key:
+        counter[key] = counter.get(key, 0) + 1
+
+
+def _ingest(idx: dict, offset: int, raw: bytes) -> None:
+    try:
+        entry = json.loads(raw)
+    except ValueError:
+        return  # a torn or hand-mangled line; skipped, like any reader would
+    if not isinstance(entry, dict):
+        return
+    ts = entry.get("ts") or ""
+    kind = entry.get("kind") or "general"
+    user = entry.get("user") or entry.get("contact")
+    idx["rows"].append([offset, len(raw), ts, kind, user])
+    roll = idx["rollup"]
+    roll["total"] += 1
+    _bump(roll["by_kind"], kind)
+    _bump(roll["by_surface"], entry.get("surface"))
+    for cat in entry.get("categories") or []:
+        _bump(roll["by_category"], cat)
+    _bump(roll["by_day"], ts[:10])
+
+
+def _refresh(path: Path) -> dict:
+    """Bring the month's index up to the file's current size. Returns it."""
+    with _cache_lock:
+        idx = _cache.get(path)
+        if idx is None:
+            idx = _cache[path] = _load(path)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            _cache.pop(path, None)
+            return _empty_index(path)
+        if size < idx["indexed_bytes"]:  # rewritten/truncated out of band
+            idx = _cache[path] = _empty_index(path)
+        if size == idx["indexed_bytes"]:
+            return idx
+        with open(path, "rb") as f:
+            f.seek(idx["indexed_bytes"])
+            offset = idx["indexed_bytes"]
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # a line still being written; picked up next time
+                _ingest(idx, offset, raw.rstrip(b"\r\n"))
+                offset += len(raw)
+        idx["indexed_bytes"] = offset
+        idx["dirty"] = True
+        return idx
+
+
+def _month_files(directory: Path) -> list:
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    return sorted(p for p in directory.iterdir() if _FILE_RE.match(p.name))
+
+
+def _month_of(path: Path) -> str:
+    """``YYYY-MM`` of a month file, from its name."""
+    m = _FILE_RE.match(path.name)
+    return f"{m.group(1)}-{m.group(2)}"
+
+
+def _persist_dirty() -> None:
+    with _cache_lock:
+        for path, idx in list(_cache.items()):
+            if idx.get("dirty"):
+                _save(path, idx)
+
+
+# ── read side ────────────────────────────────────────────────────────────────
+
+def _norm_ts(value: Optional[str]) -> Optional[str]:
+    """ISO date/datetime → the store's ts format, so comparisons are string-safe."""
+    if not value:
+        return None
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def query(directory: Path, since: Optional[str] = None, until: Optional[str] = None,
+          kind: Optional[str] = None, user: Optional[str] = None,
+          limit: int = 100, offset: int = 0) -> dict:
+    """Entries matching every given filter, newest first.
+
+    ``since`` is inclusive, ``until`` exclusive (ISO dates or datetimes, UTC
+    if naive). Only matching lines are read from disk. Raises ValueError on
+    an unparseable timestamp."""
+    lo, hi = _norm_ts(since), _norm_ts(until)
+    matches = []
+    for path in _month_files(directory):
+        month = _month_of(path)
+        if hi and f"{month}-01T00:00:00+00:00" >= hi or lo and month < lo[:7]:
+            continue  # the whole month is outside the range; don't even index it
+        idx = _refresh(path)
+        for row in idx["rows"]:
+            _, _, ts, row_kind, row_user = row
+            if lo and ts < lo or hi and ts >= hi:
+                continue
+            if kind and row_kind != kind or user and row_user != user:
+                continue
+            matches.append((ts, path, row))
+    _persist_dirty()
+    matches.sort(key=lambda m: (m[0], m[2][0]), reverse=True)
+    page = matches[offset:offset + limit] if limit is not None else matches[offset:]
+    entries = []
+    by_file: dict = {}
+    for _, path, row in page:
+        by_file.setdefault(path, []).append(row)
+    loaded = {}
+    for path, rows in by_file.items():
+        with open(path, "rb") as f:
+            for row in rows:
+                f.seek(row[0])
+                loaded[(path, row[0])] = json.loads(f.read(row[1]))
+    for _, path, row in page:
+        entries.append(loaded[(path, row[0])])
+    return {"total": len(matches), "entries": entries}
+
+
+def rollups(directory: Path, since_month: Optional[str] = None,
+            until_month: Optional[str] = None) -> list:
+    """Precomputed per-month aggregates (``YYYY-MM`` bounds, both inclusive).
+
+    Months outside the bounds are skipped by file name, before any refresh."""
+    out = []
+    for path in _month_files(directory):
+        month = _month_of(path)
+        if since_month and month < since_month or until_month and month > until_month:
+            continue
+        idx = _refresh(path)
+        out.append({"month": month, **copy.deepcopy(idx["rollup"])})
+    _persist_dirty()
+    return out
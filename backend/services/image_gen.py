@@ -1,16 +1,16 @@
-import base64
 import logging
 from typing import Optional, List, Dict, Any
 from backend import config
 from backend import google_api
 from backend.helpers import SafetyBlockedError
-from backend.utils.retry import retry_on_transient
+from backend.utils.image_payload import ImageLike, ImagePayload
+from backend.utils.retry import RetryPolicy, retrying
 from google.genai import types
 
 logger = logging.getLogger(__name__)
 
 def generate_image(self, prompt: str, model_name: str = None, aspect_ratio: str = "1:1",
-                   negative_prompt: str = None, input_images: Optional[List[bytes]] = None,
+                   negative_prompt: str = None, input_images: Optional[List[ImageLike]] = None,
                    response_modalities: Optional[List[str]] = None,
                    thinking_level: Optional[str] = None,
                    include_thoughts: bool = False,
@@ -20,14 +20,21 @@ def generate_image(self, prompt: str, model_name: str = None, aspect_ratio: str
                    image_count: int = 1,
                    add_watermark: bool = True,
                    use_google_search: bool = False,
-                   tags: list = None):
-    """Generate image using Imagen 3 or Gemini."""
+                   tags: list = None,
+                   as_payload: bool = False):
+    """Generate image using Imagen 3 or Gemini.
+
+    ``input_images`` may be raw bytes or ``ImagePayload``s (a client's base64
+    is then forwarded without a decode/encode round trip). Images come back
+    as base64 strings, or as ``ImagePayload``s with ``as_payload=True`` so the
+    caller encodes once — or not at all for a binary response.
+    """
     if not self.genai_client:
         raise ValueError("API Key not configured")
 
     try:
         # Consolidate reference images so Gemini paths can consume multiple inputs
-        reference_images: List[bytes] = []
+        reference_images: List[ImageLike] = []
         if input_images:
             reference_images.extend(input_images)
 
@@ -37,7 +44,7 @@ def generate_image(self, prompt: str, model_name: str = None, aspect_ratio: str
                 response_modalities, thinking_level, include_thoughts,
                 media_resolution, person_generation, safety_settings,
                 image_count, add_watermark, use_google_search,
-                tags=tags
+                tags=tags, as_payload=as_payload
             )
         else:
             # Use Imagen 3 — natively supports number_of_images, add_watermark,
@@ -48,15 +55,18 @@ def generate_image(self, prompt: str, model_name: str = None, aspect_ratio: str
                 add_watermark=add_watermark,
                 person_generation=person_generation,
                 tags=tags,
+                as_payload=as_payload,
             )
     except SafetyBlockedError:
         raise  # keep the type — routers emit a structured 422 for these
     except Exception as e:
         raise Exception(f"Image generation failed: {str(e)}")
 
-@retry_on_transient(max_attempts=3, backoff_base=5.0)
+# Budget keyed per model: a 429 storm on one image model doesn't stop retries on another.
+@retrying(RetryPolicy(max_attempts=3, base=5.0, cap=30.0),
+          key=lambda self, prompt, model_name, *a, **k: model_name)
 def _generate_image_gemini(self, prompt: str, model_name: str, aspect_ratio: str,
-                           reference_images: Optional[List[bytes]] = None,
+                           reference_images: Optional[List[ImageLike]] = None,
                            response_modalities: Optional[List[str]] = None,
                            thinking_level: Optional[str] = None,
                            include_thoughts: bool = False,
@@ -66,11 +76,13 @@ def _generate_image_gemini(self, prompt: str, model_name: str, aspect_ratio: str
                            image_count: int = 1,
                            add_watermark: bool = True,
                            use_google_search: bool = False,
-                           tags: list = None):
+                           tags: list = None,
+                           as_payload: bool = False):
     """Generate an image via Gemini (google_api dispatch: Interactions or legacy).
 
     Returns either a base64 string or a dict with 'image' and 'text' keys
-    (when the model returns both modalities). Signature keeps the full set of
+    (when the model returns both modalities); ``ImagePayload`` in place of
+    the base64 string with ``as_payload=True``. Signature keeps the full set of
     public API parameters; ones without an Interactions equivalent
     (image_count>1) are dropped there with a warning, and
     `person_generation` / `add_watermark` remain Imagen-only as before.
@@ -106,8 +118,8 @@ def _generate_image_gemini(self, prompt: str, model_name: str, aspect_ratio: str
 
     blocks = []
     if reference_images:
-        for image_bytes in reference_images:
-            blocks.append(google_api.image_block(image_bytes))
+        for image in reference_images:
+            blocks.append(google_api.image_block(image))
     blocks.append(google_api.text_block(prompt))
 
     image_bytes, _mime, text_out = google_api.gen_image(
@@ -131,13 +143,15 @@ def _generate_image_gemini(self, prompt: str, model_name: str, aspect_ratio: str
 
     final_bytes = self.embed_metadata(image_bytes, prompt, tags=tags)
     self.save_output(final_bytes, f"img_{model_name}")
-    image_b64 = base64.b64encode(final_bytes).decode("utf-8")
+    image = ImagePayload.from_bytes(final_bytes)
+    if not as_payload:
+        image = image.b64
 
     # Preserve historical contract: bare base64 string when there's no text,
     # dict when the model returned both modalities.
     if text_out:
-        return {"image": image_b64, "text": text_out}
-    return image_b64
+        return {"image": image, "text": text_out}
+    return image
 
 def _generate_image_imagen(
     self,
@@ -149,6 +163,7 @@ def _generate_image_imagen(
     add_watermark: bool = True,
     person_generation: Optional[str] = None,
     tags: list = None,
+    as_payload: bool = False,
 ):
     """Helper for Imagen 3 generation.
 
@@ -195,11 +210,12 @@ def _generate_image_imagen(
     # When the caller asked for one image, preserve the original string
     # return contract. For multi-image requests, return a list so callers
     # can opt into the new shape without breaking existing single-image flows.
-    encoded: List[str] = []
+    encoded: List[Any] = []
     for image in response.generated_images:
         final_bytes = self.embed_metadata(image.image_bytes, prompt, tags=tags)
         self.save_output(final_bytes, f"img_{model_name}")
-        encoded.append(base64.b64encode(final_bytes).decode("utf-8"))
+        payload = ImagePayload.from_bytes(final_bytes)
+        encoded.append(payload if as_payload else payload.b64)
 
     if len(encoded) == 1:
         return encoded[0]
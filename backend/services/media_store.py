@@ -0,0 +1,122 @@
+"""Short-lived spool for generated media served by reference.
+
+``POST /api/generate/{image,video}`` with ``response_mode: "ref"`` stores
+each output here and answers with a small JSON of ``/api/media/<token>``
+URLs instead of inline base64; the client then streams the bytes with a
+plain GET (``<img src>`` / ``<video src>`` work directly, Range included).
+
+Entries are files in one temp directory, keyed by an unguessable token and
+bound to the requesting user in service mode. They expire after
+``SYNTH_MEDIA_REF_TTL_S`` (default 15 min); past ``SYNTH_MEDIA_REF_MAX_MB``
+(default 512) in total, the oldest go first. Nothing survives a restart —
+the durable copy is still ``save_output`` / My creations.
+
+Single-process only: a token resolves only in the process that spooled it.
+Hosted deployments (several Cloud Run instances, Vercel, multiple uvicorn
+workers) can't guarantee the GET lands there, so the router refuses "ref"
+when ``is_hosted()``; a self-hosted server run with several workers should
+use "json" or "multipart" too.
+"""
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+TTL_S = float(os.environ.get("SYNTH_MEDIA_REF_TTL_S", "900"))
+MAX_BYTES = int(float(os.environ.get("SYNTH_MEDIA_REF_MAX_MB", "512")) * 1024 * 1024)
+
+_EXT = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp",
+        "image/gif": ".gif", "video/mp4": ".mp4"}
+
+
+@dataclass
+class Entry:
+    path: Path
+    mime: str
+    size: int
+    owner: Optional[int]
+    expires: float
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, Entry]" = OrderedDict()  # insertion order = age
+_total = 0
+_dir: Optional[Path] = None
+
+
+def _spool_dir() -> Path:
+    global _dir
+    if _dir is None:
+        _dir = Path(tempfile.mkdtemp(prefix="synth-media-"))
+    _dir.mkdir(parents=True, exist_ok=True)  # tmp cleaners may remove it under us
+    return _dir
+
+
+def _drop(token: str) -> None:
+    """Forget ``token`` and unlink its file. Caller holds ``_lock``."""
+    global _total
+    entry = _entries.pop(token, None)
+    if entry is None:
+        return
+    _total -= entry.size
+    try:
+        entry.path.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning("media spool: could not remove %s: %s", entry.path, e)
+
+
+def _evict(now: float, incoming: int) -> None:
+    """Expired entries, then oldest until ``incoming`` fits. Caller holds ``_lock``."""
+    for token in [t for t, e in _entries.items() if e.expires <= now]:
+        _drop(token)
+    while _entries and _total + incoming > MAX_BYTES:
+        _drop(next(iter(_entries)))
+
+
+def put(data: bytes, mime: str, owner: Optional[int] = None) -> str:
+    """Spool ``data`` and return its token. Blocking (disk write): call off-loop."""
+    global _total
+    token = secrets.token_urlsafe(18)
+    path = _spool_dir() / f"{token}{_EXT.get(mime, '.bin')}"
+    path.write_bytes(data)
+    now = time.time()
+    with _lock:
+        _evict(now, len(data))
+        _entries[token] = Entry(path, mime, len(data), owner, now + TTL_S)
+        _total += len(data)
+    return token
+
+
+def get(token: str, owner: Optional[int] = None) -> Optional[Entry]:
+    """The live entry for ``token``, or None (unknown, expired, or someone else's)."""
+    with _lock:
+        entry = _entries.get(token)
+        if entry is None:
+            return None
+        if entry.expires <= time.time():
+            _drop(token)
+            return None
+        if entry.owner is not None and entry.owner != owner:
+            return None
+        return entry
+
+
+def stats() -> dict:
+    with _lock:
+        return {"entries": len(_entries), "bytes": _total, "max_bytes": MAX_BYTES}
+
+
+def clear() -> None:
+    with _lock:
+        for token in list(_entries):
+            _drop(token)
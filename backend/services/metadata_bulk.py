@@ -0,0 +1,93 @@
+"""Bulk metadata extraction off the event loop.
+
+``/api/extract-metadata/bulk`` used to decode and parse every image inline in
+the async handler — a dropped folder froze every other request for the whole
+batch, on one core. ``iter_extract_metadata`` fans the work (base64 decode
+included) out to a small process pool and yields one row per image as it
+finishes. Batches below ``config.METADATA_POOL_MIN_BATCH`` use the default
+thread pool instead: shipping a handful of images to another process costs
+more than parsing their chunk headers.
+
+The pool is created on first use with the ``spawn`` start method (forking a
+process that runs an event loop and DB connections is not safe) and closed
+from the app's shutdown hook. If it can't be started or breaks, extraction
+falls back to threads.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from backend import config
+from backend.utils.image_utils import extract_metadata_entry
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_pool_failed = False
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool, _pool_failed
+    if _pool_failed or config.METADATA_POOL_WORKERS < 2:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            try:
+                _pool = ProcessPoolExecutor(max_workers=config.METADATA_POOL_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, NotImplementedError) as e:
+                logger.warning("Metadata process pool unavailable, using threads: %s", e)
+                _pool_failed = True
+        return _pool
+
+
+def shutdown() -> None:
+    """Stop the worker processes (app shutdown)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _mark_broken() -> None:
+    global _pool_failed
+    logger.warning("Metadata process pool broke; falling back to threads")
+    _pool_failed = True
+    shutdown()
+
+
+async def iter_extract_metadata(images: list):
+    """Yield ``{"index", "status", ...}`` rows in completion order."""
+    loop = asyncio.get_running_loop()
+    pool = _get_pool() if len(images) >= config.METADATA_POOL_MIN_BATCH else None
+
+    def submit(i, img):
+        return loop.run_in_executor(pool, extract_metadata_entry, i, img)
+
+    futures = [submit(i, img) for i, img in enumerate(images)]
+    seen = set()
+    try:
+        for next_done in asyncio.as_completed(futures):
+            try:
+                row = await next_done
+            except BrokenProcessPool:
+                break
+            seen.add(row["index"])
+            yield row
+        else:
+            return
+        # The pool died mid-batch: re-run whatever it still owed, on threads.
+        _mark_broken()
+        pool = None
+        futures = [submit(i, img) for i, img in enumerate(images) if i not in seen]
+        for next_done in asyncio.as_completed(futures):
+            yield await next_done
+    finally:
+        for f in futures:  # client went away: drop work that hasn't started
+            f.cancel()
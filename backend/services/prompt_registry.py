@@ -0,0 +1,132 @@
+"""System-prompt registry for the template-generation modes.
+
+Each mode's system prompt is registered once at import time:
+
+- ``register(mode, text)`` — a fully static prompt, kept verbatim.
+- ``register_template(mode, fmt)`` — a prompt with a few per-request slots in
+  ``str.format`` syntax (``{{`` / ``}}`` for literal braces). It is parsed
+  once into literal segments + slot names, so a request only joins strings
+  instead of re-formatting the whole prompt.
+
+Every prompt carries ``version`` — a short hash of its mode and text. It is
+stable across processes and changes whenever the wording does, so it works
+as a cache key (or a log field) for anything derived from a prompt's output.
+
+``sizes()`` reports static size, a rough token estimate and render counts
+per mode; ``python -m backend.services.prompt_registry`` prints it as a table.
+"""
+import hashlib
+import string
+import threading
+from typing import Optional
+
+# Rough chars-per-token for English prose + JSON; good enough to compare modes.
+CHARS_PER_TOKEN = 4
+
+_registry: dict[str, "PromptSpec"] = {}
+_lock = threading.Lock()
+
+
+def estimate_tokens(text_or_chars) -> int:
+    chars = text_or_chars if isinstance(text_or_chars, int) else len(text_or_chars)
+    return -(-chars // CHARS_PER_TOKEN)
+
+
+class PromptSpec:
+    """One mode's system prompt: static segments, slot names, version hash."""
+
+    def __init__(self, mode: str, source: str, slotted: bool):
+        self.mode = mode
+        self.source = source
+        self.version = hashlib.sha256(f"{mode}\0{source}".encode("utf-8")).hexdigest()[:12]
+        segments: list = []
+        if slotted:
+            for literal, field, spec, conversion in string.Formatter().parse(source):
+                if literal:
+                    segments.append(literal)
+                if field is None:
+                    continue
+                if spec or conversion or not field.isidentifier():
+                    raise ValueError(f"{mode}: only plain {{name}} slots are supported, got {field!r}")
+                segments.append((field,))
+        else:
+            segments.append(source)
+        self._segments = tuple(segments)
+        self.slots = tuple(dict.fromkeys(s[0] for s in segments if isinstance(s, tuple)))
+        self.static_chars = sum(len(s) for s in segments if isinstance(s, str))
+        self._text: Optional[str] = "".join(segments) if not self.slots else None
+        # usage — plain counters; a lost increment under a race is harmless
+        self.renders = 0
+        self.rendered_chars = 0
+
+    @property
+    def text(self) -> str:
+        """The prompt of a slot-free mode."""
+        if self._text is None:
+            raise TypeError(f"{self.mode} has slots {self.slots}; use render()")
+        self.renders += 1
+        self.rendered_chars += len(self._text)
+        return self._text
+
+    def render(self, **values) -> str:
+        """Fill the slots. Missing slots raise KeyError; extras are ignored."""
+        if self._text is not None:
+            return self.text
+        out = "".join(s if isinstance(s, str) else str(values[s[0]]) for s in self._segments)
+        self.renders += 1
+        self.rendered_chars += len(out)
+        return out
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "version": self.version,
+            "slots": list(self.slots),
+            "static_chars": self.static_chars,
+            "static_tokens_est": estimate_tokens(self.static_chars),
+            "renders": self.renders,
+            "avg_rendered_tokens_est": (
+                estimate_tokens(self.rendered_chars // self.renders) if self.renders else None),
+        }
+
+
+def _add(spec: PromptSpec) -> PromptSpec:
+    with _lock:
+        existing = _registry.get(spec.mode)
+        if existing is not None and existing.version != spec.version:
+            raise ValueError(f"Prompt mode {spec.mode!r} registered twice with different text")
+        _registry[spec.mode] = spec
+    return spec
+
+
+def register(mode: str, text: str) -> PromptSpec:
+    return _add(PromptSpec(mode, text, slotted=False))
+
+
+def register_template(mode: str, fmt: str) -> PromptSpec:
+    return _add(PromptSpec(mode, fmt, slotted=True))
+
+
+def get(mode: str) -> PromptSpec:
+    return _registry[mode]
+
+
+def versions() -> dict:
+    return {mode: spec.version for mode, spec in sorted(_registry.items())}
+
+
+def sizes() -> list:
+    """Per-mode size/usage rows, largest static prompt first."""
+    return sorted((s.stats() for s in _registry.values()),
+                  key=lambda r: r["static_chars"], reverse=True)
+
+
+if __name__ == "__main__":
+    # Run as a script this file is __main__, not the module the engine
+    # registers into — so report from the imported one.
+    from backend.services import prompt_registry, template_engine  # noqa: F401
+
+    print(f"{'mode':<36} {'version':<12} {'chars':>7} {'~tokens':>8}  slots")
+    for row in prompt_registry.sizes():
+        print(f"{row['mode']:<36} {row['version']:<12} {row['static_chars']:>7} "
+              f"{row['static_tokens_est']:>8}  {', '.join(row['slots'])}")
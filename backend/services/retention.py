@@ -32,13 +32,18 @@ def retention_days() -> int:
 
 
 def _purge_dir(root: Path, cutoff_ts: float) -> int:
-    """Delete files under root older than cutoff. Returns count removed."""
+    """Delete files under root older than cutoff. Returns count removed.
+
+    Dot-directories (e.g. the outputs sidecar index under JSON/.index/) are
+    internal state, not visitor artifacts, and are left alone."""
     if not root.exists():
         return 0
     removed = 0
     for path in root.rglob("*"):
         if not path.is_file():
             continue
+        if any(part.startswith(".") for part in path.relative_to(root).parts[:-1]):
+            continue
         try:
             if path.stat().st_mtime < cutoff_ts:
                 path.unlink()
@@ -69,6 +74,43 @@ def purge_old_outputs(days: int = None) -> dict:
     return summary
 
 
+# Orphaned reserves are refunded set-based, one statement per batch: flip the
+# generations rows, credit each user once by their aggregate, and write one
+# ledger row per generation with a running balance_after so the ledger-sum
+# invariant holds row by row. The flip is the idempotency guard — a row only
+# refunds while it is still 'failed' — and SKIP LOCKED means a concurrent
+# janitor or a live settle holding a row is stepped over, never waited on.
+ORPHAN_REFUND_BATCH = 500
+
+_REFUND_ORPHANS_SQL = """
+WITH orphans AS (
+    UPDATE generations SET status = 'refunded', error = 'orphaned_reserve'
+    WHERE id IN (
+        SELECT id FROM generations
+        WHERE status = 'failed' AND credits > 0 AND user_id IS NOT NULL
+          AND ts < now() - INTERVAL '15 minutes'
+        ORDER BY id LIMIT $1
+        FOR UPDATE SKIP LOCKED)
+    RETURNING id, user_id, credits
+), totals AS (
+    SELECT user_id, SUM(credits) AS credits FROM orphans GROUP BY user_id
+), credited AS (
+    UPDATE users u SET credits_balance = u.credits_balance + t.credits
+    FROM totals t WHERE u.id = t.user_id
+    RETURNING u.id, u.credits_balance, t.credits AS total
+), ledger AS (
+    INSERT INTO credit_ledger (user_id, delta, reason, balance_after, generation_id, note)
+    SELECT o.user_id, o.credits, 'refund',
+           c.credits_balance - c.total
+               + SUM(o.credits) OVER (PARTITION BY o.user_id ORDER BY o.id),
+           o.id, 'orphaned reserve auto-refund'
+    FROM orphans o JOIN credited c ON c.id = o.user_id
+    RETURNING 1
+)
+SELECT COUNT(*) FROM orphans
+"""
+
+
 async def purge_service_db() -> dict:
     """Service-mode database housekeeping (no-op otherwise):
 
@@ -78,7 +120,9 @@ async def purge_service_db() -> dict:
     - feedback older than 90 days is deleted,
     - orphaned reserves (a crash between reserve and settle leaves an old
       'failed' row whose charge was never refunded) are refunded after 15
-      minutes — keeps the ledger-sum invariant honest,
+      minutes — keeps the ledger-sum invariant honest. Set-based, in batches
+      of ORPHAN_REFUND_BATCH, so a post-outage backlog costs a handful of
+      statements rather than three round-trips per row,
     - storage orphans: a DSAR delete's GCS purge step logs and continues
       rather than blocking account deletion on a transient failure, so a
       users/{id}/ prefix can occasionally outlive its user row — swept here.
@@ -101,26 +145,12 @@ async def purge_service_db() -> dict:
         "WHERE ts < now() - INTERVAL '90 days' RETURNING 1) "
         "SELECT COUNT(*) FROM gone")
 
-    orphans = await pool.fetch(
-        "SELECT id, user_id, credits FROM generations "
-        "WHERE status = 'failed' AND credits > 0 AND user_id IS NOT NULL "
-        "AND ts < now() - INTERVAL '15 minutes'")
     refunded = 0
-    for row in orphans:
-        balance = await pool.fetchval(
-            "UPDATE users SET credits_balance = credits_balance + $1 "
-            "WHERE id = $2 RETURNING credits_balance",
-            row["credits"], row["user_id"])
-        if balance is None:
-            continue  # user deleted since
-        await pool.execute(
-            "INSERT INTO credit_ledger (user_id, delta, reason, balance_after, generation_id, note) "
-            "VALUES ($1, $2, 'refund', $3, $4, 'orphaned reserve auto-refund')",
-            row["user_id"], row["credits"], balance, row["id"])
-        await pool.execute(
-            "UPDATE generations SET status = 'refunded', error = 'orphaned_reserve' WHERE id = $1",
-            row["id"])
-        refunded += 1
+    while True:
+        n = await pool.fetchval(_REFUND_ORPHANS_SQL, ORPHAN_REFUND_BATCH)
+        refunded += n or 0
+        if not n or n < ORPHAN_REFUND_BATCH:
+            break
     summary["orphan_refunds"] = refunded
 
     from backend.service import storage
@@ -159,6 +189,13 @@ async def retention_loop():
             purge_old_outputs()
         except Exception as e:  # never let housekeeping kill the server
             logger.error("Retention purge failed: %s", e)
+        try:
+            from backend.service import service_mode
+            if service_mode():  # fold usage into the rollup before rows age out
+                from backend.service import usage
+                await usage.compact()
+        except Exception as e:
+            logger.error("Usage rollup compaction failed: %s", e)
         try:
             await purge_service_db()
         except Exception as e:
@@ -15,6 +15,7 @@ from typing import Optional, List, Dict, Any, Union
 from backend import config
 from backend import google_api
 from backend.helpers import SafetyBlockedError
+from backend.services import prompt_registry
 from backend.utils.retry import retry_on_transient
 from PIL import Image
 from PIL.PngImagePlugin import PngInfo
@@ -70,13 +71,7 @@ def normalize_template(template: dict) -> dict:
 
     return normalized
 
-def generate_template(self, user_prompt: str, model_override: str = None) -> str:
-    """
-    Generates a Synthograsizer JSON template based on user prompt.
-    """
-    model = model_override or config.MODEL_TEMPLATE_GEN
-    
-    system_prompt = """
+_GENERATE_TEMPLATE_PROMPT = prompt_registry.register("generate_template", """
 You are a template generator for PromptCraft Sequencer — a VST/synthesizer-inspired real-time prompt engineering tool. Templates are loaded into a 16-step sequencer where each variable can be programmed per-step, creating evolving AI image/video generation prompts. The output uses SD/Comfy-style (term:weight) syntax.
 
 ## INTERPRETING THE REQUEST
@@ -142,7 +137,15 @@ CORRECT:
 
 WRONG (parallel arrays — NEVER use this):
   "values": ["cinematic", "noir"], "weights": [3, 2]
-"""
+""")
+
+def generate_template(self, user_prompt: str, model_override: str = None) -> str:
+    """
+    Generates a Synthograsizer JSON template based on user prompt.
+    """
+    model = model_override or config.MODEL_TEMPLATE_GEN
+    
+    system_prompt = _GENERATE_TEMPLATE_PROMPT.text
     
     try:
          return self.llm_text(
@@ -155,13 +158,7 @@ WRONG (parallel arrays — NEVER use this):
     except Exception as e:
         raise Exception(f"Template generation failed: {e}")
 
-def generate_template_from_analysis(self, analysis_text: str, model_override: str = None) -> str:
-    """
-    Generates a Synthograsizer JSON template based on an image analysis description.
-    """
-    model = model_override or config.MODEL_TEMPLATE_GEN
-    
-    system_prompt = """
+_TEMPLATE_FROM_ANALYSIS_PROMPT = prompt_registry.register("generate_template_from_analysis", """
 You are a template generator for PromptCraft Sequencer — a 16-step prompt sequencer for AI image/video generation. Your task is to convert image analysis into a sequencer-ready template.
 
 ## GOAL
@@ -209,7 +206,15 @@ Each entry in "values" is: {"text": "the value string", "weight": N}
 - Values are used in a 16-step sequencer — 8-12 values per variable allows interesting patterns
 - Adjacent values should create smooth or dramatically interesting visual transitions
 - Include 1-2 "neutral" values per variable that work well as locked constants
-"""
+""")
+
+def generate_template_from_analysis(self, analysis_text: str, model_override: str = None) -> str:
+    """
+    Generates a Synthograsizer JSON template based on an image analysis description.
+    """
+    model = model_override or config.MODEL_TEMPLATE_GEN
+    
+    system_prompt = _TEMPLATE_FROM_ANALYSIS_PROMPT.text
 
     try:
          return self.llm_text(
@@ -222,21 +227,7 @@ Each entry in "values" is: {"text": "the value string", "weight": N}
     except Exception as e:
         raise Exception(f"Template generation failed: {e}")
 
-def generate_template_hybrid(self, image_bytes: bytes, direction: str, model_override: str = None) -> str:
-    """
-    Generate a template from an image's aesthetic + user's structural direction.
-    The image defines the style baseline; the text defines the variable structure.
-    """
-    if not self.genai_client:
-        raise ValueError("API Key not configured")
-
-    # Step 1: Analyze image for aesthetic/style
-    analysis = self.analyze_image_to_prompt(image_bytes)
-
-    # Step 2: Generate template using both analysis + direction
-    model = model_override or config.MODEL_TEMPLATE_GEN
-
-    system_prompt = """You are a template generator for PromptCraft Sequencer — a VST-inspired 16-step prompt sequencer for AI image/video generation.
+_TEMPLATE_HYBRID_PROMPT = prompt_registry.register("generate_template_hybrid", """You are a template generator for PromptCraft Sequencer — a VST-inspired 16-step prompt sequencer for AI image/video generation.
 You are working in HYBRID mode: you have been given an IMAGE ANALYSIS (describing an image's visual style and aesthetic) and a USER DIRECTION (describing what kind of template structure and variables the user wants).
 
 ## YOUR TASK
@@ -277,7 +268,23 @@ Each entry in "values" is: {"text": "the value string", "weight": N}
 5. **feature_name**: SHORT Title Case label (1-3 words) for the compact sidebar UI.
 6. **Aesthetic Integration**: The promptTemplate MUST embed the image's core aesthetic as fixed text, NOT as a variable.
 7. **Sequencer-friendly**: Values should create smooth transitions when stepped through. Include 1-2 neutral/lockable values per variable.
-"""
+""")
+
+def generate_template_hybrid(self, image_bytes: bytes, direction: str, model_override: str = None) -> str:
+    """
+    Generate a template from an image's aesthetic + user's structural direction.
+    The image defines the style baseline; the text defines the variable structure.
+    """
+    if not self.genai_client:
+        raise ValueError("API Key not configured")
+
+    # Step 1: Analyze image for aesthetic/style
+    analysis = self.analyze_image_to_prompt(image_bytes)
+
+    # Step 2: Generate template using both analysis + direction
+    model = model_override or config.MODEL_TEMPLATE_GEN
+
+    system_prompt = _TEMPLATE_HYBRID_PROMPT.text
 
     try:
         # Image analysis above used Google (multimodal); this final step is
@@ -292,28 +299,7 @@ Each entry in "values" is: {"text": "the value string", "weight": N}
     except Exception as e:
         raise Exception(f"Hybrid template generation failed: {e}")
 
-def generate_template_from_images(self, images_list: list, direction: str = None, model_override: str = None) -> str:
-    """
-    Extract a common aesthetic pattern from multiple images and generate a template.
-    Shared traits become fixed text; differences become variables.
-    Optional direction text lets the user steer variable structure and template focus.
-    """
-    if not self.genai_client:
-        raise ValueError("API Key not configured")
-
-    # Step 1: Analyze each image
-    analyses = []
-    for i, img_bytes in enumerate(images_list):
-        try:
-            analysis = self.analyze_image_to_prompt(img_bytes)
-            analyses.append(analysis)
-        except Exception as e:
-            analyses.append(f"(Analysis failed for image {i+1}: {str(e)})")
-
-    # Step 2: Feed all analyses to template generator
-    model = model_override or config.MODEL_TEMPLATE_GEN
-
-    system_prompt = """You are a template generator for PromptCraft Sequencer — a VST-inspired 16-step prompt sequencer for AI image/video generation.
+_TEMPLATE_FROM_IMAGES_PROMPT = prompt_registry.register("generate_template_from_images", """You are a template generator for PromptCraft Sequencer — a VST-inspired 16-step prompt sequencer for AI image/video generation.
 You are working in MULTI-IMAGE PATTERN EXTRACTION mode. You have been given analyses of MULTIPLE images. Your task is to identify what is COMMON across all images (the shared aesthetic) and what VARIES between them (the template variables).
 
 ## YOUR TASK
@@ -357,7 +343,30 @@ Each entry in "values" is: {"text": "the value string", "weight": N}
 5. **feature_name**: SHORT Title Case label (1-3 words) for the compact sidebar UI.
 6. **If images have NO clear commonality**: Focus on most frequently shared traits.
 7. **Sequencer-friendly**: Include 1-2 neutral/lockable values per variable. Adjacent values should create interesting transitions.
-"""
+""")
+
+def generate_template_from_images(self, images_list: list, direction: str = None, model_override: str = None) -> str:
+    """
+    Extract a common aesthetic pattern from multiple images and generate a template.
+    Shared traits become fixed text; differences become variables.
+    Optional direction text lets the user steer variable structure and template focus.
+    """
+    if not self.genai_client:
+        raise ValueError("API Key not configured")
+
+    # Step 1: Analyze each image
+    analyses = []
+    for i, img_bytes in enumerate(images_list):
+        try:
+            analysis = self.analyze_image_to_prompt(img_bytes)
+            analyses.append(analysis)
+        except Exception as e:
+            analyses.append(f"(Analysis failed for image {i+1}: {str(e)})")
+
+    # Step 2: Feed all analyses to template generator
+    model = model_override or config.MODEL_TEMPLATE_GEN
+
+    system_prompt = _TEMPLATE_FROM_IMAGES_PROMPT.text
 
     combined = "\n\n".join([f"IMAGE {i+1} ANALYSIS:\n{a}" for i, a in enumerate(analyses)])
 
@@ -378,14 +387,7 @@ Each entry in "values" is: {"text": "the value string", "weight": N}
     except Exception as e:
         raise Exception(f"Multi-image template generation failed: {e}")
 
-def remix_template(self, current_template: dict, instruction: str, reference_images: list = None, model_override: str = None) -> str:
-    """
-    Evolve an existing template based on user instructions.
-    Preserves elements the user doesn't explicitly ask to change.
-    """
-    model = model_override or config.MODEL_TEMPLATE_GEN
-
-    system_prompt = """You are a template editor for PromptCraft Sequencer — a VST-inspired 16-step prompt sequencer for AI image/video generation.
+_REMIX_TEMPLATE_PROMPT = prompt_registry.register("remix_template", """You are a template editor for PromptCraft Sequencer — a VST-inspired 16-step prompt sequencer for AI image/video generation.
 You are working in REMIX mode. You have been given an EXISTING template (JSON) and USER INSTRUCTIONS for how to modify it.
 
 ## YOUR TASK
@@ -433,7 +435,16 @@ Each entry in "values" is: {"text": "the value string", "weight": N}
 7. **Incoming template format**: The input template may use either the old parallel-array format or the new nested format. Always OUTPUT the new nested format regardless of input format.
 8. **Sequencer-friendly**: When adding new variables, include 8-12 values with smooth transitions. Include 1-2 neutral/lockable values.
 9. **Reference Images**: If reference images are attached, the user's instructions will explain their purpose (e.g., character reference, aesthetic palette, current vs. desired output). Use the images as visual context for your modifications — extract colors, styles, compositions, or character traits as directed by the instruction text. Do not describe the images in the output unless the user asks for it.
-"""
+""")
+
+def remix_template(self, current_template: dict, instruction: str, reference_images: list = None, model_override: str = None) -> str:
+    """
+    Evolve an existing template based on user instructions.
+    Preserves elements the user doesn't explicitly ask to change.
+    """
+    model = model_override or config.MODEL_TEMPLATE_GEN
+
+    system_prompt = _REMIX_TEMPLATE_PROMPT.text
 
     template_json = json.dumps(current_template, indent=2)
 
@@ -473,43 +484,7 @@ Each entry in "values" is: {"text": "the value string", "weight": N}
     except Exception as e:
         raise Exception(f"Template remix failed: {e}")
 
-def edit_p5_sketch(self, p5_code: str, instruction: str, variables: list = None,
-                   reference_images: list = None, model_override: str = None) -> str:
-    """
-    Surgically edit a p5.js sketch in place.
-
-    Unlike remix_template, which regenerates the entire template (promptTemplate +
-    variables + p5Code) — and pays Pro-model latency for emitting the full JSON —
-    this method ONLY touches the sketch code. The variables list is passed in as
-    read-only context so the model can reference existing names correctly, but it
-    cannot modify them. Output is raw JavaScript (no JSON envelope).
-
-    Use case: AV / live-performance editing where the user wants "change the
-    palette to greens", "make the particles cluster more", "add easing" — none of
-    which require regenerating the prompt template or knob set.
-
-    Args:
-      p5_code: the current sketch source (instance-mode p5.js 1.9.4)
-      instruction: natural-language edit request
-      variables: optional list of {name, values:[{text,...}, ...]} for read-only
-                 context. Lets the model honour existing lookup-map keys.
-      reference_images: optional list of image bytes (palette / style cues)
-      model_override: 'gemini-2.5-pro' / 'gemini-2.5-flash' / etc.
-
-    Returns:
-      Raw JavaScript source (no markdown fences, no JSON wrapping).
-      If the instruction can't be satisfied by sketch-only changes, the model is
-      told to prepend `// REQUIRES_FULL_REMIX: <reason>` and return the unchanged
-      sketch — the caller can detect this and re-route to full remix.
-    """
-    if not p5_code or not p5_code.strip():
-        raise ValueError("edit_p5_sketch requires a non-empty p5_code.")
-    if not instruction or not instruction.strip():
-        raise ValueError("edit_p5_sketch requires an instruction.")
-
-    model = model_override or config.MODEL_TEMPLATE_GEN
-
-    system_prompt = """You are a p5.js sketch editor for the Synthograsizer Performance Suite.
+_EDIT_P5_SKETCH_PROMPT = prompt_registry.register("edit_p5_sketch", """You are a p5.js sketch editor for the Synthograsizer Performance Suite.
 
 You receive a p5.js sketch (INSTANCE MODE, p5.js 1.9.4) and an edit instruction.
 
@@ -562,7 +537,45 @@ The caller will route to full remix mode. Do not partially apply such edits.
 If reference images are attached, the user's instruction explains how to use
 them (palette extraction, motion cue, composition reference). Apply the cue to
 the sketch only — do not describe the image.
-"""
+""")
+
+def edit_p5_sketch(self, p5_code: str, instruction: str, variables: list = None,
+                   reference_images: list = None, model_override: str = None) -> str:
+    """
+    Surgically edit a p5.js sketch in place.
+
+    Unlike remix_template, which regenerates the entire template (promptTemplate +
+    variables + p5Code) — and pays Pro-model latency for emitting the full JSON —
+    this method ONLY touches the sketch code. The variables list is passed in as
+    read-only context so the model can reference existing names correctly, but it
+    cannot modify them. Output is raw JavaScript (no JSON envelope).
+
+    Use case: AV / live-performance editing where the user wants "change the
+    palette to greens", "make the particles cluster more", "add easing" — none of
+    which require regenerating the prompt template or knob set.
+
+    Args:
+      p5_code: the current sketch source (instance-mode p5.js 1.9.4)
+      instruction: natural-language edit request
+      variables: optional list of {name, values:[{text,...}, ...]} for read-only
+                 context. Lets the model honour existing lookup-map keys.
+      reference_images: optional list of image bytes (palette / style cues)
+      model_override: 'gemini-2.5-pro' / 'gemini-2.5-flash' / etc.
+
+    Returns:
+      Raw JavaScript source (no markdown fences, no JSON wrapping).
+      If the instruction can't be satisfied by sketch-only changes, the model is
+      told to prepend `// REQUIRES_FULL_REMIX: <reason>` and return the unchanged
+      sketch — the caller can detect this and re-route to full remix.
+    """
+    if not p5_code or not p5_code.strip():
+        raise ValueError("edit_p5_sketch requires a non-empty p5_code.")
+    if not instruction or not instruction.strip():
+        raise ValueError("edit_p5_sketch requires an instruction.")
+
+    model = model_override or config.MODEL_TEMPLATE_GEN
+
+    system_prompt = _EDIT_P5_SKETCH_PROMPT.text
 
     # Build the context block — read-only variables list, if provided.
     ctx_parts = []
@@ -639,26 +652,8 @@ the sketch only — do not describe the image.
     except Exception as e:
         raise Exception(f"p5.js sketch edit failed: {e}")
 
-def generate_story_template(self, user_prompt: str, model_override: str = None) -> str:
-    """
-    Story Template Generator — Bespoke-Beat Storyboard Mode.
-    Generates a Synthograsizer template with N narratively distinct per-beat prompts
-    sharing world/character/style anchors. Designed for storyboard-driven
-    short film production (e.g. 12 beats × 8s = 96s).
-    """
-    model = model_override or config.MODEL_TEMPLATE_GEN
-
-    # ── Infer target_beats and beat_duration_s from user prompt ──
-    import re as _re
-    beats_match = _re.search(r'(\d+)\s*(?:beats?|clips?|shots?|scenes?|frames?)', user_prompt, _re.IGNORECASE)
-    target_beats = int(beats_match.group(1)) if beats_match else 12
-
-    dur_match = _re.search(r'(\d+)\s*(?:sec(?:ond)?s?|s)\s*(?:per\s*)?(?:beat|clip|each)', user_prompt, _re.IGNORECASE)
-    beat_duration_s = int(dur_match.group(1)) if dur_match else 8
-
-    total_duration = target_beats * beat_duration_s
-
-    system_prompt = f"""You are a cinematic storyboard writer and art director for an AI short-film tool.
+# Slotted prompt: str.format syntax — {name} is filled per request, {{ }} are literal braces.
+_STORY_TEMPLATE_PROMPT = prompt_registry.register_template("generate_story_template", """You are a cinematic storyboard writer and art director for an AI short-film tool.
 
 ## YOUR TASK
 The user gives you a story concept. You produce a JSON template that drives a visual storyboard:
@@ -784,7 +779,30 @@ Beat 3: "A shot of {{{{character}}}} in {{{{environment}}}}, {{{{mood}}}} atmosp
 4. Characters referenced by {{{{id}}}} in prompts — the system substitutes their anchor text.
 5. Beat IDs are sequential integers starting from 1.
 6. Honor the user's explicit choices exactly — named characters, settings, genres, tones, or plot points from the concept must appear as given. Where the concept is open-ended, commit to a specific genre register and let its visual language (lighting, lenses, palette) shape the anchors, rather than defaulting to a generic cinematic look.
-"""
+""")
+
+def generate_story_template(self, user_prompt: str, model_override: str = None) -> str:
+    """
+    Story Template Generator — Bespoke-Beat Storyboard Mode.
+    Generates a Synthograsizer template with N narratively distinct per-beat prompts
+    sharing world/character/style anchors. Designed for storyboard-driven
+    short film production (e.g. 12 beats × 8s = 96s).
+    """
+    model = model_override or config.MODEL_TEMPLATE_GEN
+
+    # ── Infer target_beats and beat_duration_s from user prompt ──
+    import re as _re
+    beats_match = _re.search(r'(\d+)\s*(?:beats?|clips?|shots?|scenes?|frames?)', user_prompt, _re.IGNORECASE)
+    target_beats = int(beats_match.group(1)) if beats_match else 12
+
+    dur_match = _re.search(r'(\d+)\s*(?:sec(?:ond)?s?|s)\s*(?:per\s*)?(?:beat|clip|each)', user_prompt, _re.IGNORECASE)
+    beat_duration_s = int(dur_match.group(1)) if dur_match else 8
+
+    total_duration = target_beats * beat_duration_s
+
+    system_prompt = _STORY_TEMPLATE_PROMPT.render(
+        target_beats=target_beats, total_duration=total_duration, beat_duration_s=beat_duration_s,
+    )
 
     try:
         return self.llm_text(
@@ -797,6 +815,32 @@ Beat 3: "A shot of {{{{character}}}} in {{{{environment}}}}, {{{{mood}}}} atmosp
     except Exception as e:
         raise Exception(f"Story template generation failed: {e}")
 
+# Slotted prompt: str.format syntax — {name} is filled per request, {{ }} are literal braces.
+_STORY_BEAT_PROMPT = prompt_registry.register_template("generate_story_beat", """You are a cinematic storyboard writer. Regenerate a single beat in an existing storyboard.
+
+## CONTEXT
+{context}
+{direction_text}
+
+## TASK
+Write a NEW replacement beat object for beat ID {target_beat_id}. The beat must:
+1. Be narratively distinct from adjacent beats (different shot type, different framing).
+2. Reference shared anchors via {{{{anchor_key}}}} placeholders (e.g. {{{{style}}}}, {{{{world}}}}).
+3. Reference characters via {{{{character_id}}}} placeholders.
+4. Advance the story and serve a clear narrative purpose.
+5. If user direction is provided, incorporate it.
+
+## OUTPUT FORMAT
+Respond with valid JSON only — a single beat object:
+{{
+  "id": {target_beat_id},
+  "shot": "Shot type label",
+  "purpose": "What this beat accomplishes narratively.",
+  "prompt": "The bespoke image prompt for this beat with {{{{anchor}}}} and {{{{character}}}} placeholders.",
+  "characters": ["character_id_1"]
+}}
+""")
+
 def generate_story_beat(self, current_template: dict, target_beat_id: int, direction: str = None, model_override: str = None,
                         prev_image_b64: str = None, next_image_b64: str = None) -> str:
     """
@@ -841,30 +885,9 @@ def generate_story_beat(self, current_template: dict, target_beat_id: int, direc
 
     direction_text = f"\nUser direction: {direction}" if direction else ""
 
-    system_prompt = f"""You are a cinematic storyboard writer. Regenerate a single beat in an existing storyboard.
-
-## CONTEXT
-{chr(10).join(context_parts)}
-{direction_text}
-
-## TASK
-Write a NEW replacement beat object for beat ID {target_beat_id}. The beat must:
-1. Be narratively distinct from adjacent beats (different shot type, different framing).
-2. Reference shared anchors via {{{{anchor_key}}}} placeholders (e.g. {{{{style}}}}, {{{{world}}}}).
-3. Reference characters via {{{{character_id}}}} placeholders.
-4. Advance the story and serve a clear narrative purpose.
-5. If user direction is provided, incorporate it.
-
-## OUTPUT FORMAT
-Respond with valid JSON only — a single beat object:
-{{
-  "id": {target_beat_id},
-  "shot": "Shot type label",
-  "purpose": "What this beat accomplishes narratively.",
-  "prompt": "The bespoke image prompt for this beat with {{{{anchor}}}} and {{{{character}}}} placeholders.",
-  "characters": ["character_id_1"]
-}}
-"""
+    system_prompt = _STORY_BEAT_PROMPT.render(
+        context="\n".join(context_parts), direction_text=direction_text, target_beat_id=target_beat_id,
+    )
 
     # Optional: multimodal continuity — attach rendered adjacent beat images
     # so the LLM can see what's actually on screen, not just our prompt text.
@@ -914,15 +937,7 @@ Respond with valid JSON only — a single beat object:
     except Exception as e:
         raise Exception(f"Story beat regeneration failed: {e}")
 
-def generate_p5_template(self, user_prompt: str, image_bytes: bytes = None, model_override: str = None) -> str:
-    """
-    Generate a complete p5.js generative art template with Synthograsizer-controllable variables.
-    The sketch code uses instance mode (p. prefix) and reads live variable values via p.getSynthVar().
-    An optional reference image can be provided for color palette / aesthetic guidance.
-    """
-    model = model_override or config.MODEL_TEMPLATE_GEN
-
-    system_prompt = """You are a creative coder generating p5.js generative art templates for the Synthograsizer system.
+_P5_TEMPLATE_PROMPT = prompt_registry.register("generate_p5_template", """You are a creative coder generating p5.js generative art templates for the Synthograsizer system.
 
 ## FIDELITY TO THE REQUEST
 The sketch must implement what the user actually described. If they name a specific technique (flow field, boids, L-system, reaction-diffusion, particle trails), implement that technique — do not substitute a simpler effect. If the description is loose or poetic, translate its mood into concrete visual systems and commit to a distinctive interpretation rather than a generic particle sketch.
@@ -993,7 +1008,17 @@ Resolve getSynthVar ONCE per frame at the top of p.draw, always with a fallback
 - Smooth animation — use p.lerp(), Math.sin(p.frameCount * speed), or easing; avoid hard jumps
 - Clear the background each frame unless intentional trails (comment if so)
 - Use p.push() / p.pop() for state isolation; p.translate() / p.rotate() for transforms
-- No console.log, no alert, no document.write, no external dependencies"""
+- No console.log, no alert, no document.write, no external dependencies""")
+
+def generate_p5_template(self, user_prompt: str, image_bytes: bytes = None, model_override: str = None) -> str:
+    """
+    Generate a complete p5.js generative art template with Synthograsizer-controllable variables.
+    The sketch code uses instance mode (p. prefix) and reads live variable values via p.getSynthVar().
+    An optional reference image can be provided for color palette / aesthetic guidance.
+    """
+    model = model_override or config.MODEL_TEMPLATE_GEN
+
+    system_prompt = _P5_TEMPLATE_PROMPT.text
 
     try:
         if not image_bytes:
@@ -1034,23 +1059,7 @@ Resolve getSynthVar ONCE per frame at the top of p.draw, always with a fallback
     except Exception as e:
         raise Exception(f"p5.js template generation failed: {e}")
 
-def generate_taste_vector(self, artifacts: list, model_override: str = None) -> str:
-    """
-    Mines a sample of the user's creative artifacts (saved templates, agent bios,
-    image prompts, chat fragments, presets) and extracts a portable "taste vector"
-    JSON profile capturing voice, aesthetic, and creative tendencies.
-
-    artifacts: list of dicts. Each dict must include:
-      - kind:  'template' | 'agent_bio' | 'image_prompt' | 'chat_message' | 'preset' | 'other'
-      - text:  the artifact's textual content
-      - meta:  (optional) dict with extra context — name, variables, weights, source path
-    """
-    if not artifacts:
-        raise ValueError("artifacts list is empty — nothing to mine")
-
-    model = model_override or config.MODEL_TEMPLATE_GEN
-
-    system_prompt = """You are an aesthetic anthropologist analyzing a creator's body of work. Your task is to extract a concise but vivid "taste vector" — a portable JSON profile capturing their voice, sensibility, and creative tendencies. This vector will be used downstream to bias the generation of new outputs (agent personas, prompts, recipes) so they feel personal rather than generic.
+_TASTE_VECTOR_PROMPT = prompt_registry.register("generate_taste_vector", """You are an aesthetic anthropologist analyzing a creator's body of work. Your task is to extract a concise but vivid "taste vector" — a portable JSON profile capturing their voice, sensibility, and creative tendencies. This vector will be used downstream to bias the generation of new outputs (agent personas, prompts, recipes) so they feel personal rather than generic.
 
 You will be given a sample of artifacts: prompts they've written, agents they've designed, templates they've saved. Read across the whole set, not item by item. You are looking for patterns, not summaries.
 
@@ -1081,7 +1090,25 @@ Hard rules:
 - Quote distinctive phrasing only as fragments; never copy more than a few words.
 - `tendencies.avoids` is the most diagnostic field — what they DON'T do separates them from neighbours. Work to fill it honestly.
 - If the sample is thin or contradictory, say so plainly inside `voice_signature` rather than inventing.
-- Do not flatter. Do not generalise. Do not pad. The vector should feel uncomfortably accurate."""
+- Do not flatter. Do not generalise. Do not pad. The vector should feel uncomfortably accurate.""")
+
+def generate_taste_vector(self, artifacts: list, model_override: str = None) -> str:
+    """
+    Mines a sample of the user's creative artifacts (saved templates, agent bios,
+    image prompts, chat fragments, presets) and extracts a portable "taste vector"
+    JSON profile capturing voice, aesthetic, and creative tendencies.
+
+    artifacts: list of dicts. Each dict must include:
+      - kind:  'template' | 'agent_bio' | 'image_prompt' | 'chat_message' | 'preset' | 'other'
+      - text:  the artifact's textual content
+      - meta:  (optional) dict with extra context — name, variables, weights, source path
+    """
+    if not artifacts:
+        raise ValueError("artifacts list is empty — nothing to mine")
+
+    model = model_override or config.MODEL_TEMPLATE_GEN
+
+    system_prompt = _TASTE_VECTOR_PROMPT.text
 
     bundle_lines = [f"# Sample of {len(artifacts)} artifact(s)"]
     for i, art in enumerate(artifacts, start=1):
@@ -1110,7 +1137,7 @@ Hard rules:
         raise Exception(f"Taste vector extraction failed: {e}")
 
 
-_AGENT_PROFILE_STRUCTURAL_PREAMBLE = """You are an expert agent persona designer for Agent Studio, a collaborative multi-agent simulation framework. Your task is to generate or refine an "Agent Profile" — a dynamic, variable-driven character biography template.
+_AGENT_PROFILE_STRUCTURAL_PREAMBLE = prompt_registry.register("generate_agent_profile", """You are an expert agent persona designer for Agent Studio, a collaborative multi-agent simulation framework. Your task is to generate or refine an "Agent Profile" — a dynamic, variable-driven character biography template.
 
 The output MUST be valid JSON containing exactly this structure:
 {
@@ -1138,7 +1165,7 @@ Structural rules (always enforced — never violate these):
 2. Every variable must have 3 to 6 values. Distribute weights so 1-2 options have weight 3+ and others weight 1.
 3. anchors.agent_name must match the top-level name field.
 4. If an EXISTING PROFILE is provided, edit it to match the request rather than generating from scratch — preserve variables and anchors that still apply.
-5. The bioTemplate must faithfully reflect the user's described concept, domain, and character."""
+5. The bioTemplate must faithfully reflect the user's described concept, domain, and character.""")
 
 _AGENT_PROFILE_DEFAULT_STYLE = """Style guidelines:
 - Match the tone and energy of the user's description precisely. If they describe a cheerful character, write upbeat text; if they describe a gruff expert, be terse and technical.
@@ -1153,7 +1180,7 @@ def generate_agent_profile(self, user_prompt: str, model_override: str = None, s
     model = model_override or config.MODEL_TEMPLATE_GEN
 
     style_block = style_instruction.strip() if style_instruction and style_instruction.strip() else _AGENT_PROFILE_DEFAULT_STYLE
-    system_prompt = _AGENT_PROFILE_STRUCTURAL_PREAMBLE + "\n\n" + style_block
+    system_prompt = _AGENT_PROFILE_STRUCTURAL_PREAMBLE.text + "\n\n" + style_block
 
     try:
         return self.llm_text([system_prompt, user_prompt], model, json_mode=True)
@@ -1163,7 +1190,7 @@ def generate_agent_profile(self, user_prompt: str, model_override: str = None, s
         raise Exception(f"Agent Profile generation failed: {e}")
 
 
-_TASTE_PROFILE_SYSTEM_PROMPT = """You are the Taste Profile synthesizer for the Synthograsizer Suite — a creative tool that builds AI agent ensembles tuned to an artist's personal aesthetic.
+_TASTE_PROFILE_SYSTEM_PROMPT = prompt_registry.register("generate_taste_profile", """You are the Taste Profile synthesizer for the Synthograsizer Suite — a creative tool that builds AI agent ensembles tuned to an artist's personal aesthetic.
 
 You have been given:
 1. Analyses of multiple images the artist has uploaded (their work / references)
@@ -1238,7 +1265,7 @@ Your task: synthesize a single coherent taste profile object AND four AI agents
 - [ ] Every {{placeholder}} in each bioTemplate has a matching entry in that agent's variables array
 - [ ] All 8 axes are present in the fixed order
 - [ ] palette has exactly 5 hex colors
-"""
+""")
 
 
 def generate_taste_profile(self, images_list: list, quiz_answers: dict, corpus_text: str = None, model_override: str = None) -> str:
@@ -1272,7 +1299,7 @@ def generate_taste_profile(self, images_list: list, quiz_answers: dict, corpus_t
 
     try:
         return self.llm_text(
-            [_TASTE_PROFILE_SYSTEM_PROMPT, user_payload],
+            [_TASTE_PROFILE_SYSTEM_PROMPT.text, user_payload],
             model,
             json_mode=True,
         )
@@ -1,4 +1,3 @@
-import base64
 import logging
 import time
 import requests
@@ -7,15 +6,25 @@ from functools import partial
 from typing import Optional
 from backend import config
 from backend.helpers import decode_base64_image
+from backend.utils.image_payload import ImagePayload
 from google.genai import types
 
 logger = logging.getLogger(__name__)
 
+
+def _video_result(video_bytes: bytes, video_uri, as_payload: bool) -> dict:
+    video = ImagePayload.from_bytes(video_bytes, mime="video/mp4")
+    if as_payload:
+        return {"video": video, "video_uri": video_uri}
+    return {"video_b64": video.b64, "video_uri": video_uri}
+
+
 async def generate_video(self, prompt: str, model_name: str = config.MODEL_VIDEO_GEN,
                   duration_seconds: int = None, aspect_ratio: str = None,
                   end_frame_image: str = None, start_frame_image: str = None,
                   reference_images: list = None, extension_video_uri: str = None,
-                  resolution: str = None, person_generation: str = None):
+                  resolution: str = None, person_generation: str = None,
+                  as_payload: bool = False):
     """Generate video using Veo (Async).
 
     Supports text-to-video, image-to-video (first frame), interpolation
@@ -23,7 +32,9 @@ async def generate_video(self, prompt: str, model_name: str = config.MODEL_VIDEO
     video extension (Veo 3.1 only — requires a URI from a prior Veo generation).
     Polls the long-running operation with a configurable timeout
     (see config.VIDEO_POLL_TIMEOUT_SECONDS).
-    Returns dict {"video_b64": str, "video_uri": str|None}.
+    Returns dict {"video_b64": str, "video_uri": str|None}; with
+    ``as_payload=True``, {"video": ImagePayload, "video_uri": ...} instead, so
+    a binary response never base64s the clip.
     """
     if not self.genai_client:
         raise ValueError("API Key not configured")
@@ -183,10 +194,7 @@ async def generate_video(self, prompt: str, model_name: str = config.MODEL_VIDEO
                     if vid_response.status_code == 200:
                         logger.info("Video downloaded (%d bytes)", len(vid_response.content))
                         self.save_output(vid_response.content, f"vid_{model_name}")
-                        return {
-                            "video_b64": base64.b64encode(vid_response.content).decode('utf-8'),
-                            "video_uri": video_uri,
-                        }
+                        return _video_result(vid_response.content, video_uri, as_payload)
                     else:
                         logger.error("Failed to download video. Status: %s", vid_response.status_code)
                         raise Exception(f"Failed to download video from URI: {vid_response.text}")
@@ -194,10 +202,7 @@ async def generate_video(self, prompt: str, model_name: str = config.MODEL_VIDEO
             if hasattr(video_wrapper, 'video_bytes') and video_wrapper.video_bytes:
                 logger.info("Video bytes found directly (%d bytes)", len(video_wrapper.video_bytes))
                 self.save_output(video_wrapper.video_bytes, f"vid_{model_name}")
-                return {
-                    "video_b64": base64.b64encode(video_wrapper.video_bytes).decode('utf-8'),
-                    "video_uri": None,
-                }
+                return _video_result(video_wrapper.video_bytes, None, as_payload)
         
         # Surface RAI filtering explicitly — an empty result with a filtered
         # count is a content-policy rejection, not a malformed response.
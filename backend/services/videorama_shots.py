@@ -13,7 +13,7 @@ import time
 from pathlib import Path
 
 from backend import config
-from scripts.film_factory import costs, qc
+from scripts.film_factory import costs, qc, refcache
 from scripts.film_factory.render import MODEL as VEO_MODEL, build_name_subs, scrub_names
 
 logger = logging.getLogger(__name__)
@@ -246,6 +246,7 @@ def regenerate_asset(ai, db, asset_id: str, tweak: str, dirs) -> dict:
     b64 = out["image"] if isinstance(out, dict) else out
     path = _next_asset_path(dirs, asset_id)
     path.write_bytes(base64.b64decode(b64))
+    refcache.invalidate_asset(db, asset_id)
     usd = costs.charge(db, "bible", f"{asset_id}_regen", config.MODEL_IMAGE_GEN_HQ, 1)
     db.exec("UPDATE assets SET status='done', path=?, cost=cost+?, error=NULL WHERE id=?",
             (str(path), usd, asset_id))
@@ -267,6 +268,7 @@ def upload_asset(db, asset_id: str, image_bytes: bytes, dirs) -> dict:
         img = img.resize((2048, int(img.height * 2048 / img.width)))
     path = _next_asset_path(dirs, asset_id)
     img.save(path, format="PNG")
+    refcache.invalidate_asset(db, asset_id)
     db.exec("UPDATE assets SET status='done', path=?, error=NULL WHERE id=?",
             (str(path), asset_id))
     return {"path": str(path)}
@@ -101,3 +101,66 @@ WORKFLOW:
         # reaching here is a genuine generation/parsing error.
         raise Exception(f"Workflow curation failed: {e}")
 
+
+async def iter_workflow_curations(self, workflow: dict, images: list, guidance: str = None,
+                                  include_rationale: bool = True, model_override: str = None,
+                                  timeout: float = None, concurrency: int = None,
+                                  on_start=None):
+    """Curate ``workflow`` against every image concurrently; yield outcomes as they finish.
+
+    At most ``concurrency`` (default config.WORKFLOW_CURATION_CONCURRENCY)
+    images are in flight, and ``timeout`` applies to each image from the moment
+    it starts. A timed-out image's thread can't be stopped, so it holds its
+    slot until it returns. Images may be raw bytes or base64 strings — decoding happens
+    per image, so one bad upload fails only itself.
+
+    Each outcome is ``{"index", "ok", "result"}`` or ``{"index", "ok": False,
+    "error", "exc"}``; ``exc`` is the original exception, for callers that
+    need to re-raise it (it is not JSON-serializable — drop it before sending).
+
+    ``on_start(index)``, if given, is called as each image's worker thread
+    launches — that curation runs (and bills) to completion even if the
+    consumer stops iterating.
+    """
+    from backend.helpers import decode_base64_image
+
+    sem = asyncio.Semaphore(max(1, concurrency or config.WORKFLOW_CURATION_CONCURRENCY))
+
+    def _finished(work: asyncio.Future) -> None:
+        sem.release()
+        if not work.cancelled():
+            work.exception()  # retrieved, so an abandoned failure doesn't warn
+
+    async def one(index, image):
+        await sem.acquire()
+        try:
+            image_bytes = decode_base64_image(image) if isinstance(image, str) else image
+        except Exception as e:
+            sem.release()
+            return {"index": index, "ok": False, "error": str(e), "exc": e}
+        # The slot belongs to the worker thread, not to this wait: a thread
+        # can't be stopped, so a timed-out or abandoned curation keeps its
+        # slot until it really ends, and the batch never runs more than
+        # ``concurrency`` threads.
+        work = asyncio.ensure_future(asyncio.to_thread(
+            self.curate_workflow, workflow, image_bytes, guidance=guidance,
+            include_rationale=include_rationale, model_override=model_override,
+        ))
+        work.add_done_callback(_finished)
+        if on_start is not None:
+            on_start(index)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(work), timeout)
+            return {"index": index, "ok": True, "result": result}
+        except asyncio.TimeoutError as e:
+            return {"index": index, "ok": False, "error": f"Timed out after {timeout}s", "exc": e}
+        except Exception as e:
+            return {"index": index, "ok": False, "error": str(e), "exc": e}
+
+    tasks = [asyncio.create_task(one(i, img)) for i, img in enumerate(images)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for t in tasks:  # consumer went away (or raised): stop queued images
+            t.cancel()
@@ -0,0 +1,138 @@
+"""One image, carried through a request once.
+
+An image request used to pay for several full copies of the same picture:
+the client's base64 decoded in the router, re-encoded to base64 for the
+Interactions API, and the generated PNG base64'd again for the response.
+``ImagePayload`` holds whichever form it was created from and produces the
+others on first use, memoized, so each representation exists at most once
+per request:
+
+- built from a client's base64 string (``from_b64``, validated but not
+  decoded), the string goes to the Interactions API as-is and the raw bytes
+  are only decoded if something actually needs them (the legacy
+  generateContent path, PIL);
+- built from raw bytes (``from_bytes``), base64 is produced once, when a JSON
+  response asks for it — a binary response never produces it at all.
+
+``mime`` is sniffed from the magic bytes; when only base64 is held, just the
+first few characters are decoded to do so. Veo clips ride in the same type
+with an explicit ``mime="video/mp4"``.
+"""
+import base64
+import binascii
+import re
+from typing import Optional, Union
+
+# Enough base64 for sniff_mime_type's longest signature (WEBP: bytes 8..12).
+_SNIFF_BYTES = 16
+_NOT_B64 = re.compile(rb"[^A-Za-z0-9+/]")
+# Standard alphabet, padded: what b64decode would accept, checked without decoding.
+_B64_TEXT = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+
+
+def check_encoded_size(b64_string: str, max_bytes: int) -> None:
+    """ValueError when base64 of this length would decode past ``max_bytes``."""
+    # Conservative: every 4 base64 chars decode to at most 3 bytes.
+    estimated_decoded = (len(b64_string) * 3) // 4
+    if estimated_decoded > max_bytes:
+        raise ValueError(
+            f"Image payload too large: ~{estimated_decoded // (1024 * 1024)} MB "
+            f"exceeds the {max_bytes // (1024 * 1024)} MB cap"
+        )
+
+
+class ImagePayload:
+    """Raw bytes and/or base64 of one image, each computed at most once."""
+
+    __slots__ = ("_data", "_b64", "_mime")
+
+    def __init__(self, data: Optional[bytes] = None, *, b64: Optional[str] = None,
+                 mime: Optional[str] = None):
+        if data is None and b64 is None:
+            raise ValueError("ImagePayload needs data or b64")
+        self._data = bytes(data) if isinstance(data, (bytearray, memoryview)) else data
+        self._b64 = b64
+        self._mime = mime
+
+    @classmethod
+    def from_bytes(cls, data: bytes, mime: Optional[str] = None) -> "ImagePayload":
+        return cls(data, mime=mime)
+
+    @classmethod
+    def from_b64(cls, b64_string: str, max_bytes: Optional[int] = None) -> "ImagePayload":
+        """Wrap a client's base64 (raw or data URI) without decoding it.
+
+        The size cap is checked on the encoded length, as in
+        ``helpers.decode_base64_image``, and the text is validated (alphabet,
+        padding, length) with one regex scan — ValueError either way, so a
+        bad upload still fails before the request is charged.
+        """
+        if "," in b64_string:
+            b64_string = b64_string.split(",", 1)[1]
+        if "\n" in b64_string or " " in b64_string:  # wrapped base64 (e.g. from `base64` CLI)
+            b64_string = "".join(b64_string.split())
+        if max_bytes is not None:
+            check_encoded_size(b64_string, max_bytes)
+        if not b64_string or len(b64_string) % 4 or not _B64_TEXT.fullmatch(b64_string):
+            raise ValueError("Image payload is not valid base64")
+        return cls(b64=b64_string)
+
+    @property
+    def data(self) -> bytes:
+        """Raw image bytes (decoded from base64 on first access)."""
+        if self._data is None:
+            self._data = base64.b64decode(self._b64)
+        return self._data
+
+    @property
+    def b64(self) -> str:
+        """Base64 text (encoded from the bytes on first access)."""
+        if self._b64 is None:
+            self._b64 = base64.b64encode(self._data).decode("ascii")
+        return self._b64
+
+    @property
+    def mime(self) -> str:
+        if self._mime is None:
+            from backend.utils.image_utils import sniff_mime_type  # PIL-heavy module
+            self._mime = sniff_mime_type(self._head())
+        return self._mime
+
+    @property
+    def data_uri(self) -> str:
+        return f"data:{self.mime};base64,{self.b64}"
+
+    @property
+    def has_data(self) -> bool:
+        """True once raw bytes are held (no decode needed to read them)."""
+        return self._data is not None
+
+    def __len__(self) -> int:
+        """Decoded size in bytes (estimated from base64 when not decoded yet)."""
+        if self._data is not None:
+            return len(self._data)
+        return (len(self._b64) * 3) // 4 - self._b64[-2:].count("=")
+
+    def __bytes__(self) -> bytes:
+        return self.data
+
+    def __repr__(self) -> str:
+        return f"<ImagePayload {self.mime} ~{len(self)} bytes>"
+
+    def _head(self) -> bytes:
+        if self._data is not None:
+            return self._data[:_SNIFF_BYTES]
+        head = _NOT_B64.sub(b"", self._b64[:_SNIFF_BYTES * 2].encode("ascii", "ignore"))
+        head = head[:len(head) // 4 * 4]
+        try:
+            return base64.b64decode(head)
+        except (binascii.Error, ValueError):
+            return self.data[:_SNIFF_BYTES]
+
+
+ImageLike = Union[bytes, bytearray, ImagePayload]
+
+
+def as_bytes(image: ImageLike) -> bytes:
+    """Raw bytes of either a payload or plain bytes."""
+    return image.data if isinstance(image, ImagePayload) else image
@@ -3,6 +3,8 @@ import io
 from PIL import Image
 from PIL.PngImagePlugin import PngInfo
 
+from backend.utils import metrics, prompt_sanitize
+
 def sniff_mime_type(image_bytes: bytes) -> str:
     """Detect image MIME type from magic bytes. Falls back to image/png."""
     if image_bytes[:2] == b'\xff\xd8':
@@ -15,26 +17,42 @@ def sniff_mime_type(image_bytes: bytes) -> str:
         return 'image/webp'
     return 'image/png'  # safe default
 
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_TEXT_CHUNKS = (b"tEXt", b"zTXt", b"iTXt")
+
+
+@metrics.timed("image.embed_metadata")
 def embed_metadata(self, image_bytes: bytes, prompt: str, tags: list = None) -> bytes:
-    """Embeds the prompt (and optional provenance tags) into the PNG metadata."""
+    """Embeds the prompt (and optional provenance tags) into the PNG metadata.
+
+    PNG input gets its text chunks spliced in by ``png_with_text`` — the
+    compressed pixel data is copied, never decoded. Anything else (a JPEG
+    from the model) is converted to PNG through PIL as before.
+    """
+    text = {
+        "prompt": prompt,
+        "Description": prompt,  # Common key
+        "Software": "Synthograsizer",
+    }
+    # Embed provenance tags if provided
+    if tags and isinstance(tags, list) and len(tags) > 0:
+        import json as _json
+        from datetime import datetime, timezone
+        provenance = {
+            "tags": tags,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "tool": "Synthograsizer"
+        }
+        text["provenance"] = _json.dumps(provenance)
+
+    spliced = png_with_text(image_bytes, text)
+    if spliced is not None:
+        return spliced
     try:
         image = Image.open(io.BytesIO(image_bytes))
         metadata = PngInfo()
-        metadata.add_text("prompt", prompt)
-        metadata.add_text("Description", prompt) # Common key
-        metadata.add_text("Software", "Synthograsizer")
-
-        # Embed provenance tags if provided
-        if tags and isinstance(tags, list) and len(tags) > 0:
-            import json as _json
-            from datetime import datetime, timezone
-            provenance = {
-                "tags": tags,
-                "generated_at": datetime.now(timezone.utc).isoformat(),
-                "tool": "Synthograsizer"
-            }
-            metadata.add_text("provenance", _json.dumps(provenance))
-
+        for key, value in text.items():
+            metadata.add_text(key, value)
         output_buffer = io.BytesIO()
         image.save(output_buffer, format="PNG", pnginfo=metadata)
         return output_buffer.getvalue()
@@ -42,43 +60,170 @@ def embed_metadata(self, image_bytes: bytes, prompt: str, tags: list = None) ->
         print(f"Failed to embed metadata: {e}")
         return image_bytes # Return original if failure
 
-def extract_metadata(self, image_bytes: bytes) -> dict:
-    """Extracts metadata from a PNG image, including provenance tags."""
+
+def _png_chunk(ctype: bytes, data: bytes) -> bytes:
+    import zlib
+    crc = zlib.crc32(data, zlib.crc32(ctype))
+    return len(data).to_bytes(4, "big") + ctype + data + crc.to_bytes(4, "big")
+
+
+def _png_text_chunk(keyword: str, value: str) -> bytes:
+    """tEXt when the value is Latin-1, else uncompressed iTXt (as PIL's add_text)."""
+    key = keyword.encode("latin-1")
     try:
-        image = Image.open(io.BytesIO(image_bytes))
-        info = image.info
+        return _png_chunk(b"tEXt", key + b"\0" + value.encode("latin-1"))
+    except UnicodeEncodeError:
+        # flag 0 (uncompressed), method 0, empty language and translated keyword
+        return _png_chunk(b"iTXt", key + b"\0\0\0\0\0" + value.encode("utf-8"))
 
-        extracted = {}
-        raw_prompt = ""
 
-        if "prompt" in info:
-            raw_prompt = info["prompt"]
-        elif "Description" in info:
-            raw_prompt = info["Description"]
-        elif "parameters" in info: # Automatic1111 style
-            raw_prompt = info["parameters"]
-        else:
-            raw_prompt = "No prompt found in metadata."
+def iter_png_with_text(image_bytes: bytes, text: dict):
+    """Chunks of ``image_bytes`` with ``text`` set, for streaming out.
 
-        # Clean the prompt if it's not the "No prompt found" message
-        if raw_prompt != "No prompt found in metadata.":
-            extracted["prompt"] = self.clean_midjourney_prompt(raw_prompt)
-            extracted["raw_prompt"] = raw_prompt # Keep original just in case
-        else:
-            extracted["prompt"] = raw_prompt
+    Every existing chunk is passed through as a zero-copy slice except text
+    chunks whose keyword is being set; the new text chunks go just before the
+    first IDAT, where PIL writes them and where header-only readers look.
+    Raises ValueError on input that is not a complete PNG.
+    """
+    if image_bytes[:8] != PNG_SIGNATURE:
+        raise ValueError("not a PNG")
+    view = memoryview(image_bytes)
+    replaced = {k.encode("latin-1") for k in text}
+    new_chunks = [_png_text_chunk(k, v) for k, v in text.items()]
+    yield view[:8]
+    pos, end = 8, len(image_bytes)
+    while pos + 12 <= end:
+        length = int.from_bytes(image_bytes[pos:pos + 4], "big")
+        ctype = bytes(view[pos + 4:pos + 8])
+        chunk_end = pos + 12 + length
+        if chunk_end > end:
+            break
+        if ctype == b"IDAT" and new_chunks:
+            yield from new_chunks
+            new_chunks = None
+        keyword = (bytes(view[pos + 8:min(chunk_end - 4, pos + 88)]).split(b"\0", 1)[0]
+                   if ctype in _TEXT_CHUNKS else None)
+        if keyword not in replaced:
+            yield view[pos:chunk_end]
+        if ctype == b"IEND":
+            if new_chunks:
+                raise ValueError("PNG has no IDAT")
+            return
+        pos = chunk_end
+    raise ValueError("truncated PNG")
+
+
+def png_with_text(image_bytes: bytes, text: dict) -> bytes | None:
+    """``image_bytes`` with ``text`` chunks inserted or replaced, IDAT copied
+    untouched; None when the input is not a well-formed PNG."""
+    try:
+        return b"".join(iter_png_with_text(image_bytes, text))
+    except ValueError:
+        return None
+
+
+def read_png_text(image_bytes: bytes) -> dict | None:
+    """Text chunks (tEXt / zTXt / iTXt) of a PNG as {keyword: text}.
+
+    Walks the chunk list and skips IDAT payloads by length, so the pixels are
+    never inflated — and, unlike ``Image.open().info``, text chunks written
+    after the image data are found too. Returns None for non-PNG input; a
+    truncated file yields whatever was read before the cut.
+    """
+    if image_bytes[:8] != PNG_SIGNATURE:
+        return None
+    import zlib
 
-        # Extract provenance tags if present
-        if "provenance" in info:
-            import json as _json
-            try:
-                extracted["provenance"] = _json.loads(info["provenance"])
-            except Exception:
-                extracted["provenance_raw"] = info["provenance"]
+    text = {}
+    pos, end = 8, len(image_bytes)
+    while pos + 8 <= end:
+        length = int.from_bytes(image_bytes[pos:pos + 4], "big")
+        ctype = image_bytes[pos + 4:pos + 8]
+        data_start = pos + 8
+        pos = data_start + length + 4  # data + CRC
+        if ctype == b"IEND" or pos > end:
+            break
+        if ctype not in (b"tEXt", b"zTXt", b"iTXt"):
+            continue
+        data = image_bytes[data_start:data_start + length]
+        keyword, sep, rest = data.partition(b"\0")
+        if not sep:
+            continue
+        try:
+            if ctype == b"tEXt":
+                value = rest.decode("latin-1")
+            elif ctype == b"zTXt":  # compression method byte, then deflate
+                value = zlib.decompress(rest[1:]).decode("latin-1")
+            else:  # iTXt: flag, method, language\0, translated keyword\0, text
+                compressed, body = rest[0], rest[2:]
+                body = body.split(b"\0", 2)[2]
+                value = (zlib.decompress(body) if compressed else body).decode("utf-8")
+        except (zlib.error, IndexError, UnicodeDecodeError):
+            continue
+        text[keyword.decode("latin-1")] = value  # last wins, as in PIL
+    return text
 
-        return extracted
+
+def _metadata_from_info(info: dict) -> dict:
+    extracted = {}
+    raw_prompt = ""
+
+    if "prompt" in info:
+        raw_prompt = info["prompt"]
+    elif "Description" in info:
+        raw_prompt = info["Description"]
+    elif "parameters" in info: # Automatic1111 style
+        raw_prompt = info["parameters"]
+    else:
+        raw_prompt = "No prompt found in metadata."
+
+    # Clean the prompt if it's not the "No prompt found" message
+    if raw_prompt != "No prompt found in metadata.":
+        extracted["prompt"] = clean_midjourney_prompt(None, raw_prompt)
+        extracted["raw_prompt"] = raw_prompt # Keep original just in case
+    else:
+        extracted["prompt"] = raw_prompt
+
+    # Extract provenance tags if present
+    if "provenance" in info:
+        import json as _json
+        try:
+            extracted["provenance"] = _json.loads(info["provenance"])
+        except Exception:
+            extracted["provenance_raw"] = info["provenance"]
+
+    return extracted
+
+
+@metrics.timed("image.extract_metadata")
+def extract_metadata(self, image_bytes: bytes) -> dict:
+    """Extracts metadata from a PNG image, including provenance tags.
+
+    PNGs are read chunk-by-chunk (read_png_text); other formats fall back to
+    PIL's lazy open, which parses headers without decoding pixels.
+    """
+    try:
+        info = read_png_text(image_bytes)
+        if info is None:
+            info = Image.open(io.BytesIO(image_bytes)).info
+        return _metadata_from_info(info)
     except Exception as e:
         return {"error": str(e)}
 
+
+def extract_metadata_entry(index: int, img_b64: str) -> dict:
+    """One /api/extract-metadata/bulk result row, base64 decode included.
+
+    Module-level and self-free so it can run in a worker process.
+    """
+    from backend.helpers import decode_base64_image
+    try:
+        metadata = extract_metadata(None, decode_base64_image(img_b64))
+    except Exception as e:
+        return {"index": index, "status": "error", "error": str(e), "prompt": ""}
+    return {"index": index, "status": "success", "metadata": metadata,
+            "prompt": metadata.get("prompt", "")}
+
 def get_image_dimensions(self, image_bytes: bytes) -> tuple:
     """Get width and height from image bytes.
     
@@ -123,6 +268,7 @@ def map_to_closest_aspect_ratio(self, width: int, height: int) -> str:
     closest = min(ratios.items(), key=lambda x: abs(x[1] - actual_ratio))
     return closest[0]
 
+@metrics.timed("image.ensure_aspect_ratio")
 def ensure_aspect_ratio(self, image_bytes: bytes, target_ratio: str) -> bytes:
     """Resize/Crop image to match target aspect ratio (16:9 or 9:16)."""
     if not target_ratio:
@@ -174,34 +320,7 @@ def ensure_aspect_ratio(self, image_bytes: bytes, target_ratio: str) -> bytes:
 
 def clean_midjourney_prompt(self, prompt: str) -> str:
     """Removes Midjourney parameters, Job IDs, and image URLs from the prompt."""
-    import re
-    if not prompt:
-        return ""
-        
-    # 1. Remove Image URLs (typically at the start)
-    # Pattern matches http/https URLs followed by space or end of string
-    url_pattern = r"https?://\S+\s*"
-    prompt = re.sub(url_pattern, "", prompt)
-        
-    # 2. Remove Parameters and Job IDs
-    # Regex to find the start of MJ parameters
-    # Looks for --parameter or Job ID:
-    # Examples: --ar 16:9, --v 6.0, Job ID: ...
-    # We want to cut everything off starting from the first occurrence of these.
-    
-    # Pattern matches:
-    # 1. " --" followed by letters (start of a parameter like --ar)
-    # 2. " Job ID:" (start of job id)
-    # We use a non-greedy match to find the *first* occurrence.
-    
-    param_pattern = r"(\s--[a-zA-Z]+|\sJob ID:)"
-    
-    match = re.search(param_pattern, prompt)
-    if match:
-        # Return everything up to the start of the match
-        return prompt[:match.start()].strip()
-        
-    return prompt.strip()
+    return prompt_sanitize.clean_midjourney_prompt(prompt)
 
 def _placeholder_image(self, aspect_ratio: str = '16:9') -> str:
     """Return a base64-encoded dark grey placeholder PNG with an error label.
@@ -0,0 +1,181 @@
+"""SQLite sidecar index over directories of one-JSON-file-per-record stores.
+
+Routers that persist a JSON file per record (routers/outputs.py) used to list
+by parsing every file on every request, and to dedup by re-hashing every file.
+This keeps one row per file — fingerprint, mtime, size and a small summary —
+so listing and dedup become indexed lookups.
+
+The files stay the source of truth; the index is a cache that is always safe
+to delete. ``sync()`` only stats the directory (no parsing), re-describes the
+files whose (mtime, size) changed and drops rows whose file vanished, so edits,
+copies and retention deletes made out of band heal on the next call.
+
+One db per index path, WAL mode, one shared connection guarded by an RLock —
+the same shape as scripts/film_factory/db.py.
+"""
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+  scope       TEXT NOT NULL,     -- output kind / store name
+  filename    TEXT NOT NULL,
+  fingerprint TEXT,              -- content hash; NULL for unreadable files
+  mtime       REAL,              -- st_mtime, as the list endpoints report it
+  mtime_ns    INTEGER,           -- change detection: (mtime_ns, size)
+  size        INTEGER,
+  summary     TEXT,              -- json object of lightweight list fields
+  ok          INTEGER DEFAULT 1, -- 0 = unreadable, remembered so it isn't re-parsed every call
+  PRIMARY KEY (scope, filename)
+);
+CREATE INDEX IF NOT EXISTS entries_fingerprint ON entries(scope, fingerprint);
+CREATE INDEX IF NOT EXISTS entries_mtime ON entries(scope, mtime);
+"""
+
+# describe(content) -> (fingerprint, summary dict)
+Describe = Callable[[dict], tuple]
+
+_FIELD_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class JsonDirIndex:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.lock:
+            self.conn.executescript(SCHEMA)
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # -- maintenance -------------------------------------------------------
+    def sync(self, scope: str, directory: Path, describe: Describe, pattern: str = ".json"):
+        """Reconcile ``scope`` with the files in ``directory`` ending in ``pattern``."""
+        on_disk = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.endswith(pattern) and entry.is_file():
+                        st = entry.stat()
+                        on_disk[entry.name] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
+        with self.lock:
+            known = {name: (mtime_ns, size) for name, mtime_ns, size in self.conn.execute(
+                "SELECT filename, mtime_ns, size FROM entries WHERE scope=?", (scope,))}
+            gone = [name for name in known if name not in on_disk]
+            changed = [name for name, sig in on_disk.items() if known.get(name) != sig]
+            if not gone and not changed:
+                return
+            self.conn.executemany("DELETE FROM entries WHERE scope=? AND filename=?",
+                                  [(scope, name) for name in gone])
+            for name in changed:
+                self._upsert(scope, Path(directory) / name, describe)
+            self.conn.commit()
+
+    def record(self, scope: str, path: Path, describe: Describe, content: Optional[dict] = None):
+        """Index one file just written by the caller (content passed to skip a re-read)."""
+        with self.lock:
+            self._upsert(scope, Path(path), describe, content)
+            self.conn.commit()
+
+    def forget(self, scope: str, filename: str):
+        with self.lock:
+            self.conn.execute("DELETE FROM entries WHERE scope=? AND filename=?", (scope, filename))
+            self.conn.commit()
+
+    def _upsert(self, scope, path: Path, describe: Describe, content=None):
+        try:
+            st = path.stat()
+        except OSError:
+            self.conn.execute("DELETE FROM entries WHERE scope=? AND filename=?", (scope, path.name))
+            return
+        fingerprint, summary, ok = None, None, 1
+        try:
+            if content is None:
+                with path.open("r", encoding="utf-8") as f:
+                    content = json.load(f)
+            fingerprint, summary = describe(content)
+            summary = json.dumps(summary, ensure_ascii=False)
+        except Exception as e:
+            logger.warning("Indexing skipped unreadable %s: %s", path, e)
+            ok = 0
+        self.conn.execute(
+            "INSERT INTO entries (scope, filename, fingerprint, mtime, mtime_ns, size, summary, ok) "
+            "VALUES (?,?,?,?,?,?,?,?) "
+            "ON CONFLICT(scope, filename) DO UPDATE SET fingerprint=excluded.fingerprint, "
+            "mtime=excluded.mtime, mtime_ns=excluded.mtime_ns, size=excluded.size, "
+            "summary=excluded.summary, ok=excluded.ok",
+            (scope, path.name, fingerprint, st.st_mtime, st.st_mtime_ns, st.st_size, summary, ok))
+
+    # -- lookups -----------------------------------------------------------
+    def find(self, scope: str, fingerprint: str) -> Optional[str]:
+        """Filename of a file in ``scope`` with this fingerprint, if any."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT filename FROM entries WHERE scope=? AND fingerprint=? AND ok=1 LIMIT 1",
+                (scope, fingerprint)).fetchone()
+        return row[0] if row else None
+
+    def count(self, scope: str) -> int:
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE scope=? AND ok=1", (scope,)).fetchone()[0]
+
+    def rows(self, scope: str, order_by: str = "mtime", descending: bool = True,
+             limit: Optional[int] = None, offset: int = 0) -> list:
+        """Readable entries as dicts: filename, mtime, size, fingerprint + summary fields.
+
+        ``order_by`` is ``mtime``, ``filename``, ``size`` or the name of a
+        summary field (sorted via json_extract)."""
+        if order_by in ("mtime", "filename", "size"):
+            key, params = order_by, []
+        elif _FIELD_RE.match(order_by or ""):
+            key, params = "json_extract(summary, ?)", [f"$.{order_by}"]
+        else:
+            raise ValueError(f"Unsortable field: {order_by!r}")
+        direction = "DESC" if descending else "ASC"
+        sql = (f"SELECT filename, mtime, size, fingerprint, summary FROM entries "
+               f"WHERE scope=? AND ok=1 ORDER BY {key} {direction}, filename {direction}")
+        params = [scope] + params
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [int(limit), int(offset)]
+        with self.lock:
+            fetched = self.conn.execute(sql, params).fetchall()
+        out = []
+        for filename, mtime, size, fingerprint, summary in fetched:
+            out.append({"filename": filename, "mtime": mtime, "size": size,
+                        "fingerprint": fingerprint, **json.loads(summary or "{}")})
+        return out
+
+
+_indexes: dict = {}
+_indexes_lock = threading.Lock()
+
+
+def open_index(path: Path) -> JsonDirIndex:
+    """Shared index for ``path``. Reopened (and so rebuilt by the next sync)
+    if the db file was deleted underneath us."""
+    path = Path(path)
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is not None and not path.exists():
+            index.close()
+            index = None
+        if index is None:
+            index = _indexes[path] = JsonDirIndex(path)
+        return index
@@ -0,0 +1,137 @@
+"""Mount routers on first use instead of at import.
+
+Importing every router at startup pulls in google-genai, PIL, asyncpg, the
+music/OSC managers and the template prompt module before the first request
+can be answered, which is the cold-start cost of a scale-to-zero deployment.
+``LazySurface`` is a route that only knows its path prefixes. The first
+request under one of them imports the router module (in a worker thread,
+so the event loop keeps serving), includes its routes, and every later
+request dispatches straight to them.
+
+Prefix rules: an entry ending in ``/`` claims that subtree; any other entry
+is an exact path. A request that falls under a surface's prefixes but
+matches none of its routes gets the usual 405 or 404.
+
+``report()`` lists every surface with its mode (eager / lazy / disabled),
+whether it has been loaded, and how long its import took.
+
+With lazy surfaces the OpenAPI schema (``/docs``) covers only the surfaces
+that were mounted eagerly.
+"""
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Optional
+
+from fastapi import APIRouter
+from starlette._utils import get_route_path
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_surfaces: dict = {}   # name → {"name", "module", "mode", "loaded", "import_ms"}
+_lock = threading.Lock()
+startup_ms: Optional[float] = None  # set by backend/server.py once its import finishes
+
+
+def record(name: str, module: str, mode: str, import_ms: Optional[float] = None) -> None:
+    with _lock:
+        _surfaces[name] = {"name": name, "module": module, "mode": mode,
+                           "loaded": import_ms is not None,
+                           "import_ms": round(import_ms, 1) if import_ms is not None else None}
+
+
+def timed_import(module: str):
+    """Import ``module``; returns (module, elapsed ms)."""
+    t0 = time.perf_counter()
+    mod = importlib.import_module(module)
+    return mod, (time.perf_counter() - t0) * 1000
+
+
+def report() -> list:
+    with _lock:
+        return [dict(s) for s in _surfaces.values()]
+
+
+def claims(prefixes, path: str) -> bool:
+    """Whether ``path`` falls under ``prefixes`` (rules in the module docstring)."""
+    return any(path.startswith(p) if p.endswith("/") else path == p for p in prefixes)
+
+
+class LazySurface(BaseRoute):
+    """Stands in for ``module.router`` until a request under ``prefixes`` arrives."""
+
+    def __init__(self, name: str, module: str, prefixes: tuple):
+        self.name = name
+        self.module = module
+        self.prefixes = tuple(prefixes)
+        self._inner: Optional[APIRouter] = None
+        self._load_lock: Optional[asyncio.Lock] = None
+        record(name, module, "lazy")
+
+    @property
+    def loaded(self) -> bool:
+        return self._inner is not None
+
+    def _load_sync(self) -> APIRouter:
+        mod, ms = timed_import(self.module)
+        inner = APIRouter()
+        inner.include_router(mod.router)
+        record(self.name, self.module, "lazy", ms)
+        logger.info("Loaded %s surface on first use (%.0f ms)", self.name, ms)
+        return inner
+
+    async def _ensure_loaded(self) -> APIRouter:
+        if self._inner is None:
+            if self._load_lock is None:
+                self._load_lock = asyncio.Lock()
+            async with self._load_lock:
+                if self._inner is None:
+                    self._inner = await asyncio.to_thread(self._load_sync)
+        return self._inner
+
+    # -- BaseRoute ---------------------------------------------------------
+    def matches(self, scope: Scope):
+        if scope["type"] not in ("http", "websocket") or not claims(self.prefixes, get_route_path(scope)):
+            return Match.NONE, {}
+        if self._inner is None:
+            return Match.FULL, {}  # resolved in handle(), after the import
+        partial = None
+        for route in self._inner.routes:
+            match, child = route.matches(scope)
+            if match == Match.FULL:
+                return match, child
+            if match == Match.PARTIAL and partial is None:
+                partial = child
+        return (Match.PARTIAL, partial) if partial is not None else (Match.NONE, {})
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        inner = scope.get("route")
+        if inner is None or inner is self:
+            # First request for this surface: load, then match against the real routes.
+            router = await self._ensure_loaded()
+            partial = None
+            for route in router.routes:
+                match, child = route.matches(scope)
+                if match == Match.FULL:
+                    inner, partial = route, None
+                    scope.update(child)
+                    break
+                if match == Match.PARTIAL and partial is None:
+                    partial = (route, child)
+            else:
+                if partial is None:
+                    await router.not_found(scope, receive, send)
+                    return
+                inner = partial[0]
+                scope.update(partial[1])
+        scope["route"] = inner
+        await inner.handle(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params):
+        if self._inner is None:
+            raise NoMatchFound(name, path_params)
+        return self._inner.url_path_for(name, **path_params)
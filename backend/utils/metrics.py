@@ -0,0 +1,195 @@
+"""In-process latency histograms for the hot paths.
+
+``span("google_api.gen_text", model=m)`` (a context manager) or
+``@timed("storage.put")`` (sync or async functions) records the wall time of
+a block into a histogram keyed by name + labels. ``snapshot()`` returns
+count / sum / mean / p50 / p95 / p99 / max per series; ``prometheus_text()``
+renders the same in Prometheus exposition format. Both back the admin-only
+``/api/admin/metrics`` endpoint.
+
+Buckets are fixed and log-spaced (1 ms … 10 min), so recording is a bisect
+plus a few integer adds under one lock, and memory is constant per series.
+Quantiles are interpolated within the bucket.
+
+``SYNTH_METRICS=0`` disables recording: ``span()`` then returns a shared
+no-op context manager and ``timed`` wrappers make a single flag check, so
+instrumented code pays close to nothing.
+
+Keep label values low-cardinality (model names, stages, status classes —
+never user ids or prompts).
+"""
+import bisect
+import functools
+import inspect
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("SYNTH_METRICS", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Upper bounds in ms; the last bucket is +Inf.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000,
+              10000, 20000, 60000, 120000, 300000, 600000)
+
+_series: dict = {}
+_lock = threading.Lock()
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "sum", "max", "errors")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = BUCKETS_MS[i - 1] if i else 0.0
+                hi = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max
+                return min(self.max, lo + (hi - lo) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items()))) if labels else (name, ())
+
+
+def observe(name: str, ms: float, error: bool = False, **labels) -> None:
+    """Record one duration (milliseconds)."""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    idx = bisect.bisect_left(BUCKETS_MS, ms)
+    with _lock:
+        h = _series.get(key)
+        if h is None:
+            h = _series[key] = _Histogram()
+        h.counts[idx] += 1
+        h.count += 1
+        h.sum += ms
+        if ms > h.max:
+            h.max = ms
+        if error:
+            h.errors += 1
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _span:
+    __slots__ = ("name", "labels", "t0")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, (time.perf_counter() - self.t0) * 1000,
+                error=exc_type is not None, **self.labels)
+        return False
+
+
+def span(name: str, **labels):
+    """``with span("credits.reserve"):`` — times the block; an exception
+    counts toward the series' ``errors`` and still records the duration."""
+    if not ENABLED:
+        return _NO_SPAN
+    return _span(name, labels)
+
+
+def timed(name: str, **labels):
+    """Decorator form of ``span`` for sync and async functions."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not ENABLED:
+                    return await func(*args, **kwargs)
+                with _span(name, labels):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            with _span(name, labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> list:
+    """One row per series, slowest total time first."""
+    with _lock:
+        items = [(k, h.count, h.sum, h.max, h.errors,
+                  h.quantile(0.5), h.quantile(0.95), h.quantile(0.99))
+                 for k, h in _series.items()]
+    rows = [{
+        "name": name, "labels": dict(labels), "count": count, "errors": errors,
+        "sum_ms": round(total, 1), "mean_ms": round(total / count, 2) if count else 0.0,
+        "p50_ms": round(p50, 2), "p95_ms": round(p95, 2), "p99_ms": round(p99, 2),
+        "max_ms": round(mx, 2),
+    } for (name, labels), count, total, mx, errors, p50, p95, p99 in items]
+    rows.sort(key=lambda r: r["sum_ms"], reverse=True)
+    return rows
+
+
+def prometheus_text() -> str:
+    """Histograms as ``synth_<name>_ms`` in Prometheus text format."""
+    with _lock:
+        items = sorted((k, list(h.counts), h.count, h.sum) for k, h in _series.items())
+    lines, typed = [], set()
+    for (name, labels), counts, count, total in items:
+        metric = "synth_" + "".join(c if c.isalnum() else "_" for c in name) + "_ms"
+        if metric not in typed:
+            typed.add(metric)
+            lines.append(f"# TYPE {metric} histogram")
+        base = ",".join(f'{k}="{str(v)}"' for k, v in labels)
+        cumulative = 0
+        for bound, n in zip(list(BUCKETS_MS) + ["+Inf"], counts):
+            cumulative += n
+            le = f'le="{bound}"'
+            lines.append(f"{metric}_bucket{{{base + ',' if base else ''}{le}}} {cumulative}")
+        suffix = f"{{{base}}}" if base else ""
+        lines.append(f"{metric}_sum{suffix} {total:.3f}")
+        lines.append(f"{metric}_count{suffix} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def format_table(rows: list = None) -> str:
+    """Plain-text summary (CLI runs log this at exit)."""
+    rows = snapshot() if rows is None else rows
+    out = [f"{'series':<48} {'n':>6} {'p50':>9} {'p95':>9} {'max':>9} {'total s':>9}"]
+    for r in rows:
+        label = r["name"] + ("{" + ",".join(f"{k}={v}" for k, v in r["labels"].items()) + "}"
+                             if r["labels"] else "")
+        out.append(f"{label[:48]:<48} {r['count']:>6} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+                   f"{r['max_ms']:>9.1f} {r['sum_ms'] / 1000:>9.1f}")
+    return "\n".join(out)
+
+
+def reset() -> None:
+    with _lock:
+        _series.clear()
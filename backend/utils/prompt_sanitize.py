@@ -0,0 +1,113 @@
+"""Prompt sanitizers with their patterns compiled once.
+
+- ``clean_midjourney_prompt`` — drops image URLs (only scanned for when the
+  prompt has a ``://``) and cuts at the first Midjourney parameter
+  (`` --ar``) or `` Job ID:``.
+- ``name_scrubber(cast)`` — swaps character names for role descriptors
+  (film_factory's Veo celebrity-filter workaround). The whole cast becomes
+  one alternation, so a prompt is scanned once rather than once per
+  character. Past ``TRIE_MIN_NAMES`` names the alternation is emitted as a
+  prefix trie, which keeps matching cost tied to the prompt length instead
+  of the cast size (``re`` tries a flat alternation branch by branch).
+  Scrubbers are cached per cast, and each memoizes its results per text,
+  so re-scrubbing the same shot prompt on a retake is a dict lookup.
+"""
+import functools
+import re
+from typing import Dict, Iterable, Tuple
+
+# ── Midjourney metadata ──────────────────────────────────────────────────────
+
+_MJ_URL = re.compile(r"https?://\S+\s*")
+# Start of the parameter tail: " --ar 16:9 --v 6", " Job ID: ..."
+_MJ_TAIL = re.compile(r"\s--[a-zA-Z]+|\sJob ID:")
+
+
+def clean_midjourney_prompt(prompt: str) -> str:
+    """Removes Midjourney parameters, Job IDs, and image URLs from the prompt."""
+    if not prompt:
+        return ""
+    if "://" in prompt:
+        prompt = _MJ_URL.sub("", prompt)
+    match = _MJ_TAIL.search(prompt)
+    return (prompt[:match.start()] if match else prompt).strip()
+
+
+# ── character-name scrubbing ─────────────────────────────────────────────────
+
+TRIE_MIN_NAMES = 24
+MEMO_SIZE = 2048  # scrubbed texts remembered per scrubber
+
+# ((name variant, ...), descriptor) per character, in priority order
+Cast = Tuple[Tuple[Tuple[str, ...], str], ...]
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Regex matching exactly ``words``, factored into a prefix trie."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def walk(node: dict) -> str:
+        alts = [re.escape(ch) + walk(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        # Greedy optional: longer names are tried before the one ending here.
+        return f"(?:{body})?" if "" in node else body
+
+    return walk(trie)
+
+
+class NameScrubber:
+    """Callable replacing any cast name (optionally with 's) by its descriptor.
+
+    Matching is case-insensitive and whole-word; the longest name wins, and
+    a name shared by two characters goes to the first one listed.
+    """
+
+    __slots__ = ("cast", "_pattern", "_desc", "_memo")
+
+    def __init__(self, cast: Cast):
+        self.cast = cast
+        self._desc: Dict[str, str] = {}
+        for names, desc in cast:
+            for name in names:
+                self._desc.setdefault(name.lower(), desc)
+        self._memo: Dict[str, str] = {}
+        if not self._desc:
+            self._pattern = None
+            return
+        names = sorted(self._desc, key=len, reverse=True)
+        alternation = (_trie_regex(names) if len(names) >= TRIE_MIN_NAMES
+                       else "|".join(re.escape(n) for n in names))
+        self._pattern = re.compile(r"\b(" + alternation + r")('s)?\b", re.IGNORECASE)
+
+    def _replace(self, m: re.Match) -> str:
+        desc = self._desc.get(m.group(1).lower())
+        if desc is None:  # case folding disagreed with str.lower(); leave it
+            return m.group(0)
+        return desc + (m.group(2) or "")
+
+    def __call__(self, text: str) -> str:
+        if self._pattern is None or not text:
+            return text
+        out = self._memo.get(text)
+        if out is None:
+            out = self._pattern.sub(self._replace, text)
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            self._memo[text] = out
+        return out
+
+    def __repr__(self) -> str:
+        return f"<NameScrubber {len(self._desc)} names>"
+
+
+@functools.lru_cache(maxsize=32)
+def name_scrubber(cast: Cast) -> NameScrubber:
+    """The scrubber for ``cast`` — built and compiled once per distinct cast."""
+    return NameScrubber(cast)
@@ -1,32 +1,327 @@
-import time
+"""Retries for model/API calls.
+
+- ``classify(exc)`` sorts an error into a class (rate-limited, unavailable,
+  timeout, network, blocked, fatal). It reads structure first: HTTP codes
+  (``code`` / ``status_code``), gRPC status names (``status``), httpx and
+  builtin timeout/connection types, SafetyBlockedError. It walks the
+  ``__cause__`` / ``__context__`` chain, because services re-wrap SDK errors
+  as ``Exception(f"...: {e}")``. Only when no structured information exists
+  does it fall back to the message text.
+- ``Backoff`` — decorrelated-jitter exponential backoff: each wait is
+  ``uniform(base, previous * 3)`` capped at ``cap``. Concurrent callers that
+  failed together don't retry together.
+- ``RetryBudget`` — a shared token bucket per key (usually the model). Every
+  retry spends a token and every success refunds a fraction. Once the bucket
+  is half empty, callers stop retrying and fail fast instead of adding to a
+  429 storm; it refills as calls start succeeding again.
+- ``call_with_retry`` / ``acall_with_retry`` and the ``retrying`` decorator
+  (sync or async functions) tie these together under a ``RetryPolicy`` with
+  an overall per-call deadline. The async path sleeps with ``asyncio.sleep``,
+  so waiting never pins a thread.
+- ``stats()`` — per-key counters: calls, attempts, retries, give-ups,
+  budget refusals, successes.
+"""
+import asyncio
 import functools
-from typing import Tuple
+import inspect
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
 
-# Error substrings that indicate a transient (retryable) server error
-TRANSIENT_INDICATORS: Tuple[str, ...] = ("500", "503", "INTERNAL", "UNAVAILABLE", "RESOURCE_EXHAUSTED")
+logger = logging.getLogger(__name__)
 
-def retry_on_transient(max_attempts: int = 3, backoff_base: float = 5.0):
-    """Decorator that retries a function on transient Google API errors.
-    
-    Uses linear backoff: wait = backoff_base * attempt_number.
-    Non-transient errors are raised immediately.
-    """
+RATE_LIMITED = "rate_limited"
+UNAVAILABLE = "unavailable"
+TIMEOUT = "timeout"
+NETWORK = "network"
+BLOCKED = "blocked"
+FATAL = "fatal"
+
+RETRYABLE = frozenset({RATE_LIMITED, UNAVAILABLE, TIMEOUT, NETWORK})
+
+_HTTP_CLASSES = {429: RATE_LIMITED, 408: TIMEOUT, 500: UNAVAILABLE, 502: UNAVAILABLE,
+                 503: UNAVAILABLE, 504: TIMEOUT}
+_GRPC_CLASSES = {"RESOURCE_EXHAUSTED": RATE_LIMITED, "UNAVAILABLE": UNAVAILABLE,
+                 "INTERNAL": UNAVAILABLE, "DEADLINE_EXCEEDED": TIMEOUT}
+
+# Last resort for errors that reached us as bare strings.
+_TEXT_PATTERNS = (
+    (re.compile(r"\b429\b|RESOURCE_EXHAUSTED|quota", re.I), RATE_LIMITED),
+    (re.compile(r"\b50[0-3]\b|\bUNAVAILABLE\b|\bINTERNAL\b"), UNAVAILABLE),
+    (re.compile(r"\b504\b|DEADLINE_EXCEEDED|timed out|timeout", re.I), TIMEOUT),
+    (re.compile(r"connection (reset|refused|aborted|error)|disconnected|remote end closed"
+                r"|name resolution|getaddrinfo|eof occurred|temporarily unavailable"
+                r"|network is unreachable|\b11001\b", re.I), NETWORK),
+)
+
+
+def _classify_one(e: BaseException) -> Optional[str]:
+    from backend.helpers import SafetyBlockedError
+    if isinstance(e, SafetyBlockedError):
+        return BLOCKED
+    status = getattr(e, "status", None)
+    if isinstance(status, str) and status in _GRPC_CLASSES:
+        return _GRPC_CLASSES[status]
+    for attr in ("code", "status_code"):
+        code = getattr(e, attr, None)
+        if isinstance(code, int) and 400 <= code < 600:
+            return _HTTP_CLASSES.get(code, FATAL if code < 500 else UNAVAILABLE)
+    response = getattr(e, "response", None)
+    code = getattr(response, "status_code", None)
+    if isinstance(code, int) and 400 <= code < 600:
+        return _HTTP_CLASSES.get(code, FATAL if code < 500 else UNAVAILABLE)
+    try:
+        import httpx
+        if isinstance(e, httpx.TimeoutException):
+            return TIMEOUT
+        if isinstance(e, httpx.TransportError):
+            return NETWORK
+    except ImportError:
+        pass
+    if isinstance(e, (TimeoutError, asyncio.TimeoutError)):
+        return TIMEOUT
+    if isinstance(e, ConnectionError):
+        return NETWORK
+    return None
+
+
+def classify(exc: BaseException) -> str:
+    """One of RATE_LIMITED / UNAVAILABLE / TIMEOUT / NETWORK / BLOCKED / FATAL."""
+    seen, e = set(), exc
+    while e is not None and id(e) not in seen and len(seen) < 8:
+        seen.add(id(e))
+        cls = _classify_one(e)
+        if cls is not None:
+            return cls
+        e = e.__cause__ or e.__context__
+    text = str(exc)
+    for pattern, cls in _TEXT_PATTERNS:
+        if pattern.search(text):
+            return cls
+    return FATAL
+
+
+def is_retryable(exc: BaseException) -> bool:
+    return classify(exc) in RETRYABLE
+
+
+class Backoff:
+    """Decorrelated jitter: ``next()`` → ``min(cap, uniform(base, prev * 3))``."""
+
+    def __init__(self, base: float = 1.0, cap: float = 60.0, rng: random.Random = None):
+        self.base = base
+        self.cap = cap
+        self._prev = base
+        self._rng = rng or random
+
+    def next(self) -> float:
+        self._prev = min(self.cap, self._rng.uniform(self.base, self._prev * 3))
+        return self._prev
+
+
+class RetryBudget:
+    """Token bucket shared by every caller of one key (see module docstring)."""
+
+    def __init__(self, max_tokens: float = 10.0, refund: float = 0.1):
+        self.max_tokens = max_tokens
+        self.refund = refund
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def allow_retry(self) -> bool:
+        with self._lock:
+            if self.tokens <= self.max_tokens / 2:
+                return False
+            self.tokens -= 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.refund)
+
+    @property
+    def open(self) -> bool:
+        """True while retries are being refused (the breaker has tripped)."""
+        return self.tokens <= self.max_tokens / 2
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base: float = 1.0             # first backoff floor, seconds
+    cap: float = 30.0             # longest single wait
+    deadline: Optional[float] = None  # whole call incl. waits, seconds
+    retry_on: frozenset = RETRYABLE
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+_budgets: dict = {}
+_stats: dict = {}
+_registry_lock = threading.Lock()
+_COUNTERS = ("calls", "attempts", "retries", "successes", "give_ups", "budget_refusals")
+
+
+def budget_for(key: str) -> RetryBudget:
+    with _registry_lock:
+        budget = _budgets.get(key)
+        if budget is None:
+            budget = _budgets[key] = RetryBudget()
+        return budget
+
+
+def count(key: str, counter: str) -> None:
+    """Bump one of the per-key counters (for callers running their own loop)."""
+    with _registry_lock:
+        row = _stats.get(key)
+        if row is None:
+            row = _stats[key] = dict.fromkeys(_COUNTERS, 0)
+        row[counter] += 1
+
+
+def stats() -> dict:
+    """{key: {calls, attempts, retries, successes, give_ups, budget_refusals, breaker_open}}"""
+    with _registry_lock:
+        return {k: {**v, "breaker_open": _budgets[k].open if k in _budgets else False}
+                for k, v in sorted(_stats.items())}
+
+
+def reset() -> None:
+    """Forget all budgets and counters (tests)."""
+    with _registry_lock:
+        _budgets.clear()
+        _stats.clear()
+
+
+class _Attempts:
+    """Shared bookkeeping for the sync and async runners: after a failure,
+    ``wait_for(exc)`` returns the seconds to sleep, or None to give up."""
+
+    def __init__(self, policy: RetryPolicy, key: str, name: str):
+        self.policy = policy
+        self.key = key
+        self.name = name
+        self.backoff = Backoff(policy.base, policy.cap)
+        self.budget = budget_for(key)
+        self.started = time.monotonic()
+        self.attempt = 0
+        count(key, "calls")
+
+    def begin(self) -> Optional[float]:
+        """Count an attempt; returns the remaining deadline (None = unbounded)."""
+        self.attempt += 1
+        count(self.key, "attempts")
+        if self.policy.deadline is None:
+            return None
+        return max(0.0, self.policy.deadline - (time.monotonic() - self.started))
+
+    def succeeded(self) -> None:
+        count(self.key, "successes")
+        self.budget.record_success()
+
+    def wait_for(self, exc: BaseException) -> Optional[float]:
+        cls = classify(exc)
+        if cls not in self.policy.retry_on or self.attempt >= self.policy.max_attempts:
+            if cls in self.policy.retry_on:
+                count(self.key, "give_ups")
+            return None
+        wait = self.backoff.next()
+        if self.policy.deadline is not None:
+            if time.monotonic() - self.started + wait >= self.policy.deadline:
+                count(self.key, "give_ups")
+                return None
+        if not self.budget.allow_retry():
+            count(self.key, "budget_refusals")
+            count(self.key, "give_ups")
+            logger.warning("%s: retry budget for %s exhausted — failing fast (%s)",
+                           self.name, self.key, cls)
+            return None
+        count(self.key, "retries")
+        logger.warning("%s: %s (attempt %d/%d), retrying in %.1fs: %s", self.name, cls,
+                       self.attempt, self.policy.max_attempts, wait, str(exc)[:120])
+        return wait
+
+
+def call_with_retry(fn: Callable, *args, policy: RetryPolicy = DEFAULT_POLICY,
+                    key: Optional[str] = None, **kwargs):
+    """Run a blocking ``fn`` with retries. Sleeps the calling thread — use
+    ``acall_with_retry`` from async code."""
+    name = getattr(fn, "__name__", "call")
+    state = _Attempts(policy, key or name, name)
+    while True:
+        state.begin()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            wait = state.wait_for(e)
+            if wait is None:
+                raise
+            time.sleep(wait)
+            continue
+        state.succeeded()
+        return result
+
+
+async def acall_with_retry(fn: Callable, *args, policy: RetryPolicy = DEFAULT_POLICY,
+                           key: Optional[str] = None, **kwargs):
+    """Async runner. ``fn`` may be a coroutine function or a blocking
+    callable (run via ``asyncio.to_thread``). Waits don't hold a thread, and
+    the deadline also bounds each attempt."""
+    name = getattr(fn, "__name__", "call")
+    state = _Attempts(policy, key or name, name)
+    is_coro = inspect.iscoroutinefunction(fn)
+    while True:
+        remaining = state.begin()
+        work = fn(*args, **kwargs) if is_coro else asyncio.to_thread(fn, *args, **kwargs)
+        try:
+            result = await (asyncio.wait_for(work, remaining) if remaining is not None else work)
+        except Exception as e:
+            wait = state.wait_for(e)
+            if wait is None:
+                raise
+            await asyncio.sleep(wait)
+            continue
+        state.succeeded()
+        return result
+
+
+def retrying(policy: RetryPolicy = DEFAULT_POLICY,
+             key: Union[str, Callable[..., str], None] = None):
+    """Decorator form. ``key`` names the shared budget/counters — a string, or
+    a callable given the wrapped call's arguments (e.g. to key by model)."""
     def decorator(func):
+        def key_of(args, kwargs):
+            if callable(key):
+                try:
+                    return key(*args, **kwargs)
+                except Exception:
+                    return func.__name__
+            return key or func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await acall_with_retry(func, *args, policy=policy,
+                                              key=key_of(args, kwargs), **kwargs)
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            last_err = None
-            for attempt in range(max_attempts):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    last_err = e
-                    err_str = str(e)
-                    if any(indicator in err_str for indicator in TRANSIENT_INDICATORS):
-                        wait = backoff_base * (attempt + 1)
-                        print(f"Transient error in {func.__name__} (attempt {attempt+1}/{max_attempts}), retrying in {wait}s: {err_str[:120]}")
-                        time.sleep(wait)
-                        continue
-                    raise  # Non-transient — don't retry
-            raise last_err  # All retries exhausted
+            return call_with_retry(func, *args, policy=policy, key=key_of(args, kwargs), **kwargs)
         return wrapper
     return decorator
+
+
+def retry_on_transient(max_attempts: int = 3, backoff_base: float = 5.0):
+    """Decorator that retries a function on transient Google API errors.
+
+    Kept for existing call sites: same arguments, now with jittered backoff
+    (``backoff_base`` is the first wait's floor), structured classification
+    and the shared per-function budget.
+    """
+    return retrying(RetryPolicy(max_attempts=max_attempts, base=backoff_base,
+                                cap=backoff_base * 6))
@@ -0,0 +1,117 @@
+"""Bridge a blocking iterator (an SDK token stream) into async code.
+
+``asyncio.to_thread(next, it)`` per chunk pays a thread-pool handoff for
+every token and competes with all other blocking work on the default
+executor. ``ThreadedIterator`` instead runs the whole iterator on one
+dedicated thread, which pushes chunks onto an asyncio.Queue through
+``call_soon_threadsafe``.
+
+A semaphore bounds how far the worker may run ahead of the consumer. On
+``close()`` (leaving the ``async with``, e.g. the client disconnected) the
+worker stops at the next chunk boundary and closes the iterator on its own
+thread, so generator ``finally`` blocks run and the SDK's HTTP stream is
+torn down instead of being drained to the end.
+"""
+import asyncio
+import logging
+import threading
+from typing import Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BUFFER = 256  # chunks the worker may queue ahead of the consumer
+
+_ITEM, _DONE, _ERROR = 0, 1, 2
+
+
+class ThreadedIterator:
+    """``async with ThreadedIterator(lambda: sync_gen()) as it: async for x in it``.
+
+    ``factory`` is called on the worker thread, so even creating the
+    iterator (which may open the connection) stays off the event loop.
+    Exceptions from the iterator are re-raised from ``__anext__``.
+    """
+
+    def __init__(self, factory: Callable[[], Iterator], max_buffer: int = DEFAULT_MAX_BUFFER,
+                 name: str = "stream-bridge"):
+        self._factory = factory
+        self._name = name
+        self._slots = threading.Semaphore(max(1, max_buffer))
+        self._stop = threading.Event()
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self._finished = False
+
+    # -- lifecycle ---------------------------------------------------------
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self.thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self.thread.start()
+
+    def close(self) -> None:
+        """Ask the worker to stop. Never blocks; the thread exits on its own."""
+        self._stop.set()
+        self._slots.release()  # wake a worker waiting for buffer space
+
+    async def __aenter__(self) -> "ThreadedIterator":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    # -- consumer side -----------------------------------------------------
+    def __aiter__(self) -> "ThreadedIterator":
+        return self
+
+    async def __anext__(self):
+        if self.thread is None:
+            self.start()
+        if self._finished:
+            raise StopAsyncIteration
+        kind, value = await self._queue.get()
+        if kind == _ITEM:
+            self._slots.release()
+            return value
+        self._finished = True
+        if kind == _ERROR:
+            raise value
+        raise StopAsyncIteration
+
+    # -- worker side -------------------------------------------------------
+    def _push(self, kind: int, value=None) -> bool:
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, (kind, value))
+            return True
+        except RuntimeError:  # loop closed under us — nobody is listening
+            self._stop.set()
+            return False
+
+    def _run(self) -> None:
+        it = None
+        try:
+            it = self._factory()
+            for item in it:
+                while not self._slots.acquire(timeout=0.25):
+                    if self._stop.is_set():
+                        break
+                if self._stop.is_set() or not self._push(_ITEM, item):
+                    break
+            else:
+                self._push(_DONE)
+                return
+            logger.debug("%s stopped early (consumer closed)", self._name)
+        except BaseException as e:
+            if not self._stop.is_set():
+                self._push(_ERROR, e)
+        finally:
+            close = getattr(it, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    logger.debug("%s: closing iterator failed: %s", self._name, e)
@@ -0,0 +1,11 @@
+"""Offline benchmark for the request pipeline.
+
+Drives representative scenarios (batch text, analysis batch, template
+generation, artifact save/list, streamed text) through the real FastAPI app
+with the Gemini client and the asyncpg pool replaced by deterministic,
+latency-configurable fakes — no network, no keys, no spend. Reports
+throughput, p50/p95/p99, time-to-first-byte, allocation figures, and a
+pass/fail comparison against a stored baseline.
+
+Run from anywhere:  python -m scripts.bench [options]   (see cli.py)
+"""
@@ -0,0 +1,112 @@
+"""Benchmark CLI.
+
+  python -m scripts.bench                          # all scenarios, service mode
+  python -m scripts.bench --scenarios batch_text,text_stream --requests 200
+  python -m scripts.bench --latency-ms 0           # pure app overhead
+  python -m scripts.bench --local                  # local install path (no accounts/metering)
+  python -m scripts.bench --out run.json           # full results (incl. server-side spans)
+  python -m scripts.bench --save-baseline bench_baseline.json
+  python -m scripts.bench --baseline bench_baseline.json [--tolerance 0.15]
+
+With --baseline the exit status is 1 when any compared metric (p50/p95/p99,
+throughput, TTFB, alloc KiB) moved the wrong way by more than the tolerance.
+Baselines are machine-specific: save and compare on the same box.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+async def run(scenario_names, *, requests=40, concurrency=8, warmup=3, alloc_requests=5,
+              latency_ms=20.0, chunk_ms=10.0, db_latency_ms=0.5, service=True,
+              api_mode="interactions") -> dict:
+    """Run the named scenarios against a fresh fake upstream; returns the results dict."""
+    from . import fakes, harness
+    from .scenarios import SCENARIOS
+
+    client = fakes.FakeGenaiClient(latency_ms=latency_ms, chunk_ms=chunk_ms)
+    pool = fakes.BenchPool(latency_ms=db_latency_ms, artifacts=60)
+    config = {"requests": requests, "concurrency": concurrency, "latency_ms": latency_ms,
+              "chunk_ms": chunk_ms, "db_latency_ms": db_latency_ms,
+              "service": service, "api_mode": api_mode}
+    results = {"config": config, "environment": harness.environment(), "scenarios": {}}
+    # Services print progress lines per call; keep the calls, drop the output.
+    with fakes.install(client, pool, service=service, api_mode=api_mode) as cookies, \
+            open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        from backend.server import app
+        for name in scenario_names:
+            scenario = SCENARIOS[name]
+            if scenario.service_only and not service:
+                continue
+            results["scenarios"][name] = await harness.run_scenario(
+                app, scenario, requests=requests, concurrency=concurrency,
+                warmup=warmup, alloc_requests=alloc_requests, cookies=cookies)
+    results["upstream_calls"] = client.calls
+    results["db_queries"] = pool.queries
+    return results
+
+
+def main(argv=None):
+    from .scenarios import SCENARIOS
+
+    ap = argparse.ArgumentParser(prog="python -m scripts.bench",
+                                 description="Offline request-pipeline benchmark.")
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS),
+                    help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    ap.add_argument("--requests", type=int, default=40, help="timed requests per scenario")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--warmup", type=int, default=3)
+    ap.add_argument("--alloc-requests", type=int, default=5,
+                    help="sequential tracemalloc requests per scenario (0 = skip)")
+    ap.add_argument("--latency-ms", type=float, default=20.0, help="fake model latency per call")
+    ap.add_argument("--chunk-ms", type=float, default=10.0, help="fake gap between stream chunks")
+    ap.add_argument("--db-latency-ms", type=float, default=0.5, help="fake DB round trip")
+    ap.add_argument("--api-mode", choices=("interactions", "legacy"), default="interactions")
+    ap.add_argument("--local", action="store_true", help="local install path (SYNTH_AUTH off)")
+    ap.add_argument("--out", type=Path, help="write full results JSON here")
+    ap.add_argument("--baseline", type=Path, help="compare against this results JSON")
+    ap.add_argument("--save-baseline", type=Path, help="write results as a new baseline")
+    ap.add_argument("--tolerance", type=float, default=0.15,
+                    help="allowed fractional regression before --baseline fails")
+    args = ap.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        ap.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    from . import harness
+
+    results = asyncio.run(run(
+        names, requests=args.requests, concurrency=args.concurrency, warmup=args.warmup,
+        alloc_requests=args.alloc_requests, latency_ms=args.latency_ms,
+        chunk_ms=args.chunk_ms, db_latency_ms=args.db_latency_ms,
+        service=not args.local, api_mode=args.api_mode))
+    print(harness.format_results(results))
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            path.write_text(json.dumps(results, indent=2))
+            print(f"wrote {path}")
+
+    failed = any(r["errors"] for r in results["scenarios"].values())
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        mismatch = harness.config_mismatch(results, baseline)
+        if mismatch:
+            print(f"warning: run settings differ from the baseline ({', '.join(mismatch)})")
+        rows = harness.compare(results, baseline, args.tolerance)
+        print(harness.format_comparison(rows, args.tolerance))
+        failed = failed or any(r["regressed"] for r in rows)
+    return 1 if failed else 0
@@ -0,0 +1,376 @@
+"""Deterministic stand-ins for the two network dependencies of a request.
+
+``FakeGenaiClient`` answers ``interactions.create`` (streaming or not) and the
+legacy ``models.generate_content[_stream]`` with canned output after a
+configurable sleep, so everything from ``google_api`` upward runs for real.
+``BenchPool`` is an in-memory asyncpg pool that speaks exactly the SQL the
+metered request path emits (session lookup, reserve/settle, ledger,
+artifacts) — same approach as the FakePool fixtures in tests/, but built to
+stay up for thousands of requests. Unknown SQL raises, so a query added to
+the request path shows up as bench errors instead of silently skipped work.
+
+``install()`` wires both in (plus in-memory artifact storage and a signed-in
+user) and restores everything on exit.
+"""
+import asyncio
+import base64
+import contextlib
+import functools
+import hashlib
+import io
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+BENCH_TERMS = "bench"
+BENCH_TOKEN = "bench-session"
+
+TEMPLATE = {
+    "promptTemplate": "a {{style}} portrait of a {{subject}} in {{setting}}, {{lighting}}",
+    "variables": [
+        {"name": "style", "feature_name": "style",
+         "values": ["oil painting", "cyanotype", "risograph", "claymation"]},
+        {"name": "subject", "feature_name": "subject",
+         "values": ["lighthouse keeper", "astronaut", "street musician", "beekeeper"]},
+        {"name": "setting", "feature_name": "setting",
+         "values": ["a foggy harbor", "a neon arcade", "a desert motel", "a greenhouse"]},
+        {"name": "lighting", "feature_name": "lighting",
+         "values": ["golden hour", "sodium streetlight", "overcast", "candlelight"]},
+    ],
+}
+
+_WORDS = ("luminous", "grain", "harbor", "static", "velvet", "signal", "amber", "drift",
+          "chrome", "moss", "echo", "lantern", "tide", "ember", "paper", "orbit")
+
+
+def _text_for(seed: str, words: int) -> str:
+    rng = random.Random(hashlib.blake2b(seed.encode(), digest_size=8).digest())
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def tiny_png(size: int = 64, seed: int = 0) -> bytes:
+    """A small real PNG (analysis and artifact payloads)."""
+    from PIL import Image
+    img = Image.new("RGB", (size, size), ((seed * 53) % 256, (seed * 97) % 256, 128))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+# ── genai ────────────────────────────────────────────────────────────────────
+
+class FakeGenaiClient:
+    """Sleeps ``latency_ms`` (± ``jitter``) per call, then returns canned output.
+
+    Streams yield ``chunks`` deltas: the first after ``latency_ms``, the rest
+    ``chunk_ms`` apart. JSON-mode requests get ``json_reply`` (a dict, or a
+    callable of the request text returning one; default a valid template);
+    requests carrying an image get an analysis-style paragraph; everything
+    else gets text derived from the input, so output is stable across runs.
+    """
+
+    def __init__(self, latency_ms: float = 20.0, jitter: float = 0.2,
+                 chunk_ms: float = 10.0, chunks: int = 8, seed: int = 0, json_reply=None):
+        self.json_reply = TEMPLATE if json_reply is None else json_reply
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.chunk_ms = chunk_ms
+        self.chunks = chunks
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.interactions = SimpleNamespace(create=self._interactions_create)
+        self.models = SimpleNamespace(generate_content=self._generate_content,
+                                      generate_content_stream=self._generate_content_stream)
+
+    def _wait(self, ms: float) -> None:
+        if ms <= 0:
+            return
+        with self._lock:
+            factor = 1 + self.jitter * (2 * self._rng.random() - 1)
+        time.sleep(ms * factor / 1000)
+
+    def _answer(self, seed: str, json_mode: bool, has_image: bool) -> str:
+        with self._lock:
+            self.calls += 1
+        if json_mode:
+            reply = self.json_reply(seed) if callable(self.json_reply) else self.json_reply
+            return json.dumps(reply)
+        if has_image:
+            return "A photograph of " + _text_for(seed, 40)
+        return _text_for(seed, 60)
+
+    def _pieces(self, text: str) -> list:
+        step = max(1, -(-len(text) // self.chunks))
+        return [text[i:i + step] for i in range(0, len(text), step)]
+
+    # -- Interactions ---------------------------------------------------------
+    def _interactions_create(self, *, model, input, stream=False, response_format=None, **_):
+        blocks = [b for step in input for b in step.get("content", [step])] \
+            if isinstance(input, list) else []
+        has_image = any(b.get("type") == "image" for b in blocks)
+        seed = model + "".join(b.get("text", "")[:200] for b in blocks)
+        text = self._answer(seed, response_format is not None, has_image)
+        if not stream:
+            self._wait(self.latency_ms)
+            return SimpleNamespace(status="completed", output_text=text, steps=[])
+        return self._interaction_events(text)
+
+    def _interaction_events(self, text):
+        self._wait(self.latency_ms)
+        yield SimpleNamespace(event_type="step.start", step=SimpleNamespace(type="model_output"))
+        for i, piece in enumerate(self._pieces(text)):
+            if i:
+                self._wait(self.chunk_ms)
+            yield SimpleNamespace(event_type="step.delta",
+                                  delta=SimpleNamespace(type="text", text=piece))
+
+    # -- legacy generateContent ----------------------------------------------
+    def _legacy_text(self, model, contents, config):
+        has_image = any(getattr(p, "inline_data", None) is not None
+                        for c in contents for p in (getattr(c, "parts", None) or []))
+        json_mode = getattr(config, "response_mime_type", None) == "application/json"
+        return self._answer(model + str(contents)[:400], json_mode, has_image)
+
+    def _generate_content(self, *, model, contents, config=None):
+        text = self._legacy_text(model, contents, config)
+        self._wait(self.latency_ms)
+        return SimpleNamespace(text=text, candidates=None, prompt_feedback=None)
+
+    def _generate_content_stream(self, *, model, contents, config=None):
+        text = self._legacy_text(model, contents, config)
+        self._wait(self.latency_ms)
+        for i, piece in enumerate(self._pieces(text)):
+            if i:
+                self._wait(self.chunk_ms)
+            yield SimpleNamespace(text=piece)
+
+
+# ── Postgres ────────────────────────────────────────────────────────────────
+
+@functools.lru_cache(maxsize=256)
+def _norm(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def bench_user(user_id: int = 1) -> dict:
+    from backend.service.credits import current_period
+    return {
+        "id": user_id, "google_sub": f"bench-{user_id}", "email": f"bench{user_id}@example.com",
+        "email_verified": True, "name": "Bench User", "avatar_url": None, "tier": "free",
+        "credits_balance": 10 ** 9, "credits_period": current_period(),
+        "accepted_terms_version": BENCH_TERMS, "age_attested_at": "2026-01-01T00:00:00Z",
+        "stripe_customer_id": None, "disabled_at": None,
+    }
+
+
+class BenchPool:
+    """In-memory asyncpg pool; each call awaits ``latency_ms`` like a round trip."""
+
+    SEEDED_GENERATION = 1  # an owned 'image' generation the artifact scenarios save against
+
+    def __init__(self, latency_ms: float = 0.5, artifacts: int = 0):
+        self.latency = latency_ms / 1000
+        self.user = bench_user()
+        self.balance = self.user["credits_balance"]
+        self.generations = {self.SEEDED_GENERATION: {"user_id": 1, "action": "image",
+                                                     "status": "ok"}}
+        self._gen_ids = itertools.count(self.SEEDED_GENERATION + 1)
+        self.artifacts = {}
+        self._artifact_ids = itertools.count(1)
+        self.ledger = 0
+        self.queries = 0
+        for _ in range(artifacts):
+            self._insert_artifact(1, self.SEEDED_GENERATION, "image", "image/png", 2048,
+                                  "users/1/seed.png", None, None)
+
+    async def _rt(self) -> None:
+        self.queries += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    def _insert_artifact(self, user_id, generation_id, kind, mime, nbytes, path, label, thumb):
+        aid = next(self._artifact_ids)
+        self.artifacts[aid] = {"id": aid, "user_id": user_id, "generation_id": generation_id,
+                               "kind": kind, "mime": mime, "bytes": nbytes,
+                               "storage_path": path, "label": label, "thumb_path": thumb,
+                               "created_at": datetime.now(timezone.utc)}
+        return aid
+
+    # -- asyncpg surface -----------------------------------------------------
+    async def fetchrow(self, sql, *args):
+        await self._rt()
+        s = _norm(sql)
+        if "FROM sessions s JOIN users u" in s:
+            if args[0] != _token_hash():
+                return None
+            now = datetime.now(timezone.utc)
+            return dict(self.user, credits_balance=self.balance, token_hash=args[0],
+                        session_created_at=now, expires_at=now + timedelta(days=30),
+                        last_seen_at=now, user_agent="bench")
+        if "SELECT action FROM generations" in s:
+            gen = self.generations.get(args[0])
+            return {"action": gen["action"]} if gen and gen["user_id"] == args[1] else None
+        if "FOR UPDATE" in s:
+            return {"credits_balance": self.balance, "credits_period": self.user["credits_period"]}
+        raise AssertionError(f"bench pool: unexpected fetchrow: {s}")
+
+    async def fetchval(self, sql, *args):
+        await self._rt()
+        s = _norm(sql)
+        if "SET credits_balance = credits_balance -" in s:
+            if self.balance < args[0]:
+                return None
+            self.balance -= args[0]
+            return self.balance
+        if "SET credits_balance = credits_balance +" in s:
+            self.balance += args[0]
+            return self.balance
+        if "INSERT INTO generations" in s:
+            gid = next(self._gen_ids)
+            self.generations[gid] = {"user_id": args[0], "action": args[2], "status": "failed"}
+            return gid
+        if "SELECT credits_balance FROM users" in s:
+            return self.balance
+        if "SUM(usd_est)" in s:
+            return 0.0
+        if "SELECT COALESCE(SUM(bytes), 0) FROM artifacts" in s:
+            return sum(a["bytes"] for a in self.artifacts.values() if a["user_id"] == args[0])
+        if "INSERT INTO artifacts" in s:
+            return self._insert_artifact(*args)
+        raise AssertionError(f"bench pool: unexpected fetchval: {s}")
+
+    async def fetch(self, sql, *args):
+        await self._rt()
+        s = _norm(sql)
+        if "FROM artifacts WHERE user_id = $1" in s:
+            user_id, before_id, limit = args
+            rows = (a for aid, a in sorted(self.artifacts.items(), reverse=True)
+                    if a["user_id"] == user_id and (before_id is None or aid < before_id))
+            return list(itertools.islice(rows, limit))
+        raise AssertionError(f"bench pool: unexpected fetch: {s}")
+
+    async def execute(self, sql, *args):
+        await self._rt()
+        s = _norm(sql)
+        if "INSERT INTO credit_ledger" in s:
+            self.ledger += 1
+        elif "UPDATE generations SET status" in s:
+            status = "ok" if "status = 'ok'" in s else "refunded"
+            self.generations.setdefault(args[-1], {"user_id": 1, "action": "?"})["status"] = status
+        elif "DELETE FROM artifacts WHERE id = $1" in s:
+            self.artifacts.pop(args[0], None)
+        elif "UPDATE artifacts SET thumb_path = NULL" in s:
+            self.artifacts[args[0]]["thumb_path"] = None
+        elif "UPDATE sessions SET last_seen_at" in s or "UPDATE users SET credits_balance = $1" in s:
+            pass
+        else:
+            raise AssertionError(f"bench pool: unexpected execute: {s}")
+
+    @contextlib.asynccontextmanager
+    async def _conn(self):
+        yield _Conn(self)
+
+    def acquire(self):
+        return self._conn()
+
+
+class _Conn:
+    def __init__(self, pool):
+        self.fetchrow, self.fetchval = pool.fetchrow, pool.fetchval
+        self.fetch, self.execute = pool.fetch, pool.execute
+
+    @contextlib.asynccontextmanager
+    async def _tx(self):
+        yield self
+
+    def transaction(self):
+        return self._tx()
+
+
+def _token_hash() -> str:
+    from backend.service import auth
+    return auth._hash(BENCH_TOKEN)
+
+
+class MemoryStorage:
+    """The artifact store's I/O functions over a dict."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def enabled(self):
+        return True
+
+    def put(self, path, data, mime):
+        self.objects[path] = data
+
+    def get(self, path):
+        return self.objects[path]
+
+    def signed_url(self, path, ttl_seconds=None):
+        return f"https://bench.invalid/{path}"
+
+    def delete(self, path):
+        self.objects.pop(path, None)
+
+
+def b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+# ── wiring ──────────────────────────────────────────────────────────────────
+
+_ENV = {
+    "SYNTH_AUTH": "1",
+    "GOOGLE_OAUTH_CLIENT_ID": "bench.apps.googleusercontent.com",
+    "SYNTH_TERMS_VERSION": BENCH_TERMS,
+    "RATE_LIMIT_USER_REQUESTS": str(10 ** 9),
+    "ADMIN_EMAILS": "",
+    "SYNTH_HOSTED": None,  # the per-IP limiter would 429 a benchmark
+}
+
+
+@contextlib.contextmanager
+def install(client: FakeGenaiClient, pool: BenchPool, *, service: bool = True,
+            api_mode: str = "interactions"):
+    """Point the backend at the fakes; yields the cookies for the bench user.
+
+    ``service=False`` runs the local (unmetered, no accounts) request path.
+    """
+    saved_env = {k: os.environ.get(k) for k in _ENV}
+    for k, v in _ENV.items():
+        if v is None or (k == "SYNTH_AUTH" and not service):
+            os.environ.pop(k, None)
+        else:
+            os.environ[k] = v
+
+    from backend.ai_manager import ai_manager
+    from backend.policy import policy, TIER_GOOGLE
+    from backend.service import budget, db, storage
+
+    mem = MemoryStorage()
+    patches = [(ai_manager, "genai_client", client), (db, "_pool", pool),
+               (policy, "_tier", TIER_GOOGLE), (policy, "_google_api_mode", api_mode),
+               (budget, "_cache", {"at": 0.0, "usd": 0.0})]
+    patches += [(storage, name, getattr(mem, name))
+                for name in ("enabled", "put", "get", "signed_url", "delete")]
+    saved = [(obj, attr, getattr(obj, attr)) for obj, attr, _ in patches]
+    for obj, attr, value in patches:
+        setattr(obj, attr, value)
+    try:
+        from backend.service import auth
+        yield {auth.COOKIE_NAME: BENCH_TOKEN} if service else {}
+    finally:
+        for obj, attr, value in reversed(saved):
+            setattr(obj, attr, value)
+        for k, v in saved_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
@@ -0,0 +1,229 @@
+"""Drive the ASGI app directly, measure, and compare against a baseline.
+
+Requests go straight into ``app(scope, receive, send)`` — no sockets, no
+HTTP client buffering — so the numbers are the app's own cost plus the fake
+upstream latency, and time-to-first-byte is real for streaming endpoints.
+
+Each scenario runs twice: a timed pass at the requested concurrency
+(latency percentiles, throughput, gen-0 GC collections per request as a
+cheap allocation-churn signal), then a short sequential pass under
+``tracemalloc`` for peak allocated KiB per request, kept separate so the
+tracing overhead never reaches the latency numbers.
+"""
+import asyncio
+import gc
+import json
+import math
+import os
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from backend.utils import metrics
+
+
+@dataclass
+class Response:
+    status: int = 0
+    body: bytes = b""
+    ttfb_ms: Optional[float] = None
+    total_ms: float = 0.0
+
+
+async def request(app, method: str, path: str, json_body=None, cookies: dict = None) -> Response:
+    """One request through ``app``; the body is collected and timed per chunk."""
+    path, _, query = path.partition("?")
+    body = json.dumps(json_body).encode() if json_body is not None else b""
+    headers = [(b"host", b"bench.local"), (b"content-length", str(len(body)).encode())]
+    if json_body is not None:
+        headers.append((b"content-type", b"application/json"))
+    if cookies:
+        headers.append((b"cookie", "; ".join(f"{k}={v}" for k, v in cookies.items()).encode()))
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+             "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+             "query_string": query.encode(), "root_path": "", "headers": headers,
+             "client": ("127.0.0.1", 50000), "server": ("bench.local", 80)}
+    done = asyncio.Event()
+    sent = False
+    resp = Response()
+    chunks = []
+    t0 = time.perf_counter()
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            resp.status = message["status"]
+        elif message["type"] == "http.response.body":
+            data = message.get("body", b"")
+            if data:
+                if resp.ttfb_ms is None:
+                    resp.ttfb_ms = (time.perf_counter() - t0) * 1000
+                chunks.append(data)
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        done.set()
+    resp.total_ms = (time.perf_counter() - t0) * 1000
+    resp.body = b"".join(chunks)
+    return resp
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    body: Callable[[int], Optional[dict]] = lambda i: None
+    # Optional response check; return an error string to count the request as failed.
+    check: Optional[Callable[[Response], Optional[str]]] = None
+    streaming: bool = False
+    service_only: bool = False
+    description: str = ""
+
+
+def percentile(values, q: float) -> float:
+    """Nearest-rank percentile of ``values`` (q in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies, wall_s: float) -> dict:
+    return {
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / wall_s, 2) if wall_s > 0 else 0.0,
+    }
+
+
+async def _one(app, scenario: Scenario, i: int, cookies: dict):
+    resp = await request(app, scenario.method, scenario.path, scenario.body(i), cookies)
+    error = None
+    if resp.status >= 400:
+        error = f"HTTP {resp.status}: {resp.body[:200]!r}"
+    elif scenario.check is not None:
+        error = scenario.check(resp)
+    return resp, error
+
+
+async def run_scenario(app, scenario: Scenario, *, requests: int, concurrency: int,
+                       warmup: int, alloc_requests: int, cookies: dict) -> dict:
+    for i in range(warmup):
+        await _one(app, scenario, -1 - i, cookies)
+
+    metrics.reset()
+    results = []
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            results.append(await _one(app, scenario, i, cookies))
+
+    gc0 = gc.get_stats()[0]["collections"]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    wall = time.perf_counter() - t0
+    gc0 = gc.get_stats()[0]["collections"] - gc0
+    server_side = metrics.snapshot()[:6]
+
+    ok = [r for r, err in results if err is None]
+    errors = [err for _, err in results if err is not None]
+    row = {"requests": requests, "concurrency": concurrency, "errors": len(errors),
+           **summarize([r.total_ms for r in ok], wall),
+           "gc0_per_req": round(gc0 / max(1, requests), 3)}
+    if scenario.streaming:
+        row["ttfb_p50_ms"] = round(percentile([r.ttfb_ms for r in ok if r.ttfb_ms], 50), 2)
+        row["ttfb_p95_ms"] = round(percentile([r.ttfb_ms for r in ok if r.ttfb_ms], 95), 2)
+    if errors:
+        row["first_error"] = errors[0]
+
+    if alloc_requests:
+        peaks = []
+        tracemalloc.start()
+        try:
+            for i in range(alloc_requests):
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                await _one(app, scenario, requests + i, cookies)
+                peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        finally:
+            tracemalloc.stop()
+        row["alloc_peak_kib"] = round(sum(peaks) / len(peaks) / 1024, 1)
+    row["server"] = server_side
+    return row
+
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "machine": platform.machine(),
+            "cpus": os.cpu_count(), "lazy_routers": os.environ.get("SYNTH_LAZY_ROUTERS", "")}
+
+
+# ── baseline comparison ─────────────────────────────────────────────────────
+
+# metric → +1 when larger is worse, -1 when smaller is worse
+COMPARED = {"p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "throughput_rps": -1,
+            "alloc_peak_kib": 1, "ttfb_p50_ms": 1,
+            # film_factory bench stages
+            "wall_s": 1, "shots_per_min": -1, "loop_lag_p95_ms": 1}
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """One row per (scenario, metric) present in both runs; ``regressed`` when
+    the metric moved the wrong way by more than ``tolerance`` (a fraction)."""
+    rows = []
+    for name, cur in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for metric, sign in COMPARED.items():
+            if metric not in cur or metric not in base or not base[metric]:
+                continue
+            change = (cur[metric] - base[metric]) / base[metric]
+            rows.append({"scenario": name, "metric": metric, "baseline": base[metric],
+                         "current": cur[metric], "change": round(change, 3),
+                         "regressed": sign * change > tolerance})
+    return rows
+
+
+def config_mismatch(current: dict, baseline: dict) -> list:
+    """Run settings that differ from the baseline's (numbers aren't comparable)."""
+    a, b = current.get("config", {}), baseline.get("config", {})
+    return [k for k in sorted(set(a) | set(b)) if a.get(k) != b.get(k)]
+
+
+def format_results(results: dict) -> str:
+    head = f"{'scenario':<16} {'n':>5} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} " \
+           f"{'ttfb50':>8} {'KiB/req':>8} {'gc0/req':>8}"
+    lines = [head, "-" * len(head)]
+    for name, r in results["scenarios"].items():
+        ttfb = f"{r['ttfb_p50_ms']:.1f}" if "ttfb_p50_ms" in r else "-"
+        kib = f"{r['alloc_peak_kib']:.0f}" if "alloc_peak_kib" in r else "-"
+        lines.append(f"{name:<16} {r['requests']:>5} {r['errors']:>4} {r['throughput_rps']:>8.1f} "
+                     f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+                     f"{ttfb:>8} {kib:>8} {r['gc0_per_req']:>8.2f}")
+        if r.get("first_error"):
+            lines.append(f"  first error: {r['first_error']}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: list, tolerance: float) -> str:
+    lines = [f"vs baseline (tolerance {tolerance:.0%}):"]
+    for r in rows:
+        flag = "  REGRESSED" if r["regressed"] else ""
+        lines.append(f"  {r['scenario']:<16} {r['metric']:<15} {r['baseline']:>10} -> "
+                     f"{r['current']:<10} {r['change']:+.1%}{flag}")
+    return "\n".join(lines)
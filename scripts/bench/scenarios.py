@@ -0,0 +1,68 @@
+"""The request mixes the benchmark drives through the real app.
+
+Each one is a representative call of a hot endpoint, sized like real
+traffic: an 8-prompt text batch, a 4-image analysis batch, a text-mode
+template, an artifact save and a gallery page, and a streamed completion.
+"""
+import json
+
+from .fakes import BenchPool, b64, tiny_png
+from .harness import Response, Scenario
+
+_IMAGES = [b64(tiny_png(seed=i)) for i in range(4)]
+_ARTIFACT = b64(tiny_png(32, seed=9))
+
+
+def _ndjson_ok(resp: Response):
+    rows = [json.loads(line) for line in resp.body.splitlines() if line.strip()]
+    bad = [r for r in rows if r.get("status") != "success"]
+    return f"{len(bad)} failed rows: {bad[0]}" if bad else None
+
+
+def _batch_ok(resp: Response):
+    bad = [r for r in json.loads(resp.body)["results"] if r.get("status") != "success"]
+    return f"{len(bad)} failed prompts: {bad[0]}" if bad else None
+
+
+def _template_ok(resp: Response):
+    return None if isinstance(json.loads(resp.body).get("template"), dict) else "no template"
+
+
+SCENARIOS = {s.name: s for s in [
+    Scenario(
+        "batch_text", "POST", "/api/batch/text",
+        body=lambda i: {"prompts": [f"describe scene {i}.{k} in one line" for k in range(8)]},
+        check=_batch_ok,
+        description="8 prompts, each metered separately",
+    ),
+    Scenario(
+        "analyze_batch", "POST", "/api/analyze/batch",
+        body=lambda i: {"images": _IMAGES},
+        check=_ndjson_ok, streaming=True,
+        description="4 PNGs → NDJSON analysis rows",
+    ),
+    Scenario(
+        "template", "POST", "/api/generate/template",
+        body=lambda i: {"prompt": f"moody portraits, variation {i}", "mode": "text"},
+        check=_template_ok,
+        description="text-mode template (+ gallery naming in service mode)",
+    ),
+    Scenario(
+        "artifact_save", "POST", "/api/artifacts",
+        body=lambda i: {"data_b64": _ARTIFACT, "kind": "image", "mime": "image/png",
+                        "generation_id": BenchPool.SEEDED_GENERATION, "label": f"bench {i}"},
+        service_only=True,
+        description="save a small PNG to My creations",
+    ),
+    Scenario(
+        "artifact_list", "GET", "/api/me/artifacts",
+        service_only=True,
+        description="first gallery page",
+    ),
+    Scenario(
+        "text_stream", "POST", "/api/generate/text/stream",
+        body=lambda i: {"prompt": f"a short poem about tape hiss #{i}"},
+        streaming=True,
+        description="streamed completion; TTFB is the headline number",
+    ),
+]}
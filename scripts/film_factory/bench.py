@@ -0,0 +1,337 @@
+"""BENCH — time render -> qc -> assemble -> tapeify on a synthetic film, offline.
+
+  python -m scripts.film_factory bench [--bench-shots 12] [--bench-concurrency 1,3,6]
+                                       [--veo-latency 1.0] [--qc-latency-ms 200]
+                                       [--transient-rate 0.1] [--fake-ffmpeg]
+                                       [--ffmpeg-scale 1.0] [--save-baseline F | --baseline F]
+
+Builds a throwaway project (film.json, character sheets, keyframe stills,
+N pending shots across three acts) and drives the real stage code against
+it: ``ai.generate_video`` is an async fake that sleeps ``--veo-latency``
+and returns a tiny mp4, and the QC Gemini call goes to the offline genai
+fake with deterministic scores (some fall under the gate, so retakes
+happen). The render stage runs once per ``--bench-concurrency`` value on a
+reset shot table; assemble and tapeify (at ``--concurrency``) run once.
+
+ffmpeg: with ffmpeg on PATH the takes are real 8 s clips and every stage
+runs real ffmpeg. Without it (or with ``--fake-ffmpeg``) each ffmpeg call
+is replaced by a sleep of its modelled duration — ``FFMPEG_MODEL``,
+scaled by ``--ffmpeg-scale`` — that writes a plausible output file, so
+scheduling and DB changes can still be compared.
+
+Reported per stage: wall time, shots/min and takes (render), event-loop lag
+p95/max while rendering (blocking work inside the farm shows up here), and
+the QC call p50 from the metrics spans. ``--save-baseline`` / ``--baseline``
+use the same comparison as ``python -m scripts.bench``.
+"""
+import asyncio
+import base64
+import io
+import json
+import logging
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from . import REPO_ROOT
+
+log = logging.getLogger("filmfactory.bench")
+
+# Modelled ffmpeg costs for fake mode (seconds, before --ffmpeg-scale):
+# frame grabs are fixed; encodes are clip seconds / speed (x realtime).
+FFMPEG_MODEL = {"frame_s": 0.05, "concat_x_realtime": 12.0, "tapeify_x_realtime": 3.0}
+CLIP_SECONDS = 8
+FAKE_CLIP_KIB = 256
+
+CHARACTERS = [
+    {"id": "ava", "name": "Ava Marlowe", "role": "lead", "discipline": "sculpture"},
+    {"id": "teo", "name": "Teo Brandt", "role": "rival", "discipline": "glassblowing"},
+    {"id": "mina", "name": "Mina Oduya", "role": "host"},
+]
+
+
+# ── fakes ────────────────────────────────────────────────────────────────────
+
+class FakeStudio:
+    """Stands in for ai_manager: Veo via ``generate_video``, Gemini via ``genai_client``."""
+
+    def __init__(self, clip: bytes, veo_latency_s: float, qc_latency_ms: float,
+                 transient_rate: float = 0.0, seed: int = 7):
+        from scripts.bench.fakes import FakeGenaiClient
+        self._clip_b64 = base64.b64encode(clip).decode()
+        self.veo_latency_s = veo_latency_s
+        self.transient_rate = transient_rate
+        self._rng = random.Random(seed)
+        self.genai_client = FakeGenaiClient(latency_ms=qc_latency_ms, json_reply=self._qc_reply)
+        self.veo_calls = 0
+
+    def _qc_reply(self, _seed):
+        overall = round(self._rng.uniform(4.5, 9.5), 1)
+        return {"adherence": overall, "characters": 8, "artifacts": 8,
+                "overall": overall, "notes": "bench grade"}
+
+    async def generate_video(self, prompt, model_name=None, **_):
+        self.veo_calls += 1
+        await asyncio.sleep(self.veo_latency_s * (0.8 + 0.4 * self._rng.random()))
+        if self._rng.random() < self.transient_rate:
+            raise Exception("429 RESOURCE_EXHAUSTED: bench quota")
+        return {"video_b64": self._clip_b64, "video_uri": None}
+
+
+class FakeFFmpeg:
+    """Drop-in for the ``subprocess`` module inside qc/assemble/tapeify.
+
+    ``run`` sleeps the modelled duration of the ffmpeg command and writes its
+    output file; anything that is not ffmpeg is an error.
+    """
+    CalledProcessError = subprocess.CalledProcessError
+    TimeoutExpired = subprocess.TimeoutExpired
+    CompletedProcess = subprocess.CompletedProcess
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+        self.calls = {"frame": 0, "concat": 0, "tapeify": 0}
+        self._jpeg = _image_bytes(640, 360, "JPEG", seed=3)
+
+    def run(self, cmd, check=False, timeout=None, capture_output=False, **_):
+        if not cmd or Path(cmd[0]).name != "ffmpeg":
+            raise AssertionError(f"fake ffmpeg: unexpected command {cmd[:1]}")
+        src = Path(cmd[cmd.index("-i") + 1])
+        out = Path(cmd[-1])
+        if "-frames:v" in cmd:
+            op, secs, data = "frame", FFMPEG_MODEL["frame_s"], self._jpeg
+        elif "concat" in cmd:
+            clips = len(src.read_text(encoding="utf-8").splitlines())
+            op = "concat"
+            secs = clips * CLIP_SECONDS / FFMPEG_MODEL["concat_x_realtime"]
+            data = b"bench-concat"
+        else:
+            op = "tapeify"
+            secs = CLIP_SECONDS / FFMPEG_MODEL["tapeify_x_realtime"]
+            data = src.read_bytes()
+        self.calls[op] += 1
+        time.sleep(secs * self.scale)
+        out.write_bytes(data)
+        return subprocess.CompletedProcess(cmd, 0, b"", b"")
+
+
+def _image_bytes(w: int, h: int, fmt: str, seed: int = 0) -> bytes:
+    """Noise-textured still (so JPEG/PNG encode costs look like real frames)."""
+    from PIL import Image
+    noise = Image.effect_noise((w, h), 40 + seed).convert("RGB")
+    tint = Image.new("RGB", (w, h), ((seed * 71) % 256, (seed * 29) % 256, 140))
+    buf = io.BytesIO()
+    Image.blend(noise, tint, 0.5).save(buf, format=fmt)
+    return buf.getvalue()
+
+
+def _make_clip(work_dir: Path, real_ffmpeg: bool) -> bytes:
+    """A tiny real 8 s mp4 when ffmpeg is available, else placeholder bytes."""
+    if real_ffmpeg:
+        out = work_dir / "bench_clip.mp4"
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error",
+             "-f", "lavfi", "-i", f"testsrc2=size=320x180:rate=24:duration={CLIP_SECONDS}",
+             "-f", "lavfi", "-i", f"sine=frequency=440:duration={CLIP_SECONDS}",
+             "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+             "-c:a", "aac", "-shortest", str(out)],
+            check=True, timeout=120, capture_output=True)
+        return out.read_bytes()
+    return b"\x00\x00\x00\x18ftypmp42" + random.Random(0).randbytes(FAKE_CLIP_KIB * 1024)
+
+
+# ── synthetic film ──────────────────────────────────────────────────────────
+
+def build_film(db, n_shots: int) -> None:
+    """film.json, done character sheets, keyframes on every other shot."""
+    dirs = db.dirs()
+    db.set_meta("bench", 1)
+    db.set_meta("budget_usd", 10 ** 6)
+    db.set_meta("aspect", "16:9")
+    db.set_meta("tape_preset", "vhs")
+    db.save_film({"title": "Bench Reel", "logline": "A synthetic film for timing the farm.",
+                  "characters": CHARACTERS})
+    for i, c in enumerate(CHARACTERS):
+        path = dirs["bible"] / f"char_{c['id']}.png"
+        path.write_bytes(_image_bytes(768, 768, "PNG", seed=i))
+        db.exec("INSERT OR REPLACE INTO assets (id, kind, name, prompt, path, status) "
+                "VALUES (?,?,?,?,?, 'done')",
+                (f"char_{c['id']}", "character", c["name"], "sheet", str(path)))
+    keyframe = _image_bytes(1920, 1080, "PNG", seed=11)
+    for i in range(n_shots):
+        act = f"A{i * 3 // n_shots + 1}"
+        shot_id = f"{act}_S{i // 2 + 1:02d}_{i % 2 + 1:02d}"
+        a, b = CHARACTERS[i % 3], CHARACTERS[(i + 1) % 3]
+        kf_path = None
+        if i % 2 == 0:
+            kf_path = dirs["keyframes"] / f"{shot_id}.png"
+            kf_path.write_bytes(keyframe)
+        db.exec(
+            "INSERT OR REPLACE INTO shots (id, seq, act, scene, title, veo_prompt, "
+            "keyframe_prompt, characters, location, needs_keyframe, keyframe_path, "
+            "keyframe_status, status) VALUES (?,?,?,?,?,?,?,?,?,?,?,?, 'pending')",
+            (shot_id, i, act, f"S{i // 2 + 1:02d}", f"shot {i}",
+             f"Slow dolly past {a['name']} watching {b['name']} work, tungsten light, "
+             f"handheld documentary texture, take {i}.",
+             "still", json.dumps([a["id"], b["id"]]), "arena", int(kf_path is not None),
+             str(kf_path) if kf_path else None, "done" if kf_path else "skipped"))
+
+
+def reset_render(db) -> None:
+    db.exec("DELETE FROM takes")
+    db.exec("DELETE FROM ledger")
+    db.exec("UPDATE shots SET status='pending', selected_take=NULL, error=NULL")
+
+
+# ── timing ──────────────────────────────────────────────────────────────────
+
+async def _lag_monitor(samples: list, interval: float = 0.01):
+    while True:
+        t = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - t - interval) * 1000)
+
+
+async def _timed_render(ai, db, concurrency, max_takes, qc_threshold) -> dict:
+    from backend.utils import metrics, retry
+    from . import qc, render
+
+    retry.reset()
+    metrics.reset()
+    lag = []
+    monitor = asyncio.create_task(_lag_monitor(lag))
+    t0 = time.perf_counter()
+    try:
+        await render.run_async(ai, db, concurrency=concurrency, max_takes=max_takes,
+                               qc_threshold=qc_threshold)
+    finally:
+        monitor.cancel()
+    wall = time.perf_counter() - t0
+
+    from scripts.bench.harness import percentile
+    n_shots = db.fetchone("SELECT COUNT(*) FROM shots")[0]
+    selected = db.fetchone("SELECT COUNT(*) FROM shots WHERE status='selected'")[0]
+    takes = db.fetchone("SELECT COUNT(*) FROM takes")[0]
+    qc_row = next((r for r in metrics.snapshot() if r["name"] == "google_api.gen_text"
+                   and r["labels"].get("model") == qc.MODEL), None)
+    return {"wall_s": round(wall, 2), "shots": n_shots, "selected": selected, "takes": takes,
+            "shots_per_min": round(selected / wall * 60, 1) if wall else 0.0,
+            "loop_lag_p95_ms": round(percentile(lag, 95), 1),
+            "loop_lag_max_ms": round(max(lag, default=0.0), 1),
+            "qc_p50_ms": qc_row["p50_ms"] if qc_row else None}
+
+
+def _timed(fn, *args, **kwargs) -> float:
+    t0 = time.perf_counter()
+    fn(*args, **kwargs)
+    return round(time.perf_counter() - t0, 2)
+
+
+def run(project_dir: Path, *, shots=12, concurrencies=(1, 3, 6), tape_concurrency=3,
+        max_takes=2, qc_threshold=6.0, veo_latency_s=1.0, qc_latency_ms=200.0,
+        transient_rate=0.0, fake_ffmpeg=False, ffmpeg_scale=1.0, preset="vhs") -> dict:
+    """Build the synthetic film in ``project_dir`` and time every stage."""
+    from .db import DB
+    from . import assemble, qc, render, tapeify
+
+    if (project_dir / "film.db").exists() and DB(project_dir).get_meta("bench") != "1":
+        raise SystemExit(f"{project_dir} holds a real project — bench needs an empty dir.")
+    real_ffmpeg = not fake_ffmpeg and shutil.which("ffmpeg") is not None
+    db = DB(project_dir)
+    build_film(db, shots)
+    ai = FakeStudio(_make_clip(project_dir, real_ffmpeg), veo_latency_s, qc_latency_ms,
+                    transient_rate)
+    ffmpeg = None if real_ffmpeg else FakeFFmpeg(ffmpeg_scale)
+
+    # Retry waits scaled to the fake Veo latency (30-180 s would dwarf the run).
+    saved = [(render, "TRANSIENT_BASE_S", render.TRANSIENT_BASE_S),
+             (render, "TRANSIENT_CAP_S", render.TRANSIENT_CAP_S)]
+    if ffmpeg is not None:
+        saved += [(m, "subprocess", m.subprocess) for m in (qc, assemble, tapeify)]
+    render.TRANSIENT_BASE_S = veo_latency_s / 2
+    render.TRANSIENT_CAP_S = veo_latency_s * 2
+    if ffmpeg is not None:
+        for m in (qc, assemble, tapeify):
+            m.subprocess = ffmpeg
+
+    scenarios = {}
+    try:
+        for c in concurrencies:
+            reset_render(db)
+            scenarios[f"render_c{c}"] = asyncio.run(
+                _timed_render(ai, db, c, max_takes, qc_threshold))
+            log.info("render c=%d: %s", c, scenarios[f"render_c{c}"])
+        scenarios["assemble"] = {"wall_s": _timed(assemble.run, ai, db, version="bench")}
+        scenarios[f"tapeify_c{tape_concurrency}"] = {"wall_s": _timed(
+            tapeify.run, ai, db, concurrency=tape_concurrency, force=True, preset=preset)}
+    finally:
+        for obj, attr, value in saved:
+            setattr(obj, attr, value)
+
+    from scripts.bench.harness import environment
+    return {"config": {"shots": shots, "concurrencies": list(concurrencies),
+                       "tape_concurrency": tape_concurrency, "max_takes": max_takes,
+                       "qc_threshold": qc_threshold, "veo_latency_s": veo_latency_s,
+                       "qc_latency_ms": qc_latency_ms, "transient_rate": transient_rate,
+                       "ffmpeg": "real" if real_ffmpeg else f"fake x{ffmpeg_scale}",
+                       "preset": preset},
+            "environment": environment(),
+            "scenarios": scenarios,
+            "veo_calls": ai.veo_calls,
+            "ffmpeg_calls": ffmpeg.calls if ffmpeg else None}
+
+
+def format_results(results: dict) -> str:
+    lines = [f"{'stage':<14} {'wall s':>8} {'shots/min':>10} {'takes':>6} "
+             f"{'lag p95':>8} {'lag max':>8} {'qc p50':>8}"]
+    for name, r in results["scenarios"].items():
+        def col(key, width, spec=".1f"):
+            return format(r[key], f">{width}{spec}") if r.get(key) is not None else f"{'-':>{width}}"
+        lines.append(f"{name:<14} {r['wall_s']:>8.2f} {col('shots_per_min', 10)} "
+                     f"{col('takes', 6, 'd')} {col('loop_lag_p95_ms', 8)} "
+                     f"{col('loop_lag_max_ms', 8)} {col('qc_p50_ms', 8)}")
+    lines.append(f"ffmpeg: {results['config']['ffmpeg']}  veo calls: {results['veo_calls']}")
+    return "\n".join(lines)
+
+
+def main(args) -> int:
+    """Entry point for ``python -m scripts.film_factory bench`` (args from cli.py)."""
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    logging.basicConfig(level=logging.WARNING,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    from scripts.bench import harness
+
+    concurrencies = [int(c) for c in args.bench_concurrency.split(",") if c.strip()]
+    own_dir = args.project_dir is None
+    project_dir = Path(tempfile.mkdtemp(prefix="ff_bench_")) if own_dir else args.project_dir
+    try:
+        results = run(project_dir, shots=args.bench_shots, concurrencies=concurrencies,
+                      tape_concurrency=args.concurrency, max_takes=args.max_takes,
+                      qc_threshold=args.qc_threshold, veo_latency_s=args.veo_latency,
+                      qc_latency_ms=args.qc_latency_ms, transient_rate=args.transient_rate,
+                      fake_ffmpeg=args.fake_ffmpeg, ffmpeg_scale=args.ffmpeg_scale,
+                      preset=args.preset or "vhs")
+    finally:
+        if own_dir:
+            shutil.rmtree(project_dir, ignore_errors=True)
+    print(format_results(results))
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2))
+        print(f"wrote {args.save_baseline}")
+    failed = any(r.get("selected", r.get("shots")) != r.get("shots")
+                 for r in results["scenarios"].values())
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        mismatch = harness.config_mismatch(results, baseline)
+        if mismatch:
+            print(f"warning: run settings differ from the baseline ({', '.join(mismatch)})")
+        rows = harness.compare(results, baseline, args.tolerance)
+        print(harness.format_comparison(rows, args.tolerance))
+        failed = failed or any(r["regressed"] for r in rows)
+    return 1 if failed else 0
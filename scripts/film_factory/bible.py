@@ -2,17 +2,20 @@
 
 One 16:9 sheet per character (three views on neutral grey), one establishing
 plate per location, two style frames. These are the consistency refs for both
-keyframe generation and Veo reference-image shots.
+keyframe generation and Veo reference-image shots. Sheets generate
+concurrently (--concurrency) and land in refcache for the keyframes stage.
 """
-import base64
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from backend import config
-from . import costs
+from . import costs, refcache
 
 log = logging.getLogger("filmfactory.bible")
 
 MODEL = config.MODEL_IMAGE_GEN_HQ  # gemini-3-pro-image-preview
+DEFAULT_CONCURRENCY = 3
 
 
 def _sheet_prompts(film):
@@ -38,36 +41,67 @@ def _sheet_prompts(film):
         f"arena crowd, long shadows, drone perspective, no text. {style}"))
 
 
-def run(ai, db, only_failed=False):
+def _generate_sheet(ai, db, dirs, aid, name, prompt) -> None:
+    out = ai.generate_image(
+        prompt=prompt, model_name=MODEL, aspect_ratio="16:9",
+        media_resolution="media_resolution_medium", as_payload=True)
+    image = out["image"] if isinstance(out, dict) else out
+    path = dirs["bible"] / f"{aid}.png"
+    path.write_bytes(image.data)
+    refcache.remember(path, image.data)  # keyframes read it from memory
+    usd = costs.charge(db, "bible", aid, MODEL, 1)
+    db.exec("UPDATE assets SET status='done', path=?, cost=?, error=NULL WHERE id=?",
+            (str(path), usd, aid))
+    log.info("bible sheet done: %s (%s)", aid, name)
+
+
+def run(ai, db, only_failed=False, concurrency=DEFAULT_CONCURRENCY):
     dirs = db.dirs()
     film = db.film()
     if not film.get("characters"):
         raise SystemExit("Run develop first - film.json has no characters.")
 
+    todo = []
     for kind, aid, name, prompt in _sheet_prompts(film):
         db.exec("INSERT OR IGNORE INTO assets (id, kind, name, prompt) VALUES (?,?,?,?)",
                 (aid, kind, name, prompt))
         row = db.fetchone("SELECT status FROM assets WHERE id=?", (aid,))
         if row[0] == "done" or (only_failed and row[0] != "failed"):
             continue
-        costs.assert_budget(db, costs.estimate(MODEL, 1))
+        todo.append((aid, name, prompt))
+
+    # Sheets in flight are reserved against the budget, so N workers can't
+    # each pass the check and overshoot the cap together.
+    unit = costs.estimate(MODEL, 1)
+    in_flight = 0
+    gate = threading.Lock()
+
+    def work(item):
+        nonlocal in_flight
+        with gate:
+            costs.assert_budget(db, unit * (in_flight + 1))
+            in_flight += 1
         try:
-            out = ai.generate_image(
-                prompt=prompt, model_name=MODEL, aspect_ratio="16:9",
-                media_resolution="media_resolution_medium")
-            b64 = out["image"] if isinstance(out, dict) else out
-            path = dirs["bible"] / f"{aid}.png"
-            path.write_bytes(base64.b64decode(b64))
-            usd = costs.charge(db, "bible", aid, MODEL, 1)
-            db.exec("UPDATE assets SET status='done', path=?, cost=?, error=NULL WHERE id=?",
-                    (str(path), usd, aid))
-            log.info("bible sheet done: %s (%s)", aid, name)
-        except costs.BudgetExceeded:
-            raise
-        except Exception as e:
-            db.exec("UPDATE assets SET status='failed', error=? WHERE id=?",
-                    (str(e)[:500], aid))
-            log.error("bible sheet FAILED: %s - %s", aid, str(e)[:200])
+            _generate_sheet(ai, db, dirs, *item)
+        finally:
+            with gate:
+                in_flight -= 1
+
+    if todo:
+        log.info("BIBLE: %d sheets to generate (concurrency %d)", len(todo), concurrency)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(work, item): item[0] for item in todo}
+        for fut in as_completed(futures):
+            aid = futures[fut]
+            try:
+                fut.result()
+            except costs.BudgetExceeded:
+                pool.shutdown(cancel_futures=True)
+                raise
+            except Exception as e:
+                db.exec("UPDATE assets SET status='failed', error=? WHERE id=?",
+                        (str(e)[:500], aid))
+                log.error("bible sheet FAILED: %s - %s", aid, str(e)[:200])
 
     done, failed = (db.fetchone(
         "SELECT SUM(status='done'), SUM(status='failed') FROM assets"))
@@ -1,7 +1,7 @@
 """Film Factory CLI.
 
   python -m scripts.film_factory develop   [--project-dir D]
-  python -m scripts.film_factory bible     [--only-failed]
+  python -m scripts.film_factory bible     [--only-failed] [--concurrency 3]
   python -m scripts.film_factory keyframes [--concurrency 3] [--limit N]
   python -m scripts.film_factory render    [--concurrency 3] [--max-takes 2]
                                            [--limit N] [--shots id,id]
@@ -9,6 +9,10 @@
   python -m scripts.film_factory assemble  [--version v1]
   python -m scripts.film_factory status
   python -m scripts.film_factory budget    [--set 4500]
+  python -m scripts.film_factory bench     [--bench-shots 12] [--bench-concurrency 1,3,6]
+                                           [--veo-latency 1.0] [--fake-ffmpeg]
+                                           [--save-baseline F | --baseline F]
+                                           (offline: synthetic film, fake Veo/QC — see bench.py)
 
 Stop a running farm gracefully: create a file named STOP in the project dir.
 """
@@ -66,7 +70,7 @@ def main(argv=None):
     ap = argparse.ArgumentParser(prog="film_factory")
     ap.add_argument("command", choices=["develop", "bible", "keyframes", "render",
                                         "assemble", "status", "budget", "restyle",
-                                        "tapeify", "extend"])
+                                        "tapeify", "extend", "bench"])
     ap.add_argument("--force", action="store_true")
     ap.add_argument("--count", type=int, default=5, help="extend: how many new shots")
     ap.add_argument("--direction", type=str, default=None,
@@ -79,7 +83,8 @@ def main(argv=None):
                     help="assemble: use tapeify/ processed clips")
     ap.add_argument("--preset", type=str, default=None,
                     help="tapeify: signal-path preset (default: project meta)")
-    ap.add_argument("--project-dir", type=Path, default=DEFAULT_PROJECT)
+    ap.add_argument("--project-dir", type=Path, default=None,
+                    help=f"default {DEFAULT_PROJECT} (bench: a temp dir)")
     ap.add_argument("--concurrency", type=int, default=3)
     ap.add_argument("--limit", type=int, default=None)
     ap.add_argument("--shots", type=str, default=None, help="comma-separated shot ids")
@@ -89,14 +94,42 @@ def main(argv=None):
     ap.add_argument("--fast", action="store_true", help="render on Veo 3.1 Fast")
     ap.add_argument("--version", type=str, default="v1")
     ap.add_argument("--set", dest="set_value", type=float, default=None)
+    ap.add_argument("--bench-shots", type=int, default=12, help="bench: synthetic film length")
+    ap.add_argument("--bench-concurrency", type=str, default="1,3,6",
+                    help="bench: farm concurrencies to time (tapeify uses --concurrency)")
+    ap.add_argument("--veo-latency", type=float, default=1.0, help="bench: fake Veo seconds")
+    ap.add_argument("--qc-latency-ms", type=float, default=200.0, help="bench: fake QC call")
+    ap.add_argument("--transient-rate", type=float, default=0.0,
+                    help="bench: fraction of Veo calls that 429")
+    ap.add_argument("--fake-ffmpeg", action="store_true",
+                    help="bench: simulate ffmpeg even when it is installed")
+    ap.add_argument("--ffmpeg-scale", type=float, default=1.0,
+                    help="bench: multiplier on the modelled fake-ffmpeg durations")
+    ap.add_argument("--baseline", type=Path, default=None, help="bench: compare to this JSON")
+    ap.add_argument("--save-baseline", type=Path, default=None, help="bench: write results JSON")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="bench: allowed regression")
     args = ap.parse_args(argv)
 
+    if args.command == "bench":
+        from . import bench
+        return bench.main(args)
+    args.project_dir = args.project_dir or DEFAULT_PROJECT
+
     _setup_logging(args.project_dir)
     from . import bootstrap
     ai = bootstrap(args.project_dir)
     from .db import DB
     db = DB(args.project_dir)
+    from backend.utils import metrics
+    try:
+        with metrics.span("film_factory.stage", stage=args.command):
+            _dispatch(ap, args, ai, db)
+    finally:
+        if metrics.ENABLED and metrics.snapshot():
+            logging.getLogger("filmfactory").info("timings:\n%s", metrics.format_table())
+
 
+def _dispatch(ap, args, ai, db):
     if args.command == "status":
         status(db)
     elif args.command == "budget":
@@ -113,7 +146,7 @@ def main(argv=None):
                        args.direction or "")
     elif args.command == "bible":
         from . import bible
-        bible.run(ai, db, only_failed=args.only_failed)
+        bible.run(ai, db, only_failed=args.only_failed, concurrency=args.concurrency)
     elif args.command == "keyframes":
         from . import keyframes
         keyframes.run(ai, db, concurrency=args.concurrency, limit=args.limit,
@@ -142,4 +175,4 @@ def main(argv=None):
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -11,7 +11,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from PIL import Image
 
 from backend import config
-from . import costs
+from . import costs, refcache
 
 log = logging.getLogger("filmfactory.keyframes")
 
@@ -19,22 +19,26 @@ MODEL = config.MODEL_IMAGE_GEN_HQ
 
 
 def _load_refs(db, shot_chars, shot_loc):
-    """Ordered refs: up to 2 character sheets, the location plate, style frame."""
+    """Ordered refs: up to 2 character sheets, the location plate, style frame.
+
+    Sheets come from refcache, so each is read from disk (and base64'd for
+    the request) once per process rather than once per shot.
+    """
     refs, labels = [], []
     for cid in shot_chars[:2]:
         row = db.fetchone("SELECT path, name FROM assets WHERE id=? AND status='done'",
                           (f"char_{cid}",))
         if row:
-            refs.append(open(row[0], "rb").read())
+            refs.append(refcache.sheet(row[0]))
             labels.append(f"image {len(refs)}: character reference sheet for {row[1]}")
     row = db.fetchone("SELECT path, name FROM assets WHERE id=? AND status='done'",
                       (f"loc_{shot_loc}",))
     if row:
-        refs.append(open(row[0], "rb").read())
+        refs.append(refcache.sheet(row[0]))
         labels.append(f"image {len(refs)}: location plate ({row[1]})")
     row = db.fetchone("SELECT path FROM assets WHERE id='style_main' AND status='done'")
     if row and len(refs) < 4:
-        refs.append(open(row[0], "rb").read())
+        refs.append(refcache.sheet(row[0]))
         labels.append(f"image {len(refs)}: color grade / style frame")
     return refs, labels
 
@@ -0,0 +1,98 @@
+"""In-process cache of bible reference sheets.
+
+Keyframes condition every still on up to four bible sheets, and text-to-video
+takes send character sheets to Veo as JPEGs, so the same handful of files
+used to be read (and, for Veo, decoded and re-encoded) once per shot or take.
+Here each sheet is read once and held as an ``ImagePayload`` — its base64 is
+then encoded once too, however many keyframe requests carry it — and each
+Veo JPEG is built once. Safe to share across the keyframes thread pool.
+
+Entries are keyed by path and checked against the file's mtime/size on every
+lookup, so a sheet rewritten by another process is picked up; in-process
+replacements (``videorama_shots.regenerate_asset`` / ``upload_asset``) also
+drop the old entry explicitly via ``invalidate_asset``.
+"""
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from backend.utils.image_payload import ImagePayload
+
+MAX_ENTRIES = 64  # per kind; a bible is characters + locations + 2 style frames
+
+_lock = threading.Lock()
+_sheets: "OrderedDict[str, tuple]" = OrderedDict()  # path -> (signature, ImagePayload)
+_jpegs: "OrderedDict[tuple, tuple]" = OrderedDict()  # (path, max_w) -> (signature, b64 str)
+
+
+def _signature(path: str) -> tuple:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _get(table: OrderedDict, key, sig):
+    with _lock:
+        hit = table.get(key)
+        if hit is None or hit[0] != sig:
+            return None
+        table.move_to_end(key)
+        return hit[1]
+
+
+def _put(table: OrderedDict, key, sig, value) -> None:
+    with _lock:
+        table[key] = (sig, value)
+        table.move_to_end(key)
+        while len(table) > MAX_ENTRIES:
+            table.popitem(last=False)
+
+
+def sheet(path) -> ImagePayload:
+    """The sheet at ``path`` as a payload, read from disk at most once."""
+    key = str(path)
+    sig = _signature(key)
+    payload = _get(_sheets, key, sig)
+    if payload is None:
+        payload = ImagePayload.from_bytes(Path(key).read_bytes())
+        _put(_sheets, key, sig, payload)
+    return payload
+
+
+def remember(path, data: bytes) -> None:
+    """Seed the cache with a sheet just written to ``path``."""
+    key = str(path)
+    _put(_sheets, key, _signature(key), ImagePayload.from_bytes(data))
+
+
+def veo_jpeg(path, max_w: int = 1920) -> str:
+    """Cached ``keyframes.jpeg_for_veo(path, max_w)``."""
+    from .keyframes import jpeg_for_veo
+
+    key = (str(path), max_w)
+    sig = _signature(key[0])
+    b64 = _get(_jpegs, key, sig)
+    if b64 is None:
+        b64 = jpeg_for_veo(key[0], max_w)
+        _put(_jpegs, key, sig, b64)
+    return b64
+
+
+def invalidate(path=None) -> None:
+    """Drop everything cached for ``path`` (all entries when None)."""
+    with _lock:
+        if path is None:
+            _sheets.clear()
+            _jpegs.clear()
+            return
+        key = str(path)
+        _sheets.pop(key, None)
+        for jkey in [k for k in _jpegs if k[0] == key]:
+            del _jpegs[jkey]
+
+
+def invalidate_asset(db, asset_id: str) -> None:
+    """Drop the cached sheet of ``asset_id`` ahead of replacing it."""
+    row = db.fetchone("SELECT path FROM assets WHERE id=?", (asset_id,))
+    if row and row[0]:
+        invalidate(row[0])
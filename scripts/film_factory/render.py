@@ -11,11 +11,12 @@ import asyncio
 import base64
 import json
 import logging
-import re
 import time
 
 from backend import config, google_api
-from . import costs, qc
+from backend.utils import retry
+from backend.utils.prompt_sanitize import NameScrubber, name_scrubber
+from . import costs, qc, refcache
 from .keyframes import jpeg_for_veo
 
 log = logging.getLogger("filmfactory.render")
@@ -23,6 +24,8 @@ log = logging.getLogger("filmfactory.render")
 MODEL = config.MODEL_VIDEO_GEN  # veo-3.1-generate-preview
 TAKE_SECONDS = 8
 TRANSIENT_RETRIES = 5
+TRANSIENT_BASE_S = 30   # jittered backoff floor / cap for 429s and network blips
+TRANSIENT_CAP_S = 180
 
 SOFTEN_SYS = ("Rewrite this video prompt so it passes strict content filters "
               "while keeping the same cinematic intent: remove anything that "
@@ -30,29 +33,18 @@ SOFTEN_SYS = ("Rewrite this video prompt so it passes strict content filters "
               "keep length and structure. Return only the rewritten prompt.")
 
 
-def _is_transient(err: str) -> bool:
-    e = err.lower()
-    return any(k in e for k in ("429", "resource_exhausted", "quota", "rate",
-                                "timeout", "timed out", "503", "500", "unavailable",
-                                "deadline", "connection",
-                                # network / DNS blips — retry through them
-                                "getaddrinfo", "disconnect", "network",
-                                "name resolution", "temporarily", "reset by peer",
-                                "eof occurred", "11001", "connection reset",
-                                "remote end closed", "read timed out"))
-
-
 def _is_blocked(err: str) -> bool:
     e = err.lower()
     return any(k in e for k in ("safety", "blocked", "filtered", "violat",
                                 "prohibited", "responsible ai", "rai "))
 
 
-def build_name_subs(film: dict) -> list:
-    """(pattern, descriptor) pairs replacing character names with role
-    descriptors — Veo's celebrity filter false-positives on fictional full
-    names next to photoreal faces. Shared by the farm and single-shot ops."""
-    subs = []
+def build_name_subs(film: dict) -> NameScrubber:
+    """Scrubber replacing character names with role descriptors — Veo's
+    celebrity filter false-positives on fictional full names next to
+    photoreal faces. Shared by the farm and single-shot ops; compiled once
+    per distinct cast (see backend/utils/prompt_sanitize.py)."""
+    cast = []
     for c in film.get("characters", []):
         parts = c.get("name", "").split()
         if not parts:
@@ -61,16 +53,12 @@ def build_name_subs(film: dict) -> list:
         desc = ("the broadcast commentator" if c.get("role") == "host"
                 else f"the {disc} artist")
         names = [c["name"]] + ([parts[0], parts[-1]] if len(parts) > 1 else [])
-        pat = re.compile(r"\b(" + "|".join(re.escape(n) for n in names) + r")('s)?\b",
-                         re.IGNORECASE)
-        subs.append((pat, desc))
-    return subs
+        cast.append((tuple(names), desc))
+    return name_scrubber(tuple(cast))
 
 
-def scrub_names(prompt: str, subs: list) -> str:
-    for pat, desc in subs:
-        prompt = pat.sub(lambda m, d=desc: d + (m.group(2) or ""), prompt)
-    return prompt
+def scrub_names(prompt: str, subs: NameScrubber) -> str:
+    return subs(prompt)
 
 
 class Farm:
@@ -121,7 +109,7 @@ class Farm:
                     "SELECT path FROM assets WHERE id=? AND status='done'",
                     (f"char_{cid}",))
                 if row:
-                    refs.append(jpeg_for_veo(row[0]))
+                    refs.append(refcache.veo_jpeg(row[0]))
             if refs:
                 kw["reference_images"] = refs
         return kw
@@ -131,6 +119,8 @@ class Farm:
         prompt_used = shot["veo_prompt"]
         kwargs = self._veo_kwargs(shot)
         blocked_count = 0
+        backoff = retry.Backoff(TRANSIENT_BASE_S, TRANSIENT_CAP_S)
+        budget = retry.budget_for(self.model)
         for attempt in range(TRANSIENT_RETRIES + 1):
             costs.assert_budget(self.db, costs.estimate(self.model, TAKE_SECONDS))
             try:
@@ -146,6 +136,7 @@ class Farm:
                     "cost, status, qc_score, qc_notes) VALUES (?,?,?,?,?,?,?,?,?)",
                     (take_id, shot["id"], n, str(path), result.get("video_uri"),
                      usd, "done", score, notes))
+                budget.record_success()
                 log.info("take done %s qc=%.1f (%s)", take_id, score, notes[:60])
                 return score
             except costs.BudgetExceeded:
@@ -164,12 +155,22 @@ class Farm:
                         log.warning("take %s filtered twice, softening prompt", take_id)
                         kwargs["prompt"] = self._soften(prompt_used)
                         continue
-                if _is_transient(err) and attempt < TRANSIENT_RETRIES:
-                    wait = min(30 * (attempt + 1), 180)
-                    log.warning("take %s transient error (attempt %d, wait %ds): %s",
-                                take_id, attempt + 1, wait, err[:150])
+                if retry.is_retryable(e) and attempt < TRANSIENT_RETRIES:
+                    # Jittered so the pool's workers don't retry in lockstep; while
+                    # the model's shared budget is drained (a 429 storm) every
+                    # worker cools down for the full cap instead.
+                    if budget.allow_retry():
+                        wait = backoff.next()
+                    else:
+                        wait = TRANSIENT_CAP_S
+                        retry.count(self.model, "budget_refusals")
+                    retry.count(self.model, "retries")
+                    log.warning("take %s %s (attempt %d, wait %.0fs): %s", take_id,
+                                retry.classify(e), attempt + 1, wait, err[:150])
                     await asyncio.sleep(wait)
                     continue
+                if retry.is_retryable(e):
+                    retry.count(self.model, "give_ups")
                 self.db.exec(
                     "INSERT OR REPLACE INTO takes (id, shot_id, n, status, error) "
                     "VALUES (?,?,?,?,?)",
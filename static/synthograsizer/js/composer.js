@@ -2604,7 +2604,7 @@ function SessionRoom({
       color: 'var(--hw-text-dim)',
       letterSpacing: '.06em'
     }
-  }, (s.agents || []).length, " agents \xB7 ", Object.keys(s.sharedAnchors || {}).length, " anchors")), /*#__PURE__*/React.createElement("button", {
+  }, s.agentCount ?? (s.agents || []).length, " agents \xB7 ", s.anchorCount ?? Object.keys(s.sharedAnchors || {}).length, " anchors")), /*#__PURE__*/React.createElement("button", {
     className: "hw-btn tiny ghost",
     style: {
       color: 'var(--hw-pink)'
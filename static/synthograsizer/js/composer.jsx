@@ -1631,7 +1631,7 @@ function SessionRoom({
                            onClick={() => { onLoadSession && onLoadSession(s.id); setShowLoadMenu(false); }}>
                         <div style={{ fontFamily: 'var(--font-display)', fontSize: 14 }}>{s.name || '(unnamed)'}</div>
                         <div style={{ fontSize: 9, color: 'var(--hw-text-dim)', letterSpacing: '.06em' }}>
-                          {(s.agents || []).length} agents · {Object.keys(s.sharedAnchors || {}).length} anchors
+                          {s.agentCount ?? (s.agents || []).length} agents · {s.anchorCount ?? Object.keys(s.sharedAnchors || {}).length} anchors
                         </div>
                       </div>
                       <button className="hw-btn tiny ghost"
@@ -5590,7 +5590,9 @@ class StudioIntegration {
             html += this.renderSingleWorkflowResult(result, 0);
         } else {
             // Multiple results (batch mode)
-            html += `<p style="margin-bottom:15px; font-size:13px; color:#666;">Generated ${results.length} curated workflows from your reference images.</p>`;
+            const okCount = results.filter(r => r.template).length;
+            const failNote = okCount < results.length ? ` (${results.length - okCount} failed)` : '';
+            html += `<p style="margin-bottom:15px; font-size:13px; color:#666;">Generated ${okCount} curated workflows from your reference images${failNote}.</p>`;
             html += `<div style="display:flex; flex-direction:column; gap:15px;">`;
             results.forEach((result, idx) => {
                 html += `<div style="border:1px solid #e0e0e0; border-radius:8px; padding:12px;">`;
@@ -5632,6 +5634,11 @@ class StudioIntegration {
         const template = result.template;
         const rationale = result.rationale || [];
 
+        // A failed image in a batch keeps its slot with an error instead of a template
+        if (!template) {
+            return `<div style="background:#fdecea; color:#c62828; padding:8px 10px; border-radius:6px; font-size:12px;">Curation failed for this image: ${result.error || 'unknown error'}</div>`;
+        }
+
         let html = ``;
 
         // Show curated variable selections
@@ -5674,7 +5681,7 @@ class StudioIntegration {
     }
 
     importWorkflowResult(idx) {
-        if (!this.workflowResults || !this.workflowResults[idx]) {
+        if (!this.workflowResults || !this.workflowResults[idx] || !this.workflowResults[idx].template) {
             this.showToast("Result not found.", 'error');
             return;
         }
@@ -5691,7 +5698,7 @@ class StudioIntegration {
     }
 
     downloadWorkflowResult(idx) {
-        if (!this.workflowResults || !this.workflowResults[idx]) {
+        if (!this.workflowResults || !this.workflowResults[idx] || !this.workflowResults[idx].template) {
             this.showToast("Result not found.", 'error');
             return;
         }
@@ -0,0 +1,53 @@
+"""Offline benchmark harness: every scenario runs clean against the fakes."""
+import asyncio
+
+from backend.ai_manager import ai_manager
+from backend.service import db as service_db
+from backend.service import service_mode
+from scripts.bench import cli, harness
+from scripts.bench.scenarios import SCENARIOS
+
+
+def _run(**kw):
+    opts = dict(requests=4, concurrency=2, warmup=1, alloc_requests=1,
+                latency_ms=0, chunk_ms=0, db_latency_ms=0)
+    opts.update(kw)
+    return asyncio.run(cli.run(list(SCENARIOS), **opts))
+
+
+def test_every_scenario_runs_without_errors_and_restores_state():
+    client_before, pool_before = ai_manager.genai_client, service_db._pool
+    results = _run()
+    assert set(results["scenarios"]) == set(SCENARIOS)
+    for name, row in results["scenarios"].items():
+        assert row["errors"] == 0, (name, row.get("first_error"))
+        assert row["p50_ms"] > 0 and row["throughput_rps"] > 0
+        assert row["alloc_peak_kib"] > 0
+    assert results["scenarios"]["text_stream"]["ttfb_p50_ms"] > 0
+    assert results["db_queries"] > 0 and results["upstream_calls"] > 0
+    assert ai_manager.genai_client is client_before and service_db._pool is pool_before
+    assert not service_mode()
+
+
+def test_local_mode_skips_account_scenarios():
+    results = _run(service=False, api_mode="legacy")
+    assert "artifact_save" not in results["scenarios"]
+    assert all(r["errors"] == 0 for r in results["scenarios"].values())
+
+
+def test_baseline_comparison_flags_the_wrong_direction():
+    base = {"config": {"requests": 40}, "scenarios": {
+        "t": {"p50_ms": 10.0, "p95_ms": 20.0, "throughput_rps": 100.0}}}
+    cur = {"config": {"requests": 80}, "scenarios": {
+        "t": {"p50_ms": 10.5, "p95_ms": 30.0, "throughput_rps": 150.0}}}
+    rows = {r["metric"]: r for r in harness.compare(cur, base, tolerance=0.15)}
+    assert rows["p95_ms"]["regressed"] and not rows["p50_ms"]["regressed"]
+    assert not rows["throughput_rps"]["regressed"]  # faster is never a regression
+    assert harness.config_mismatch(cur, base) == ["requests"]
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert harness.percentile(values, 50) == 50
+    assert harness.percentile(values, 99) == 99
+    assert harness.percentile([7.0], 95) == 7.0
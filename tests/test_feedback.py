@@ -83,3 +83,88 @@ class TestLimitsAndFallbacks:
         res = client.post("/api/feedback", json={"message": "hello"})
         assert res.status_code == 503
         assert "github_url" in res.json()["detail"]
+
+
+def _seed(feedback_dir, month, entries):
+    feedback_dir.mkdir(parents=True, exist_ok=True)
+    with open(feedback_dir / f"feedback-{month}.jsonl", "a", encoding="utf-8") as f:
+        for e in entries:
+            f.write(json.dumps(e) + "\n")
+
+
+class TestReader:
+    def test_filters_by_kind_user_and_time(self, client, tmp_path):
+        fb = tmp_path / "feedback"
+        _seed(fb, "202609", [
+            {"ts": "2026-09-30T23:00:00+00:00", "kind": "general", "message": "sep"},
+        ])
+        _seed(fb, "202610", [
+            {"ts": "2026-10-01T10:00:00+00:00", "kind": "wrongly_blocked", "message": "a",
+             "contact": "x@example.com"},
+            {"ts": "2026-10-02T10:00:00+00:00", "kind": "general", "message": "b"},
+            {"ts": "2026-10-03T10:00:00+00:00", "kind": "wrongly_blocked", "message": "c"},
+        ])
+        body = client.get("/api/feedback").json()
+        assert body["total"] == 4
+        assert [e["message"] for e in body["entries"]] == ["c", "b", "a", "sep"]
+
+        blocked = client.get("/api/feedback?kind=wrongly_blocked").json()
+        assert [e["message"] for e in blocked["entries"]] == ["c", "a"]
+        mine = client.get("/api/feedback?user=x@example.com").json()
+        assert [e["message"] for e in mine["entries"]] == ["a"]
+        window = client.get("/api/feedback?since=2026-10-01&until=2026-10-03").json()
+        assert [e["message"] for e in window["entries"]] == ["b", "a"]
+        page = client.get("/api/feedback?limit=1&offset=1").json()
+        assert [e["message"] for e in page["entries"]] == ["b"]
+
+    def test_index_refreshes_incrementally_on_append(self, client, tmp_path):
+        client.post("/api/feedback", json={"message": "one"})
+        assert client.get("/api/feedback").json()["total"] == 1
+        assert list((tmp_path / "feedback").glob("*.idx.json"))
+        client.post("/api/feedback", json={"message": "two"})
+        body = client.get("/api/feedback").json()
+        assert [e["message"] for e in body["entries"]] == ["two", "one"]
+
+    def test_rollups_aggregate_per_month(self, client, tmp_path):
+        fb = tmp_path / "feedback"
+        _seed(fb, "202610", [
+            {"ts": "2026-10-01T10:00:00+00:00", "kind": "wrongly_blocked",
+             "surface": "image-studio", "categories": ["DANGEROUS_CONTENT"]},
+            {"ts": "2026-10-01T11:00:00+00:00", "kind": "general", "surface": "settings"},
+        ])
+        months = client.get("/api/feedback/rollups").json()["months"]
+        assert len(months) == 1
+        oct_ = months[0]
+        assert oct_["month"] == "2026-10"
+        assert oct_["total"] == 2
+        assert oct_["by_kind"] == {"wrongly_blocked": 1, "general": 1}
+        assert oct_["by_category"] == {"DANGEROUS_CONTENT": 1}
+        assert oct_["by_day"] == {"2026-10-01": 2}
+
+    def test_rollup_bounds_skip_months_before_indexing(self, client, tmp_path, monkeypatch):
+        fb = tmp_path / "feedback"
+        for month in ("202608", "202609", "202610"):
+            _seed(fb, month, [{"ts": f"{month[:4]}-{month[4:]}-02T10:00:00+00:00"}])
+        from backend.services import feedback_store
+        refreshed, real = [], feedback_store._refresh
+        monkeypatch.setattr(feedback_store, "_refresh", lambda p: refreshed.append(p.name) or real(p))
+        months = client.get("/api/feedback/rollups?since_month=2026-09&until_month=2026-09").json()["months"]
+        assert [m["month"] for m in months] == ["2026-09"]
+        assert refreshed == ["feedback-202609.jsonl"]
+
+    def test_rewritten_file_is_reindexed(self, client, tmp_path):
+        fb = tmp_path / "feedback"
+        _seed(fb, "202610", [{"ts": "2026-10-01T10:00:00+00:00", "message": "long original line"}])
+        assert client.get("/api/feedback").json()["total"] == 1
+        (fb / "feedback-202610.jsonl").write_text(
+            json.dumps({"ts": "2026-10-01T10:00:00+00:00", "message": "x"}) + "\n", encoding="utf-8")
+        body = client.get("/api/feedback").json()
+        assert [e["message"] for e in body["entries"]] == ["x"]
+
+    def test_bad_timestamp_is_400(self, client):
+        assert client.get("/api/feedback?since=yesterday").status_code == 400
+
+    def test_reads_hidden_when_hosted(self, client, monkeypatch):
+        monkeypatch.setenv("SYNTH_HOSTED", "1")
+        assert client.get("/api/feedback").status_code == 404
+        assert client.get("/api/feedback/rollups").status_code == 404
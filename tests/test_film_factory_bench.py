@@ -0,0 +1,38 @@
+"""Film factory bench: synthetic film through render → qc → assemble → tapeify."""
+import subprocess
+
+import pytest
+
+from scripts.film_factory import assemble, bench, qc, render, tapeify
+from scripts.film_factory.db import DB
+
+
+def test_synthetic_film_runs_every_stage_with_fake_ffmpeg(tmp_path):
+    base_s = render.TRANSIENT_BASE_S
+    results = bench.run(tmp_path, shots=6, concurrencies=(1, 3), tape_concurrency=2,
+                        veo_latency_s=0.01, qc_latency_ms=0, transient_rate=0.2,
+                        fake_ffmpeg=True, ffmpeg_scale=0.001)
+    sc = results["scenarios"]
+    assert set(sc) == {"render_c1", "render_c3", "assemble", "tapeify_c2"}
+    for name in ("render_c1", "render_c3"):
+        assert sc[name]["selected"] == sc[name]["shots"] == 6
+        assert sc[name]["takes"] >= 6  # sub-gate QC scores force some retakes
+        assert sc[name]["qc_p50_ms"] is not None
+    assert (tmp_path / "exports" / "manifest.csv").exists()
+    assert len(list((tmp_path / "tape").glob("*.mp4"))) == 6
+    assert results["ffmpeg_calls"]["concat"] == 4  # three acts + the full cut
+    # module patches are undone
+    assert render.TRANSIENT_BASE_S == base_s
+    assert qc.subprocess is subprocess and assemble.subprocess is subprocess
+    assert tapeify.subprocess is subprocess
+
+
+def test_refuses_a_real_project(tmp_path):
+    DB(tmp_path).set_meta("budget_usd", 100)
+    with pytest.raises(SystemExit):
+        bench.run(tmp_path, shots=2, concurrencies=(1,), fake_ffmpeg=True)
+
+
+def test_fake_ffmpeg_rejects_other_commands(tmp_path):
+    with pytest.raises(AssertionError):
+        bench.FakeFFmpeg().run(["ls", str(tmp_path)])
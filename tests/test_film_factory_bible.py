@@ -0,0 +1,96 @@
+"""Film factory bible: concurrent sheet generation, budget reservation, refcache."""
+import io
+import os
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+from scripts.film_factory import bible, costs, keyframes, refcache
+from scripts.film_factory.db import DB
+from backend.utils.image_payload import ImagePayload
+
+CHARACTERS = [{"id": f"c{i}", "name": f"Artist {i}", "visual_desc": "tall", "discipline": "paint",
+               "country": "PT"} for i in range(4)]
+
+
+def _png(seed=0) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (32, 18), (seed * 40 % 256, 80, 120)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class FakeAI:
+    def __init__(self, latency_s=0.02):
+        self.latency_s = latency_s
+        self.calls = []
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate_image(self, **kw):
+        with self._lock:
+            self.calls.append(kw)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.latency_s)
+        with self._lock:
+            self.active -= 1
+        return ImagePayload.from_bytes(_png(len(self.calls))) if kw.get("as_payload") else "unused"
+
+
+@pytest.fixture
+def db(tmp_path):
+    refcache.invalidate()
+    db = DB(tmp_path)
+    db.save_film({"title": "T", "characters": CHARACTERS,
+                  "locations": [{"id": "arena", "name": "Arena", "visual_desc": "vast"}]})
+    yield db
+    refcache.invalidate()
+
+
+def test_sheets_generate_concurrently_and_seed_the_cache(db):
+    ai = FakeAI()
+    bible.run(ai, db, concurrency=3)
+    rows = db.fetchall("SELECT id, status, path FROM assets")
+    assert len(rows) == 4 + 1 + 2 and all(r[1] == "done" for r in rows)
+    assert ai.peak == 3
+    path = dict((r[0], r[2]) for r in rows)["char_c0"]
+    assert refcache.sheet(path).data == open(path, "rb").read()
+    assert refcache.sheet(path) is refcache.sheet(path)
+
+
+def test_in_flight_sheets_count_against_the_budget(db):
+    db.set_meta("budget_usd", costs.estimate(bible.MODEL, 1) * 2.5)  # room for two
+    ai = FakeAI(latency_s=0.05)
+    with pytest.raises(costs.BudgetExceeded):
+        bible.run(ai, db, concurrency=4)
+    assert len(ai.calls) == 2
+    assert costs.spent(db) <= costs.budget(db)
+
+
+def test_keyframe_refs_come_from_the_cache(db):
+    bible.run(FakeAI(latency_s=0), db, concurrency=2)
+    refs, labels = keyframes._load_refs(db, ["c0", "c1"], "arena")
+    again, _ = keyframes._load_refs(db, ["c0", "c1"], "arena")
+    assert len(refs) == 4 and len(labels) == 4
+    assert all(a is b for a, b in zip(refs, again))
+
+
+def test_rewritten_or_replaced_sheets_are_reloaded(db):
+    path = db.dirs()["bible"] / "char_c0.png"
+    path.write_bytes(_png(1))
+    first = refcache.sheet(path)
+    jpeg = refcache.veo_jpeg(path)
+    assert refcache.veo_jpeg(path) is jpeg
+
+    path.write_bytes(_png(2))  # another process rewrites the file
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert refcache.sheet(path).data == _png(2)
+
+    db.exec("INSERT INTO assets (id, kind, name, prompt, path, status) "
+            "VALUES ('char_c0', 'character', 'A', 'p', ?, 'done')", (str(path),))
+    cached = refcache.sheet(path)
+    refcache.invalidate_asset(db, "char_c0")
+    assert refcache.sheet(path) is not cached
+    assert first.data == _png(1)
@@ -22,6 +22,7 @@ import pytest
 from backend import google_api
 from backend.helpers import SafetyBlockedError
 from backend.policy import policy, GOOGLE_API_INTERACTIONS, GOOGLE_API_LEGACY
+from backend.utils.image_payload import ImagePayload
 
 
 PNG = b"\x89PNG\r\n\x1a\n" + b"fakepixels"
@@ -142,6 +143,17 @@ class TestRequestShapes:
         assert sent["mime_type"] == "image/png"
         assert base64.b64decode(sent["data"]) == PNG
 
+    def test_image_payload_forwards_client_base64_unchanged(self, interactions_mode):
+        client = FakeClient(make_interaction(output_text="y"))
+        encoded = base64.b64encode(PNG).decode()
+        payload = ImagePayload.from_b64(encoded)
+        google_api.gen_text(client, "m", [google_api.image_block(payload),
+                                          google_api.text_block("x")])
+        sent = client.interactions.calls[0]["input"][0]
+        assert sent["data"] is encoded
+        assert sent["mime_type"] == "image/png"
+        assert not payload.has_data  # never decoded
+
     def test_chat_history_becomes_typed_steps(self, interactions_mode):
         client = FakeClient(make_interaction(output_text="y"))
         history = [
@@ -308,3 +320,12 @@ class TestModeDispatch:
         contents = client.models.calls[0]["contents"]
         assert [c["role"] for c in contents] == ["user", "model", "user"]
         assert contents[-1]["parts"][0]["text"] == "ping"
+
+    def test_legacy_decodes_image_payload_to_part(self, legacy_mode):
+        response = NS(prompt_feedback=None, candidates=[], text="ok")
+        client = FakeClient(legacy_response=response)
+        payload = ImagePayload.from_b64(base64.b64encode(PNG).decode())
+        google_api.gen_text(client, "m", [google_api.image_block(payload),
+                                          google_api.text_block("x")])
+        part = client.models.calls[0]["contents"][0]
+        assert part.inline_data.data == PNG
@@ -0,0 +1,143 @@
+"""Tests for backend.utils.image_payload — lazy, memoized image representations."""
+import base64
+import io
+
+import pytest
+from PIL import Image
+
+from backend.helpers import MAX_DECODED_IMAGE_BYTES, decode_image_payload
+from backend.utils.image_payload import ImagePayload, as_bytes
+
+
+def _png(size=8) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (size, size), (200, 40, 90)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+class TestFromB64:
+    def test_keeps_client_string_and_sniffs_without_full_decode(self):
+        png = _png()
+        encoded = _b64(png)
+        p = ImagePayload.from_b64(f"data:image/whatever;base64,{encoded}")
+        assert p.b64 is not None and p.b64 == encoded
+        assert p.mime == "image/png"
+        assert not p.has_data
+        assert len(p) == len(png)
+
+    def test_decodes_once_on_first_bytes_access(self):
+        png = _png()
+        p = ImagePayload.from_b64(_b64(png))
+        first = p.data
+        assert first == png
+        assert p.data is first
+        assert bytes(p) == png and as_bytes(p) is first
+
+    def test_wrapped_base64_is_normalized(self):
+        encoded = _b64(_png(32))
+        wrapped = "\n".join(encoded[i:i + 76] for i in range(0, len(encoded), 76))
+        assert ImagePayload.from_b64(wrapped).b64 == encoded
+
+    def test_size_cap_matches_decode_base64_image(self):
+        with pytest.raises(ValueError, match="too large"):
+            decode_image_payload("A" * (((MAX_DECODED_IMAGE_BYTES + 1024) * 4) // 3))
+        with pytest.raises(ValueError, match="too large"):
+            decode_image_payload(_b64(b"x" * 1024), max_bytes=64)
+
+
+    @pytest.mark.parametrize("bad", [
+        "data:image/png;base64,@@@not-base64@@@",
+        "iVBORw0KGgo",          # unpadded (length not a multiple of 4)
+        "iVBO=w0K",             # padding in the middle
+        "iVBORw0KGgo-_A=",      # URL-safe alphabet
+        "",
+    ])
+    def test_malformed_base64_is_rejected_up_front(self, bad):
+        with pytest.raises(ValueError, match="not valid base64"):
+            decode_image_payload(bad)
+
+
+class TestFromBytes:
+    def test_encodes_once_and_builds_data_uri(self):
+        jpeg = b"\xff\xd8\xff\xe0" + b"\0" * 32
+        p = ImagePayload.from_bytes(jpeg)
+        assert p.b64 is p.b64
+        assert base64.b64decode(p.b64) == jpeg
+        assert p.data_uri == f"data:image/jpeg;base64,{p.b64}"
+
+    def test_explicit_mime_wins(self):
+        assert ImagePayload.from_bytes(b"????", mime="image/webp").mime == "image/webp"
+
+    def test_needs_some_data(self):
+        with pytest.raises(ValueError):
+            ImagePayload()
+
+    def test_as_bytes_passes_plain_bytes_through(self):
+        raw = b"abc"
+        assert as_bytes(raw) is raw
+
+
+class TestGeminiImagePath:
+    """Reference image in, generated image out — one encode each way at most."""
+
+    def _manager(self, out_png):
+        from types import SimpleNamespace as NS
+
+        calls = []
+
+        class Interactions:
+            def create(self, **kwargs):
+                calls.append(kwargs)
+                return NS(status="completed", output_text=None, output_image=None,
+                          steps=[NS(type="model_output", error=None, content=[
+                              NS(type="image", data=_b64(out_png), mime_type="image/png")])])
+
+        manager = NS(genai_client=NS(interactions=Interactions()), saved=[],
+                     embed_metadata=lambda data, prompt, tags=None: data)
+        manager.save_output = lambda data, name: manager.saved.append(data)
+        return manager, calls
+
+    def _generate(self, manager, **kw):
+        from backend.services import image_gen
+        return image_gen._generate_image_gemini.__wrapped__(
+            manager, "a fox", "gemini-3.1-flash-image-preview", "1:1", **kw)
+
+    def test_payload_in_and_out(self, monkeypatch):
+        from backend.policy import policy, GOOGLE_API_INTERACTIONS
+        monkeypatch.setattr(policy, "effective_google_api", lambda: GOOGLE_API_INTERACTIONS)
+        out_png = _png(16)
+        manager, calls = self._manager(out_png)
+        ref = decode_image_payload(_b64(_png()))
+
+        result = self._generate(manager, reference_images=[ref], as_payload=True)
+
+        assert calls[0]["input"][0]["data"] is ref.b64
+        assert not ref.has_data
+        assert isinstance(result, ImagePayload) and result.data == out_png
+        assert manager.saved == [out_png]
+
+    def test_default_contract_is_base64(self, monkeypatch):
+        from backend.policy import policy, GOOGLE_API_INTERACTIONS
+        monkeypatch.setattr(policy, "effective_google_api", lambda: GOOGLE_API_INTERACTIONS)
+        out_png = _png(16)
+        manager, _ = self._manager(out_png)
+        assert self._generate(manager) == _b64(out_png)
+
+
+def test_bad_upload_fails_before_the_charge(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import backend.routers.generation as generation
+    import backend.server as server
+
+    charges = []
+    monkeypatch.setattr(generation, "charged", lambda *a, **k: charges.append(k))
+    r = TestClient(server.app, raise_server_exceptions=False).post(
+        "/api/generate/smart-transform",
+        json={"user_intent": "x", "input_image": "data:image/png;base64,@@@not-base64@@@"})
+    assert r.status_code == 500 and "not valid base64" in r.json()["detail"]
+    assert charges == []
@@ -0,0 +1,78 @@
+"""embed_metadata's chunk-level PNG writer: IDAT copied untouched, text set."""
+import io
+import json
+
+from PIL import Image
+
+from backend.utils.image_utils import (
+    PNG_SIGNATURE, _png_chunk, embed_metadata, png_with_text, read_png_text,
+)
+
+
+def _png(size=(24, 16)) -> bytes:
+    pixels = bytes(i * 7 % 256 for i in range(size[0] * size[1] * 3))
+    buf = io.BytesIO()
+    Image.frombytes("RGB", size, pixels).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _chunks(data: bytes):
+    pos, out = 8, []
+    while pos < len(data):
+        length = int.from_bytes(data[pos:pos + 4], "big")
+        out.append((data[pos + 4:pos + 8], data[pos + 8:pos + 8 + length]))
+        pos += 12 + length
+    return out
+
+
+def _idat(data: bytes) -> bytes:
+    return b"".join(body for ctype, body in _chunks(data) if ctype == b"IDAT")
+
+
+def test_embed_copies_idat_and_pil_reads_the_text():
+    src = _png()
+    out = embed_metadata(None, src, "a red fox", tags=[{"k": "v"}])
+    assert _idat(out) == _idat(src)
+    img = Image.open(io.BytesIO(out))
+    assert img.info["prompt"] == "a red fox" and img.info["Software"] == "Synthograsizer"
+    assert json.loads(img.info["provenance"])["tags"] == [{"k": "v"}]
+    assert img.tobytes() == Image.open(io.BytesIO(src)).tobytes()
+
+
+def test_text_goes_before_first_idat_and_replaces_same_keyword():
+    once = embed_metadata(None, _png(), "first")
+    twice = embed_metadata(None, once, "second")
+    types = [c for c, _ in _chunks(twice)]
+    assert types.count(b"tEXt") == 3
+    assert types.index(b"tEXt") < types.index(b"IDAT")
+    assert read_png_text(twice)["prompt"] == "second"
+
+
+def test_non_latin1_prompt_becomes_itxt():
+    out = embed_metadata(None, _png(), "狐 — fox")
+    assert b"iTXt" in [c for c, _ in _chunks(out)]
+    assert Image.open(io.BytesIO(out)).info["prompt"] == "狐 — fox"
+    assert read_png_text(out)["prompt"] == "狐 — fox"
+
+
+def test_other_chunks_survive():
+    src = _png()
+    # a private ancillary chunk (e.g. provenance data from upstream), before IEND
+    custom = _png_chunk(b"caBX", b"c2pa-ish")
+    src = src[:-12] + custom + src[-12:]
+    out = png_with_text(src, {"prompt": "x"})
+    assert (b"caBX", b"c2pa-ish") in _chunks(out)
+
+
+def test_jpeg_input_falls_back_to_pil_png():
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8), (10, 20, 30)).save(buf, format="JPEG")
+    out = embed_metadata(None, buf.getvalue(), "jpeg in")
+    assert out.startswith(PNG_SIGNATURE)
+    assert Image.open(io.BytesIO(out)).info["prompt"] == "jpeg in"
+
+
+def test_truncated_or_garbage_input():
+    src = _png()
+    assert png_with_text(src[:len(src) // 2], {"prompt": "x"}) is None
+    assert embed_metadata(None, b"not an image", "x") == b"not an image"
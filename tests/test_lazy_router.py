@@ -0,0 +1,75 @@
+"""Lazy surfaces: prefix table matches the routers, first request loads."""
+import importlib
+import sys
+import types
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+import backend.server as server
+from backend.utils import lazy_router
+
+
+@pytest.mark.parametrize("name", sorted(server.SURFACES))
+def test_surface_prefixes_cover_every_route(name):
+    prefixes = server.SURFACES[name]
+    router = importlib.import_module(f"backend.routers.{name}").router
+    for route in router.routes:
+        # a templated segment can only be claimed by a subtree prefix
+        probe = route.path.replace("{", "x").replace("}", "").replace(":path", "")
+        assert lazy_router.claims(prefixes, probe), f"{name}: {route.path} not covered by {prefixes}"
+
+
+def _fake_surface_module(monkeypatch):
+    mod = types.ModuleType("tests_fake_surface")
+    router = APIRouter()
+
+    @router.get("/api/fake/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    @router.post("/api/fake/echo")
+    async def echo(body: dict):
+        return body
+
+    mod.router = router
+    monkeypatch.setitem(sys.modules, "tests_fake_surface", mod)
+    return mod
+
+
+def test_first_request_loads_then_dispatches(monkeypatch):
+    _fake_surface_module(monkeypatch)
+    app = FastAPI()
+    surface = lazy_router.LazySurface("fake", "tests_fake_surface", ("/api/fake/",))
+    app.router.routes.append(surface)
+
+    @app.get("/api/other")
+    async def other():
+        return {"ok": True}
+
+    with TestClient(app) as client:
+        assert client.get("/api/other").json() == {"ok": True}
+        assert not surface.loaded  # unrelated paths never trigger the import
+        assert client.get("/api/fake/items/7").json() == {"id": 7}
+        assert surface.loaded
+        assert client.post("/api/fake/echo", json={"a": 1}).json() == {"a": 1}
+        assert client.get("/api/fake/echo").status_code == 405
+        assert client.get("/api/fake/nope").status_code == 404
+
+    row = next(r for r in lazy_router.report() if r["name"] == "fake")
+    assert row["mode"] == "lazy" and row["loaded"] and row["import_ms"] is not None
+
+
+def test_wrong_method_on_first_request_is_405(monkeypatch):
+    _fake_surface_module(monkeypatch)
+    app = FastAPI()
+    app.router.routes.append(lazy_router.LazySurface("fake2", "tests_fake_surface", ("/api/fake/",)))
+    with TestClient(app) as client:
+        assert client.get("/api/fake/echo").status_code == 405
+
+
+def test_report_lists_every_surface():
+    names = {r["name"] for r in lazy_router.report()}
+    assert set(server.SURFACES) <= names
+    assert lazy_router.startup_ms is not None
@@ -0,0 +1,166 @@
+"""Binary response modes for /api/generate/{image,video} and the media spool.
+
+Local (non-service) mode; the model calls are stubbed on the ai_manager
+instance, returning ImagePayloads the way the real services do with
+``as_payload=True``.
+"""
+import base64
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.server as server
+from backend.ai_manager import ai_manager
+from backend.services import media_store
+from backend.utils.image_payload import ImagePayload
+
+client = TestClient(server.app, raise_server_exceptions=False)
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"pixels" * 100
+PNG2 = b"\x89PNG\r\n\x1a\n" + b"other" * 50
+MP4 = b"\0\0\0\x18ftypmp42" + b"\x01" * 300
+
+
+@pytest.fixture(autouse=True)
+def local_mode(monkeypatch, tmp_path):
+    monkeypatch.delenv("SYNTH_AUTH", raising=False)
+    monkeypatch.delenv("SYNTH_HOSTED", raising=False)
+    monkeypatch.delenv("VERCEL", raising=False)
+    monkeypatch.setattr(media_store, "_dir", tmp_path / "spool")
+    media_store.clear()
+    yield
+    media_store.clear()
+
+
+@pytest.fixture
+def one_image(monkeypatch):
+    seen = {}
+
+    def fake_image(**kwargs):
+        seen.update(kwargs)
+        return ImagePayload.from_bytes(PNG) if kwargs.get("as_payload") else base64.b64encode(PNG).decode()
+    monkeypatch.setattr(ai_manager, "generate_image", fake_image, raising=False)
+    return seen
+
+
+def _parts(resp):
+    boundary = resp.headers["content-type"].split("boundary=", 1)[1].encode()
+    chunks = resp.content.split(b"--" + boundary)
+    assert chunks[-1].strip() == b"--"
+    out = []
+    for chunk in chunks[1:-1]:
+        head, _, body = chunk[2:].partition(b"\r\n\r\n")
+        headers = dict(line.split(": ", 1) for line in head.decode().split("\r\n"))
+        out.append((headers, body[:-2]))
+    return out
+
+
+class TestImageModes:
+    def test_json_is_the_default(self, one_image):
+        r = client.post("/api/generate/image", json={"prompt": "p"})
+        assert r.status_code == 200
+        assert base64.b64decode(r.json()["image"]) == PNG
+        assert one_image["as_payload"] is True
+
+    def test_multipart_via_accept_header(self, one_image):
+        r = client.post("/api/generate/image", json={"prompt": "p"},
+                        headers={"Accept": "multipart/mixed"})
+        assert r.status_code == 200
+        assert int(r.headers["content-length"]) == len(r.content)
+        (meta_h, meta), (img_h, img) = _parts(r)
+        assert meta_h["Content-Type"] == "application/json"
+        meta = json.loads(meta)
+        assert meta["status"] == "success" and "image" not in meta
+        assert meta["parts"] == [{"name": "image", "mime": "image/png", "bytes": len(PNG)}]
+        assert img_h["Content-Type"] == "image/png" and img == PNG
+
+    def test_ref_then_streaming_get(self, one_image):
+        r = client.post("/api/generate/image", json={"prompt": "p", "response_mode": "ref"})
+        body = r.json()
+        assert body["image"]["mime"] == "image/png" and body["expires_in"] > 0
+        got = client.get(body["image"]["url"])
+        assert got.status_code == 200
+        assert got.headers["content-type"] == "image/png" and got.content == PNG
+
+    def test_multi_image_ref_spools_each_once(self, monkeypatch):
+        images = [ImagePayload.from_bytes(PNG), ImagePayload.from_bytes(PNG2)]
+        monkeypatch.setattr(ai_manager, "generate_image",
+                            lambda **k: {"image": images[0], "images": images}, raising=False)
+        body = client.post("/api/generate/image",
+                           json={"prompt": "p", "image_count": 2, "response_mode": "ref"}).json()
+        assert body["image"] == body["images"][0]
+        assert [client.get(ref["url"]).content for ref in body["images"]] == [PNG, PNG2]
+        assert media_store.stats()["entries"] == 2
+
+    def test_text_rides_in_the_metadata(self, monkeypatch):
+        monkeypatch.setattr(ai_manager, "generate_image",
+                            lambda **k: {"image": ImagePayload.from_bytes(PNG), "text": "caption"},
+                            raising=False)
+        r = client.post("/api/generate/image", json={"prompt": "p", "response_mode": "multipart"})
+        (_, meta), (_, img) = _parts(r)
+        assert json.loads(meta)["text"] == "caption" and img == PNG
+
+    def test_ref_is_refused_when_hosted(self, one_image, monkeypatch):
+        monkeypatch.setenv("SYNTH_HOSTED", "1")
+        r = client.post("/api/generate/image", json={"prompt": "p", "response_mode": "ref"})
+        assert r.status_code == 400 and "single-process" in r.json()["detail"]
+        assert not one_image
+
+    def test_ref_needs_a_user_in_service_mode(self, one_image, monkeypatch):
+        import backend.routers.generation as generation
+        monkeypatch.setattr(generation, "service_mode", lambda: True)
+        r = client.post("/api/generate/image", json={"prompt": "p", "response_mode": "ref"})
+        assert r.status_code == 401 and "sign-in" in r.json()["detail"]
+        assert not one_image and media_store.stats()["entries"] == 0
+
+    def test_unknown_mode_is_400(self, one_image):
+        r = client.post("/api/generate/image", json={"prompt": "p", "response_mode": "zip"})
+        assert r.status_code == 400
+        assert not one_image  # rejected before the model call
+
+
+class TestVideoModes:
+    def test_multipart_video(self, monkeypatch):
+        async def fake_video(*a, **k):
+            assert k["as_payload"] is True
+            return {"video": ImagePayload.from_bytes(MP4, mime="video/mp4"), "video_uri": "gs://x"}
+        monkeypatch.setattr(ai_manager, "generate_video", fake_video, raising=False)
+        r = client.post("/api/generate/video", json={"prompt": "p", "response_mode": "multipart"})
+        (_, meta), (vid_h, vid) = _parts(r)
+        assert json.loads(meta)["video_uri"] == "gs://x"
+        assert vid_h["Content-Type"] == "video/mp4" and vid == MP4
+        assert vid_h["Content-Disposition"].endswith('filename="video-0.mp4"')
+
+    def test_json_video_from_legacy_result_shape(self, monkeypatch):
+        async def fake_video(*a, **k):
+            return {"video_b64": base64.b64encode(MP4).decode(), "video_uri": None}
+        monkeypatch.setattr(ai_manager, "generate_video", fake_video, raising=False)
+        body = client.post("/api/generate/video", json={"prompt": "p"}).json()
+        assert base64.b64decode(body["video"]) == MP4
+
+
+class TestMediaStore:
+    def test_unknown_token_is_404(self):
+        assert client.get("/api/media/nope").status_code == 404
+
+    def test_owner_bound(self):
+        token = media_store.put(PNG, "image/png", owner=7)
+        assert media_store.get(token, 7) is not None
+        assert media_store.get(token, 8) is None
+        assert media_store.get(token, None) is None
+
+    def test_expiry_removes_file(self, monkeypatch):
+        monkeypatch.setattr(media_store, "TTL_S", -1.0)
+        token = media_store.put(PNG, "image/png")
+        path = media_store._entries[token].path
+        assert media_store.get(token) is None
+        assert not path.exists()
+
+    def test_size_cap_evicts_oldest(self, monkeypatch):
+        monkeypatch.setattr(media_store, "MAX_BYTES", len(PNG) * 2)
+        first = media_store.put(PNG, "image/png")
+        media_store.put(PNG, "image/png")
+        media_store.put(PNG, "image/png")
+        assert media_store.get(first) is None
+        assert media_store.stats() == {"entries": 2, "bytes": len(PNG) * 2, "max_bytes": len(PNG) * 2}
@@ -0,0 +1,104 @@
+"""PNG text-chunk reader and the bulk extraction fan-out."""
+import asyncio
+import base64
+import io
+import zlib
+
+import pytest
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+from backend import config
+from backend.services import metadata_bulk
+from backend.utils.image_utils import embed_metadata, extract_metadata, read_png_text
+
+
+def _png(**text) -> bytes:
+    info = PngInfo()
+    for k, v in text.items():
+        info.add_text(k, v)
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 64), (200, 10, 10)).save(buf, format="PNG", pnginfo=info)
+    return buf.getvalue()
+
+
+def _chunk(ctype: bytes, data: bytes) -> bytes:
+    return (len(data).to_bytes(4, "big") + ctype + data
+            + zlib.crc32(ctype + data).to_bytes(4, "big"))
+
+
+def _b64(data: bytes) -> str:
+    return "data:image/png;base64," + base64.b64encode(data).decode()
+
+
+def test_reads_text_ztxt_and_itxt_chunks():
+    info = PngInfo()
+    info.add_text("prompt", "a red square")
+    info.add_text("Description", "x" * 2000, zip=True)   # zTXt
+    info.add_itxt("parameters", "café ☕", zip=True)      # compressed iTXt
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buf, format="PNG", pnginfo=info)
+    text = read_png_text(buf.getvalue())
+    assert text == {"prompt": "a red square", "Description": "x" * 2000,
+                    "parameters": "café ☕"}
+
+
+def test_finds_text_written_after_the_image_data():
+    data = _png()
+    iend = data.rindex(b"IEND") - 4
+    patched = data[:iend] + _chunk(b"tEXt", b"prompt\0late chunk") + data[iend:]
+    assert read_png_text(patched) == {"prompt": "late chunk"}
+    assert extract_metadata(None, patched)["prompt"] == "late chunk"
+
+
+def test_non_png_and_truncated_input():
+    assert read_png_text(b"\xff\xd8\xff\xe0jpeg") is None
+    data = _png(prompt="kept")
+    assert read_png_text(data[:-20]) == {"prompt": "kept"}
+
+
+def test_round_trip_with_embed_metadata():
+    tagged = embed_metadata(None, _png(), "neon city --ar 16:9", tags=["hero"])
+    meta = extract_metadata(None, tagged)
+    assert meta["prompt"] == "neon city"
+    assert meta["raw_prompt"] == "neon city --ar 16:9"
+    assert meta["provenance"]["tags"] == ["hero"]
+
+
+def _collect(images):
+    async def run():
+        return [row async for row in metadata_bulk.iter_extract_metadata(images)]
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(config, "METADATA_POOL_WORKERS", 2)
+    monkeypatch.setattr(config, "METADATA_POOL_MIN_BATCH", 2)
+    yield
+    metadata_bulk.shutdown()
+
+
+def test_bulk_rows_through_the_process_pool(pool):
+    images = [_b64(_png(prompt=f"image {i}")) for i in range(6)] + ["!!not base64!!"]
+    rows = {r["index"]: r for r in _collect(images)}
+    assert metadata_bulk._pool is not None
+    assert [rows[i]["prompt"] for i in range(6)] == [f"image {i}" for i in range(6)]
+    assert rows[6]["status"] == "error" and rows[6]["prompt"] == ""
+
+
+def test_small_batches_stay_on_threads(monkeypatch):
+    monkeypatch.setattr(config, "METADATA_POOL_MIN_BATCH", 8)
+    rows = _collect([_b64(_png(prompt="solo"))])
+    assert rows[0]["prompt"] == "solo"
+    assert metadata_bulk._pool is None
+
+
+def test_endpoint_keeps_input_order(pool):
+    from backend.models.requests import BulkMetadataRequest
+    from backend.routers.metadata import extract_metadata_bulk
+
+    images = [_b64(_png(prompt=f"p{i}")) for i in range(4)]
+    res = asyncio.run(extract_metadata_bulk(BulkMetadataRequest(images=images)))
+    assert [r["index"] for r in res["results"]] == [0, 1, 2, 3]
+    assert [r["prompt"] for r in res["results"]] == ["p0", "p1", "p2", "p3"]
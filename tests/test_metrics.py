@@ -0,0 +1,136 @@
+"""Latency histograms: recording, quantiles, exposition, no-op when disabled."""
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import google_api
+from backend.utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def _fresh(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _row(name, **labels):
+    return next(r for r in metrics.snapshot() if r["name"] == name and r["labels"] == labels)
+
+
+def test_quantiles_come_from_the_buckets():
+    for ms in [3] * 90 + [400] * 9 + [9000]:
+        metrics.observe("x", ms)
+    r = _row("x")
+    assert r["count"] == 100 and r["max_ms"] == 9000
+    assert 2 <= r["p50_ms"] <= 5
+    assert 200 <= r["p95_ms"] <= 500
+    assert r["p99_ms"] <= 9000
+
+
+def test_span_and_timed_record_errors_and_labels():
+    with pytest.raises(ValueError):
+        with metrics.span("op", model="m1"):
+            raise ValueError("x")
+
+    @metrics.timed("sync_op")
+    def work():
+        time.sleep(0.01)
+        return 1
+
+    @metrics.timed("async_op")
+    async def awork():
+        await asyncio.sleep(0.01)
+        return 2
+
+    assert work() == 1 and asyncio.run(awork()) == 2
+    assert _row("op", model="m1")["errors"] == 1
+    assert _row("sync_op")["p50_ms"] >= 5
+    assert _row("async_op")["count"] == 1
+
+
+def test_disabled_records_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", False)
+
+    @metrics.timed("quiet")
+    def work():
+        return 1
+
+    with metrics.span("quiet_span"):
+        work()
+    assert metrics.snapshot() == []
+
+
+def test_prometheus_text_is_cumulative():
+    metrics.observe("storage.put", 3)
+    metrics.observe("storage.put", 30)
+    text = metrics.prometheus_text()
+    assert "# TYPE synth_storage_put_ms histogram" in text
+    assert 'synth_storage_put_ms_bucket{le="5"} 1' in text
+    assert 'synth_storage_put_ms_bucket{le="+Inf"} 2' in text
+    assert "synth_storage_put_ms_count 2" in text
+
+
+def test_streaming_dispatcher_times_stream_and_first_chunk():
+    @google_api._timed_dispatch
+    def gen_fake(client, model, blocks):
+        time.sleep(0.02)
+        yield "a"
+        time.sleep(0.02)
+        yield "b"
+
+    assert list(gen_fake(None, "gemini-test", [])) == ["a", "b"]
+    whole = _row("google_api.gen_fake", model="gemini-test")
+    first = _row("google_api.gen_fake.first_chunk", model="gemini-test")
+    assert first["max_ms"] < whole["max_ms"]
+    assert whole["max_ms"] >= 35
+
+
+def test_stream_closed_early_is_cancelled_not_an_error():
+    @google_api._timed_dispatch
+    def gen_fake(client, model, blocks):
+        yield "a"
+        yield "b"
+
+    @google_api._timed_dispatch
+    def gen_broken(client, model, blocks):
+        yield "a"
+        raise RuntimeError("upstream")
+
+    stream = gen_fake(None, "gemini-test", [])
+    assert next(stream) == "a"
+    stream.close()  # consumer went away (e.g. ThreadedIterator.close on disconnect)
+    cancelled = _row("google_api.gen_fake", model="gemini-test", status="cancelled")
+    assert cancelled["count"] == 1 and cancelled["errors"] == 0
+
+    with pytest.raises(RuntimeError):
+        list(gen_broken(None, "gemini-test", []))
+    assert _row("google_api.gen_broken", model="gemini-test")["errors"] == 1
+
+
+def test_endpoint_latency_is_keyed_by_route_template():
+    import backend.server as server
+
+    with TestClient(server.app) as client:
+        client.get("/api/health")
+        client.get("/api/sessions/does-not-exist")
+    routes = {r["labels"].get("route") for r in metrics.snapshot() if r["name"] == "http.request"}
+    assert "/api/health" in routes
+    assert "/api/sessions/{sid}" in routes
+
+
+def test_disconnected_client_is_not_counted_as_5xx():
+    import backend.server as server
+    from starlette.requests import Request
+
+    async def hang_up(request):
+        raise asyncio.CancelledError
+
+    request = Request({"type": "http", "method": "GET", "path": "/x", "headers": []})
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(server._endpoint_latency(request, hang_up))
+    statuses = {r["labels"].get("status") for r in metrics.snapshot() if r["name"] == "http.request"}
+    assert statuses == {"cancelled"}
@@ -0,0 +1,96 @@
+"""music_hub fan-out: per-listener ring buffers, drop-oldest, metrics.
+
+Driven by a fake PCM source — no Lyria session, no sockets.
+"""
+import asyncio
+
+from backend.music_hub import BYTES_PER_SECOND, MusicHub
+
+CHUNK = b"\x00\x01" * (BYTES_PER_SECOND // 20)  # 0.1 s of 48kHz stereo PCM
+
+
+async def _fake_source(hub, n, interval=0.0):
+    for i in range(n):
+        await hub.publish(bytes([i % 256]) + CHUNK[1:])
+        await asyncio.sleep(interval)
+
+
+def test_slow_listener_drops_without_stalling_fast_one():
+    async def run():
+        hub = MusicHub(buffer_seconds=0.5)  # 5 chunks of headroom
+        fast, slow = hub.add(), hub.add()
+        got_fast, got_slow = [], []
+
+        async def fast_send(data):
+            got_fast.append(data)
+
+        async def slow_send(data):
+            await asyncio.sleep(0.05)
+            got_slow.append(data)
+
+        pumps = [asyncio.create_task(fast.pump(fast_send)),
+                 asyncio.create_task(slow.pump(slow_send))]
+        await _fake_source(hub, 40, interval=0.001)
+        await asyncio.sleep(0.4)
+        for l in (fast, slow):
+            hub.remove(l)
+        for p in pumps:
+            p.cancel()
+        return fast, slow, got_fast, got_slow
+
+    fast, slow, got_fast, got_slow = asyncio.run(run())
+    assert len(got_fast) == 40
+    assert fast.chunks_dropped == 0
+    assert slow.chunks_dropped > 0
+    assert len(got_slow) + slow.chunks_dropped + len(slow._audio) == 40
+    # what the slow client did hear is still in order (it skipped, not shuffled)
+    seq = [c[0] for c in got_slow]
+    assert seq == sorted(seq)
+
+
+def test_ring_buffer_keeps_newest_audio_within_budget():
+    hub = MusicHub(buffer_seconds=0.3)
+    listener = hub.add()
+    for i in range(10):
+        hub.publish_nowait(bytes([i]) + CHUNK[1:])
+    assert listener.lag_seconds <= 0.3 + 1e-9
+    assert [c[0] for c in listener._audio] == [7, 8, 9]
+    assert listener.chunks_dropped == 7
+
+
+def test_status_text_is_sent_before_queued_audio_and_never_dropped_for_audio():
+    async def run():
+        hub = MusicHub(buffer_seconds=0.1)
+        listener = hub.add()
+        for _ in range(5):
+            hub.publish_nowait(CHUNK)
+        hub.publish_nowait('{"status": "playing"}')
+        sent = []
+
+        async def send(data):
+            sent.append(data)
+            if len(sent) == 2:
+                listener.close()
+
+        await listener.pump(send)
+        return sent
+
+    sent = asyncio.run(run())
+    assert sent[0] == '{"status": "playing"}'
+    assert isinstance(sent[1], bytes)
+
+
+def test_stats_report_per_listener_lag_and_drops():
+    hub = MusicHub(buffer_seconds=0.2)
+    a = hub.add()
+    hub.add()
+    for _ in range(4):
+        hub.publish_nowait(CHUNK)
+    stats = hub.stats()
+    assert stats["listeners"] == 2
+    assert stats["chunks_dropped"] == 4
+    per = {s["id"]: s for s in stats["per_listener"]}
+    assert per[a.id]["lag_s"] == 0.2
+    assert per[a.id]["chunks_in"] == 4
+    hub.remove(a)
+    assert len(hub) == 1
@@ -0,0 +1,120 @@
+"""MusicManager control path: equal-power crossfades and command coalescing.
+
+No Lyria session — the scheduler gets a recording ``apply`` and the command
+queue is inspected directly.
+"""
+import asyncio
+import math
+
+import pytest
+
+from backend.music_manager import (
+    CMD_QUEUE_MAX, CrossfadeScheduler, MusicManager, equal_power_blend,
+)
+
+A = [{"text": "ambient pads", "weight": 1.0}]
+B = [{"text": "breakbeat", "weight": 1.0}]
+C = [{"text": "cello drone", "weight": 1.0}]
+
+
+def _weights(prompts):
+    return {p["text"]: p["weight"] for p in prompts}
+
+
+def test_equal_power_blend_keeps_power_constant():
+    for t in (0.1, 0.25, 0.5, 0.75, 0.9):
+        w = _weights(equal_power_blend(A, B, t))
+        assert w["ambient pads"] ** 2 + w["breakbeat"] ** 2 == pytest.approx(1.0)
+    mid = _weights(equal_power_blend(A, B, 0.5))
+    assert mid["ambient pads"] == pytest.approx(math.sqrt(0.5))  # linear would dip to 0.5
+
+
+def test_shared_prompt_moves_linearly_and_zero_weights_are_dropped():
+    old = [{"text": "piano", "weight": 1.0}, {"text": "rain", "weight": 0.5}]
+    new = [{"text": "piano", "weight": 0.5}]
+    mid = _weights(equal_power_blend(old, new, 0.5))
+    assert mid["piano"] == pytest.approx(0.75)
+    assert "rain" not in _weights(equal_power_blend(old, new, 1.0))
+
+
+def _recording_scheduler(max_rate=20.0):
+    sent, done = [], []
+
+    async def apply(prompts):
+        sent.append(prompts)
+
+    async def on_done(prompts):
+        done.append(prompts)
+
+    return CrossfadeScheduler(apply, on_done, max_rate=max_rate), sent, done
+
+
+def test_fade_is_rate_bounded_and_lands_on_target():
+    async def run():
+        sched, sent, done = _recording_scheduler(max_rate=20.0)
+        sched.start(A, B, duration=0.3, steps=1000)  # steps capped by max_rate
+        await asyncio.sleep(0.5)
+        return sched, sent, done
+
+    sched, sent, done = asyncio.run(run())
+    assert 2 <= len(sent) <= 8
+    assert sent[-1] == B
+    assert done == [B]
+    assert not sched.active
+
+
+def test_retarget_mid_flight_starts_from_current_mix():
+    async def run():
+        sched, sent, done = _recording_scheduler(max_rate=20.0)
+        sched.start(A, B, duration=0.4)
+        await asyncio.sleep(0.15)
+        mid = list(sched.current)
+        sched.start(A, C, duration=0.2)
+        await asyncio.sleep(0.4)
+        return sent, done, mid
+
+    sent, done, mid = asyncio.run(run())
+    assert "breakbeat" in _weights(mid)
+    assert done == [C]  # the abandoned A→B fade never reports completion
+    after = sent[sent.index(mid) + 1:]
+    # The retargeted fade starts from the A/B mix, not from A at full weight.
+    assert all(_weights(p).get("ambient pads", 0) <= _weights(mid)["ambient pads"] + 1e-9
+               for p in after)
+    assert after[-1] == C
+
+
+def test_set_now_cancels_a_running_fade():
+    async def run():
+        sched, sent, done = _recording_scheduler()
+        sched.start(A, B, duration=0.3)
+        await asyncio.sleep(0.1)
+        await sched.set_now(C)
+        await asyncio.sleep(0.4)
+        await sched.close()
+        return sent, done
+
+    sent, done = asyncio.run(run())
+    assert sent[-1] == C
+    assert done == []
+
+
+def test_rapid_controller_input_coalesces_instead_of_flooding():
+    async def run():
+        mm = MusicManager(api_key="test-key")
+        await mm.send_command({"action": "play"})
+        for i in range(200):
+            await mm.send_command({"action": "set_config", "config": {"bpm": 60 + i}})
+            await mm.send_command({"action": "set_config", "config": {"density": i / 200}})
+            await mm.send_command({"action": "crossfade_prompts", "new_prompts": [{"text": f"p{i}"}]})
+        await mm.send_command({"action": "stop"})
+        queued = []
+        while not mm._cmd_queue.empty():
+            cmd = mm._cmd_queue.get_nowait()
+            queued.append(mm._pending.pop(cmd["_slot"]) if "_slot" in cmd else cmd)
+        return queued
+
+    queued = asyncio.run(run())
+    assert len(queued) < CMD_QUEUE_MAX
+    assert [c["action"] for c in queued] == ["play", "set_config", "crossfade_prompts", "stop"]
+    assert queued[1]["config"] == {"bpm": 259, "density": 199 / 200}
+    assert queued[2]["new_prompts"] == [{"text": "p199"}]
@@ -0,0 +1,216 @@
+"""OSCBridge send scheduler against a real local UDP listener, and Scope
+discovery against a stand-in HTTP server."""
+import asyncio
+import http.server
+import socket
+import threading
+import time
+
+import pytest
+from pythonosc.osc_bundle import OscBundle
+from pythonosc.osc_message import OscMessage
+
+from backend.osc_bridge import MAX_BUNDLE_BYTES, OSCBridge
+
+
+@pytest.fixture
+def listener():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1.0)
+    yield sock
+    sock.close()
+
+
+def _drain(sock, quiet=0.2):
+    packets = []
+    sock.settimeout(quiet)
+    try:
+        while True:
+            packets.append(sock.recv(65536))
+    except socket.timeout:
+        pass
+    return packets
+
+
+def _messages(packet):
+    if OscBundle.dgram_is_bundle(packet):
+        return [(m.address, m.params[0]) for m in OscBundle(packet)]
+    m = OscMessage(packet)
+    return [(m.address, m.params[0])]
+
+
+def test_knob_sweep_coalesces_into_one_bundle_per_tick(listener):
+    bridge = OSCBridge("127.0.0.1", listener.getsockname()[1], tick_ms=50)
+    for i in range(100):
+        bridge.send_float("/scope/guidance", i / 10)
+    bridge.send_prompt("neon city", "/scope/prompt")
+    packets = _drain(listener)
+
+    assert len(packets) == 1
+    assert OscBundle.dgram_is_bundle(packets[0])
+    assert abs(OscBundle(packets[0]).timestamp - time.time()) < 5
+    assert _messages(packets[0]) == [("/scope/guidance", pytest.approx(9.9)),
+                                     ("/scope/prompt", "neon city")]
+    stats = bridge.stats()
+    assert stats["messagesIn"] == 101
+    assert stats["messagesCoalesced"] == 99
+    assert stats["messagesSent"] == 2
+    assert stats["packetsSent"] == 1
+
+
+def test_oversized_tick_splits_into_ordered_bundles(listener):
+    bridge = OSCBridge("127.0.0.1", listener.getsockname()[1], tick_ms=50)
+    long_prompt = "x" * 1000
+    for i in range(20):
+        bridge.send_prompt(long_prompt, f"/scope/layer/{i}")
+    packets = _drain(listener)
+
+    assert len(packets) > 1
+    assert all(len(p) <= MAX_BUNDLE_BYTES for p in packets)
+    addresses = [a for p in packets for a, _ in _messages(p)]
+    assert addresses == [f"/scope/layer/{i}" for i in range(20)]
+
+
+def test_zero_tick_sends_every_call_immediately(listener):
+    bridge = OSCBridge("127.0.0.1", listener.getsockname()[1], tick_ms=0)
+    bridge.send_int("/scope/seed", 1)
+    bridge.send_int("/scope/seed", 2)
+    packets = _drain(listener)
+    assert [_messages(p) for p in packets] == [[("/scope/seed", 1)], [("/scope/seed", 2)]]
+    assert bridge.stats()["messagesCoalesced"] == 0
+
+
+def _failing_send(packet):
+    raise OSError("network unreachable")
+
+
+def test_zero_tick_send_failure_reaches_the_caller(listener):
+    bridge = OSCBridge("127.0.0.1", listener.getsockname()[1], tick_ms=0)
+    bridge._client.send = _failing_send
+    with pytest.raises(OSError):
+        bridge.send_float("/scope/guidance", 1.0)
+    assert bridge.stats()["sendErrors"] == 1 and bridge.stats()["messagesSent"] == 0
+
+
+def test_send_endpoints_report_failures(monkeypatch, listener):
+    from fastapi import HTTPException
+    import backend.routers.osc as osc_router
+    from backend.models.requests import OSCSendParamRequest
+
+    req = OSCSendParamRequest(address="/scope/guidance", value=1.0)
+    bridge = OSCBridge("127.0.0.1", listener.getsockname()[1], tick_ms=0)
+    bridge._client.send = _failing_send
+    monkeypatch.setattr(osc_router, "osc_bridge", bridge)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(osc_router.osc_send_param(req))
+    assert exc.value.status_code == 500
+
+    bridge.tick_ms = 10  # queued: the flush fails later, on the sender thread
+    assert asyncio.run(osc_router.osc_send_param(req)) == {"ok": True, "queued": True, "sendErrors": 1}
+    time.sleep(0.1)
+    assert asyncio.run(osc_router.osc_send_param(req))["sendErrors"] == 2
+
+
+# ── Scope discovery ─────────────────────────────────────────────────────────
+
+class _ScopeStandIn:
+    """Minimal Scope: GET /health → 200, counting hits."""
+
+    def __init__(self):
+        stand_in = self
+        self.hits = 0
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.hits += 1
+                self.send_response(200 if self.path == "/health" else 404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _dead_url():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f"http://127.0.0.1:{port}"
+
+
+@pytest.fixture
+def scope():
+    s = _ScopeStandIn()
+    yield s
+    s.stop()
+
+
+def test_discovery_aligns_osc_and_serves_from_cache(scope):
+    async def run():
+        bridge = OSCBridge(tick_ms=0)
+        bridge.scope_candidates = []
+        first = await bridge.discover_scope(scope.url)
+        hits = scope.hits
+        second = await bridge.discover_scope(scope.url)
+        return first, second, hits, bridge
+
+    first, second, hits, bridge = asyncio.run(run())
+    assert first["healthy"] and first["scopeUrl"] == scope.url
+    assert (first["oscHost"], first["oscPort"]) == ("127.0.0.1", scope.port)
+    assert (bridge.host, bridge.port) == ("127.0.0.1", scope.port)
+    assert scope.hits == hits  # second answer came from the cache
+    assert second["checkedAt"] == first["checkedAt"]
+
+
+def test_stale_entry_returns_immediately_and_refreshes_in_background(scope):
+    async def run():
+        bridge = OSCBridge(tick_ms=0)
+        bridge.scope_candidates = []
+        bridge.discovery_ttl = 0.0
+        await bridge.discover_scope(scope.url)
+        scope.stop()  # Scope goes away
+        stale = await bridge.discover_scope(scope.url)
+        await asyncio.gather(*bridge._discovery_tasks.values())
+        fresh = await bridge.discover_scope(scope.url)
+        return stale, fresh
+
+    stale, fresh = asyncio.run(run())
+    assert stale["healthy"] is True  # cached answer, not a blocking re-probe
+    assert fresh["healthy"] is False
+
+
+def test_candidates_are_probed_concurrently_with_tight_timeouts(scope):
+    async def run():
+        bridge = OSCBridge(tick_ms=0)
+        bridge.scope_url = _dead_url()
+        bridge.scope_candidates = ["http://10.255.255.1:8000", scope.url]
+        t0 = time.monotonic()
+        result = await bridge.discover_scope()
+        return result, time.monotonic() - t0
+
+    result, elapsed = asyncio.run(run())
+    assert result["healthy"] and result["scopeUrl"] == scope.url
+    assert elapsed < 2.0
+
+
+def test_explicit_url_is_the_only_one_probed(scope):
+    async def run():
+        bridge = OSCBridge("127.0.0.1", 9999, tick_ms=0)
+        bridge.scope_candidates = [scope.url]
+        return await bridge.discover_scope(_dead_url()), bridge
+
+    result, bridge = asyncio.run(run())
+    assert result["healthy"] is False and result["scopeUrl"] != scope.url
+    assert scope.hits == 0
+    assert (bridge.host, bridge.port) == ("127.0.0.1", 9999)  # OSC not realigned
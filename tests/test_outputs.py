@@ -0,0 +1,90 @@
+"""/api/save-output + /api/list-outputs: content-addressed dedup and the sidecar index."""
+import json
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import backend.routers.outputs as outputs_router
+from backend import config
+
+
+@pytest.fixture()
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "OUTPUT_JSON_DIR", tmp_path / "JSON")
+    app = FastAPI()
+    app.include_router(outputs_router.router)
+    return TestClient(app)
+
+
+def _save(client, content, hint=None, kind="agent_profile"):
+    body = {"kind": kind, "content": content}
+    if hint:
+        body["filename_hint"] = hint
+    res = client.post("/api/save-output", json=body)
+    assert res.status_code == 200
+    return res.json()
+
+
+def _kind_dir(tmp_path):
+    return tmp_path / "JSON" / outputs_router.KIND_DIRS["agent_profile"]
+
+
+class TestSaveAndDedup:
+    def test_same_content_under_another_slug_is_deduped(self, client):
+        first = _save(client, {"name": "Night Owl", "category": "critic"})
+        assert first["status"] == "success"
+        again = _save(client, {"name": "Night Owl", "category": "critic", "id": "x"},
+                      hint="different words")
+        assert again["status"] == "exists"
+        assert again["filename"] == first["filename"]
+
+    def test_dedup_sees_files_copied_in_out_of_band(self, client, tmp_path):
+        _save(client, {"name": "seed"})  # index exists before the copy lands
+        content = {"name": "Copied In", "category": "x"}
+        (_kind_dir(tmp_path) / "hand-placed.json").write_text(json.dumps(content), encoding="utf-8")
+        res = _save(client, content, hint="something else")
+        assert res["status"] == "exists"
+        assert res["filename"] == "hand-placed.json"
+
+
+class TestListing:
+    def test_lists_newest_first_with_summary_fields(self, client, tmp_path):
+        a = _save(client, {"name": "Alpha", "description": "first"})
+        b = _save(client, {"name": "Beta", "description": "second"})
+        older = _kind_dir(tmp_path) / a["filename"]
+        os.utime(older, (1_000_000, 1_000_000))
+        body = client.get("/api/list-outputs/agent_profile").json()
+        assert body["count"] == 2
+        assert [i["filename"] for i in body["items"]] == [b["filename"], a["filename"]]
+        assert body["items"][0]["name"] == "Beta"
+        assert body["items"][0]["description"] == "second"
+
+    def test_out_of_band_edits_and_deletes_heal(self, client, tmp_path):
+        a = _save(client, {"name": "Alpha"})
+        b = _save(client, {"name": "Beta"})
+        (_kind_dir(tmp_path) / b["filename"]).unlink()
+        edited = _kind_dir(tmp_path) / a["filename"]
+        edited.write_text(json.dumps({"name": "Alpha Prime", "category": "edited"}), encoding="utf-8")
+        body = client.get("/api/list-outputs/agent_profile").json()
+        assert body["count"] == 1
+        assert body["items"][0]["name"] == "Alpha Prime"
+
+    def test_unreadable_files_are_skipped(self, client, tmp_path):
+        _save(client, {"name": "Good"})
+        (_kind_dir(tmp_path) / "broken.json").write_text("{nope", encoding="utf-8")
+        body = client.get("/api/list-outputs/agent_profile").json()
+        assert [i["name"] for i in body["items"]] == ["Good"]
+
+    def test_delete_drops_from_listing(self, client):
+        a = _save(client, {"name": "Alpha"})
+        assert client.delete(f"/api/delete-output/agent_profile/{a['filename']}").status_code == 200
+        assert client.get("/api/list-outputs/agent_profile").json()["count"] == 0
+
+    def test_deleted_index_is_rebuilt(self, client, tmp_path):
+        _save(client, {"name": "Alpha"})
+        for p in (tmp_path / "JSON" / ".index").iterdir():
+            p.unlink()
+        body = client.get("/api/list-outputs/agent_profile").json()
+        assert [i["name"] for i in body["items"]] == ["Alpha"]
@@ -0,0 +1,46 @@
+"""prompt_registry: slotted prompts render like str.format, versions are
+content hashes, and the template engine's modes are all registered."""
+import pytest
+
+from backend.services import prompt_registry, template_engine
+
+
+def test_slotted_prompt_renders_like_str_format():
+    fmt = 'Make {n} beats.\n{{"id": {n}, "prompt": "{{{{style}}}}"}}\n{extra}'
+    spec = prompt_registry.PromptSpec("t_format", fmt, slotted=True)
+    assert spec.slots == ("n", "extra")
+    assert spec.render(n=12, extra="ok") == fmt.format(n=12, extra="ok")
+    with pytest.raises(KeyError):
+        spec.render(n=12)
+
+
+def test_static_prompt_is_kept_verbatim_including_braces():
+    text = 'Respond as {"a": 1} with {{placeholders}}.'
+    spec = prompt_registry.PromptSpec("t_static", text, slotted=False)
+    assert spec.text == text and spec.slots == ()
+    assert spec.static_chars == len(text)
+
+
+def test_version_tracks_content():
+    a = prompt_registry.PromptSpec("m", "hello", slotted=False)
+    assert a.version == prompt_registry.PromptSpec("m", "hello", slotted=False).version
+    assert a.version != prompt_registry.PromptSpec("m", "hello!", slotted=False).version
+    assert a.version != prompt_registry.PromptSpec("other", "hello", slotted=False).version
+
+
+def test_complex_slot_expressions_are_rejected():
+    with pytest.raises(ValueError):
+        prompt_registry.PromptSpec("bad", "{x.upper()}", slotted=True)
+
+
+def test_template_engine_modes_are_registered_with_sizes():
+    modes = {row["mode"]: row for row in prompt_registry.sizes()}
+    for mode in ("generate_template", "remix_template", "generate_story_template",
+                 "generate_p5_template", "generate_agent_profile", "generate_taste_profile"):
+        assert mode in modes and modes[mode]["static_tokens_est"] > 0
+    assert modes["generate_story_template"]["slots"] == [
+        "target_beats", "total_duration", "beat_duration_s"]
+    story = template_engine._STORY_TEMPLATE_PROMPT.render(
+        target_beats=6, total_duration=48, beat_duration_s=8)
+    assert "6 BESPOKE beat prompts" in story and "{{anchor_key}}" in story
+    assert '"duration_seconds": 48,' in story
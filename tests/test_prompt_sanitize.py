@@ -0,0 +1,97 @@
+"""Tests for backend.utils.prompt_sanitize — MJ prompt cleaning and name scrubbing."""
+import random
+import re
+
+import pytest
+
+from backend.utils import prompt_sanitize
+from backend.utils.prompt_sanitize import NameScrubber, clean_midjourney_prompt, name_scrubber
+from scripts.film_factory.render import build_name_subs, scrub_names
+
+
+def _old_clean(prompt):
+    """The pre-module implementation, kept as the reference behavior."""
+    if not prompt:
+        return ""
+    prompt = re.sub(r"https?://\S+\s*", "", prompt)
+    match = re.search(r"(\s--[a-zA-Z]+|\sJob ID:)", prompt)
+    return prompt[:match.start()].strip() if match else prompt.strip()
+
+
+@pytest.mark.parametrize("prompt", [
+    "",
+    "a lighthouse at dusk",
+    "https://s.mj.run/abc a lighthouse at dusk --ar 16:9 --v 6.0",
+    "https://a.b/1.png https://a.b/2.png twin moons, oil paint --stylize 250",
+    "portrait of a fox Job ID: 1234-abcd",
+    "x https://a.b --ar 16:9",
+    "em--dash stays --no text",
+    "  padded prompt  ",
+])
+def test_clean_matches_reference(prompt):
+    assert clean_midjourney_prompt(prompt) == _old_clean(prompt)
+
+
+FILM = {"characters": [
+    {"name": "Dana Okafor", "discipline": "Sculpture"},
+    {"name": "Lou Reyes", "role": "host"},
+    {"name": "Ari", "discipline": "dance"},
+]}
+
+
+def _old_scrub(prompt, film):
+    for c in film["characters"]:
+        parts = c["name"].split()
+        disc = (c.get("discipline") or "artist").lower()
+        desc = "the broadcast commentator" if c.get("role") == "host" else f"the {disc} artist"
+        names = [c["name"]] + ([parts[0], parts[-1]] if len(parts) > 1 else [])
+        pat = re.compile(r"\b(" + "|".join(re.escape(n) for n in names) + r")('s)?\b", re.I)
+        prompt = pat.sub(lambda m, d=desc: d + (m.group(2) or ""), prompt)
+    return prompt
+
+
+@pytest.mark.parametrize("prompt", [
+    "Dana Okafor chisels marble while Lou Reyes narrates.",
+    "Close on OKAFOR's hands; Dana looks up. Reyes: 'And there it is.'",
+    "Ari spins; Arizona sunset behind, Ari's shadow long.",
+    "No cast here at all.",
+])
+def test_scrub_matches_sequential_reference(prompt):
+    assert scrub_names(prompt, build_name_subs(FILM)) == _old_scrub(prompt, FILM)
+
+
+def test_scrubber_is_cached_per_cast_and_memoizes():
+    a, b = build_name_subs(FILM), build_name_subs({"characters": list(FILM["characters"])})
+    assert a is b
+    text = "Dana Okafor waves."
+    assert a(text) is a(text)
+    assert build_name_subs({"characters": FILM["characters"][:1]}) is not a
+
+
+def test_shared_name_goes_to_first_character():
+    s = NameScrubber(((("Sam Lee", "Sam", "Lee"), "the painter"),
+                      (("Sam Cho", "Sam", "Cho"), "the drummer")))
+    assert s("Sam and Cho") == "the painter and the drummer"
+
+
+def test_empty_cast_passes_text_through():
+    assert name_scrubber(())("Anyone") == "Anyone"
+
+
+def test_trie_matches_flat_alternation(monkeypatch):
+    rng = random.Random(7)
+    syll = ["ka", "ro", "mi", "an", "del", "su", "ve", "lo"]
+    cast = []
+    for i in range(40):
+        first = "".join(rng.choice(syll) for _ in range(2)).title()
+        last = "".join(rng.choice(syll) for _ in range(3)).title()
+        cast.append(((f"{first} {last}", first, last), f"the artist {i}"))
+    cast = tuple(cast)
+    words = [n for names, _ in cast for n in names]
+    text = " ".join(rng.choice(words + ["and", "the", "Karo's", "Mika"]) for _ in range(400))
+
+    trie = NameScrubber(cast)
+    monkeypatch.setattr(prompt_sanitize, "TRIE_MIN_NAMES", 10_000)
+    flat = NameScrubber(cast)
+    assert "(?:" in trie._pattern.pattern and "(?:" not in flat._pattern.pattern
+    assert trie(text) == flat(text)
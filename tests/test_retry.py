@@ -0,0 +1,145 @@
+"""Retry engine: classification, jittered backoff, budgets, deadlines."""
+import asyncio
+import random
+import time
+
+import httpx
+import pytest
+from google.genai import errors as genai_errors
+
+from backend.helpers import SafetyBlockedError
+from backend.utils import retry
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    retry.reset()
+    yield
+    retry.reset()
+
+
+def _api_error(code, status):
+    return genai_errors.APIError(code, {"error": {"code": code, "status": status,
+                                                  "message": "boom"}})
+
+
+def test_classification_reads_structure_before_text():
+    assert retry.classify(_api_error(429, "RESOURCE_EXHAUSTED")) == retry.RATE_LIMITED
+    assert retry.classify(_api_error(503, "UNAVAILABLE")) == retry.UNAVAILABLE
+    assert retry.classify(_api_error(400, "INVALID_ARGUMENT")) == retry.FATAL
+    assert retry.classify(httpx.ReadTimeout("slow")) == retry.TIMEOUT
+    assert retry.classify(httpx.ConnectError("refused")) == retry.NETWORK
+    # "500" in a prompt echoed back inside a 400 is not a server error
+    assert retry.classify(_api_error(400, "INVALID_ARGUMENT 500 words")) == retry.FATAL
+    assert retry.classify(SafetyBlockedError("blocked: INTERNAL")) == retry.BLOCKED
+
+
+def test_wrapped_errors_are_classified_through_the_chain():
+    try:
+        try:
+            raise _api_error(429, "RESOURCE_EXHAUSTED")
+        except Exception as e:
+            raise Exception(f"Image generation failed: {e}")
+    except Exception as outer:
+        assert retry.classify(outer) == retry.RATE_LIMITED
+
+
+def test_bare_strings_fall_back_to_text():
+    assert retry.classify(Exception("503 UNAVAILABLE")) == retry.UNAVAILABLE
+    assert retry.classify(Exception("getaddrinfo failed")) == retry.NETWORK
+    assert retry.classify(Exception("bad prompt")) == retry.FATAL
+
+
+def test_backoff_is_jittered_and_capped():
+    b1, b2 = retry.Backoff(1, 20, rng=random.Random(1)), retry.Backoff(1, 20, rng=random.Random(2))
+    seq1 = [b1.next() for _ in range(8)]
+    seq2 = [b2.next() for _ in range(8)]
+    assert seq1 != seq2  # two callers failing together don't retry together
+    assert all(1 <= w <= 20 for w in seq1 + seq2)
+    assert max(seq1) > 3  # grows past the floor rather than staying linear-small
+
+
+def test_sync_retries_transient_then_succeeds_and_counts():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _api_error(503, "UNAVAILABLE")
+        return "ok"
+
+    policy = retry.RetryPolicy(max_attempts=4, base=0.001, cap=0.01)
+    assert retry.call_with_retry(flaky, policy=policy, key="m") == "ok"
+    s = retry.stats()["m"]
+    assert (s["calls"], s["attempts"], s["retries"], s["successes"], s["give_ups"]) == (1, 3, 2, 1, 0)
+
+
+def test_fatal_errors_are_not_retried():
+    calls = []
+
+    def bad():
+        calls.append(1)
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        retry.call_with_retry(bad, policy=retry.RetryPolicy(base=0.001), key="m")
+    assert len(calls) == 1
+
+
+def test_budget_trips_and_fails_fast_across_callers():
+    def always_429():
+        raise _api_error(429, "RESOURCE_EXHAUSTED")
+
+    policy = retry.RetryPolicy(max_attempts=10, base=0.001, cap=0.002)
+    for _ in range(3):
+        with pytest.raises(genai_errors.APIError):
+            retry.call_with_retry(always_429, policy=policy, key="veo")
+    s = retry.stats()["veo"]
+    assert s["retries"] == 5  # the shared bucket allowed 5 retries in total, not 27
+    assert s["budget_refusals"] == 3
+    assert s["breaker_open"] is True
+    assert retry.stats().get("imagen") is None  # other models unaffected
+
+
+def test_async_deadline_bounds_the_whole_call():
+    async def hangs():
+        await asyncio.sleep(5)
+
+    async def run():
+        t0 = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await retry.acall_with_retry(
+                hangs, policy=retry.RetryPolicy(max_attempts=5, base=0.01, deadline=0.2), key="k")
+        return time.monotonic() - t0
+
+    assert asyncio.run(run()) < 1.0
+
+
+def test_async_decorator_sleeps_without_holding_threads():
+    attempts = []
+
+    @retry.retrying(retry.RetryPolicy(max_attempts=3, base=0.05, cap=0.05), key=lambda m: m)
+    async def call(model):
+        attempts.append(model)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("reset")
+        return model
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        t = asyncio.create_task(ticker())
+        out = await call("gemini-x")
+        t.cancel()
+        return out, ticks
+
+    out, ticks = asyncio.run(run())
+    assert out == "gemini-x"
+    assert ticks >= 3  # the loop kept running during the backoff
+    assert retry.stats()["gemini-x"]["retries"] == 1
@@ -47,9 +47,28 @@ class FakePool:
     def ledger_reasons(self):
         return [op[0].split(":", 1)[1] for op in self.ops if op[0].startswith("ledger:")]
 
+    def _refund_orphans(self, limit):
+        """The janitor's set-based statement: flip still-'failed' rows, credit
+        the aggregate once, ledger each row with its running balance."""
+        batch = [o for o in self.orphans
+                 if self.gen_rows.get(o["id"], {}).get("status", "failed") == "failed"][:limit]
+        if not batch:
+            return 0
+        total = sum(o["credits"] for o in batch)
+        self.ops.append(("refund", total))
+        running = self.balance
+        self.balance += total
+        for o in sorted(batch, key=lambda o: o["id"]):
+            self.gen_rows.setdefault(o["id"], {}).update(status="refunded", error="orphaned_reserve")
+            running += o["credits"]
+            self.ops.append(("ledger:refund", (o["user_id"], o["credits"], running, o["id"])))
+        return len(batch)
+
     # -- asyncpg surface -----------------------------------------------------
     async def fetchval(self, sql, *args):
         s = self._norm(sql)
+        if "'orphaned reserve auto-refund'" in s:
+            return self._refund_orphans(limit=args[0])
         if "SET credits_balance = credits_balance -" in s:
             cost, _uid = args
             if self.balance >= cost:
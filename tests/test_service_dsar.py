@@ -110,6 +110,31 @@ def test_janitor_refunds_orphaned_reserves(service_on, fake_pool):
     assert "refund" in fake_pool.ledger_reasons()
 
 
+def test_janitor_orphan_refunds_are_aggregated_and_idempotent(service_on, fake_pool):
+    fake_pool.orphans = [{"id": 7, "user_id": 1, "credits": 2},
+                         {"id": 6, "user_id": 1, "credits": 3}]
+    summary = asyncio.run(retention.purge_service_db())
+    assert summary["orphan_refunds"] == 2
+    assert fake_pool.balance == 305
+    # one aggregate credit, one ledger row per generation with a running balance
+    assert [op for op in fake_pool.ops if op[0] == "refund"] == [("refund", 5)]
+    ledger = [op[1] for op in fake_pool.ops if op[0] == "ledger:refund"]
+    assert [(row[3], row[2]) for row in ledger] == [(6, 303), (7, 305)]
+
+    again = asyncio.run(retention.purge_service_db())
+    assert again["orphan_refunds"] == 0
+    assert fake_pool.balance == 305
+
+
+def test_janitor_refunds_orphan_backlog_in_batches(service_on, fake_pool, monkeypatch):
+    monkeypatch.setattr(retention, "ORPHAN_REFUND_BATCH", 2)
+    fake_pool.orphans = [{"id": i, "user_id": 1, "credits": 1} for i in range(1, 6)]
+    summary = asyncio.run(retention.purge_service_db())
+    assert summary["orphan_refunds"] == 5
+    assert fake_pool.balance == 305
+    assert [op[1] for op in fake_pool.ops if op[0] == "refund"] == [2, 2, 1]
+
+
 def test_janitor_noop_locally(monkeypatch):
     monkeypatch.delenv("SYNTH_AUTH", raising=False)
     assert asyncio.run(retention.purge_service_db()) == {}
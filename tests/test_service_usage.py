@@ -0,0 +1,146 @@
+"""Usage rollup tests — backend/service/usage.py compaction + stats reads.
+
+Runs without Postgres: a fake pool holds generations rows, the usage_daily
+table and the watermark in memory and answers exactly the SQL shapes
+usage.py emits, so the watermark/fold/tail-merge logic executes for real.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.service import db as service_db
+from backend.service import usage
+
+
+class FakeUsagePool:
+    def __init__(self):
+        self.generations = []   # {id, ts, action, model, credits, usd}
+        self.daily = {}         # (day, action, model) → [n, credits, usd]
+        self.watermark = 0
+
+    def add(self, action, credits=1, usd=0.01, model=None, age=timedelta(minutes=2)):
+        gid = len(self.generations) + 1
+        self.generations.append({"id": gid, "ts": datetime.now(timezone.utc) - age,
+                                 "action": action, "model": model,
+                                 "credits": credits, "usd": usd})
+        return gid
+
+    def _norm(self, sql):
+        return " ".join(sql.split())
+
+    async def fetchval(self, sql, *args):
+        s = self._norm(sql)
+        if "SELECT last_generation_id FROM usage_rollup_state" in s:
+            return self.watermark
+        if "SELECT MAX(id) FROM generations" in s:
+            cutoff = datetime.now(timezone.utc) - timedelta(minutes=1)
+            ids = [g["id"] for g in self.generations if g["id"] > args[0] and g["ts"] < cutoff]
+            return max(ids) if ids else None
+        if "INSERT INTO usage_daily" in s:
+            lo, hi = args
+            folded = 0
+            for g in self.generations:
+                if lo < g["id"] <= hi:
+                    key = (g["ts"].date(), g["action"], g["model"] or "")
+                    cell = self.daily.setdefault(key, [0, 0, 0.0])
+                    cell[0] += 1
+                    cell[1] += g["credits"]
+                    cell[2] += g["usd"]
+                    folded += 1
+            return folded
+        raise AssertionError(f"unexpected fetchval: {s}")
+
+    async def execute(self, sql, *args):
+        s = self._norm(sql)
+        if "UPDATE usage_rollup_state" in s:
+            self.watermark = args[0]
+            return
+        raise AssertionError(f"unexpected execute: {s}")
+
+    async def fetch(self, sql, *args):
+        s = self._norm(sql)
+        grouped = {}
+        if "FROM usage_daily" in s:
+            for (day, action, _model), (n, credits, usd) in self.daily.items():
+                if day >= args[0]:
+                    cell = grouped.setdefault((day, action), [0, 0, 0.0])
+                    cell[0] += n
+                    cell[1] += credits
+                    cell[2] += usd
+        elif "FROM generations WHERE id >" in s:
+            for g in self.generations:
+                if g["id"] > self.watermark and g["ts"] >= args[0]:
+                    cell = grouped.setdefault((g["ts"].date(), g["action"]), [0, 0, 0.0])
+                    cell[0] += 1
+                    cell[1] += g["credits"]
+                    cell[2] += g["usd"]
+        else:
+            raise AssertionError(f"unexpected fetch: {s}")
+        return [{"day": d, "action": a, "n": n, "credits": c, "usd": u}
+                for (d, a), (n, c, u) in grouped.items()]
+
+    def acquire(self):
+        pool = self
+
+        class _Tx:
+            async def __aenter__(self): return self
+            async def __aexit__(self, *a): return False
+
+        class _Conn:
+            fetchval = pool.fetchval
+            execute = pool.execute
+            def transaction(self): return _Tx()
+
+        class _Acquire:
+            async def __aenter__(self): return _Conn()
+            async def __aexit__(self, *a): return False
+        return _Acquire()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    p = FakeUsagePool()
+    monkeypatch.setattr(service_db, "_pool", p)
+    return p
+
+
+def test_compact_folds_once_and_advances_watermark(pool):
+    pool.add("text", credits=1, usd=0.01, model="m1")
+    pool.add("text", credits=1, usd=0.01, model="m1")
+    pool.add("image", credits=4, usd=0.04, model="m2")
+    assert asyncio.run(usage.compact()) == 3
+    assert pool.watermark == 3
+    assert asyncio.run(usage.compact()) == 0  # idempotent: nothing past the watermark
+    today = datetime.now(timezone.utc) - timedelta(minutes=2)
+    assert pool.daily[(today.date(), "text", "m1")][0] == 2
+
+
+def test_compact_leaves_in_flight_rows_for_next_pass(pool):
+    pool.add("text")
+    pool.add("text", age=timedelta(seconds=5))
+    assert asyncio.run(usage.compact()) == 1
+    assert pool.watermark == 1
+
+
+def test_stats_merge_rollup_with_uncompacted_tail(pool):
+    pool.add("image", credits=4, usd=0.04)
+    pool.add("text", credits=1, usd=0.01)
+    pool.add("text", credits=1, usd=0.01, age=timedelta(seconds=1))  # too fresh to fold
+    out = asyncio.run(usage.stats())
+    assert pool.watermark == 2
+    assert out["today"]["generations"] == 3
+    assert out["today"]["credits"] == 6
+    assert [a["action"] for a in out["today"]["by_action"]] == ["image", "text"]
+    assert out["month"]["generations"] == 3
+
+
+def test_stats_after_compaction_match_live_numbers(pool):
+    for _ in range(3):
+        pool.add("text", credits=1, usd=0.01)
+    asyncio.run(usage.compact())
+    pool.add("text", credits=1, usd=0.01, age=timedelta(seconds=1))  # tail row
+    out = asyncio.run(usage.stats())
+    assert out["today"]["generations"] == 4
+    assert out["today"]["by_action"] == [{"action": "text", "n": 4, "usd_est": pytest.approx(0.04)}]
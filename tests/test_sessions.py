@@ -0,0 +1,101 @@
+"""/api/sessions: indexed, paginated listing and partial updates."""
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import backend.routers.sessions as sessions_router
+
+
+@pytest.fixture()
+def client(tmp_path, monkeypatch):
+    sessions_dir = tmp_path / "Sessions"
+    sessions_dir.mkdir()
+    monkeypatch.setattr(sessions_router, "SESSIONS_DIR", sessions_dir)
+    app = FastAPI()
+    app.include_router(sessions_router.router)
+    return TestClient(app)
+
+
+def _save(client, **fields):
+    res = client.post("/api/sessions", json=fields)
+    assert res.status_code == 200
+    return res.json()["session"]
+
+
+class TestListing:
+    def test_list_returns_metadata_not_bodies(self, client):
+        _save(client, id="s_a", name="Alpha", goal="win",
+              agents=[{"profileId": "p1"}, {"profileId": "p2"}], sharedAnchors={"k": "v"})
+        body = client.get("/api/sessions").json()
+        assert body["total"] == 1
+        item = body["sessions"][0]
+        assert item["id"] == "s_a"
+        assert item["agentCount"] == 2
+        assert item["anchorCount"] == 1
+        assert "agents" not in item
+
+    def test_full_loads_bodies_for_the_page(self, client):
+        _save(client, id="s_a", name="Alpha", agents=[{"profileId": "p1"}])
+        item = client.get("/api/sessions?full=true").json()["sessions"][0]
+        assert item["agents"] == [{"profileId": "p1", "overrides": None}]
+        assert item["agentCount"] == 1
+
+    def test_full_returns_the_stored_body_untruncated(self, client, tmp_path):
+        goal = "g" * 300
+        _save(client, id="s_a", name="Alpha", goal=goal)
+        (tmp_path / "Sessions" / "s_hand.json").write_text(
+            json.dumps({"name": "Hand placed", "goal": "x"}), encoding="utf-8")
+        items = {s["id"]: s for s in client.get("/api/sessions?full=true").json()["sessions"]}
+        assert items["s_a"]["goal"] == goal
+        assert "resolutionMode" not in items["s_hand"]
+        assert client.get("/api/sessions").json()["sessions"][0]["goal"] == goal[:140]
+
+    def test_full_keeps_unreadable_sessions_on_the_page(self, client, monkeypatch):
+        _save(client, id="s_a", name="Alpha")
+        _save(client, id="s_b", name="Beta")
+        read_one = sessions_router._read_one
+        monkeypatch.setattr(sessions_router, "_read_one",
+                            lambda p: None if p.name == "s_b.json" else read_one(p))
+        body = client.get("/api/sessions?full=true").json()
+        assert body["total"] == len(body["sessions"]) == 2
+        assert {s["id"]: s["name"] for s in body["sessions"]} == {"s_a": "Alpha", "s_b": "Beta"}
+
+    def test_sorted_and_paginated(self, client):
+        for sid, name in (("s_1", "Cello"), ("s_2", "Alto"), ("s_3", "Bass")):
+            _save(client, id=sid, name=name)
+        body = client.get("/api/sessions?sort=name&order=asc&limit=2").json()
+        assert [s["name"] for s in body["sessions"]] == ["Alto", "Bass"]
+        assert body["total"] == 3
+        page2 = client.get("/api/sessions?sort=name&order=asc&limit=2&offset=2").json()
+        assert [s["name"] for s in page2["sessions"]] == ["Cello"]
+
+    def test_rejects_unknown_sort_field(self, client):
+        assert client.get("/api/sessions?sort=agents").status_code == 400
+
+    def test_out_of_band_files_are_picked_up(self, client, tmp_path):
+        _save(client, id="s_a", name="Alpha")
+        (tmp_path / "Sessions" / "s_hand.json").write_text(
+            json.dumps({"name": "Hand placed", "updatedAt": "2001-01-01T00:00:00Z"}), encoding="utf-8")
+        names = [s["name"] for s in client.get("/api/sessions").json()["sessions"]]
+        assert names == ["Alpha", "Hand placed"]
+        client.delete("/api/sessions/s_a")
+        assert [s["id"] for s in client.get("/api/sessions").json()["sessions"]] == ["s_hand"]
+
+
+class TestPatch:
+    def test_patch_changes_only_given_fields(self, client):
+        saved = _save(client, id="s_a", name="Alpha", goal="win", agents=[{"profileId": "p1"}])
+        res = client.patch("/api/sessions/s_a", json={"name": "Renamed"})
+        assert res.status_code == 200
+        session = res.json()["session"]
+        assert session["name"] == "Renamed"
+        assert session["goal"] == "win"
+        assert session["agents"] == saved["agents"]
+        assert session["createdAt"] == saved["createdAt"]
+        listed = client.get("/api/sessions").json()["sessions"][0]
+        assert listed["name"] == "Renamed"
+
+    def test_patch_missing_session_404s(self, client):
+        assert client.patch("/api/sessions/s_nope", json={"name": "x"}).status_code == 404
@@ -0,0 +1,91 @@
+"""ThreadedIterator: one worker thread per stream, errors surface, early close
+stops the producer."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.utils.stream_bridge import ThreadedIterator
+
+
+def test_whole_stream_runs_on_one_dedicated_thread():
+    threads = set()
+
+    def tokens():
+        for i in range(50):
+            threads.add(threading.get_ident())
+            yield f"t{i}"
+
+    async def run():
+        async with ThreadedIterator(tokens) as it:
+            return [t async for t in it]
+
+    out = asyncio.run(run())
+    assert out == [f"t{i}" for i in range(50)]
+    assert len(threads) == 1
+    assert threading.get_ident() not in threads
+
+
+def test_iterator_errors_reach_the_consumer():
+    def tokens():
+        yield "a"
+        raise RuntimeError("upstream reset")
+
+    async def run():
+        got = []
+        with pytest.raises(RuntimeError, match="upstream reset"):
+            async with ThreadedIterator(tokens) as it:
+                async for t in it:
+                    got.append(t)
+        return got
+
+    assert asyncio.run(run()) == ["a"]
+
+
+def test_closing_early_stops_and_closes_the_producer():
+    produced, closed = [], threading.Event()
+
+    def tokens():
+        try:
+            for i in range(10_000):
+                produced.append(i)
+                time.sleep(0.001)
+                yield i
+        finally:
+            closed.set()
+
+    async def run():
+        async with ThreadedIterator(tokens, max_buffer=4) as it:
+            async for t in it:
+                if t == 2:
+                    break
+        return it
+
+    it = asyncio.run(run())
+    it.thread.join(2.0)
+    assert closed.is_set()
+    assert not it.thread.is_alive()
+    assert len(produced) < 20  # bounded by the buffer, not the stream length
+
+
+def test_slow_consumer_bounds_worker_read_ahead():
+    produced = []
+
+    def tokens():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    async def run():
+        async with ThreadedIterator(tokens, max_buffer=3) as it:
+            first = await it.__anext__()
+            await asyncio.sleep(0.1)
+            ahead = len(produced)
+            rest = [t async for t in it]
+        return first, ahead, rest
+
+    first, ahead, rest = asyncio.run(run())
+    assert first == 0
+    assert ahead <= 5
+    assert rest == list(range(1, 100))
@@ -13,6 +13,7 @@ these exercise the wrapper's plumbing, not Gemini.
 import asyncio
 
 import pytest
+from fastapi import HTTPException
 
 import backend.routers.templates as tmod
 from backend.models.requests import TemplateRequest
@@ -33,15 +34,20 @@ class _FakeCharge:
         pass
 
 
-def _wire(monkeypatch, *, impl_result, service_mode, name="Neon Cats", gen_id=4242):
+def _wire(monkeypatch, *, impl_result, service_mode, name="Neon Cats", gen_id=4242,
+          brief_name=None):
     async def fake_impl(request):
         return impl_result
 
     async def fake_name(template):
         return name
 
+    async def fake_brief(brief):
+        return brief_name
+
     monkeypatch.setattr(tmod, "_generate_template_impl", fake_impl)
     monkeypatch.setattr(tmod, "_safe_name_template", fake_name)
+    monkeypatch.setattr(tmod, "_safe_name_brief", fake_brief)
     monkeypatch.setattr(tmod, "charged", lambda *a, **k: _FakeCharge(gen_id))
     monkeypatch.setattr(tmod, "service_mode", lambda: service_mode)
     monkeypatch.setattr(tmod, "is_free_tier", lambda req: False)
@@ -105,6 +111,121 @@ def test_name_failure_is_non_fatal(monkeypatch):
     assert "template_name" not in res
 
 
+# ── naming without a sequential extra call ───────────────────────────────────
+
+def test_name_already_in_template_skips_model_calls(monkeypatch):
+    """p5 sketches / stories come back named — use that, call nothing after."""
+    post_hoc = {"called": False}
+
+    async def spy_name(template):
+        post_hoc["called"] = True
+        return "Unused"
+
+    _wire(monkeypatch,
+          impl_result={"status": "success",
+                       "template": {"promptTemplate": "x", "variables": [],
+                                    "story": {"title": "The Long Night Shift"}}},
+          service_mode=True, brief_name="Brief Name")
+    monkeypatch.setattr(tmod, "_safe_name_template", spy_name)
+    res = _run(TemplateRequest(mode="story", prompt="a noir western"))
+    assert res["template_name"] == "The Long Night Shift"
+    assert post_hoc["called"] is False
+
+
+@pytest.mark.parametrize("mode", ["story", "p5", "remix"])
+def test_no_speculative_name_for_self_named_or_edit_modes(monkeypatch, mode):
+    """story/p5 carry their own name; a remix prompt is an edit, not a theme."""
+    async def no_brief(brief):
+        raise AssertionError(f"{mode} must not start a speculative naming call")
+
+    _wire(monkeypatch,
+          impl_result={"status": "success", "template": {"promptTemplate": "x", "variables": []}},
+          service_mode=True)
+    monkeypatch.setattr(tmod, "_safe_name_brief", no_brief)
+    res = _run(TemplateRequest(mode=mode, prompt="make it darker"))
+    assert res["template_name"] == "Neon Cats"  # post-hoc, from the template
+
+
+def test_no_speculative_name_when_the_reservation_is_refused(monkeypatch):
+    started = {"brief": False}
+
+    class _Refused:
+        async def __aenter__(self):
+            raise HTTPException(status_code=402, detail="insufficient credits")
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def spy_brief(brief):
+        started["brief"] = True
+
+    _wire(monkeypatch, impl_result=None, service_mode=True)
+    monkeypatch.setattr(tmod, "charged", lambda *a, **k: _Refused())
+    monkeypatch.setattr(tmod, "_safe_name_brief", spy_brief)
+
+    async def run():
+        with pytest.raises(HTTPException):
+            await tmod.generate_template(TemplateRequest(mode="text", prompt="cats"),
+                                         http_request=object())
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert started["brief"] is False
+
+
+def test_speculative_name_overlaps_generation(monkeypatch):
+    """The brief-based name runs during generation: total ≈ max, not sum."""
+    import time
+
+    async def slow_impl(request):
+        await asyncio.sleep(0.2)
+        return {"status": "success", "template": {"promptTemplate": "x", "variables": []}}
+
+    async def slow_brief(brief):
+        await asyncio.sleep(0.2)
+        return "Neon Cats"
+
+    async def no_post_hoc(template):
+        raise AssertionError("post-hoc naming should not run when speculation succeeded")
+
+    _wire(monkeypatch, impl_result=None, service_mode=True)
+    monkeypatch.setattr(tmod, "_generate_template_impl", slow_impl)
+    monkeypatch.setattr(tmod, "_safe_name_brief", slow_brief)
+    monkeypatch.setattr(tmod, "_safe_name_template", no_post_hoc)
+    t0 = time.monotonic()
+    res = _run(TemplateRequest(mode="text", prompt="cats in neon"))
+    assert res["template_name"] == "Neon Cats"
+    assert time.monotonic() - t0 < 0.35
+
+
+def test_speculative_name_is_cancelled_when_generation_fails(monkeypatch):
+    state = {"cancelled": False}
+
+    async def failing_impl(request):
+        await asyncio.sleep(0.01)
+        raise HTTPException(status_code=504, detail="timeout")
+
+    async def hanging_brief(brief):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+
+    _wire(monkeypatch, impl_result=None, service_mode=True)
+    monkeypatch.setattr(tmod, "_generate_template_impl", failing_impl)
+    monkeypatch.setattr(tmod, "_safe_name_brief", hanging_brief)
+
+    async def run():
+        with pytest.raises(HTTPException):
+            await tmod.generate_template(TemplateRequest(mode="text", prompt="cats"),
+                                         http_request=object())
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert state["cancelled"] is True
+
+
 # ── pure name sanitizer ──────────────────────────────────────────────────────
 
 @pytest.mark.parametrize("raw,expected", [
@@ -121,6 +242,88 @@ def test_sanitize_name(raw, expected):
     assert tmod._sanitize_name(raw) == expected
 
 
+@pytest.mark.parametrize("raw,expected", [
+    ("The Long Night of Glass", "The Long Night of Glass"),   # titles keep their words
+    ("**Ember Road.**\nsubtitle", "Ember Road"),
+    ("word " * 30, ("word " * 12).strip()),                   # cut at a word boundary
+    ("x" * 80, "x" * tmod.TITLE_MAX_CHARS),
+    ("  ", None),
+])
+def test_trim_title(raw, expected):
+    assert tmod._trim_title(raw) == expected
+
+
 def test_sanitize_name_caps_length():
     out = tmod._sanitize_name("Supercalifragilistic Expialidocious")
     assert out is not None and len(out) <= 24
+
+
+# ── workflow stream metering on disconnect ───────────────────────────────────
+
+class _StreamCharge:
+    settled = None
+
+    def __init__(self, *a, **k):
+        pass
+
+    async def reserve(self):
+        pass
+
+    async def settle_ok(self, error=None):
+        _StreamCharge.settled = ("ok", error)
+
+    async def settle_refund(self, error=None):
+        _StreamCharge.settled = ("refund", error)
+
+
+class _SlowCurator:
+    def __init__(self, delay, fail=False):
+        self.delay, self.fail = delay, fail
+
+    def curate_workflow(self, workflow, image_bytes, **kwargs):
+        import time
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError("bad image")
+        return {"template": {}, "rationale": []}
+
+    def iter_workflow_curations(self, *a, **k):
+        from backend.services.workflow import iter_workflow_curations
+        return iter_workflow_curations(self, *a, **k)
+
+
+def _drop_stream(monkeypatch, curator, wait_s):
+    monkeypatch.setattr(tmod, "Charge", _StreamCharge)
+    monkeypatch.setattr(tmod, "ai_manager", curator)
+    monkeypatch.setattr(tmod, "is_free_tier", lambda req: False)
+    _StreamCharge.settled = None
+
+    async def run():
+        resp = await tmod.generate_workflow_stream(
+            TemplateRequest(mode="workflow", workflow={"variables": []}, images=["AAAA", "AAAA"]),
+            http_request=object())
+        first = asyncio.ensure_future(resp.body_iterator.__anext__())
+        await asyncio.sleep(wait_s)
+        first.cancel()  # client hangs up
+        with pytest.raises(BaseException):
+            await first
+    asyncio.run(run())
+    return _StreamCharge.settled
+
+
+def test_disconnect_with_curations_running_keeps_the_charge(monkeypatch):
+    assert _drop_stream(monkeypatch, _SlowCurator(0.3), 0.05) == ("ok", "client_disconnected")
+
+
+def test_stream_where_every_image_failed_refunds(monkeypatch):
+    _drop_stream(monkeypatch, _SlowCurator(0.0, fail=True), 0.0)  # wires the fakes
+
+    async def run():
+        resp = await tmod.generate_workflow_stream(
+            TemplateRequest(mode="workflow", workflow={"variables": []}, images=["AAAA", "AAAA"]),
+            http_request=object())
+        return [line async for line in resp.body_iterator]
+
+    lines = asyncio.run(run())
+    assert '"failed": 2' in lines[-1]
+    assert _StreamCharge.settled == ("refund", "workflow_curation_failed")
@@ -0,0 +1,95 @@
+"""iter_workflow_curations: images run concurrently under a bound, each with
+its own timeout, and a failure stays in its own slot."""
+import asyncio
+import threading
+import time
+
+from backend.services.workflow import iter_workflow_curations
+
+WORKFLOW = {"variables": [{"name": "mood", "values": ["calm", "wild"]}]}
+
+
+class _FakeManager:
+    """Stands in for AIManager: ``curate_workflow`` sleeps per image."""
+
+    def __init__(self, delays, fail=()):
+        self.delays = delays
+        self.fail = set(fail)
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def curate_workflow(self, workflow, image_bytes, **kwargs):
+        idx = int(image_bytes)
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delays[idx])
+            if idx in self.fail:
+                raise ValueError(f"bad image {idx}")
+            return {"template": {"image": idx}, "rationale": []}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _collect(manager, n, **kwargs):
+    async def run():
+        images = [str(i).encode() for i in range(n)]
+        return [o async for o in iter_workflow_curations(manager, WORKFLOW, images, **kwargs)]
+
+    t0 = time.monotonic()
+    outcomes = asyncio.run(run())
+    return outcomes, time.monotonic() - t0
+
+
+def test_batch_takes_about_as_long_as_its_slowest_image():
+    mgr = _FakeManager([0.2] * 4)
+    outcomes, elapsed = _collect(mgr, 4, concurrency=4)
+    assert sorted(o["index"] for o in outcomes) == [0, 1, 2, 3]
+    assert all(o["ok"] for o in outcomes)
+    assert elapsed < 0.6  # serial would be 0.8s
+
+
+def test_concurrency_bound_is_respected():
+    mgr = _FakeManager([0.05] * 8)
+    outcomes, _ = _collect(mgr, 8, concurrency=2)
+    assert len(outcomes) == 8
+    assert mgr.peak == 2
+
+
+def test_outcomes_arrive_in_completion_order():
+    mgr = _FakeManager([0.3, 0.05, 0.15])
+    outcomes, _ = _collect(mgr, 3, concurrency=3)
+    assert [o["index"] for o in outcomes] == [1, 2, 0]
+
+
+def test_failures_and_timeouts_stay_in_their_own_slot():
+    mgr = _FakeManager([0.05, 0.05, 0.6], fail={1})
+    outcomes, _ = _collect(mgr, 3, concurrency=3, timeout=0.3)
+    by_index = {o["index"]: o for o in outcomes}
+    assert by_index[0]["ok"] and by_index[0]["result"]["template"] == {"image": 0}
+    assert not by_index[1]["ok"] and "bad image 1" in by_index[1]["error"]
+    assert isinstance(by_index[1]["exc"], ValueError)
+    assert not by_index[2]["ok"] and by_index[2]["error"].startswith("Timed out")
+    assert isinstance(by_index[2]["exc"], asyncio.TimeoutError)
+
+
+def test_undecodable_image_fails_alone():
+    mgr = _FakeManager([0.01, 0.01])
+
+    async def run():
+        images = [b"0", "data:image/png;base64,@@not-base64@@"]
+        return [o async for o in iter_workflow_curations(mgr, WORKFLOW, images)]
+
+    outcomes = {o["index"]: o for o in asyncio.run(run())}
+    assert outcomes[0]["ok"]
+    assert not outcomes[1]["ok"]
+
+
+def test_timed_out_images_keep_their_slot_until_the_thread_ends():
+    mgr = _FakeManager([0.3] * 4)
+    outcomes, _ = _collect(mgr, 4, concurrency=2, timeout=0.05)
+    assert all(not o["ok"] for o in outcomes)
+    assert mgr.peak == 2  # abandoned threads still count against the bound